@@ -1,3 +1,4 @@
+from access.grupos import pertence_a_grupo
 from rest_framework import permissions
 
 
@@ -5,7 +6,7 @@ class IsStaffOrSindico(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and (
             request.user.is_staff
-            or request.user.groups.filter(name__iexact="admin").exists()
-            or request.user.groups.filter(name="Síndicos").exists()
-            or request.user.groups.filter(name="Cerimonialista").exists()
+            or pertence_a_grupo(
+                request.user, "admin", "Síndicos", "Cerimonialista"
+            )
         )
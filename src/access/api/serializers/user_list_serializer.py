@@ -1,4 +1,6 @@
 from access.models import User
+from app.utils.campos_dinamicos import CamposDinamicosMixin
+from cadastros.services.arquivo_service import url_versionada
 from django.contrib.auth.models import Group
 from rest_framework import serializers
 
@@ -9,7 +11,7 @@ class GroupSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     condominio_nome = serializers.CharField(
         source="condominio.nome", read_only=True
     )
@@ -32,8 +34,10 @@ class UserListSerializer(serializers.ModelSerializer):
     foto_url = serializers.SerializerMethodField(read_only=True)
 
     def get_foto_url(self, obj):
-        if obj.foto_db_data:
-            return f"/access/profile/{obj.id}/foto-db/"
+        if obj.foto_arquivo_id:
+            return url_versionada(
+                f"/access/profile/{obj.id}/foto-db/", obj.foto_arquivo_id
+            )
         return None
 
     class Meta:
@@ -56,3 +60,12 @@ class UserListSerializer(serializers.ModelSerializer):
             "groups",
             "foto_url",
         ]
+        select_related_por_campo = {
+            "condominio_nome": ("condominio",),
+            "condominio_id": ("condominio",),
+        }
+        prefetch_related_por_campo = {
+            "unidade_identificacao": ("unidades",),
+            "unidade_id": ("unidades",),
+            "groups": ("groups",),
+        }
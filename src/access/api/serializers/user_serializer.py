@@ -1,4 +1,5 @@
 from access.models import User
+from cadastros.services.arquivo_service import url_versionada
 from rest_framework import serializers
 
 
@@ -22,8 +23,10 @@ class UserSerializer(serializers.ModelSerializer):
         return str(first.id) if first else None
 
     def get_foto_url(self, obj):
-        if obj.foto_db_data:
-            return f"/access/profile/{obj.id}/foto-db/"
+        if obj.foto_arquivo_id:
+            return url_versionada(
+                f"/access/profile/{obj.id}/foto-db/", obj.foto_arquivo_id
+            )
         return None
 
     class Meta:
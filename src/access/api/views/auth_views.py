@@ -5,8 +5,10 @@ from django.http import HttpResponse, JsonResponse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from rest_framework.authentication import get_authorization_header
 from rest_framework.authtoken.models import Token
 
+from ...autenticacao import invalidar_token, invalidar_tokens_do_usuario
 from ..serializers import UserSerializer
 
 
@@ -65,5 +67,11 @@ class LoginView(View):
 @method_decorator(csrf_exempt, name="dispatch")
 class LogoutView(View):
     def post(self, request, *args, **kwargs):
+        # Tira o usuário do cache de autenticação por token
+        partes = get_authorization_header(request).split()
+        if len(partes) == 2 and partes[0].lower() == b"token":
+            invalidar_token(partes[1].decode(errors="ignore"))
+        elif request.user.is_authenticated:
+            invalidar_tokens_do_usuario(request.user.pk)
         logout(request)
         return JsonResponse({"message": "Logout successful"})
@@ -1,5 +1,7 @@
+from access.grupos import pertence_a_grupo
 from django.contrib.auth.models import Group
 from django.core.paginator import Paginator
+from django.db.models import Count
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -11,9 +13,8 @@ class GroupListView(APIView):
 
     def get(self, request):
         # Verificar se o usuário tem permissão (apenas staff ou admin)
-        if (
-            not request.user.is_staff
-            and not request.user.groups.filter(name="admin").exists()
+        if not request.user.is_staff and not pertence_a_grupo(
+            request.user, "admin"
         ):
             return Response(
                 {"error": "Acesso negado"}, status=status.HTTP_403_FORBIDDEN
@@ -26,7 +27,9 @@ class GroupListView(APIView):
             page_size = int(request.GET.get("page_size", 10))
 
             # Filtrar grupos
-            groups = Group.objects.all().order_by("name")
+            groups = Group.objects.annotate(
+                users_count=Count("user")
+            ).order_by("name")
 
             if search:
                 groups = groups.filter(name__icontains=search)
@@ -43,7 +46,7 @@ class GroupListView(APIView):
                         "id": group.id,
                         "nome": group.name,
                         "is_ativo": True,  # Grupos do Django são sempre ativos
-                        "users_count": group.user_set.count(),
+                        "users_count": group.users_count,
                     }
                 )
 
@@ -64,9 +67,8 @@ class GroupListView(APIView):
 
     def post(self, request):
         # Verificar se o usuário tem permissão (apenas staff ou admin)
-        if (
-            not request.user.is_staff
-            and not request.user.groups.filter(name="admin").exists()
+        if not request.user.is_staff and not pertence_a_grupo(
+            request.user, "admin"
         ):
             return Response(
                 {"error": "Acesso negado"}, status=status.HTTP_403_FORBIDDEN
@@ -111,9 +113,8 @@ class GroupDetailView(APIView):
 
     def patch(self, request, group_id):
         # Verificar se o usuário tem permissão (apenas staff ou admin)
-        if (
-            not request.user.is_staff
-            and not request.user.groups.filter(name="admin").exists()
+        if not request.user.is_staff and not pertence_a_grupo(
+            request.user, "admin"
         ):
             return Response(
                 {"error": "Acesso negado"}, status=status.HTTP_403_FORBIDDEN
@@ -151,9 +152,8 @@ class GroupDetailView(APIView):
 
     def delete(self, request, group_id):
         # Verificar se o usuário tem permissão (apenas staff ou admin)
-        if (
-            not request.user.is_staff
-            and not request.user.groups.filter(name="admin").exists()
+        if not request.user.is_staff and not pertence_a_grupo(
+            request.user, "admin"
         ):
             return Response(
                 {"error": "Acesso negado"}, status=status.HTTP_403_FORBIDDEN
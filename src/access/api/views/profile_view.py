@@ -2,10 +2,14 @@ import re
 from html import escape
 from urllib.parse import urlparse
 
+from access.grupos import grupos_do_usuario, pertence_a_grupo
 from app.utils.validators import format_cpf
+from cadastros.services.arquivo_service import ler_arquivo, url_versionada
+from cadastros.services.email_service import enfileirar_email
 from django.conf import settings as django_settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.db import transaction
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -58,8 +62,6 @@ def _enviar_email_aprovacao_morador(request, user, senha_temporaria):
     import base64
     import io
 
-    import resend
-
     if not user.email:
         return False
 
@@ -78,8 +80,9 @@ def _enviar_email_aprovacao_morador(request, user, senha_temporaria):
     try:
         from PIL import Image
 
-        if condominio and getattr(condominio, "logo_db_data", None):
-            image_buffer = io.BytesIO(bytes(condominio.logo_db_data))
+        logo_db = ler_arquivo(getattr(condominio, "logo_arquivo_id", None))
+        if logo_db:
+            image_buffer = io.BytesIO(logo_db)
             img = Image.open(image_buffer).convert("RGBA")
             img.thumbnail((220, 80), Image.LANCZOS)
             out_buffer = io.BytesIO()
@@ -132,7 +135,6 @@ def _enviar_email_aprovacao_morador(request, user, senha_temporaria):
 """
 
     try:
-        resend.api_key = api_key
         payload = {
             "from": email_from,
             "to": [user.email],
@@ -148,7 +150,7 @@ def _enviar_email_aprovacao_morador(request, user, senha_temporaria):
                     "disposition": "inline",
                 }
             ]
-        resend.Emails.send(payload)
+        enfileirar_email(payload)
         return True
     except Exception:
         return False
@@ -158,8 +160,6 @@ def _enviar_email_reset_senha(request, user, nova_senha):
     import base64
     import io
 
-    import resend
-
     if not user.email:
         return False
 
@@ -178,8 +178,9 @@ def _enviar_email_reset_senha(request, user, nova_senha):
     try:
         from PIL import Image
 
-        if condominio and getattr(condominio, "logo_db_data", None):
-            image_buffer = io.BytesIO(bytes(condominio.logo_db_data))
+        logo_db = ler_arquivo(getattr(condominio, "logo_arquivo_id", None))
+        if logo_db:
+            image_buffer = io.BytesIO(logo_db)
             img = Image.open(image_buffer).convert("RGBA")
             img.thumbnail((220, 80), Image.LANCZOS)
             out_buffer = io.BytesIO()
@@ -231,7 +232,6 @@ def _enviar_email_reset_senha(request, user, nova_senha):
 """
 
     try:
-        resend.api_key = api_key
         payload = {
             "from": email_from,
             "to": [user.email],
@@ -247,7 +247,7 @@ def _enviar_email_reset_senha(request, user, nova_senha):
                     "disposition": "inline",
                 }
             ]
-        resend.Emails.send(payload)
+        enfileirar_email(payload)
         return True
     except Exception:
         return False
@@ -260,7 +260,10 @@ class ProfileView(APIView):
         user = request.user
 
         # Buscar os grupos do usuário
-        groups = user.groups.all().values("id", "name")
+        groups = [
+            {"id": grupo_id, "name": nome}
+            for grupo_id, nome in sorted(grupos_do_usuario(user))
+        ]
 
         return Response(
             {
@@ -277,15 +280,18 @@ class ProfileView(APIView):
                 "is_active": user.is_active,
                 "created_at": user.created_at,
                 "updated_at": user.updated_at,
-                "groups": list(groups),
+                "groups": groups,
                 "condominio_id": user.condominio.id
                 if user.condominio
                 else None,
                 "condominio_nome": user.condominio.nome
                 if user.condominio
                 else None,
-                "foto_url": f"/access/profile/{user.id}/foto-db/"
-                if user.foto_db_data
+                "foto_url": url_versionada(
+                    f"/access/profile/{user.id}/foto-db/",
+                    user.foto_arquivo_id,
+                )
+                if user.foto_arquivo_id
                 else None,
                 "unidade_id": user.unidades.values_list(
                     "id", flat=True
@@ -307,9 +313,7 @@ class ProfileView(APIView):
         try:
             # Determinar usuário alvo da atualização
             target_user = None
-            is_sindico_requester = request.user.groups.filter(
-                name="Síndicos"
-            ).exists()
+            is_sindico_requester = pertence_a_grupo(request.user, "Síndicos")
             was_inactive = False
             activated_now = False
             should_delete_pending_user = False
@@ -325,7 +329,7 @@ class ProfileView(APIView):
                     if request.user.is_staff:
                         target_user = User.objects.get(id=user_id)
                     # Síndicos podem editar usuários do mesmo condomínio
-                    elif request.user.groups.filter(name="Síndicos").exists():
+                    elif pertence_a_grupo(request.user, "Síndicos"):
                         candidate = User.objects.get(id=user_id)
                         if getattr(
                             request.user, "condominio_id", None
@@ -340,9 +344,7 @@ class ProfileView(APIView):
                                 },
                                 status=status.HTTP_403_FORBIDDEN,
                             )
-                    elif request.user.groups.filter(
-                        name="Cerimonialista"
-                    ).exists():
+                    elif pertence_a_grupo(request.user, "Cerimonialista"):
                         candidate = User.objects.get(id=user_id)
                         pode_editar_grupo = candidate.groups.filter(
                             name__in=["Organizador do Evento", "Recepção"]
@@ -560,34 +562,36 @@ class ProfileView(APIView):
                 target_user.set_password(senha_temporaria_aprovacao)
                 target_user.first_access = True
 
-            target_user.save()
+            # E-mails vão para a outbox na mesma transação da alteração
+            with transaction.atomic():
+                target_user.save()
 
-            if activated_now:
-                email_enviado = _enviar_email_aprovacao_morador(
-                    request,
-                    target_user,
-                    senha_temporaria_aprovacao,
-                )
+                if activated_now:
+                    email_enviado = _enviar_email_aprovacao_morador(
+                        request,
+                        target_user,
+                        senha_temporaria_aprovacao,
+                    )
 
-            # Enviar e-mail informando usuário e nova senha quando alterado por administrador/síndico
-            if senha_alterada_por_terceiro and nova_senha_fornecida:
-                if not target_user.email:
-                    senha_email_erro = "Usuário sem e-mail cadastrado"
-                elif not django_settings.RESEND_API_KEY:
-                    senha_email_erro = "RESEND_API_KEY ausente"
-                elif not django_settings.EMAIL_FROM:
-                    senha_email_erro = "EMAIL_FROM ausente"
-                else:
-                    try:
-                        senha_email_enviado = _enviar_email_reset_senha(
-                            request, target_user, nova_senha_fornecida
-                        )
-                    except Exception:
-                        senha_email_enviado = False
-                    if not senha_email_enviado:
-                        senha_email_erro = (
-                            "Falha ao enviar e-mail pelo provedor"
-                        )
+                # Enviar e-mail informando usuário e nova senha quando alterado por administrador/síndico
+                if senha_alterada_por_terceiro and nova_senha_fornecida:
+                    if not target_user.email:
+                        senha_email_erro = "Usuário sem e-mail cadastrado"
+                    elif not django_settings.RESEND_API_KEY:
+                        senha_email_erro = "RESEND_API_KEY ausente"
+                    elif not django_settings.EMAIL_FROM:
+                        senha_email_erro = "EMAIL_FROM ausente"
+                    else:
+                        try:
+                            senha_email_enviado = _enviar_email_reset_senha(
+                                request, target_user, nova_senha_fornecida
+                            )
+                        except Exception:
+                            senha_email_enviado = False
+                        if not senha_email_enviado:
+                            senha_email_erro = (
+                                "Falha ao enviar e-mail pelo provedor"
+                            )
 
             return Response(
                 {
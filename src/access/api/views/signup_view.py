@@ -1,8 +1,14 @@
 import re
-from io import BytesIO
 
+from access.grupos import pertence_a_grupo
 from app.utils.validators import validate_cpf
 from cadastros.models import Condominio, Unidade
+from cadastros.services.arquivo_service import (
+    resposta_arquivo,
+    salvar_upload,
+    url_versionada,
+)
+from cadastros.services.qrcode_service import qrcode_png
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
@@ -74,21 +80,25 @@ class SignupCondominioInfoView(APIView):
         unidades = (
             Unidade.objects.filter(
                 is_active=True,
-                created_by__condominio_id=condominio.id,
+                condominio_id=condominio.id,
             )
             .distinct()
             .order_by("bloco", "numero")
         )
 
+        logo_path = (
+            f"/api/access/signup/condominio/{condominio.signup_slug}/logo/"
+        )
+        if condominio.logo_arquivo_id:
+            logo_path = url_versionada(logo_path, condominio.logo_arquivo_id)
+
         return Response(
             {
                 "condominio": {
                     "id": condominio.id,
                     "nome": condominio.nome,
                     "slug": condominio.signup_slug,
-                    "logo_url": request.build_absolute_uri(
-                        f"/api/access/signup/condominio/{condominio.signup_slug}/logo/"
-                    ),
+                    "logo_url": request.build_absolute_uri(logo_path),
                 },
                 "unidades": [
                     {
@@ -106,7 +116,7 @@ class SignupCondominioLogoView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
-    def get(self, _request, slug):
+    def get(self, request, slug):
         try:
             condominio = Condominio.objects.get(
                 signup_slug=slug, is_ativo=True
@@ -117,12 +127,15 @@ class SignupCondominioLogoView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        if getattr(condominio, "logo_db_data", None):
-            return HttpResponse(
-                bytes(condominio.logo_db_data),
-                content_type=condominio.logo_db_content_type
-                or "application/octet-stream",
-            )
+        response = resposta_arquivo(
+            request,
+            condominio.logo_arquivo_id,
+            condominio.logo_db_content_type,
+            last_modified=condominio.updated_at,
+            publico=True,
+        )
+        if response is not None:
+            return response
 
         if getattr(condominio, "logo", None):
             try:
@@ -151,10 +164,7 @@ class SignupInviteLinkView(APIView):
     def get_target_condominio(self, request):
         condominio_id = request.query_params.get("condominio_id")
 
-        if (
-            request.user.is_staff
-            or request.user.groups.filter(name="admin").exists()
-        ):
+        if request.user.is_staff or pertence_a_grupo(request.user, "admin"):
             if condominio_id:
                 try:
                     return Condominio.objects.get(id=condominio_id)
@@ -166,7 +176,7 @@ class SignupInviteLinkView(APIView):
                 ).first()
             return None
 
-        is_sindico = request.user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(request.user, "Síndicos")
         if not is_sindico:
             return None
 
@@ -221,8 +231,6 @@ class SignupInviteQrCodeView(SignupInviteLinkView):
     """Retorna PNG do QR Code do link de cadastro de moradores do condomínio."""
 
     def get(self, request):
-        import qrcode
-
         condominio = self.get_target_condominio(request)
         if not condominio:
             return Response(
@@ -236,11 +244,6 @@ class SignupInviteQrCodeView(SignupInviteLinkView):
         payload = self._build_response(request, condominio)
         signup_url = payload.get("signup_url") or payload.get("path")
 
-        qr_img = qrcode.make(str(signup_url))
-        buffer = BytesIO()
-        qr_img.save(buffer, format="PNG")
-        buffer.seek(0)
-
         safe_nome = "".join(
             c if c.isalnum() or c in "-_" else "-"
             for c in str(condominio.nome or "condominio")
@@ -248,7 +251,9 @@ class SignupInviteQrCodeView(SignupInviteLinkView):
             .replace(" ", "-")
         )
 
-        response = HttpResponse(buffer.read(), content_type="image/png")
+        response = HttpResponse(
+            qrcode_png(signup_url), content_type="image/png"
+        )
         response["Content-Disposition"] = (
             f'attachment; filename="qrcode-cadastro-{safe_nome}.png"'
         )
@@ -346,7 +351,7 @@ class SignupView(APIView):
             unidades = Unidade.objects.filter(
                 id__in=unidade_ids,
                 is_active=True,
-                created_by__condominio_id=condominio.id,
+                condominio_id=condominio.id,
             ).distinct()
 
             if unidades.count() != len(set(str(u) for u in unidade_ids)):
@@ -376,16 +381,7 @@ class SignupView(APIView):
 
                 foto = request.FILES.get("foto")
                 if foto:
-                    user.foto_db_data = foto.read()
-                    user.foto_db_content_type = foto.content_type
-                    user.foto_db_filename = foto.name
-                    user.save(
-                        update_fields=[
-                            "foto_db_data",
-                            "foto_db_content_type",
-                            "foto_db_filename",
-                        ]
-                    )
+                    salvar_upload(user, "foto", foto)
 
                 moradores_group, _ = Group.objects.get_or_create(
                     name="Moradores"
@@ -1,7 +1,9 @@
 from html import escape
 from urllib.parse import urlparse
 
+from access.grupos import pertence_a_grupo
 from cadastros.models import Condominio, Unidade
+from cadastros.services.email_service import enfileirar_email
 from django.conf import settings as django_settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
@@ -37,7 +39,6 @@ def _build_login_url(request):
 def _enviar_email_novo_usuario_com_acesso(
     request, user, senha_temporaria, perfil_label
 ):
-    import resend
 
     if not user.email:
         return False
@@ -88,8 +89,7 @@ def _enviar_email_novo_usuario_com_acesso(
 """
 
     try:
-        resend.api_key = api_key
-        resend.Emails.send(
+        enfileirar_email(
             {
                 "from": email_from,
                 "to": [user.email],
@@ -117,7 +117,7 @@ class UserCreateView(APIView):
         ]:
             if not (
                 request.user.is_staff
-                or request.user.groups.filter(name__iexact="admin").exists()
+                or pertence_a_grupo(request.user, "admin")
             ):
                 return Response(
                     {
@@ -130,8 +130,8 @@ class UserCreateView(APIView):
         elif user_type in ["recepcao", "organizador_evento"]:
             if not (
                 request.user.is_staff
-                or request.user.groups.filter(name__iexact="admin").exists()
-                or request.user.groups.filter(name="Cerimonialista").exists()
+                or pertence_a_grupo(request.user, "admin")
+                or pertence_a_grupo(request.user, "Cerimonialista")
             ):
                 return Response(
                     {"error": "Acesso negado para criar este tipo de usuário"},
@@ -142,8 +142,8 @@ class UserCreateView(APIView):
         elif user_type in ["funcionario", "morador"]:
             if not (
                 request.user.is_staff
-                or request.user.groups.filter(name__iexact="admin").exists()
-                or request.user.groups.filter(name__iexact="Síndicos").exists()
+                or pertence_a_grupo(request.user, "admin")
+                or pertence_a_grupo(request.user, "Síndicos")
             ):
                 return Response(
                     {"error": "Acesso negado para criar este tipo de usuário"},
@@ -1,3 +1,4 @@
+from access.grupos import pertence_a_grupo
 from access.models import User
 from django.db.models import Q
 from rest_framework import filters, generics
@@ -19,8 +20,8 @@ class UserListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
         queryset = User.objects.exclude(id=user.id)
-        is_cerimonialista = user.groups.filter(name="Cerimonialista").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_cerimonialista = pertence_a_grupo(user, "Cerimonialista")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         # Filtrar por tipo de usuário
         user_type = self.request.query_params.get("type", "")
@@ -76,7 +77,10 @@ class UserListView(generics.ListAPIView):
                     | Q(full_name__icontains=search)
                 ).distinct()
 
-        return queryset.order_by("username")
+        # Relações carregadas conforme os campos pedidos (?fields=/?omit=)
+        return UserListSerializer.preparar_queryset(
+            queryset.order_by("username"), self.request
+        )
 
     def get_paginated_response(self, data):
         assert self.paginator is not None
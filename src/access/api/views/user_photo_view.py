@@ -1,5 +1,6 @@
+from access.grupos import pertence_a_grupo
+from cadastros.services.arquivo_service import resposta_arquivo, salvar_upload
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -18,7 +19,7 @@ class UserPhotoView(APIView):
         if request.user.is_staff:
             return User.objects.filter(id=user_id).first()
 
-        is_sindico = request.user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(request.user, "Síndicos")
         if is_sindico:
             candidate = User.objects.filter(id=user_id).first()
             if (
@@ -37,17 +38,19 @@ class UserPhotoView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        if not target_user.foto_db_data:
+        response = resposta_arquivo(
+            request,
+            target_user.foto_arquivo_id,
+            target_user.foto_db_content_type,
+            last_modified=target_user.updated_at,
+        )
+        if response is None:
             return Response(
                 {"error": "Foto não encontrada."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return HttpResponse(
-            bytes(target_user.foto_db_data),
-            content_type=target_user.foto_db_content_type
-            or "application/octet-stream",
-        )
+        return response
 
     def post(self, request, user_id=None):
         target_user = self._get_target_user(request, user_id)
@@ -64,15 +67,6 @@ class UserPhotoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        target_user.foto_db_data = foto.read()
-        target_user.foto_db_content_type = foto.content_type
-        target_user.foto_db_filename = foto.name
-        target_user.save(
-            update_fields=[
-                "foto_db_data",
-                "foto_db_content_type",
-                "foto_db_filename",
-            ]
-        )
+        salvar_upload(target_user, "foto", foto)
 
         return Response({"message": "Foto de perfil salva com sucesso."})
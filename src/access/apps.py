@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class AccessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'access'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,236 @@
+"""
+Autenticação por token com cache.
+
+O ``TokenAuthentication`` do DRF consulta o token e a linha completa do
+usuário a cada requisição. Aqui o resultado (projeção enxuta do usuário,
+grupos e os campos de ``CAMPOS_CONDOMINIO`` do condomínio) fica em dois
+níveis de cache:
+
+- LRU em memória do processo, com TTL curto (``AUTH_TOKEN_CACHE_LOCAL_TTL``);
+- cache do Django (``AUTH_TOKEN_CACHE_TTL``).
+
+Os signals em ``access.signals`` invalidam as entradas quando o usuário é
+salvo (senha, ``is_active``, dados do perfil), muda de grupo, faz logout ou
+tem o token apagado, e quando o condomínio é salvo ou excluído. Em outros
+processos a entrada local pode sobreviver até o fim do TTL local; por isso o
+acerto no LRU local não consulta o cache do Django (nem a versão das chaves). Se o cache do Django não é compartilhado entre os
+processos (LocMem, sem ``REDIS_URL``), as invalidações também não chegam a
+ele nos outros workers; nesse caso ele usa o TTL local, e um usuário
+desativado deixa de autenticar em todos os workers em até
+``AUTH_TOKEN_CACHE_LOCAL_TTL`` segundos.
+
+Na falha do cache a consulta traz só as colunas de ``CAMPOS_USUARIO`` e de
+``CAMPOS_CONDOMINIO`` (via ``select_related``); os demais campos, como a
+senha, ficam adiados e são carregados se alguém os acessar.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.utils.cache_compartilhado import ttl_invalidavel
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .grupos import grupos_do_usuario, guardar_grupos_na_instancia
+from .models import User
+
+CACHE_PREFIX = "access:token"
+
+CAMPOS_USUARIO = (
+    "id",
+    "username",
+    "full_name",
+    "first_name",
+    "last_name",
+    "email",
+    "cpf",
+    "phone",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "first_access",
+    "condominio_id",
+    "foto_arquivo_id",
+)
+
+# Lidos de request.user.condominio a cada requisição (perfil, listagens)
+CAMPOS_CONDOMINIO = ("id", "nome", "is_ativo")
+
+
+class _CacheLocal:
+    """LRU com TTL, protegido por lock (workers com threads)."""
+
+    def __init__(self):
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, valor = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor, ttl, maximo):
+        if ttl <= 0 or maximo <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + ttl, valor)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > maximo:
+                self._itens.popitem(last=False)
+
+    def delete(self, chave):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def clear(self):
+        with self._lock:
+            self._itens.clear()
+
+
+_local = _CacheLocal()
+
+
+def _versao():
+    versao = cache.get(f"{CACHE_PREFIX}:versao")
+    if versao is None:
+        versao = 1
+        cache.add(f"{CACHE_PREFIX}:versao", versao, None)
+    return versao
+
+
+def _resumo(key):
+    # O token não vai em claro para o cache
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _chave(resumo):
+    return f"{CACHE_PREFIX}:{_versao()}:{resumo}"
+
+
+def _entrada(user):
+    valores = {campo: getattr(user, campo) for campo in CAMPOS_USUARIO}
+    condominio = None
+    if user.condominio_id is not None:
+        condominio = {
+            campo: getattr(user.condominio, campo)
+            for campo in CAMPOS_CONDOMINIO
+        }
+    return valores, grupos_do_usuario(user), condominio
+
+
+def _instancia(model, valores):
+    campos = [
+        f.attname for f in model._meta.concrete_fields if f.attname in valores
+    ]
+    return model.from_db(
+        DEFAULT_DB_ALIAS, campos, [valores[campo] for campo in campos]
+    )
+
+
+def _usuario(entrada):
+    """Instancia o usuário a partir da entrada do cache, sem consulta."""
+    valores, grupos, condominio = entrada
+    user = _instancia(User, valores)
+    guardar_grupos_na_instancia(user, grupos)
+    if condominio is not None:
+        User.condominio.field.set_cached_value(
+            user,
+            _instancia(User.condominio.field.related_model, condominio),
+        )
+    return user
+
+
+def _carregar(key):
+    campos = [f"user__{campo.removesuffix('_id')}" for campo in CAMPOS_USUARIO]
+    campos += [f"user__condominio__{campo}" for campo in CAMPOS_CONDOMINIO]
+    return (
+        Token.objects.select_related("user__condominio")
+        .only("key", *campos)
+        .get(key=key)
+    )
+
+
+def invalidar_token(key):
+    resumo = _resumo(key)
+    _local.delete(resumo)
+    cache.delete(_chave(resumo))
+
+
+def invalidar_tokens_do_usuario(user_id):
+    for key in Token.objects.filter(user_id=user_id).values_list(
+        "key", flat=True
+    ):
+        invalidar_token(key)
+
+
+def invalidar_todos_os_tokens():
+    """Descarta todas as entradas (ex.: um grupo foi renomeado)."""
+    _local.clear()
+    try:
+        cache.incr(f"{CACHE_PREFIX}:versao")
+    except ValueError:
+        cache.set(f"{CACHE_PREFIX}:versao", 2, None)
+
+
+class TokenCacheAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` com cache do usuário autenticado."""
+
+    def authenticate_credentials(self, key):
+        resumo = _resumo(key)
+        entrada = _local.get(resumo)
+        if entrada is None:
+            entrada = cache.get(_chave(resumo))
+            if entrada is not None:
+                self._guardar_local(resumo, entrada)
+
+        if entrada is not None:
+            user = _usuario(entrada)
+            token = Token.from_db(
+                DEFAULT_DB_ALIAS, ["key", "user_id"], [key, user.pk]
+            )
+            token.user = user
+            return user, token
+
+        try:
+            token = _carregar(key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _("User inactive or deleted.")
+            )
+
+        entrada = _entrada(token.user)
+        cache.set(
+            _chave(resumo),
+            entrada,
+            ttl_invalidavel(
+                settings.AUTH_TOKEN_CACHE_TTL,
+                settings.AUTH_TOKEN_CACHE_LOCAL_TTL,
+            ),
+        )
+        self._guardar_local(resumo, entrada)
+        return token.user, token
+
+    def _guardar_local(self, resumo, entrada):
+        _local.set(
+            resumo,
+            entrada,
+            settings.AUTH_TOKEN_CACHE_LOCAL_TTL,
+            settings.AUTH_TOKEN_CACHE_MAX,
+        )
@@ -0,0 +1,91 @@
+"""
+Resolução dos grupos (papéis) de um usuário com cache.
+
+Os grupos são carregados uma única vez por instância de usuário — como o
+``request.user`` é criado a cada requisição, isso equivale a um cache por
+requisição — e guardados no cache do Django por poucos segundos para as
+requisições seguintes. Os signals em ``access.signals`` invalidam o cache
+quando os grupos de um usuário (ou um grupo) mudam.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = "access:grupos"
+_ATRIBUTO_INSTANCIA = "_grupos_resolvidos"
+
+
+def _ttl():
+    return getattr(settings, "ACCESS_GRUPOS_CACHE_TTL", 60)
+
+
+def _versao():
+    versao = cache.get(f"{CACHE_PREFIX}:versao")
+    if versao is None:
+        versao = 1
+        cache.add(f"{CACHE_PREFIX}:versao", versao, None)
+    return versao
+
+
+def _chave(user_id):
+    return f"{CACHE_PREFIX}:{_versao()}:{user_id}"
+
+
+def grupos_do_usuario(user):
+    """Retorna um frozenset imutável de pares ``(id, nome)`` dos grupos."""
+    if (
+        user is None
+        or not getattr(user, "is_authenticated", False)
+        or getattr(user, "pk", None) is None
+    ):
+        return frozenset()
+
+    grupos = user.__dict__.get(_ATRIBUTO_INSTANCIA)
+    if grupos is not None:
+        return grupos
+
+    chave = _chave(user.pk)
+    grupos = cache.get(chave)
+    if grupos is None:
+        grupos = frozenset(user.groups.values_list("id", "name"))
+        cache.set(chave, grupos, _ttl())
+
+    user.__dict__[_ATRIBUTO_INSTANCIA] = grupos
+    return grupos
+
+
+def nomes_grupos(user):
+    return frozenset(nome for _, nome in grupos_do_usuario(user))
+
+
+def ids_grupos(user):
+    return frozenset(grupo_id for grupo_id, _ in grupos_do_usuario(user))
+
+
+def pertence_a_grupo(user, *nomes):
+    """True se o usuário pertence a algum dos grupos (sem diferenciar caixa)."""
+    alvo = {nome.casefold() for nome in nomes}
+    return any(nome.casefold() in alvo for nome in nomes_grupos(user))
+
+
+def invalidar_cache_grupos(user_id=None):
+    """
+    Invalida o cache de grupos de um usuário ou, sem ``user_id``, de todos
+    (incrementando a versão das chaves).
+    """
+    if user_id is not None:
+        cache.delete(_chave(user_id))
+        return
+    try:
+        cache.incr(f"{CACHE_PREFIX}:versao")
+    except ValueError:
+        cache.set(f"{CACHE_PREFIX}:versao", 2, None)
+
+
+def descartar_grupos_da_instancia(user):
+    user.__dict__.pop(_ATRIBUTO_INSTANCIA, None)
+
+
+def guardar_grupos_na_instancia(user, grupos):
+    """Usa ``grupos`` já resolvidos (ex.: vindos do cache de autenticação)."""
+    user.__dict__[_ATRIBUTO_INSTANCIA] = frozenset(grupos)
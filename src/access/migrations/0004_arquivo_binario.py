@@ -0,0 +1,88 @@
+# Generated by Django 4.2.10 on 2026-10-17 03:55
+
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# (app_label, modelo, prefixo dos campos <prefixo>_db_data/<prefixo>_arquivo)
+REFERENCIAS = [("access", "User", "foto")]
+
+
+def mover_para_arquivos(apps, _schema_editor):
+    ArquivoBinario = apps.get_model("cadastros", "ArquivoBinario")
+    for app_label, model_name, prefixo in REFERENCIAS:
+        model = apps.get_model(app_label, model_name)
+        campo_dados = f"{prefixo}_db_data"
+        pks = list(
+            model.objects.filter(
+                **{f"{campo_dados}__isnull": False}
+            ).values_list("pk", flat=True)
+        )
+        # Um registro por vez para não carregar todos os BLOBs em memória
+        for pk in pks:
+            dados, content_type = (
+                model.objects.filter(pk=pk)
+                .values_list(campo_dados, f"{prefixo}_db_content_type")
+                .first()
+            )
+            if not dados:
+                continue
+            dados = bytes(dados)
+            arquivo, _ = ArquivoBinario.objects.get_or_create(
+                hash=hashlib.sha256(dados).hexdigest(),
+                defaults={
+                    "tamanho": len(dados),
+                    "content_type": content_type or "",
+                    "dados": dados,
+                },
+            )
+            model.objects.filter(pk=pk).update(
+                **{f"{prefixo}_arquivo": arquivo}
+            )
+
+
+def restaurar_dos_arquivos(apps, _schema_editor):
+    ArquivoBinario = apps.get_model("cadastros", "ArquivoBinario")
+    for app_label, model_name, prefixo in REFERENCIAS:
+        model = apps.get_model(app_label, model_name)
+        campo_fk = f"{prefixo}_arquivo_id"
+        registros = model.objects.filter(
+            **{f"{campo_fk}__isnull": False}
+        ).values_list("pk", campo_fk)
+        for pk, arquivo_id in registros:
+            dados = (
+                ArquivoBinario.objects.filter(pk=arquivo_id)
+                .values_list("dados", flat=True)
+                .first()
+            )
+            model.objects.filter(pk=pk).update(**{f"{prefixo}_db_data": dados})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0012_arquivo_binario"),
+        ("access", "0003_create_event_user_groups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="foto_arquivo",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Foto de perfil (armazenamento por conteúdo)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="cadastros.arquivobinario",
+                verbose_name="Foto de perfil",
+            ),
+        ),
+        migrations.RunPython(mover_para_arquivos, restaurar_dos_arquivos),
+        migrations.RemoveField(
+            model_name="user",
+            name="foto_db_data",
+        ),
+    ]
@@ -65,10 +65,14 @@ class User(AbstractUser):
         verbose_name="Unidades",
         help_text="Unidades onde o morador reside",
     )
-    foto_db_data = models.BinaryField(
+    foto_arquivo = models.ForeignKey(
+        "cadastros.ArquivoBinario",
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Foto de perfil do usuário armazenada em BLOB",
+        related_name="+",
+        verbose_name="Foto de perfil",
+        help_text="Foto de perfil (armazenamento por conteúdo)",
     )
     foto_db_content_type = models.CharField(
         max_length=100,
@@ -0,0 +1,82 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .autenticacao import (
+    CAMPOS_CONDOMINIO,
+    invalidar_todos_os_tokens,
+    invalidar_token,
+    invalidar_tokens_do_usuario,
+)
+from .grupos import descartar_grupos_da_instancia, invalidar_cache_grupos
+from .models import User
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidar_grupos_ao_alterar_membros(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        # instance é o usuário
+        descartar_grupos_da_instancia(instance)
+        invalidar_cache_grupos(instance.pk)
+        invalidar_tokens_do_usuario(instance.pk)
+    elif pk_set:
+        # instance é o grupo; pk_set contém os usuários afetados
+        for user_id in pk_set:
+            invalidar_cache_grupos(user_id)
+            invalidar_tokens_do_usuario(user_id)
+    else:
+        # group.user_set.clear(): usuários afetados desconhecidos
+        invalidar_cache_grupos()
+        invalidar_todos_os_tokens()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidar_grupos_ao_alterar_grupo(sender, instance, **kwargs):
+    invalidar_cache_grupos()
+    invalidar_todos_os_tokens()
+
+
+@receiver(post_delete, sender=User)
+def invalidar_grupos_ao_excluir_usuario(sender, instance, **kwargs):
+    invalidar_cache_grupos(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidar_token_ao_salvar_usuario(
+    sender, instance, update_fields, **kwargs
+):
+    # Senha, is_active e dados do perfil ficam na entrada do cache; só o
+    # last_login gravado no login não importa
+    if update_fields and set(update_fields) == {"last_login"}:
+        return
+    invalidar_tokens_do_usuario(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def invalidar_token_excluido(sender, instance, **kwargs):
+    invalidar_token(instance.key)
+
+
+@receiver(post_save, sender="cadastros.Condominio")
+def invalidar_tokens_ao_salvar_condominio(
+    sender, instance, created, update_fields, **kwargs
+):
+    # CAMPOS_CONDOMINIO fica na entrada do cache de cada usuário
+    if created or (
+        update_fields and not set(update_fields) & set(CAMPOS_CONDOMINIO)
+    ):
+        return
+    invalidar_todos_os_tokens()
+
+
+@receiver(post_delete, sender="cadastros.Condominio")
+def invalidar_tokens_ao_excluir_condominio(sender, instance, **kwargs):
+    # Os usuários perdem o condomínio via SET_NULL (UPDATE sem signals)
+    invalidar_todos_os_tokens()
@@ -0,0 +1,68 @@
+from access.grupos import (
+    grupos_do_usuario,
+    ids_grupos,
+    nomes_grupos,
+    pertence_a_grupo,
+)
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser, Group
+from django.core.cache import cache
+from django.test import TestCase
+
+User = get_user_model()
+
+
+class GruposDoUsuarioTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sindicos = Group.objects.create(name="Síndicos")
+        self.moradores = Group.objects.create(name="Moradores")
+        self.user = User.objects.create_user(
+            username="sindico",
+            password="senha123",
+            email="sindico@example.com",
+        )
+        self.user.groups.add(self.sindicos)
+
+    def _recarregar(self):
+        # Simula uma nova requisição (nova instância de request.user)
+        return User.objects.get(pk=self.user.pk)
+
+    def test_uma_consulta_por_requisicao(self):
+        user = self._recarregar()
+        with self.assertNumQueries(1):
+            self.assertTrue(pertence_a_grupo(user, "Síndicos"))
+            self.assertTrue(pertence_a_grupo(user, "sindicos", "síndicos"))
+            self.assertFalse(pertence_a_grupo(user, "Moradores"))
+            self.assertEqual(ids_grupos(user), {self.sindicos.pk})
+        self.assertIsInstance(grupos_do_usuario(user), frozenset)
+
+    def test_cache_entre_requisicoes(self):
+        pertence_a_grupo(self._recarregar(), "Síndicos")
+        user = self._recarregar()
+        with self.assertNumQueries(0):
+            self.assertEqual(nomes_grupos(user), {"Síndicos"})
+
+    def test_alteracao_de_grupos_invalida_cache(self):
+        self.assertFalse(pertence_a_grupo(self._recarregar(), "Moradores"))
+
+        self.user.groups.add(self.moradores)
+        self.assertTrue(pertence_a_grupo(self._recarregar(), "Moradores"))
+        self.assertTrue(pertence_a_grupo(self.user, "Moradores"))
+
+        self.moradores.user_set.remove(self.user)
+        self.assertFalse(pertence_a_grupo(self._recarregar(), "Moradores"))
+
+    def test_renomear_grupo_invalida_cache(self):
+        pertence_a_grupo(self._recarregar(), "Síndicos")
+
+        self.sindicos.name = "Administração"
+        self.sindicos.save()
+
+        user = self._recarregar()
+        self.assertFalse(pertence_a_grupo(user, "Síndicos"))
+        self.assertTrue(pertence_a_grupo(user, "Administração"))
+
+    def test_usuario_anonimo_nao_consulta_banco(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(pertence_a_grupo(AnonymousUser(), "Síndicos"))
@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+from access.autenticacao import TokenCacheAuthentication, _local
+from access.grupos import pertence_a_grupo
+from cadastros.models import Condominio
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+User = get_user_model()
+
+
+class TokenCacheAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _local.clear()
+        self.sindicos = Group.objects.create(name="Síndicos")
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Teste",
+            cnpj="12345678000199",
+            telefone="11999999999",
+            cep="01001000",
+            numero="100",
+        )
+        self.user = User.objects.create_user(
+            username="sindico",
+            password="senha123",
+            email="sindico@example.com",
+            full_name="Síndico Teste",
+            condominio=self.condominio,
+        )
+        self.user.groups.add(self.sindicos)
+        self.token = Token.objects.create(user=self.user)
+        self.auth = TokenCacheAuthentication()
+
+    def _autenticar(self, key=None):
+        return self.auth.authenticate_credentials(key or self.token.key)
+
+    def test_segunda_requisicao_nao_consulta_banco(self):
+        self._autenticar()
+
+        with self.assertNumQueries(0):
+            user, token = self._autenticar()
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.full_name, "Síndico Teste")
+            self.assertTrue(pertence_a_grupo(user, "Síndicos"))
+            self.assertEqual(token.key, self.token.key)
+            self.assertEqual(user.condominio.nome, "Condominio Teste")
+            self.assertEqual(user.condominio.id, self.condominio.id)
+
+    def test_acerto_local_nao_consulta_o_cache_compartilhado(self):
+        self._autenticar()
+
+        with patch("access.autenticacao.cache.get") as ler:
+            self._autenticar()
+        ler.assert_not_called()
+
+    def test_renomear_condominio_invalida_cache(self):
+        self._autenticar()
+
+        self.condominio.nome = "Novo Nome"
+        self.condominio.save()
+
+        user, _ = self._autenticar()
+        self.assertEqual(user.condominio.nome, "Novo Nome")
+
+    def test_cache_compartilhado_entre_processos(self):
+        self._autenticar()
+        _local.clear()
+
+        with self.assertNumQueries(0):
+            user, _ = self._autenticar()
+        self.assertEqual(user.username, "sindico")
+
+    def test_usuario_inativo_invalida_cache(self):
+        self._autenticar()
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar()
+
+    def test_troca_de_senha_invalida_cache(self):
+        user, _ = self._autenticar()
+        self.assertTrue(user.check_password("senha123"))
+
+        self.user.set_password("nova-senha")
+        self.user.save()
+
+        user, _ = self._autenticar()
+        self.assertTrue(user.check_password("nova-senha"))
+
+    def test_alteracao_de_grupo_invalida_cache(self):
+        moradores = Group.objects.create(name="Moradores")
+        self._autenticar()
+
+        self.user.groups.add(moradores)
+
+        user, _ = self._autenticar()
+        self.assertTrue(pertence_a_grupo(user, "Moradores"))
+
+    def test_token_excluido(self):
+        key = self.token.key
+        self._autenticar()
+
+        self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self._autenticar(key)
+
+    def test_logout_invalida_cache(self):
+        self._autenticar()
+
+        response = self.client.post(
+            "/api/access/logout/",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            self._autenticar()
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=300, AUTH_TOKEN_CACHE_LOCAL_TTL=10)
+    def test_sem_cache_compartilhado_usa_o_ttl_local(self):
+        # LocMem (por processo): as invalidações não chegam aos outros
+        # workers, então a entrada não pode viver mais que o TTL local
+        with patch("access.autenticacao.cache.set") as guardar:
+            self._autenticar()
+        self.assertEqual(guardar.call_args[0][2], 10)
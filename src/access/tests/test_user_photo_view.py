@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from cadastros.models import ArquivoBinario
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class UserPhotoViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="morador",
+            password="senha123",
+            email="morador@example.com",
+            cpf="39053344705",
+        )
+        self.outro = User.objects.create_user(
+            username="outro",
+            password="senha123",
+            email="outro@example.com",
+            cpf="52998224725",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _enviar(self, conteudo, nome="foto.png"):
+        foto = SimpleUploadedFile(nome, conteudo, content_type="image/png")
+        return self.client.post(
+            reverse("profile-photo-upload"), {"foto": foto}
+        )
+
+    def test_upload_grava_no_armazenamento_por_conteudo(self):
+        response = self._enviar(b"conteudo-da-foto")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        arquivo = ArquivoBinario.objects.get(pk=self.user.foto_arquivo_id)
+        self.assertEqual(arquivo.tamanho, len(b"conteudo-da-foto"))
+        self.assertEqual(self.user.foto_db_content_type, "image/png")
+
+        response = self.client.get(
+            reverse("profile-photo", args=[self.user.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"conteudo-da-foto")
+        self.assertEqual(response["Content-Type"], "image/png")
+
+    def test_conteudo_identico_e_gravado_uma_vez(self):
+        self._enviar(b"mesma-foto")
+        self.client.force_authenticate(user=self.outro)
+        self._enviar(b"mesma-foto", nome="outra.png")
+
+        self.user.refresh_from_db()
+        self.outro.refresh_from_db()
+        self.assertEqual(ArquivoBinario.objects.count(), 1)
+        self.assertEqual(self.user.foto_arquivo_id, self.outro.foto_arquivo_id)
+
+    def test_substituir_foto_remove_arquivo_orfao(self):
+        self._enviar(b"foto-antiga")
+        self._enviar(b"foto-nova")
+
+        self.assertEqual(ArquivoBinario.objects.count(), 1)
+        self.user.refresh_from_db()
+        self.assertEqual(
+            ArquivoBinario.objects.get().pk, self.user.foto_arquivo_id
+        )
+
+    def test_foto_inexistente_retorna_404(self):
+        response = self.client.get(
+            reverse("profile-photo", args=[self.user.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_etag_e_304_sem_ler_os_bytes(self):
+        self._enviar(b"conteudo-da-foto")
+        url = reverse("profile-photo", args=[self.user.id])
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(etag)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("max-age=300", response["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_apos_trocar_a_foto(self):
+        self._enviar(b"foto-antiga")
+        # Primeiro envio bem antes do segundo (Last-Modified tem segundos)
+        uma_hora_atras = timezone.now() - timedelta(hours=1)
+        User.objects.filter(pk=self.user.pk).update(updated_at=uma_hora_atras)
+        ArquivoBinario.objects.update(created_on=uma_hora_atras)
+        self.user.refresh_from_db()
+        url = reverse("profile-photo", args=[self.user.id])
+        ultima = self.client.get(url)["Last-Modified"]
+
+        self._enviar(b"foto-nova")
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=ultima)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"foto-nova")
+
+    def test_url_versionada_e_imutavel(self):
+        self._enviar(b"conteudo-da-foto")
+        self.user.refresh_from_db()
+
+        response = self.client.get(
+            reverse("profile-photo", args=[self.user.id]),
+            {"v": self.user.foto_arquivo_id},
+        )
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
@@ -0,0 +1,90 @@
+"""
+Compressão das respostas HTTP (brotli ou gzip, conforme o cliente aceitar).
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Qualidade baixa o bastante para comprimir respostas dinâmicas sem pesar
+# na CPU (11 é para conteúdo estático)
+QUALIDADE_BROTLI = 5
+
+TIPOS_COMPRESSIVEIS = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+
+
+def _compressivel(response):
+    """Texto/JSON sim; imagens, PDF e planilhas já vêm comprimidos."""
+    tipo = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return (
+        tipo.startswith("text/")
+        or tipo in TIPOS_COMPRESSIVEIS
+        or tipo.endswith(("+json", "+xml"))
+    )
+
+
+def _aceitas(request):
+    """Codificações do Accept-Encoding, exceto as recusadas com q=0."""
+    aceitas = set()
+    for parte in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        nome, _, parametros = parte.partition(";")
+        parametros = parametros.replace(" ", "")
+        if parametros.startswith("q=") and float(parametros[2:] or 0) == 0:
+            continue
+        aceitas.add(nome.strip().lower())
+    return aceitas
+
+
+class CompressaoMiddleware(GZipMiddleware):
+    """
+    Comprime respostas a partir de ``COMPRESSAO_MIN_BYTES``.
+
+    Usa brotli quando o cliente aceita ``br`` e o pacote ``brotli`` está
+    instalado; caso contrário, gzip (``GZipMiddleware`` do Django, que
+    também cuida das respostas em streaming).
+    """
+
+    def process_response(self, request, response):
+        if not _compressivel(response):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.COMPRESSAO_MIN_BYTES
+        ):
+            return response
+        try:
+            aceita_brotli = "br" in _aceitas(request)
+        except ValueError:
+            aceita_brotli = False
+        if (
+            brotli is None
+            or not aceita_brotli
+            or response.streaming
+            or response.has_header("Content-Encoding")
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        comprimido = brotli.compress(
+            response.content, quality=QUALIDADE_BROTLI
+        )
+        if len(comprimido) >= len(response.content):
+            return response
+        response.content = comprimido
+        response.headers["Content-Length"] = str(len(comprimido))
+        # ETag forte vira fraca, como no GZipMiddleware
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
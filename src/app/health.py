@@ -1,4 +1,8 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from .metricas import CONTENT_TYPE, exposicao
 
 
 def health(request):
@@ -7,3 +11,14 @@ def health(request):
     Retorna 200 e um JSON simples quando a aplicação está no ar.
     """
     return JsonResponse({"status": "ok"}, status=200)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def metricas(request):
+    """Métricas no formato do Prometheus (somente staff).
+
+    No Prometheus, use ``authorization: {type: Token, credentials: ...}``
+    com o token de um usuário staff.
+    """
+    return HttpResponse(exposicao(), content_type=CONTENT_TYPE)
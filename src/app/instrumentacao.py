@@ -0,0 +1,199 @@
+"""
+Instrumentação por requisição: SQL, serialização, HTTP externo e tempo
+total.
+
+Uma fração das requisições (``INSTRUMENTACAO_AMOSTRAGEM``) é medida; o
+header ``X-Debug-Timing: 1`` força a medição. Nas medidas:
+
+- usuários staff recebem o header ``Server-Timing`` (aparece no DevTools);
+- acima de ``INSTRUMENTACAO_LENTO_MS`` vai um log estruturado no logger
+  ``app.instrumentacao`` com a view e os SQL mais repetidos.
+
+As requisições fora da amostra só pagam o sorteio. Nas medidas, cada
+consulta custa duas leituras de relógio e um ``append``; a normalização
+dos SQL só acontece quando a requisição é lenta.
+"""
+
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+HEADER_FORCAR = "HTTP_X_DEBUG_TIMING"
+TOP_DUPLICADAS = 5
+
+_medicao_atual = ContextVar("medicao_atual", default=None)
+
+_RE_LISTA_IN = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+_RE_NUMERO = re.compile(r"\b\d+\b")
+_RE_TEXTO = re.compile(r"'(?:[^']|'')*'")
+
+
+class Medicao:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.tempos = defaultdict(float)
+        self.abertas = set()
+        self.consultas = []
+
+    def executar(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempos["db"] += time.perf_counter() - inicio
+            self.consultas.append(sql)
+
+    def total(self):
+        return time.perf_counter() - self.inicio
+
+
+@contextmanager
+def medir(categoria):
+    """Soma o tempo do bloco em ``categoria`` na requisição medida."""
+    medicao = _medicao_atual.get()
+    # Sem medição ou já dentro da mesma categoria (ex.: serializer aninhado)
+    if medicao is None or categoria in medicao.abertas:
+        yield
+        return
+    medicao.abertas.add(categoria)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao.tempos[categoria] += time.perf_counter() - inicio
+        medicao.abertas.discard(categoria)
+
+
+def impressao_digital(sql):
+    """SQL sem valores, para agrupar consultas repetidas (N+1)."""
+    sql = _RE_LISTA_IN.sub("(...)", sql)
+    sql = _RE_TEXTO.sub("?", sql)
+    return _RE_NUMERO.sub("?", sql)
+
+
+def duplicadas(consultas, limite=TOP_DUPLICADAS):
+    contagem = Counter(impressao_digital(sql) for sql in consultas)
+    return [
+        {"sql": sql, "vezes": vezes}
+        for sql, vezes in contagem.most_common(limite)
+        if vezes > 1
+    ]
+
+
+_serializers_instrumentados = False
+
+
+def instrumentar_serializers():
+    """Mede ``serializer.data`` (inclui o SQL disparado na serialização)."""
+    global _serializers_instrumentados
+    if _serializers_instrumentados:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data.fget
+
+    @wraps(original)
+    def data(self):
+        with medir("serializer"):
+            return original(self)
+
+    BaseSerializer.data = property(data)
+    _serializers_instrumentados = True
+
+
+def _nome_view(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return ""
+    return match.view_name or match._func_path
+
+
+def _staff(request):
+    # O DRF repassa ao HttpRequest o usuário autenticado (token ou sessão);
+    # o usuário preguiçoso do AuthenticationMiddleware que ninguém leu não é
+    # carregado, para não gerar consulta só por causa da instrumentação
+    user = getattr(request, "user", None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return False
+    return bool(user is not None and user.is_staff)
+
+
+def _server_timing(medicao, total):
+    partes = [
+        f'db;dur={medicao.tempos["db"] * 1000:.1f};'
+        f'desc="{len(medicao.consultas)} queries"'
+    ]
+    for categoria in ("serializer", "http"):
+        if categoria in medicao.tempos:
+            partes.append(
+                f"{categoria};dur={medicao.tempos[categoria] * 1000:.1f}"
+            )
+    partes.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(partes)
+
+
+class InstrumentacaoMiddleware:
+    def __init__(self, get_response):
+        if not settings.INSTRUMENTACAO_ATIVA:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrumentar_serializers()
+
+    def __call__(self, request):
+        if not (
+            request.META.get(HEADER_FORCAR) == "1"
+            or random.random() < settings.INSTRUMENTACAO_AMOSTRAGEM
+        ):
+            return self.get_response(request)
+
+        medicao = Medicao()
+        token = _medicao_atual.set(medicao)
+        try:
+            with ExitStack() as pilha:
+                for conexao in connections.all():
+                    pilha.enter_context(
+                        conexao.execute_wrapper(medicao.executar)
+                    )
+                response = self.get_response(request)
+        finally:
+            _medicao_atual.reset(token)
+
+        total = medicao.total()
+        if _staff(request):
+            response["Server-Timing"] = _server_timing(medicao, total)
+        if total * 1000 >= settings.INSTRUMENTACAO_LENTO_MS:
+            self._registrar_lenta(request, response, medicao, total)
+        return response
+
+    def _registrar_lenta(self, request, response, medicao, total):
+        dados = {
+            "metodo": request.method,
+            "caminho": request.path,
+            "view": _nome_view(request),
+            "status": response.status_code,
+            "total_ms": round(total * 1000, 1),
+            "consultas": len(medicao.consultas),
+            **{
+                f"{categoria}_ms": round(segundos * 1000, 1)
+                for categoria, segundos in medicao.tempos.items()
+            },
+            "duplicadas": duplicadas(medicao.consultas),
+        }
+        logger.warning(
+            "Requisição lenta: %s",
+            json.dumps(dados, ensure_ascii=False),
+            extra={"instrumentacao": dados},
+        )
@@ -0,0 +1,363 @@
+"""
+Métricas da aplicação no formato texto do Prometheus (``/api/metrics/``).
+
+Contadores e histogramas ficam em memória, por processo. Com
+``METRICAS_DIR`` configurado, cada processo grava periodicamente
+(``METRICAS_INTERVALO``) um retrato das suas métricas num arquivo próprio
+desse diretório (escrita atômica com ``os.replace``) e o endpoint soma os
+arquivos de todos os processos, então qualquer worker do gunicorn responde
+com o total. Os arquivos de processos encerrados continuam somando, para
+os contadores não voltarem; limpe o diretório ao subir a aplicação.
+
+Os gauges (ex.: tamanho da outbox de e-mails) são lidos do banco na hora
+da coleta.
+
+O módulo não importa o DRF nem modelos no carregamento: é usado pelo
+``qrcode_service``, que também roda em processos sem o Django configurado.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.models import Count
+
+from .instrumentacao import medir
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+VIEW_NAO_RESOLVIDA = "<nao_resolvida>"
+
+BUCKETS_SEGUNDOS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# nome: (tipo, descrição, buckets dos histogramas)
+METRICAS = {
+    "http_requisicoes_total": (
+        "counter",
+        "Requisições HTTP por view, método e status.",
+        None,
+    ),
+    "http_requisicao_segundos": (
+        "histogram",
+        "Latência das requisições HTTP por view e método.",
+        BUCKETS_SEGUNDOS,
+    ),
+    "db_consultas_por_requisicao": (
+        "histogram",
+        "Consultas SQL por requisição, por view.",
+        BUCKETS_CONSULTAS,
+    ),
+    "db_tempo_por_requisicao_segundos": (
+        "histogram",
+        "Tempo em SQL por requisição, por view.",
+        BUCKETS_SEGUNDOS,
+    ),
+    "http_externo_segundos": (
+        "histogram",
+        "Latência das chamadas HTTP externas por host.",
+        BUCKETS_SEGUNDOS,
+    ),
+    "http_externo_erros_total": (
+        "counter",
+        "Chamadas HTTP externas que levantaram exceção, por host.",
+        None,
+    ),
+    "qrcode_renderizados_total": (
+        "counter",
+        "QR codes por origem (cache, render ou pre_render em lote).",
+        None,
+    ),
+    "email_outbox_mensagens": (
+        "gauge",
+        "E-mails na outbox por status.",
+        None,
+    ),
+}
+
+
+def _chave_rotulos(rotulos):
+    return tuple(sorted((nome, str(valor)) for nome, valor in rotulos.items()))
+
+
+class Registro:
+    """Contadores e histogramas de um processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores = defaultdict(int)
+        self._histogramas = {}
+        self._ultima_gravacao = 0.0
+        self._arquivo = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+
+    def incrementar(self, nome, valor=1, **rotulos):
+        chave = (nome, _chave_rotulos(rotulos))
+        with self._lock:
+            self._contadores[chave] += valor
+        self._gravar_se_preciso()
+
+    def observar(self, nome, valor, **rotulos):
+        buckets = METRICAS[nome][2]
+        chave = (nome, _chave_rotulos(rotulos))
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                # contagens por bucket (+Inf no fim), soma, total
+                histograma = self._histogramas[chave] = [
+                    [0] * (len(buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            histograma[0][bisect_left(buckets, valor)] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+        self._gravar_se_preciso()
+
+    def retrato(self):
+        with self._lock:
+            return {
+                "contadores": [
+                    [nome, list(rotulos), valor]
+                    for (nome, rotulos), valor in self._contadores.items()
+                ],
+                "histogramas": [
+                    [nome, list(rotulos), list(contagens), soma, total]
+                    for (nome, rotulos), (
+                        contagens,
+                        soma,
+                        total,
+                    ) in self._histogramas.items()
+                ],
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    def gravar(self):
+        # Processos do pool de QR codes não configuram o Django
+        if not settings.configured:
+            return
+        diretorio = settings.METRICAS_DIR
+        if not diretorio:
+            return
+        self._ultima_gravacao = time.monotonic()
+        caminho = os.path.join(diretorio, self._arquivo)
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            temporario = f"{caminho}.tmp"
+            with open(temporario, "w") as arquivo:
+                json.dump(self.retrato(), arquivo)
+            os.replace(temporario, caminho)
+        except OSError:
+            pass
+
+    def _gravar_se_preciso(self):
+        if (
+            settings.METRICAS_DIR
+            and time.monotonic() - self._ultima_gravacao
+            >= settings.METRICAS_INTERVALO
+        ):
+            self.gravar()
+
+
+registro = Registro()
+atexit.register(registro.gravar)
+
+incrementar = registro.incrementar
+observar = registro.observar
+
+
+@contextmanager
+def chamada_externa(url):
+    """Mede uma chamada HTTP externa (métrica por host e instrumentação)."""
+    host = urlparse(url).hostname or url
+    inicio = time.perf_counter()
+    try:
+        with medir("http"):
+            yield
+    except Exception:
+        incrementar("http_externo_erros_total", host=host)
+        raise
+    finally:
+        observar(
+            "http_externo_segundos", time.perf_counter() - inicio, host=host
+        )
+
+
+def _retratos():
+    """Retratos de todos os processos (ou só deste, sem METRICAS_DIR)."""
+    diretorio = settings.METRICAS_DIR
+    if not diretorio:
+        return [registro.retrato()]
+    registro.gravar()
+    retratos = []
+    try:
+        nomes = os.listdir(diretorio)
+    except OSError:
+        return [registro.retrato()]
+    for nome in nomes:
+        if not nome.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(diretorio, nome)) as arquivo:
+                retratos.append(json.load(arquivo))
+        except (OSError, ValueError):
+            continue
+    return retratos
+
+
+def agregar(retratos):
+    contadores = defaultdict(int)
+    histogramas = {}
+    for retrato in retratos:
+        for nome, rotulos, valor in retrato["contadores"]:
+            contadores[(nome, tuple(map(tuple, rotulos)))] += valor
+        for nome, rotulos, contagens, soma, total in retrato["histogramas"]:
+            chave = (nome, tuple(map(tuple, rotulos)))
+            atual = histogramas.setdefault(
+                chave, [[0] * len(contagens), 0.0, 0]
+            )
+            atual[0] = [a + b for a, b in zip(atual[0], contagens)]
+            atual[1] += soma
+            atual[2] += total
+    return contadores, histogramas
+
+
+def _gauges():
+    from cadastros.models import EmailOutbox
+
+    por_status = EmailOutbox.objects.values("status").annotate(
+        total=Count("id")
+    )
+    return {
+        ("email_outbox_mensagens", (("status", item["status"]),)): item[
+            "total"
+        ]
+        for item in por_status
+    }
+
+
+def _escapar(valor):
+    return (
+        str(valor)
+        .replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+    )
+
+
+def _rotulos(rotulos):
+    if not rotulos:
+        return ""
+    pares = ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos)
+    return f"{{{pares}}}"
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+def formatar(contadores, histogramas, gauges):
+    """Texto no formato de exposição do Prometheus (0.0.4)."""
+    series = defaultdict(list)
+    for (nome, rotulos), valor in sorted({**contadores, **gauges}.items()):
+        series[nome].append(f"{nome}{_rotulos(rotulos)} {_numero(valor)}")
+    for (nome, rotulos), (contagens, soma, total) in sorted(
+        histogramas.items()
+    ):
+        acumulado = 0
+        limites = [*METRICAS[nome][2], "+Inf"]
+        for limite, contagem in zip(limites, contagens):
+            acumulado += contagem
+            series[nome].append(
+                f"{nome}_bucket{_rotulos((*rotulos, ('le', limite)))} "
+                f"{acumulado}"
+            )
+        series[nome].append(f"{nome}_sum{_rotulos(rotulos)} {_numero(soma)}")
+        series[nome].append(f"{nome}_count{_rotulos(rotulos)} {total}")
+
+    linhas = []
+    for nome, (tipo, descricao, _) in METRICAS.items():
+        linhas.append(f"# HELP {nome} {descricao}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        linhas.extend(series.get(nome, []))
+    return "\n".join(linhas) + "\n"
+
+
+def exposicao():
+    """Métricas de todos os processos, no formato do Prometheus."""
+    contadores, histogramas = agregar(_retratos())
+    return formatar(contadores, histogramas, _gauges())
+
+
+class _ContadorConsultas:
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.segundos += time.perf_counter() - inicio
+            self.consultas += 1
+
+
+class MetricasMiddleware:
+    """Contagem, latência e SQL de todas as requisições, por view."""
+
+    def __init__(self, get_response):
+        if not settings.METRICAS_ATIVAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        contador = _ContadorConsultas()
+        inicio = time.perf_counter()
+        with connections["default"].execute_wrapper(contador):
+            response = self.get_response(request)
+        duracao = time.perf_counter() - inicio
+
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else VIEW_NAO_RESOLVIDA
+        incrementar(
+            "http_requisicoes_total",
+            view=view,
+            metodo=request.method,
+            status=response.status_code,
+        )
+        observar(
+            "http_requisicao_segundos",
+            duracao,
+            view=view,
+            metodo=request.method,
+        )
+        observar("db_consultas_por_requisicao", contador.consultas, view=view)
+        observar(
+            "db_tempo_por_requisicao_segundos", contador.segundos, view=view
+        )
+        return response
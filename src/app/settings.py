@@ -16,6 +16,8 @@ from pathlib import Path
 import dj_database_url
 from dotenv import load_dotenv
 
+from app.utils.conexao_banco import configurar_conexao, ler_max_age
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -68,7 +70,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # Adicionar no início
+    # Métricas do Prometheus por view (app.metricas, /api/metrics/)
+    "app.metricas.MetricasMiddleware",
+    # Mede SQL/serialização/HTTP externo (Server-Timing e log de lentas)
+    "app.instrumentacao.InstrumentacaoMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    # Comprime as respostas (antes dos middlewares que mexem no conteúdo)
+    "app.compressao.CompressaoMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -127,7 +135,7 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
     # IMPORTANTE: Para Supabase, use Transaction Mode (porta 6543) em vez de Session Mode (porta 5432)
     # Transaction Mode suporta muito mais conexões simultâneas (~200 vs ~20)
-    # conn_max_age=0 fecha conexões imediatamente após cada request (ideal para Supabase free tier)
+    # O reaproveitamento das conexões é definido por DB_CONEXAO_MODO abaixo
     parsed = dj_database_url.parse(
         DATABASE_URL, conn_max_age=0, ssl_require=True
     )
@@ -139,6 +147,20 @@ if DATABASE_URL:
     parsed["OPTIONS"] = opts
     DATABASES["default"].update(parsed)
 
+# Gerenciamento das conexões (app.utils.conexao_banco): "fechar" abre uma
+# conexão por request; "persistente" reaproveita por DB_CONN_MAX_AGE
+# segundos com health check; "transacao" é o persistente para poolers em
+# modo transação (Supabase na porta 6543, PgBouncer)
+DB_CONEXAO_MODO = os.getenv("DB_CONEXAO_MODO", "fechar").strip().lower()
+configurar_conexao(
+    DATABASES["default"],
+    DB_CONEXAO_MODO,
+    max_age=ler_max_age(os.getenv("DB_CONN_MAX_AGE", "60")),
+    health_checks=(
+        os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower() == "true"
+    ),
+)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -195,11 +217,162 @@ CORS_ALLOWED_ORIGINS = [
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 EMAIL_FROM = os.getenv("EMAIL_FROM", "noreply@cancellaflow.com.br")
 
+# Outbox de e-mails (cadastros.services.email_service). O envio é feito pelo
+# comando ``python manage.py processar_emails --continuo``.
+EMAIL_OUTBOX_TRANSPORTE = os.getenv(
+    "EMAIL_OUTBOX_TRANSPORTE",
+    "cadastros.services.email_service.ResendTransporte",
+)
+EMAIL_OUTBOX_LOTE = int(os.getenv("EMAIL_OUTBOX_LOTE", "100"))
+EMAIL_OUTBOX_MAX_TENTATIVAS = int(
+    os.getenv("EMAIL_OUTBOX_MAX_TENTATIVAS", "8")
+)
+EMAIL_OUTBOX_BACKOFF_BASE = int(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE", "30"))
+EMAIL_OUTBOX_BACKOFF_MAX = int(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX", "3600"))
+EMAIL_OUTBOX_RESERVA = int(os.getenv("EMAIL_OUTBOX_RESERVA", "300"))
+# Dias que e-mails enviados/descartados ficam na outbox (sem o corpo)
+EMAIL_OUTBOX_RETENCAO_DIAS = int(
+    os.getenv("EMAIL_OUTBOX_RETENCAO_DIAS", "30")
+)
+# Chamadas por segundo ao provedor, por processo worker (Resend: 2/s)
+EMAIL_OUTBOX_TAXA_POR_SEGUNDO = float(
+    os.getenv("EMAIL_OUTBOX_TAXA_POR_SEGUNDO", "2")
+)
+
+# Envio em lote da lista de convidados do cerimonial
+# (cadastros.services.convite_cerimonial_service)
+LISTA_CERIMONIAL_ENVIO_JOBS = int(
+    os.getenv("LISTA_CERIMONIAL_ENVIO_JOBS", "2")
+)
+LISTA_CERIMONIAL_ENVIO_WORKERS = int(
+    os.getenv("LISTA_CERIMONIAL_ENVIO_WORKERS", "4")
+)
+LISTA_CERIMONIAL_ENVIO_TIMEOUT = int(
+    os.getenv("LISTA_CERIMONIAL_ENVIO_TIMEOUT", "900")
+)
+LISTA_CERIMONIAL_ENVIO_SINCRONO = (
+    os.getenv("LISTA_CERIMONIAL_ENVIO_SINCRONO", "false").lower() == "true"
+)
+
+# QR codes (cadastros.services.qrcode_service). Cache em memória por
+# processo e, opcionalmente, em disco compartilhado entre os workers.
+QRCODE_CORRECAO = os.getenv("QRCODE_CORRECAO", "M")
+QRCODE_BOX_SIZE = int(os.getenv("QRCODE_BOX_SIZE", "8"))
+QRCODE_BORDA = int(os.getenv("QRCODE_BORDA", "4"))
+QRCODE_FONTE = os.getenv("QRCODE_FONTE", "")
+QRCODE_CACHE_MEMORIA_MAX = int(os.getenv("QRCODE_CACHE_MEMORIA_MAX", "2048"))
+# Desativado por padrão: os PNGs codificam tokens de acesso (qr_token). Use
+# um diretório exclusivo da aplicação (criado com permissão 0700)
+QRCODE_CACHE_DIR = os.getenv("QRCODE_CACHE_DIR", "")
+# Processos usados por pre_renderizar (0 = número de CPUs) e tamanho
+# mínimo do lote para valer a pena abrir o pool
+QRCODE_PROCESSOS = int(os.getenv("QRCODE_PROCESSOS", "0"))
+QRCODE_LOTE_MINIMO = int(os.getenv("QRCODE_LOTE_MINIMO", "50"))
+
+# Dashboards: junta as agregações de todas as tabelas numa única consulta
+# (derived tables com CROSS JOIN); "false" volta a uma consulta por tabela
+DASHBOARD_CONSULTA_UNICA = (
+    os.getenv("DASHBOARD_CONSULTA_UNICA", "true").lower() == "true"
+)
+
+# Janela (segundos) dos snapshots dos dashboards em cache. Alterações nos
+# registros invalidam o snapshot do condomínio na hora; a janela limita a
+# defasagem dos campos que dependem do horário. 0 desliga o cache.
+# Com cache por processo (LocMem) a invalidação não chega aos outros
+# workers, então vale a janela curta (_POR_PROCESSO)
+DASHBOARD_CACHE_JANELA = int(os.getenv("DASHBOARD_CACHE_JANELA", "300"))
+DASHBOARD_CACHE_JANELA_POR_PROCESSO = int(
+    os.getenv("DASHBOARD_CACHE_JANELA_POR_PROCESSO", "60")
+)
+
+# Cache (segundos) das encomendas pendentes por unidade usado no badge do
+# morador; invalidado a cada alteração de encomenda. 0 desliga o cache.
+# Com cache por processo (LocMem) a invalidação não chega aos outros
+# workers, então vale o TTL curto (_POR_PROCESSO)
+ENCOMENDA_BADGE_CACHE_TTL = int(os.getenv("ENCOMENDA_BADGE_CACHE_TTL", "3600"))
+ENCOMENDA_BADGE_CACHE_TTL_POR_PROCESSO = int(
+    os.getenv("ENCOMENDA_BADGE_CACHE_TTL_POR_PROCESSO", "60")
+)
+
+# Tamanho dos lotes de INSERT ao entregar um aviso aos usuários
+AVISO_ENTREGA_LOTE = int(os.getenv("AVISO_ENTREGA_LOTE", "1000"))
+
+# Tamanho mínimo (bytes) para comprimir uma resposta com brotli/gzip
+COMPRESSAO_MIN_BYTES = int(os.getenv("COMPRESSAO_MIN_BYTES", "1024"))
+
+# Instrumentação por requisição (app.instrumentacao): fração das requisições
+# medidas (o header X-Debug-Timing: 1 força) e limite, em ms, para o log de
+# requisição lenta
+INSTRUMENTACAO_ATIVA = (
+    os.getenv("INSTRUMENTACAO_ATIVA", "true").lower() == "true"
+)
+INSTRUMENTACAO_AMOSTRAGEM = float(
+    os.getenv("INSTRUMENTACAO_AMOSTRAGEM", "0.1")
+)
+INSTRUMENTACAO_LENTO_MS = int(os.getenv("INSTRUMENTACAO_LENTO_MS", "1000"))
+
+# Métricas do Prometheus (app.metricas). Com vários workers do gunicorn,
+# aponte METRICAS_DIR para um diretório local compartilhado entre eles
+# (limpo a cada deploy); METRICAS_INTERVALO é o intervalo, em segundos,
+# entre as gravações de cada processo
+METRICAS_ATIVAS = os.getenv("METRICAS_ATIVAS", "true").lower() == "true"
+METRICAS_DIR = os.getenv("METRICAS_DIR", "")
+METRICAS_INTERVALO = int(os.getenv("METRICAS_INTERVALO", "5"))
+
 # URL base do frontend (usada em emails e links gerados pelo backend)
 FRONTEND_BASE_URL = os.getenv(
     "FRONTEND_BASE_URL", "https://cancellaflow.com.br"
 )
 
+# Cache padrão. Com REDIS_URL o cache é compartilhado entre os workers e as
+# invalidações feitas por signal (token, grupos, badge, dashboards) chegam a
+# todos; sem ele o Django usa o LocMem, por processo, e os caches
+# invalidáveis passam a usar TTLs curtos (app.utils.cache_compartilhado)
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+# Cache de endereços por CEP (cadastros.services.cep_service)
+CEP_REQUEST_TIMEOUT = int(os.getenv("CEP_REQUEST_TIMEOUT", "5"))
+CEP_CACHE_MEMORIA_MAX = int(os.getenv("CEP_CACHE_MEMORIA_MAX", "2048"))
+CEP_CACHE_MEMORIA_TTL = int(os.getenv("CEP_CACHE_MEMORIA_TTL", "21600"))
+CEP_CACHE_NEGATIVO_TTL = int(os.getenv("CEP_CACHE_NEGATIVO_TTL", "86400"))
+CEP_CACHE_FALHA_TTL = int(os.getenv("CEP_CACHE_FALHA_TTL", "60"))
+CEP_CACHE_DB_TTL_DIAS = int(os.getenv("CEP_CACHE_DB_TTL_DIAS", "90"))
+
+# Cache dos grupos do usuário (access.grupos), em segundos
+ACCESS_GRUPOS_CACHE_TTL = int(os.getenv("ACCESS_GRUPOS_CACHE_TTL", "60"))
+
+# Cache da autenticação por token (access.autenticacao), em segundos: no
+# cache do Django e no LRU de cada processo (que não recebe as invalidações
+# feitas em outros processos, por isso o TTL curto). Sem cache compartilhado
+# (REDIS_URL) o cache do Django também é por processo e usa o TTL local
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+AUTH_TOKEN_CACHE_LOCAL_TTL = int(os.getenv("AUTH_TOKEN_CACHE_LOCAL_TTL", "10"))
+AUTH_TOKEN_CACHE_MAX = int(os.getenv("AUTH_TOKEN_CACHE_MAX", "2048"))
+
+# Cache HTTP das imagens servidas do banco (segundos). URLs versionadas
+# (?v=<id do arquivo>) usam o max-age longo com "immutable".
+IMAGENS_CACHE_MAX_AGE = int(os.getenv("IMAGENS_CACHE_MAX_AGE", "300"))
+IMAGENS_CACHE_MAX_AGE_VERSIONADA = int(
+    os.getenv("IMAGENS_CACHE_MAX_AGE_VERSIONADA", "31536000")
+)
+
+# Variantes geradas no upload das imagens (maior lado, em pixels), servidas
+# com ?size=<px>
+IMAGENS_VARIANTES_TAMANHOS = tuple(
+    int(tamanho)
+    for tamanho in os.getenv(
+        "IMAGENS_VARIANTES_TAMANHOS", "64,128,256,512"
+    ).split(",")
+    if tamanho.strip()
+)
+
 CORS_ALLOW_CREDENTIALS = True
 
 CORS_ALLOW_METHODS = [
@@ -227,13 +400,23 @@ CORS_ALLOW_HEADERS = [
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 50,
+    # JSON com orjson quando instalado (mesma saída do renderer padrão)
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.utils.json_rapido.JSONRapidoRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app.utils.json_rapido.JSONRapidoParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "access.autenticacao.TokenCacheAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
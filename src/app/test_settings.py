@@ -24,3 +24,15 @@ SECRET_KEY = "test-secret-key-only-for-local-tests"
 # E-mail fictício para testes (substituído por mocks no código)
 RESEND_API_KEY = "re_test_fake_key"
 EMAIL_FROM = "noreply@test.example.com"
+
+# Outbox de e-mails entrega em memória (sem chamar o Resend)
+EMAIL_OUTBOX_TRANSPORTE = "cadastros.services.email_service.MemoriaTransporte"
+
+# Envio da lista do cerimonial na própria requisição (sem thread)
+LISTA_CERIMONIAL_ENVIO_SINCRONO = True
+
+# QR codes só em memória nos testes
+QRCODE_CACHE_DIR = ""
+
+# Dashboards sem snapshot em cache (testes específicos ligam)
+DASHBOARD_CACHE_JANELA = 0
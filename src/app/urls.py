@@ -22,7 +22,7 @@ from django.http import JsonResponse
 from django.urls import include, path
 from django.views.static import serve
 
-from .health import health
+from .health import health, metricas
 
 
 def root_view(request):
@@ -36,6 +36,7 @@ urlpatterns = [
     path("api/cadastros/", include("cadastros.api.urls")),
     path("api/health/", health),
     path("health/", health),
+    path("api/metrics/", metricas),
 ]
 
 # Servir arquivos de mídia em desenvolvimento
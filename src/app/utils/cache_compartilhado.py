@@ -0,0 +1,26 @@
+"""
+Se o cache padrão (``CACHES["default"]``) é visto por todos os workers.
+
+Sem ``CACHES`` configurado o Django usa o ``LocMemCache``, que é por
+processo: uma invalidação feita num worker do gunicorn não chega aos
+outros, que continuam servindo o valor antigo até o TTL vencer. Os caches
+invalidados por signal usam TTLs curtos nesse caso.
+"""
+
+from django.conf import settings
+
+BACKENDS_POR_PROCESSO = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_compartilhado():
+    return settings.CACHES["default"]["BACKEND"] not in BACKENDS_POR_PROCESSO
+
+
+def ttl_invalidavel(ttl, ttl_por_processo):
+    """``ttl`` com cache compartilhado; senão, no máximo ``ttl_por_processo``."""
+    if cache_compartilhado():
+        return ttl
+    return min(ttl, ttl_por_processo)
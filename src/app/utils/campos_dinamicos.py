@@ -0,0 +1,90 @@
+"""
+Campos sob demanda nos serializers (``?fields=`` / ``?omit=``).
+
+``?fields=id,nome`` limita a resposta a esses campos e ``?omit=cpf,email``
+remove campos. Campos fora da resposta não são calculados (inclusive
+``SerializerMethodField``), e ``preparar_queryset`` deixa de carregar as
+relações que só eles usavam.
+"""
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+def _nomes(valor):
+    return {nome.strip() for nome in (valor or "").split(",") if nome.strip()}
+
+
+def campos_pedidos(request, disponiveis):
+    """Subconjunto de ``disponiveis`` pedido na query string."""
+    campos = set(disponiveis)
+    # Escrita sempre usa todos os campos (validação e resposta completas)
+    if request is None or request.method not in SAFE_METHODS:
+        return campos
+    params = getattr(request, "query_params", request.GET)
+    fields = _nomes(params.get("fields"))
+    if fields:
+        campos &= fields
+    return campos - _nomes(params.get("omit"))
+
+
+class CamposDinamicosMixin:
+    """
+    Serializer que respeita ``?fields=`` e ``?omit=`` da requisição.
+
+    Vale só para o serializer de topo (ou o filho de um ``many=True``);
+    serializers aninhados continuam completos. O ``request`` vem do
+    ``context``.
+
+    ``Meta.select_related_por_campo`` e ``Meta.prefetch_related_por_campo``
+    mapeiam cada campo às relações que ele lê; ``Meta.anotacoes_por_campo``
+    mapeia o campo às anotações (``{nome: expressão}``) que ele usa.
+    """
+
+    def _de_topo(self):
+        if self.parent is None:
+            return True
+        return (
+            isinstance(self.parent, ListSerializer)
+            and self.parent.parent is None
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._de_topo():
+            return fields
+        campos = campos_pedidos(self.context.get("request"), fields)
+        return {
+            nome: campo for nome, campo in fields.items() if nome in campos
+        }
+
+    @classmethod
+    def preparar_queryset(cls, queryset, request):
+        """
+        Troca o select/prefetch_related de ``queryset`` pelas relações dos
+        campos que vão na resposta e anota o que eles precisam.
+        """
+        campos = cls(context={"request": request}).fields
+        anotacoes = {}
+        for nome in campos:
+            anotacoes.update(
+                getattr(cls.Meta, "anotacoes_por_campo", {}).get(nome, {})
+            )
+        relacoes = {}
+        for tipo in ("select_related", "prefetch_related"):
+            por_campo = getattr(cls.Meta, f"{tipo}_por_campo", {})
+            lookups = {}
+            for nome in campos:
+                for lookup in por_campo.get(nome, ()):
+                    chave = getattr(lookup, "prefetch_to", lookup)
+                    lookups.setdefault(chave, lookup)
+            relacoes[tipo] = list(lookups.values())
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if relacoes["select_related"]:
+            queryset = queryset.select_related(*relacoes["select_related"])
+        if relacoes["prefetch_related"]:
+            queryset = queryset.prefetch_related(*relacoes["prefetch_related"])
+        if anotacoes:
+            queryset = queryset.annotate(**anotacoes)
+        return queryset
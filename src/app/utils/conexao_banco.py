@@ -0,0 +1,49 @@
+"""
+Modos de gerenciamento das conexões com o banco (``DB_CONEXAO_MODO``).
+
+- ``fechar``: uma conexão por requisição (``CONN_MAX_AGE=0``). Para poolers
+  com poucas conexões livres.
+- ``persistente``: a conexão é reaproveitada entre requisições por até
+  ``DB_CONN_MAX_AGE`` segundos, com health check antes de reutilizá-la.
+  Evita o handshake TCP/TLS a cada requisição.
+- ``transacao``: ``persistente`` atrás de um pooler em modo transação
+  (PgBouncer, Supavisor na porta 6543), onde cada transação pode cair numa
+  conexão diferente do servidor. Desliga os cursores do lado do servidor,
+  que não sobrevivem entre transações. O psycopg2 não usa prepared
+  statements do servidor, então não há o que desligar nesse ponto.
+
+O pool dentro do processo do Django (``OPTIONS["pool"]``) só existe a
+partir do Django 5.1 com psycopg 3; aqui o pool é o do pooler externo.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+MODOS_CONEXAO = ("fechar", "persistente", "transacao")
+
+
+def configurar_conexao(banco, modo, max_age=60, health_checks=True):
+    """Aplica ``modo`` a um item de ``DATABASES`` e o devolve."""
+    if modo not in MODOS_CONEXAO:
+        raise ImproperlyConfigured(
+            f"DB_CONEXAO_MODO inválido: {modo!r} "
+            f"(use {', '.join(MODOS_CONEXAO)})"
+        )
+
+    if modo == "fechar":
+        banco["CONN_MAX_AGE"] = 0
+        banco["CONN_HEALTH_CHECKS"] = False
+        banco["DISABLE_SERVER_SIDE_CURSORS"] = False
+        return banco
+
+    # max_age=None mantém a conexão aberta sem limite de tempo
+    banco["CONN_MAX_AGE"] = max_age
+    banco["CONN_HEALTH_CHECKS"] = health_checks
+    banco["DISABLE_SERVER_SIDE_CURSORS"] = modo == "transacao"
+    return banco
+
+
+def ler_max_age(valor):
+    """``DB_CONN_MAX_AGE``: segundos, ou vazio/``none`` para sem limite."""
+    if valor is None or valor.strip().lower() in ("", "none"):
+        return None
+    return int(valor)
@@ -0,0 +1,72 @@
+"""
+Renderer e parser JSON do DRF com ``orjson``.
+
+O ``orjson`` é opcional: sem ele (ou quando ele não consegue serializar um
+valor, como inteiros acima de 64 bits) o comportamento é o do
+``JSONRenderer``/``JSONParser`` padrão do DRF. Datas, horas, ``Decimal`` e
+demais tipos que o ``orjson`` não trata do mesmo jeito passam pelo
+``JSONEncoder`` do DRF, para que a saída seja idêntica à da stdlib.
+
+Floats são a exceção, aceita de propósito (conferir cada float antes do
+``orjson`` custaria mais que a própria stdlib): a notação exponencial sai
+no formato do ``orjson`` (``1e20``, ``1e-7``; a stdlib escreve ``1e+20``,
+``1e-07``), com o mesmo valor ao fazer o parse, e ``NaN``/``Infinity`` saem
+como ``null`` em vez do ``ValueError`` do DRF com ``STRICT_JSON``. Os
+modelos não têm ``FloatField``; floats só aparecem em valores calculados.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# O DRF escapa U+2028/U+2029 para manter o JSON um subconjunto de JavaScript
+_SEPARADORES_JS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Saída indentada (?indent=, API navegável) ou só ASCII
+        # (UNICODE_JSON=False) fica com a stdlib
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            # orjson.JSONEncodeError herda de TypeError
+            return super().render(data, accepted_media_type, renderer_context)
+        for original, escapado in _SEPARADORES_JS:
+            if original in ret:
+                ret = ret.replace(original, escapado)
+        return ret
+
+
+class JSONRapidoParser(JSONParser):
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
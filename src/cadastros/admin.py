@@ -1,7 +1,11 @@
 from django.contrib import admin
 
+from .models.arquivo_binario import ArquivoBinario, ArquivoVariante
 from .models.aviso import Aviso
+from .models.aviso_entrega import AvisoEntrega
+from .models.cep_endereco import CepEndereco
 from .models.condominio import Condominio
+from .models.email_outbox import EmailOutbox
 from .models.encomenda import Encomenda
 from .models.evento_cerimonial import (
     EventoCerimonial,
@@ -94,8 +98,9 @@ class AvisoAdmin(admin.ModelAdmin):
         "data_fim",
         "created_at",
     )
-    list_filter = ("grupos", "prioridade", "status")
+    list_filter = ("grupos", "prioridade", "status", "origem")
     search_fields = ("titulo", "descricao", "grupo__name", "grupos__name")
+    raw_id_fields = ("encomenda", "unidade")
 
     def grupos_display(self, obj):
         nomes = list(obj.grupos.values_list("name", flat=True))
@@ -195,3 +200,66 @@ class FuncaoFestaAdmin(admin.ModelAdmin):
     list_display = ("nome", "ativo", "created_by", "created_at", "updated_at")
     list_filter = ("ativo", "created_at", "updated_at")
     search_fields = ("nome", "created_by__username", "created_by__full_name")
+
+
+@admin.register(CepEndereco)
+class CepEnderecoAdmin(admin.ModelAdmin):
+    list_display = ("cep", "logradouro", "cidade", "estado", "encontrado")
+    list_filter = ("encontrado", "fonte", "estado")
+    search_fields = ("cep", "logradouro", "bairro", "cidade")
+    readonly_fields = ("consultado_em",)
+
+
+@admin.register(ArquivoBinario)
+class ArquivoBinarioAdmin(admin.ModelAdmin):
+    list_display = ("hash", "tamanho", "content_type", "created_on")
+    search_fields = ("hash",)
+    exclude = ("dados",)
+    readonly_fields = ("hash", "tamanho", "content_type", "created_on")
+
+
+@admin.register(ArquivoVariante)
+class ArquivoVarianteAdmin(admin.ModelAdmin):
+    list_display = ("original", "tamanho", "formato", "arquivo")
+    list_filter = ("formato", "tamanho")
+    raw_id_fields = ("original", "arquivo")
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "status",
+        "tentativas",
+        "proxima_tentativa_em",
+        "enviado_em",
+        "created_on",
+    )
+    list_filter = ("status",)
+    search_fields = ("chave_idempotencia", "provedor_id")
+    # O payload pode conter senhas provisórias enquanto o e-mail não sai
+    exclude = ("payload",)
+    readonly_fields = (
+        "chave_idempotencia",
+        "lote_envio",
+        "tentativas",
+        "enviado_em",
+        "provedor_id",
+        "ultimo_erro",
+        "created_on",
+    )
+
+
+@admin.register(AvisoEntrega)
+class AvisoEntregaAdmin(admin.ModelAdmin):
+    list_display = (
+        "aviso",
+        "usuario",
+        "ativo",
+        "prioridade",
+        "data_inicio",
+        "lido",
+    )
+    list_filter = ("ativo", "lido", "prioridade")
+    raw_id_fields = ("aviso", "usuario")
+    readonly_fields = ("created_on", "lido_em")
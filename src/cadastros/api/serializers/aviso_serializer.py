@@ -155,8 +155,9 @@ class AvisoListSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    # obj.grupos.all() aproveita o prefetch_related("grupos") das views
     def get_grupos(self, obj):
-        grupos = list(obj.grupos.values_list("id", flat=True))
+        grupos = [grupo.id for grupo in obj.grupos.all()]
         if grupos:
             return grupos
         if obj.grupo_id:
@@ -164,7 +165,7 @@ class AvisoListSerializer(serializers.ModelSerializer):
         return []
 
     def get_grupos_nomes(self, obj):
-        grupos = list(obj.grupos.values_list("name", flat=True))
+        grupos = [grupo.name for grupo in obj.grupos.all()]
         if grupos:
             return grupos
         if obj.grupo:
@@ -1,18 +1,40 @@
-import requests
 from access.models import User
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from ...models import Condominio
+from ...services.arquivo_service import url_versionada
+
+
+def prefetch_sindicos():
+    """Prefetch dos síndicos de cada condomínio (evita N+1 nas listagens)."""
+    return Prefetch(
+        "usuarios",
+        queryset=User.objects.filter(groups__name="Síndicos").order_by(
+            "full_name"
+        ),
+        to_attr="sindicos_prefetch",
+    )
+
+
+def _sindicos(obj):
+    """Síndicos do condomínio por nome, do prefetch ou de uma consulta."""
+    if not hasattr(obj, "sindicos_prefetch"):
+        obj.sindicos_prefetch = list(
+            obj.usuarios.filter(groups__name="Síndicos").order_by("full_name")
+        )
+    return obj.sindicos_prefetch
+
+
+def _primeiro_sindico(obj):
+    # Mesmo critério do antigo .first() (User.Meta.ordering): por nome
+    sindicos = _sindicos(obj)
+    return sindicos[0] if sindicos else None
 
 
 class CondominioSerializer(serializers.ModelSerializer):
     sindico_nome = serializers.SerializerMethodField(read_only=True)
     sindico_id = serializers.SerializerMethodField(read_only=True)
-    endereco_completo = serializers.SerializerMethodField(read_only=True)
-    logradouro = serializers.SerializerMethodField(read_only=True)
-    bairro = serializers.SerializerMethodField(read_only=True)
-    cidade = serializers.SerializerMethodField(read_only=True)
-    estado = serializers.SerializerMethodField(read_only=True)
     logo_url = serializers.SerializerMethodField(read_only=True)
     signup_slug = serializers.CharField(read_only=True)
     signup_path = serializers.SerializerMethodField(read_only=True)
@@ -65,12 +87,14 @@ class CondominioSerializer(serializers.ModelSerializer):
     def get_logo_url(self, obj):
         """Retorna a URL completa da logo"""
         request = self.context.get("request")
-        if getattr(obj, "logo_db_data", None):
+        if getattr(obj, "logo_arquivo_id", None):
+            path = url_versionada(
+                f"/api/cadastros/condominios/{obj.id}/logo-db/",
+                obj.logo_arquivo_id,
+            )
             if request:
-                return request.build_absolute_uri(
-                    f"/api/cadastros/condominios/{obj.id}/logo-db/"
-                )
-            return f"/api/cadastros/condominios/{obj.id}/logo-db/"
+                return request.build_absolute_uri(path)
+            return path
 
         if obj.logo:
             if request:
@@ -79,95 +103,8 @@ class CondominioSerializer(serializers.ModelSerializer):
 
         return None
 
-    def _buscar_dados_cep(self, cep):
-        """Busca dados do CEP na API Brasil"""
-        if not cep or len(cep) != 8:
-            return None
-
-        try:
-            response = requests.get(
-                f"https://brasilapi.com.br/api/cep/v2/{cep}", timeout=5
-            )
-            if response.status_code == 200:
-                return response.json()
-        except Exception:
-            pass
-
-        return None
-
-    def get_logradouro(self, obj):
-        """Retorna o logradouro buscado via API"""
-        if obj.cep:
-            dados = self._buscar_dados_cep(obj.cep)
-            if dados:
-                return dados.get("street", "")
-        return ""
-
-    def get_bairro(self, obj):
-        """Retorna o bairro buscado via API"""
-        if obj.cep:
-            dados = self._buscar_dados_cep(obj.cep)
-            if dados:
-                return dados.get("neighborhood", "")
-        return ""
-
-    def get_cidade(self, obj):
-        """Retorna a cidade buscada via API"""
-        if obj.cep:
-            dados = self._buscar_dados_cep(obj.cep)
-            if dados:
-                return dados.get("city", "")
-        return ""
-
-    def get_estado(self, obj):
-        """Retorna o estado buscado via API"""
-        if obj.cep:
-            dados = self._buscar_dados_cep(obj.cep)
-            if dados:
-                return dados.get("state", "")
-        return ""
-
-    def get_endereco_completo(self, obj):
-        """Monta o endereço completo a partir dos dados do CEP"""
-        if not obj.cep:
-            return ""
-
-        dados = self._buscar_dados_cep(obj.cep)
-        if not dados:
-            return f"CEP: {obj.cep}"
-
-        partes = []
-
-        logradouro = dados.get("street", "")
-        if logradouro:
-            endereco_base = (
-                f"{logradouro}, {obj.numero}" if obj.numero else logradouro
-            )
-            partes.append(endereco_base)
-
-        if obj.complemento:
-            partes.append(obj.complemento)
-
-        bairro = dados.get("neighborhood", "")
-        if bairro:
-            partes.append(bairro)
-
-        cidade = dados.get("city", "")
-        estado = dados.get("state", "")
-        if cidade and estado:
-            partes.append(f"{cidade} - {estado}")
-        elif cidade:
-            partes.append(cidade)
-
-        cep_formatado = (
-            f"{obj.cep[:5]}-{obj.cep[5:]}" if len(obj.cep) == 8 else obj.cep
-        )
-        partes.append(f"CEP: {cep_formatado}")
-
-        return ", ".join(partes)
-
     def get_sindico_nome(self, obj):
-        sindico = obj.usuarios.filter(groups__name="Síndicos").first()
+        sindico = _primeiro_sindico(obj)
         if sindico:
             return (
                 sindico.full_name
@@ -177,7 +114,7 @@ class CondominioSerializer(serializers.ModelSerializer):
         return None
 
     def get_sindico_id(self, obj):
-        sindico = obj.usuarios.filter(groups__name="Síndicos").first()
+        sindico = _primeiro_sindico(obj)
         return str(sindico.id) if sindico else None
 
     def validate_cnpj(self, value):
@@ -208,7 +145,6 @@ class CondominioListSerializer(serializers.ModelSerializer):
     sindico_nome = serializers.SerializerMethodField(read_only=True)
     sindico_id = serializers.SerializerMethodField(read_only=True)
     sindicos = serializers.SerializerMethodField(read_only=True)
-    endereco_completo = serializers.SerializerMethodField(read_only=True)
     logo_url = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -232,12 +168,14 @@ class CondominioListSerializer(serializers.ModelSerializer):
     def get_logo_url(self, obj):
         """Retorna a URL completa da logo"""
         request = self.context.get("request")
-        if getattr(obj, "logo_db_data", None):
+        if getattr(obj, "logo_arquivo_id", None):
+            path = url_versionada(
+                f"/api/cadastros/condominios/{obj.id}/logo-db/",
+                obj.logo_arquivo_id,
+            )
             if request:
-                return request.build_absolute_uri(
-                    f"/api/cadastros/condominios/{obj.id}/logo-db/"
-                )
-            return f"/api/cadastros/condominios/{obj.id}/logo-db/"
+                return request.build_absolute_uri(path)
+            return path
 
         if obj.logo:
             if request:
@@ -246,63 +184,8 @@ class CondominioListSerializer(serializers.ModelSerializer):
 
         return None
 
-    def _buscar_dados_cep(self, cep):
-        """Busca dados do CEP na API Brasil"""
-        if not cep or len(cep) != 8:
-            return None
-
-        try:
-            response = requests.get(
-                f"https://brasilapi.com.br/api/cep/v2/{cep}", timeout=5
-            )
-            if response.status_code == 200:
-                return response.json()
-        except Exception:
-            pass
-
-        return None
-
-    def get_endereco_completo(self, obj):
-        """Monta o endereço completo a partir dos dados do CEP"""
-        if not obj.cep:
-            return ""
-
-        dados = self._buscar_dados_cep(obj.cep)
-        if not dados:
-            return f"CEP: {obj.cep}"
-
-        partes = []
-
-        logradouro = dados.get("street", "")
-        if logradouro:
-            endereco_base = (
-                f"{logradouro}, {obj.numero}" if obj.numero else logradouro
-            )
-            partes.append(endereco_base)
-
-        if obj.complemento:
-            partes.append(obj.complemento)
-
-        bairro = dados.get("neighborhood", "")
-        if bairro:
-            partes.append(bairro)
-
-        cidade = dados.get("city", "")
-        estado = dados.get("state", "")
-        if cidade and estado:
-            partes.append(f"{cidade} - {estado}")
-        elif cidade:
-            partes.append(cidade)
-
-        cep_formatado = (
-            f"{obj.cep[:5]}-{obj.cep[5:]}" if len(obj.cep) == 8 else obj.cep
-        )
-        partes.append(f"CEP: {cep_formatado}")
-
-        return ", ".join(partes)
-
     def get_sindico_nome(self, obj):
-        sindico = obj.usuarios.filter(groups__name="Síndicos").first()
+        sindico = _primeiro_sindico(obj)
         if sindico:
             return (
                 sindico.full_name
@@ -312,7 +195,7 @@ class CondominioListSerializer(serializers.ModelSerializer):
         return None
 
     def get_sindico_id(self, obj):
-        sindico = obj.usuarios.filter(groups__name="Síndicos").first()
+        sindico = _primeiro_sindico(obj)
         return str(sindico.id) if sindico else None
 
     def get_sindicos(self, obj):
@@ -326,7 +209,5 @@ class CondominioListSerializer(serializers.ModelSerializer):
                 "phone": s.phone or "",
                 "is_active": s.is_active,
             }
-            for s in obj.usuarios.filter(groups__name="Síndicos").order_by(
-                "full_name"
-            )
+            for s in _sindicos(obj)
         ]
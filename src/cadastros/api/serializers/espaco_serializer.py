@@ -184,7 +184,8 @@ class EspacoReservaListSerializer(serializers.ModelSerializer):
         if morador is None:
             return "-"
 
-        unidade = morador.unidades.first()
+        # Itera o prefetch de morador__unidades feito na listagem
+        unidade = next(iter(morador.unidades.all()), None)
         if unidade:
             return unidade.identificacao_completa
         return "-"
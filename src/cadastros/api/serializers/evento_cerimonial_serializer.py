@@ -1,10 +1,10 @@
-from functools import lru_cache
-
-import requests
 from access.models import User
+from app.utils.campos_dinamicos import CamposDinamicosMixin
 from rest_framework import serializers
 
 from ...models import EventoCerimonial
+from ...services.arquivo_service import url_versionada
+from ...services.cep_service import normalizar_cep
 
 
 def _to_bool(value):
@@ -15,28 +15,15 @@ def _to_bool(value):
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
 
-@lru_cache(maxsize=512)
-def _buscar_dados_cep(cep_digits):
-    if not cep_digits or len(cep_digits) != 8:
-        return None
-    try:
-        response = requests.get(
-            f"https://brasilapi.com.br/api/cep/v2/{cep_digits}", timeout=5
-        )
-        if response.status_code == 200:
-            return response.json()
-    except Exception:
-        return None
-    return None
-
-
 class ParticipanteEventoSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "full_name", "username", "phone"]
 
 
-class EventoCerimonialSerializer(serializers.ModelSerializer):
+class EventoCerimonialSerializer(
+    CamposDinamicosMixin, serializers.ModelSerializer
+):
     cerimonialistas = ParticipanteEventoSerializer(many=True, read_only=True)
     organizadores = ParticipanteEventoSerializer(many=True, read_only=True)
     funcionarios = ParticipanteEventoSerializer(many=True, read_only=True)
@@ -57,11 +44,6 @@ class EventoCerimonialSerializer(serializers.ModelSerializer):
         required=False,
     )
 
-    logradouro = serializers.SerializerMethodField(read_only=True)
-    bairro = serializers.SerializerMethodField(read_only=True)
-    cidade = serializers.SerializerMethodField(read_only=True)
-    estado = serializers.SerializerMethodField(read_only=True)
-    endereco_completo = serializers.SerializerMethodField(read_only=True)
     imagem_url = serializers.SerializerMethodField(read_only=True)
     lista_convidados_id = serializers.SerializerMethodField(read_only=True)
 
@@ -93,12 +75,27 @@ class EventoCerimonialSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = [
+            "id",
+            "logradouro",
+            "bairro",
+            "cidade",
+            "estado",
+            "endereco_completo",
+            "created_at",
+            "updated_at",
+        ]
+        select_related_por_campo = {
+            "lista_convidados_id": ("lista_convidados",),
+        }
+        prefetch_related_por_campo = {
+            "cerimonialistas": ("cerimonialistas",),
+            "organizadores": ("organizadores",),
+            "funcionarios": ("funcionarios",),
+        }
 
     def _normalizar_cep(self, value):
-        if value is None:
-            return ""
-        return "".join(ch for ch in str(value) if ch.isdigit())
+        return normalizar_cep(value)
 
     def _resolver_usuarios(self, ids, grupo_nome):
         if not ids:
@@ -209,65 +206,14 @@ class EventoCerimonialSerializer(serializers.ModelSerializer):
 
         return instance
 
-    def _dados_cep(self, obj):
-        cep = "".join(ch for ch in (obj.cep or "") if ch.isdigit())
-        return _buscar_dados_cep(cep)
-
-    def get_logradouro(self, obj):
-        dados = self._dados_cep(obj)
-        return (dados or {}).get("street", "")
-
-    def get_bairro(self, obj):
-        dados = self._dados_cep(obj)
-        return (dados or {}).get("neighborhood", "")
-
-    def get_cidade(self, obj):
-        dados = self._dados_cep(obj)
-        return (dados or {}).get("city", "")
-
-    def get_estado(self, obj):
-        dados = self._dados_cep(obj)
-        return (dados or {}).get("state", "")
-
-    def get_endereco_completo(self, obj):
-        dados = self._dados_cep(obj)
-        partes = []
-
-        logradouro = (dados or {}).get("street", "")
-        if logradouro:
-            endereco_base = (
-                f"{logradouro}, {obj.numero}" if obj.numero else logradouro
-            )
-            partes.append(endereco_base)
-        elif obj.numero:
-            partes.append(f"Número {obj.numero}")
-
-        if obj.complemento:
-            partes.append(obj.complemento)
-
-        bairro = (dados or {}).get("neighborhood", "")
-        if bairro:
-            partes.append(bairro)
-
-        cidade = (dados or {}).get("city", "")
-        estado = (dados or {}).get("state", "")
-        if cidade and estado:
-            partes.append(f"{cidade} - {estado}")
-        elif cidade:
-            partes.append(cidade)
-
-        cep = "".join(ch for ch in (obj.cep or "") if ch.isdigit())
-        if cep:
-            cep_fmt = f"{cep[:5]}-{cep[5:]}" if len(cep) == 8 else cep
-            partes.append(f"CEP: {cep_fmt}")
-
-        return ", ".join(partes)
-
     def get_imagem_url(self, obj):
         request = self.context.get("request")
-        if not obj.imagem_db_data:
+        if not obj.imagem_arquivo_id:
             return None
-        path = f"/api/cadastros/eventos-cerimonial/{obj.id}/imagem-db/"
+        path = url_versionada(
+            f"/api/cadastros/eventos-cerimonial/{obj.id}/imagem-db/",
+            obj.imagem_arquivo_id,
+        )
         if request:
             return request.build_absolute_uri(path)
         return path
@@ -277,8 +223,9 @@ class EventoCerimonialSerializer(serializers.ModelSerializer):
         return getattr(lista, "id", None)
 
 
-class EventoCerimonialListSerializer(serializers.ModelSerializer):
-    endereco_completo = serializers.SerializerMethodField(read_only=True)
+class EventoCerimonialListSerializer(
+    CamposDinamicosMixin, serializers.ModelSerializer
+):
     imagem_url = serializers.SerializerMethodField(read_only=True)
     lista_convidados_id = serializers.SerializerMethodField(read_only=True)
 
@@ -296,11 +243,9 @@ class EventoCerimonialListSerializer(serializers.ModelSerializer):
             "lista_convidados_id",
             "created_at",
         ]
-
-    def get_endereco_completo(self, obj):
-        return EventoCerimonialSerializer(
-            context=self.context
-        ).get_endereco_completo(obj)
+        select_related_por_campo = {
+            "lista_convidados_id": ("lista_convidados",),
+        }
 
     def get_imagem_url(self, obj):
         return EventoCerimonialSerializer(context=self.context).get_imagem_url(
@@ -2,6 +2,7 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from ...models import Espaco, Evento
+from ...services.arquivo_service import url_versionada
 
 
 class EventoSerializer(serializers.ModelSerializer):
@@ -72,12 +73,14 @@ class EventoSerializer(serializers.ModelSerializer):
     def get_imagem_url(self, obj):
         request = self.context.get("request")
         # Se imagem estiver armazenada como BLOB no banco, expõe rota protegida
-        if getattr(obj, "imagem_db_data", None):
+        if getattr(obj, "imagem_arquivo_id", None):
+            path = url_versionada(
+                f"/api/cadastros/eventos/{obj.id}/imagem-db/",
+                obj.imagem_arquivo_id,
+            )
             if request:
-                return request.build_absolute_uri(
-                    f"/api/cadastros/eventos/{obj.id}/imagem-db/"
-                )
-            return f"/api/cadastros/eventos/{obj.id}/imagem-db/"
+                return request.build_absolute_uri(path)
+            return path
 
         # Caso legado usando ImageField
         if getattr(obj, "imagem", None):
@@ -213,12 +216,14 @@ class EventoListSerializer(serializers.ModelSerializer):
 
     def get_imagem_url(self, obj):
         request = self.context.get("request")
-        if getattr(obj, "imagem_db_data", None):
+        if getattr(obj, "imagem_arquivo_id", None):
+            path = url_versionada(
+                f"/api/cadastros/eventos/{obj.id}/imagem-db/",
+                obj.imagem_arquivo_id,
+            )
             if request:
-                return request.build_absolute_uri(
-                    f"/api/cadastros/eventos/{obj.id}/imagem-db/"
-                )
-            return f"/api/cadastros/eventos/{obj.id}/imagem-db/"
+                return request.build_absolute_uri(path)
+            return path
 
         if getattr(obj, "imagem", None):
             if request:
@@ -1,7 +1,23 @@
+from app.utils.campos_dinamicos import CamposDinamicosMixin
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework import serializers
 
 from ...models import ConvidadoListaCerimonial, ListaConvidadosCerimonial
 
+# Subquery (e não Count("convidados")): a busca da listagem filtra por
+# convidados__nome e o Count reaproveitaria o join filtrado
+TOTAL_CONVIDADOS = Coalesce(
+    Subquery(
+        ConvidadoListaCerimonial.objects.filter(lista=OuterRef("pk"))
+        .order_by()
+        .values("lista")
+        .annotate(total=Count("id"))
+        .values("total")
+    ),
+    0,
+)
+
 
 class ConvidadoListaCerimonialSerializer(serializers.ModelSerializer):
     cpf_formatado = serializers.SerializerMethodField()
@@ -46,14 +62,21 @@ class ConvidadoListaCerimonialSerializer(serializers.ModelSerializer):
         return cpf
 
 
-class ListaConvidadosCerimonialSerializer(serializers.ModelSerializer):
+ORDEM_CONVIDADOS = ("-vip", "nome", "id")
+
+
+class ListaConvidadosCerimonialSerializer(
+    CamposDinamicosMixin, serializers.ModelSerializer
+):
     convidados = serializers.SerializerMethodField()
     total_convidados = serializers.SerializerMethodField()
     evento_nome = serializers.CharField(source="evento.nome", read_only=True)
     evento_confirmado = serializers.BooleanField(
         source="evento.evento_confirmado", read_only=True
     )
-    endereco_evento = serializers.SerializerMethodField(read_only=True)
+    endereco_evento = serializers.CharField(
+        source="evento.endereco_completo", read_only=True
+    )
 
     class Meta:
         model = ListaConvidadosCerimonial
@@ -73,15 +96,34 @@ class ListaConvidadosCerimonialSerializer(serializers.ModelSerializer):
             "updated_on",
         ]
         read_only_fields = ["id", "created_on", "updated_on"]
+        select_related_por_campo = {
+            "evento_nome": ("evento",),
+            "evento_confirmado": ("evento",),
+            "endereco_evento": ("evento",),
+        }
+        anotacoes_por_campo = {
+            "total_convidados": {"total_convidados_anotado": TOTAL_CONVIDADOS},
+        }
+        prefetch_related_por_campo = {
+            "convidados": (
+                Prefetch(
+                    "convidados",
+                    queryset=ConvidadoListaCerimonial.objects.order_by(
+                        *ORDEM_CONVIDADOS
+                    ),
+                ),
+            ),
+        }
 
     def get_total_convidados(self, obj):
+        total = getattr(obj, "total_convidados_anotado", None)
+        if total is not None:
+            return total
         return obj.convidados.count()
 
     def get_convidados(self, obj):
-        convidados = obj.convidados.all().order_by("-vip", "nome", "id")
+        convidados = obj.convidados.all()
+        # Sem o prefetch (já ordenado) de preparar_queryset, ordena no banco
+        if "convidados" not in getattr(obj, "_prefetched_objects_cache", {}):
+            convidados = convidados.order_by(*ORDEM_CONVIDADOS)
         return ConvidadoListaCerimonialSerializer(convidados, many=True).data
-
-    def get_endereco_evento(self, obj):
-        from .evento_cerimonial_serializer import EventoCerimonialSerializer
-
-        return EventoCerimonialSerializer().get_endereco_completo(obj.evento)
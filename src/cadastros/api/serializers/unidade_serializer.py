@@ -1,3 +1,4 @@
+from app.utils.campos_dinamicos import CamposDinamicosMixin
 from rest_framework import serializers
 
 from ...models import Unidade
@@ -42,7 +43,7 @@ class UnidadeSerializer(serializers.ModelSerializer):
         return None
 
 
-class UnidadeListSerializer(serializers.ModelSerializer):
+class UnidadeListSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     morador_nome = serializers.SerializerMethodField(read_only=True)
     identificacao_completa = serializers.CharField(read_only=True)
     moradores = serializers.SerializerMethodField(read_only=True)
@@ -60,6 +61,10 @@ class UnidadeListSerializer(serializers.ModelSerializer):
             "created_on",
             "updated_on",
         ]
+        prefetch_related_por_campo = {
+            "morador_nome": ("moradores",),
+            "moradores": ("moradores",),
+        }
 
     def get_morador_nome(self, obj):
         """Retorna o nome do morador associado à unidade via related_name"""
@@ -157,6 +157,11 @@ urlpatterns = [
     path("avisos/home/", views.aviso_home_view, name="aviso-home"),
     path("avisos/create/", views.aviso_create_view, name="aviso-create"),
     path("avisos/<int:pk>/", views.aviso_detail_view, name="aviso-detail"),
+    path(
+        "avisos/<int:pk>/lido/",
+        views.aviso_marcar_lido_view,
+        name="aviso-marcar-lido",
+    ),
     path(
         "avisos/<int:pk>/update/",
         views.aviso_update_view,
@@ -518,6 +523,11 @@ urlpatterns = [
         views.finalizar_lista_convidados_cerimonial_view,
         name="lista-convidados-cerimonial-finalizar",
     ),
+    path(
+        "listas-convidados-cerimonial/<int:lista_pk>/envios/<int:envio_pk>/",
+        views.envio_lista_convidados_cerimonial_view,
+        name="lista-convidados-cerimonial-envio",
+    ),
     path(
         "listas-convidados-cerimonial/<int:lista_pk>/convidados/<int:convidado_pk>/update/",
         views.atualizar_convidado_cerimonial_view,
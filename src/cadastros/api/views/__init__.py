@@ -5,6 +5,7 @@ from .aviso_views import (
     aviso_grupos_options_view,
     aviso_home_view,
     aviso_list_view,
+    aviso_marcar_lido_view,
     aviso_update_view,
 )
 from .condominio_views import (
@@ -86,6 +87,7 @@ from .lista_convidados_cerimonial_views import (
     convidados_anteriores_cerimonial_view,
     download_qrcode_cerimonial_view,
     enviar_qrcode_cerimonial_view,
+    envio_lista_convidados_cerimonial_view,
     finalizar_lista_convidados_cerimonial_view,
     lista_convidados_cerimonial_detail_view,
     listas_convidados_cerimonial_view,
@@ -210,6 +212,7 @@ __all__ = [
     "aviso_delete_view",
     "aviso_grupos_options_view",
     "aviso_home_view",
+    "aviso_marcar_lido_view",
     "morador_stats_view",
     "sindico_stats_view",
     "portaria_stats_view",
@@ -240,6 +243,7 @@ __all__ = [
     "lista_convidados_cerimonial_detail_view",
     "adicionar_convidado_cerimonial_view",
     "finalizar_lista_convidados_cerimonial_view",
+    "envio_lista_convidados_cerimonial_view",
     "atualizar_convidado_cerimonial_view",
     "remover_convidado_cerimonial_view",
     "confirmar_entrada_cerimonial_view",
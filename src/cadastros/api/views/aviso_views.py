@@ -1,13 +1,15 @@
 from access.api.permissions import IsStaffOrSindico
+from access.grupos import ids_grupos, pertence_a_grupo
 from django.contrib.auth.models import Group
-from django.core.paginator import Paginator
 from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ...models import Aviso
+from ...models import Aviso, Encomenda
+from ...services.aviso_service import feed_do_usuario, marcar_como_lido
+from ...services.paginacao_service import CursorInvalido, paginar
 from ..serializers import (
     AvisoListSerializer,
     AvisoOptionsSerializer,
@@ -15,6 +17,27 @@ from ..serializers import (
 )
 
 
+def _filtrar_avisos_encomenda(avisos, user):
+    """
+    Morador só vê avisos automáticos de encomenda das próprias unidades, e
+    apenas enquanto alguma delas tiver encomenda pendente.
+    """
+    if not pertence_a_grupo(user, "Moradores"):
+        return avisos
+    unidades_ids = list(user.unidades.values_list("id", flat=True))
+    if not unidades_ids:
+        return avisos
+
+    has_pending = Encomenda.objects.filter(
+        unidade_id__in=unidades_ids, retirado_em__isnull=True
+    ).exists()
+    if has_pending:
+        return avisos.filter(
+            ~Q(origem=Aviso.ORIGEM_ENCOMENDA) | Q(unidade_id__in=unidades_ids)
+        )
+    return avisos.exclude(origem=Aviso.ORIGEM_ENCOMENDA)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def aviso_list_view(request):
@@ -31,57 +54,31 @@ def aviso_list_view(request):
         ).prefetch_related("grupos")
 
         # Define se é síndico pelo nome do grupo (aceita variação sem acento)
-        is_sindico = user.groups.filter(
-            Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-        ).exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
 
         # Admin que não é síndico não recebe avisos
         if user.is_staff and not is_sindico:
             avisos = Aviso.objects.none()
         else:
-            # Síndico vê todos os avisos do próprio condomínio (pelo criador)
-            if is_sindico and getattr(user, "condominio", None):
-                avisos = avisos.filter(created_by__condominio=user.condominio)
+            # Síndico vê todos os avisos do próprio condomínio
+            if is_sindico and getattr(user, "condominio_id", None):
+                avisos = avisos.for_condominio(user.condominio_id)
                 # Não mostrar avisos automáticos de encomenda para o síndico
                 # (encomendas geradas pela portaria geram avisos para moradores)
-                avisos = avisos.exclude(titulo__icontains="Nova encomenda")
+                avisos = avisos.exclude(origem=Aviso.ORIGEM_ENCOMENDA)
             else:
                 # Morador/Portaria: apenas avisos ativos (inclui ativos expirados)
                 avisos = avisos.filter(status=Aviso.STATUS_ATIVO)
-                # Demais perfis: filtrar por grupo E por condomínio do criador
-                grupos_ids = list(user.groups.values_list("id", flat=True))
+                # Demais perfis: filtrar por grupo E por condomínio
+                grupos_ids = list(ids_grupos(user))
                 avisos = avisos.filter(
                     Q(grupos__id__in=grupos_ids) | Q(grupo_id__in=grupos_ids)
                 )
-                if getattr(user, "condominio", None):
-                    avisos = avisos.filter(
-                        created_by__condominio=user.condominio
-                    )
+                if getattr(user, "condominio_id", None):
+                    avisos = avisos.for_condominio(user.condominio_id)
 
                 # Se for morador, filtrar avisos de encomenda apenas das suas unidades
-                is_morador = user.groups.filter(name="Moradores").exists()
-                user_unidades = list(user.unidades.all()) if is_morador else []
-                if is_morador and user_unidades:
-                    from ...models import Encomenda
-
-                    has_pending = Encomenda.objects.filter(
-                        unidade__in=user_unidades, retirado_em__isnull=True
-                    ).exists()
-
-                    if has_pending:
-                        unit_q = Q()
-                        for unidade in user_unidades:
-                            unit_q |= Q(
-                                titulo__icontains=unidade.identificacao_completa
-                            )
-                        avisos = avisos.filter(
-                            (Q(titulo__icontains="Nova encomenda") & unit_q)
-                            | ~Q(titulo__icontains="Nova encomenda")
-                        )
-                    else:
-                        avisos = avisos.filter(
-                            ~Q(titulo__icontains="Nova encomenda")
-                        )
+                avisos = _filtrar_avisos_encomenda(avisos, user)
 
         # Filtros
         search = request.GET.get("search", "").strip()
@@ -107,25 +104,17 @@ def aviso_list_view(request):
                 Q(grupo_id=grupo_id) | Q(grupos__id=grupo_id)
             )
 
-        # Ordenação
-        avisos = avisos.order_by("-prioridade", "-data_inicio").distinct()
+        # Ordenação e paginação (por página ou por cursor)
+        avisos = avisos.distinct()
+        itens, paginacao = paginar(
+            request, avisos, 10, ("-prioridade", "-data_inicio")
+        )
 
-        # Paginação
-        page = int(request.GET.get("page", 1))
-        paginator = Paginator(avisos, 10)
-        page_obj = paginator.get_page(page)
+        serializer = AvisoListSerializer(itens, many=True)
+        return Response({"results": serializer.data, **paginacao})
 
-        serializer = AvisoListSerializer(page_obj.object_list, many=True)
-        return Response(
-            {
-                "results": serializer.data,
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-            }
-        )
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"Erro ao listar avisos: {str(e)}"},
@@ -139,62 +128,41 @@ def aviso_home_view(request):
     """Retorna avisos vigentes para exibir na Home do usuário."""
     try:
         user = request.user
-        avisos = Aviso.objects.select_related(
-            "grupo", "created_by"
-        ).prefetch_related("grupos")
         # Define se é síndico pelo nome do grupo (aceita variação sem acento)
-        is_sindico = user.groups.filter(
-            Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-        ).exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
         # Admin que não é síndico não recebe avisos na Home
         if user.is_staff and not is_sindico:
             return Response([])
-        # Demais perfis recebem por grupo e pelo condomínio do criador
-        grupos_ids = list(user.groups.values_list("id", flat=True))
-        avisos = avisos.filter(
-            Q(grupos__id__in=grupos_ids) | Q(grupo_id__in=grupos_ids)
+        # Demais perfis: caixa de entrada (grupos, condomínio e unidades já
+        # resolvidos na entrega do aviso)
+        entregas = list(feed_do_usuario(user))
+        dados = AvisoListSerializer(
+            [entrega.aviso for entrega in entregas], many=True
+        ).data
+        for item, entrega in zip(dados, entregas):
+            item["lido"] = entrega.lido
+        return Response(dados)
+    except Exception as e:
+        return Response(
+            {"error": f"Erro ao buscar avisos: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
-        if getattr(user, "condominio", None):
-            avisos = avisos.filter(created_by__condominio=user.condominio)
 
-        # Se for morador, filtrar avisos de encomenda apenas das suas unidades
-        is_morador = user.groups.filter(name="Moradores").exists()
-        user_unidades = list(user.unidades.all()) if is_morador else []
-        if is_morador and user_unidades:
-            from ...models import Encomenda
 
-            has_pending = Encomenda.objects.filter(
-                unidade__in=user_unidades, retirado_em__isnull=True
-            ).exists()
-
-            if has_pending:
-                unit_q = Q()
-                for unidade in user_unidades:
-                    unit_q |= Q(
-                        titulo__icontains=unidade.identificacao_completa
-                    )
-                avisos = avisos.filter(
-                    (Q(titulo__icontains="Nova encomenda") & unit_q)
-                    | ~Q(titulo__icontains="Nova encomenda")
-                )
-            else:
-                avisos = avisos.filter(~Q(titulo__icontains="Nova encomenda"))
-
-        from django.utils import timezone
-
-        now = timezone.now()
-        avisos = (
-            avisos.filter(status=Aviso.STATUS_ATIVO, data_inicio__lte=now)
-            .filter(Q(data_fim__gte=now) | Q(data_fim__isnull=True))
-            .order_by("-prioridade", "-data_inicio")
-            .distinct()[:10]
-        )
-
-        serializer = AvisoListSerializer(avisos, many=True)
-        return Response(serializer.data)
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def aviso_marcar_lido_view(request, pk):
+    """Marca um aviso da caixa de entrada do usuário como lido."""
+    try:
+        if not marcar_como_lido(request.user, pk):
+            return Response(
+                {"error": "Aviso não encontrado."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response({"id": pk, "lido": True})
     except Exception as e:
         return Response(
-            {"error": f"Erro ao buscar avisos: {str(e)}"},
+            {"error": f"Erro ao marcar aviso como lido: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
@@ -231,17 +199,10 @@ def aviso_detail_view(request, pk):
         user = request.user
         # Garantir acesso: staff sempre pode; síndico só do seu condomínio; demais por grupo e condomínio
         if not user.is_staff:
-            is_sindico = user.groups.filter(
-                Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-            ).exists()
+            is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
             same_condo = True
-            if getattr(user, "condominio", None):
-                same_condo = (
-                    getattr(
-                        getattr(aviso, "created_by", None), "condominio", None
-                    )
-                    == user.condominio
-                )
+            if getattr(user, "condominio_id", None):
+                same_condo = aviso.condominio_id == user.condominio_id
             if is_sindico:
                 if not same_condo:
                     return Response(
@@ -257,7 +218,7 @@ def aviso_detail_view(request, pk):
                 if not target_group_ids and aviso.grupo_id:
                     target_group_ids = [aviso.grupo_id]
                 if (
-                    not user.groups.filter(id__in=target_group_ids).exists()
+                    ids_grupos(user).isdisjoint(target_group_ids)
                     or not same_condo
                 ):
                     return Response(
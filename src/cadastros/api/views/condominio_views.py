@@ -1,39 +1,30 @@
+from access.grupos import pertence_a_grupo
 from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Condominio
+from ...services.arquivo_service import resposta_arquivo, salvar_upload
 from ..serializers import CondominioListSerializer, CondominioSerializer
+from ..serializers.condominio_serializer import prefetch_sindicos
 
 
 def _salvar_logo_db(condominio, request):
-    """Salva o arquivo 'logo' de request.FILES como BLOB no modelo."""
+    """Salva o arquivo 'logo' de request.FILES no armazenamento de arquivos."""
     arquivo = request.FILES.get("logo")
     if arquivo:
-        condominio.logo_db_data = arquivo.read()
-        condominio.logo_db_content_type = arquivo.content_type
-        condominio.logo_db_filename = arquivo.name
-        condominio.save(
-            update_fields=[
-                "logo_db_data",
-                "logo_db_content_type",
-                "logo_db_filename",
-            ]
-        )
+        salvar_upload(condominio, "logo", arquivo)
 
 
 def _can_manage_condominio(user, condominio_id):
     """Admin/staff gerenciam qualquer condomínio; síndico somente o próprio."""
-    if user.is_staff or user.groups.filter(name="admin").exists():
+    if user.is_staff or pertence_a_grupo(user, "admin"):
         return True
 
-    is_sindico = user.groups.filter(
-        Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-    ).exists()
+    is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
     return is_sindico and user.condominio_id == condominio_id
 
 
@@ -46,7 +37,7 @@ def condominio_list_view(request):
     try:
         # Busca
         search = request.GET.get("search", "")
-        condominios = Condominio.objects.all()
+        condominios = Condominio.objects.prefetch_related(prefetch_sindicos())
 
         if search:
             condominios = condominios.filter(
@@ -97,8 +88,7 @@ def condominio_create_view(request):
     try:
         # Verificar permissão
         if not (
-            request.user.is_staff
-            or request.user.groups.filter(name="admin").exists()
+            request.user.is_staff or pertence_a_grupo(request.user, "admin")
         ):
             return Response(
                 {"error": "Você não tem permissão para criar condomínios."},
@@ -215,8 +205,7 @@ def condominio_delete_view(request, pk):
     try:
         # Verificar permissão
         if not (
-            request.user.is_staff
-            or request.user.groups.filter(name="admin").exists()
+            request.user.is_staff or pertence_a_grupo(request.user, "admin")
         ):
             return Response(
                 {"error": "Você não tem permissão para excluir condomínios."},
@@ -276,18 +265,22 @@ def condominio_options_view(request):
 def condominio_logo_db_view(request, pk):
     """Serve a logo armazenada no banco como bytes (BLOB)."""
     try:
-        condominio = Condominio.objects.get(pk=pk)
-        if not condominio.logo_db_data:
+        condominio = Condominio.objects.only(
+            "id", "logo_arquivo", "logo_db_content_type", "updated_at"
+        ).get(pk=pk)
+        response = resposta_arquivo(
+            request,
+            condominio.logo_arquivo_id,
+            condominio.logo_db_content_type,
+            last_modified=condominio.updated_at,
+        )
+        if response is None:
             return Response(
                 {"error": "Logo não encontrada no DB."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        return HttpResponse(
-            bytes(condominio.logo_db_data),
-            content_type=condominio.logo_db_content_type
-            or "application/octet-stream",
-        )
+        return response
 
     except Condominio.DoesNotExist:
         return Response(
@@ -307,7 +300,7 @@ def condominio_logo_db_view(request, pk):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def condominio_upload_logo_db_view(request, pk):
-    """Recebe upload multipart/form-data e salva bytes no modelo CondominioLogo."""
+    """Recebe upload multipart/form-data e salva a logo do condomínio no DB."""
     try:
         if not _can_manage_condominio(request.user, pk):
             return Response(
@@ -325,12 +318,7 @@ def condominio_upload_logo_db_view(request, pk):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Ler conteúdo em bytes e salvar nos campos do condominio
-        conteúdo = arquivo.read()
-        condominio.logo_db_data = conteúdo
-        condominio.logo_db_content_type = arquivo.content_type
-        condominio.logo_db_filename = arquivo.name
-        condominio.save()
+        salvar_upload(condominio, "logo", arquivo)
 
         return Response({"message": "Logo salva no DB."})
 
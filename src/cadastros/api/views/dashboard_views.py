@@ -1,8 +1,11 @@
 import logging
 from datetime import timedelta
 
+from access.grupos import ids_grupos, pertence_a_grupo
 from access.models import User
-from django.db.models import Q
+from django.core.paginator import Paginator
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -16,9 +19,14 @@ from ...models import (
     EspacoReserva,
     Evento,
     Ocorrencia,
-    Unidade,
     Visitante,
 )
+from ...services.dashboard_service import (
+    calcular_metricas,
+    chave_dashboard,
+    guardar_dashboard,
+    ler_dashboard,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,17 +46,27 @@ def morador_stats_view(request):
         now = timezone.now()
 
         # Verificar se é morador
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_morador = pertence_a_grupo(user, "Moradores")
         if not is_morador:
             return Response(
                 {"error": "Acesso permitido apenas para moradores."},
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        chave = chave_dashboard(
+            "morador",
+            getattr(user, "condominio_id", None),
+            usuario_id=user.pk,
+        )
+        dados = ler_dashboard(chave)
+        if dados is not None:
+            return Response(dados)
+        completo = True
+
         # 1. ENCOMENDAS PENDENTES (não retiradas)
         try:
             encomendas_pendentes = Encomenda.objects.filter(
-                unidade__morador=user, retirado_em__isnull=True
+                unidade__moradores=user, retirado_em__isnull=True
             ).order_by("created_on")
 
             # Calcular a encomenda mais antiga e definir cor do alerta
@@ -70,6 +88,7 @@ def morador_stats_view(request):
                     cor_alerta = "#f59e0b"  # Amarelo (1 dia)
                 # else: mantém verde (menos de 1 dia)
         except Exception:
+            completo = False
             logger.exception(
                 "Erro ao calcular encomendas pendentes do morador"
             )
@@ -81,11 +100,12 @@ def morador_stats_view(request):
         try:
             visitantes_count = Visitante.objects.filter(morador=user).count()
         except Exception:
+            completo = False
             logger.exception("Erro ao calcular visitantes do morador")
             visitantes_count = 0
 
         # 3. AVISOS ATIVOS DO CONDOMÍNIO (filtrado por condomínio do morador)
-        grupos_ids = list(user.groups.values_list("id", flat=True))
+        grupos_ids = list(ids_grupos(user))
         try:
             avisos_query = Aviso.objects.filter(
                 grupo_id__in=grupos_ids,
@@ -94,14 +114,12 @@ def morador_stats_view(request):
             ).filter(Q(data_fim__gte=now) | Q(data_fim__isnull=True))
 
             # Filtrar por condomínio se o morador tiver condomínio
-            if hasattr(user, "condominio") and user.condominio:
-                avisos_query = avisos_query.filter(
-                    created_by__isnull=False,
-                    created_by__condominio=user.condominio,
-                )
+            if getattr(user, "condominio_id", None):
+                avisos_query = avisos_query.for_condominio(user.condominio_id)
 
             avisos_count = avisos_query.count()
         except Exception:
+            completo = False
             logger.exception("Erro ao calcular avisos do morador")
             avisos_count = 0
 
@@ -113,22 +131,24 @@ def morador_stats_view(request):
                 status__in=["confirmada", "pendente"],
             ).count()
         except Exception:
+            completo = False
             logger.exception("Erro ao calcular reservas futuras do morador")
             reservas_count = 0
 
         # Montar resposta
-        return Response(
-            {
-                "encomendas": {
-                    "total": encomendas_count,
-                    "dias_mais_antiga": dias_mais_antiga,
-                    "cor_alerta": cor_alerta,
-                },
-                "visitantes": {"total": visitantes_count},
-                "avisos": {"total": avisos_count},
-                "reservas": {"total": reservas_count},
-            }
-        )
+        dados = {
+            "encomendas": {
+                "total": encomendas_count,
+                "dias_mais_antiga": dias_mais_antiga,
+                "cor_alerta": cor_alerta,
+            },
+            "visitantes": {"total": visitantes_count},
+            "avisos": {"total": avisos_count},
+            "reservas": {"total": reservas_count},
+        }
+        if completo:
+            guardar_dashboard(chave, dados)
+        return Response(dados)
 
     except Exception as e:
         return Response(
@@ -154,9 +174,7 @@ def sindico_stats_view(request):
         user = request.user
 
         # Verificar se é síndico
-        is_sindico = user.groups.filter(
-            Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-        ).exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
 
         if not is_sindico:
             return Response(
@@ -172,182 +190,175 @@ def sindico_stats_view(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 1. MORADORES
-        try:
-            moradores_total = (
-                User.objects.filter(
-                    condominio_id=condominio_id, groups__name="Moradores"
-                )
-                .distinct()
-                .count()
-            )
+        chave = chave_dashboard("sindico", condominio_id)
+        dados = ler_dashboard(chave)
+        if dados is not None:
+            return Response(dados)
 
-            moradores_ativos = (
-                User.objects.filter(
-                    condominio_id=condominio_id,
-                    groups__name="Moradores",
-                    is_active=True,
-                )
-                .distinct()
-                .count()
-            )
-
-            moradores_pendentes = (
-                User.objects.filter(
-                    condominio_id=condominio_id,
-                    groups__name="Moradores",
-                    is_active=False,
-                )
-                .distinct()
-                .count()
-            )
-
-            percentual_ativos = (
-                round((moradores_ativos / moradores_total) * 100)
-                if moradores_total > 0
-                else 0
-            )
-        except Exception:
-            logger.exception("Erro ao calcular moradores do condomínio")
-            moradores_total = 0
-            moradores_ativos = 0
-            moradores_pendentes = 0
-            percentual_ativos = 0
-
-        # 2. FUNCIONÁRIOS (Portaria)
-        try:
-            funcionarios_total = (
-                User.objects.filter(
-                    condominio_id=condominio_id, groups__name="Portaria"
-                )
-                .distinct()
-                .count()
-            )
-        except Exception:
-            logger.exception("Erro ao calcular funcionários do condomínio")
-            funcionarios_total = 0
-
-        # 3. VISITANTES DO MÊS ATUAL
         hoje = timezone.now()
+        hoje_date = hoje.date()
         primeiro_dia_mes = hoje.replace(day=1)
+        proximos_7_dias = hoje_date + timedelta(days=7)
 
+        # Uma consulta de agregação por tabela, todas numa só ida ao banco
         try:
-            visitantes_mes = Visitante.objects.filter(
-                morador__condominio_id=condominio_id,
-                created_on__gte=primeiro_dia_mes,
-            ).count()
-        except Exception:
-            logger.exception("Erro ao calcular visitantes do mês")
-            visitantes_mes = 0
-
-        # 4. ENCOMENDAS PENDENTES (não retiradas) com cor por idade da mais antiga
-        try:
-            encomendas_qs = Encomenda.objects.filter(
-                created_by__condominio_id=condominio_id,
-                retirado_em__isnull=True,
-            ).order_by("created_on")
-
-            encomendas_pendentes_total = encomendas_qs.count()
-            dias_mais_antiga = 0
-            cor_alerta_encomenda = "#2abb98"  # verde padrão (< 1 dia)
-
-            if encomendas_pendentes_total > 0:
-                encomenda_mais_antiga = encomendas_qs.first()
-                if encomenda_mais_antiga and encomenda_mais_antiga.created_on:
-                    dias_mais_antiga = (
-                        timezone.now() - encomenda_mais_antiga.created_on
-                    ).days
-
-                # Regras de cor: > 3 dias = vermelho, >= 2 dias = amarelo, < 1 dia = verde
-                if dias_mais_antiga > 3:
-                    cor_alerta_encomenda = "#ef4444"
-                elif dias_mais_antiga >= 2:
-                    cor_alerta_encomenda = "#f59e0b"
-                else:
-                    cor_alerta_encomenda = "#2abb98"
-        except Exception:
-            logger.exception("Erro ao calcular encomendas pendentes")
-            encomendas_pendentes_total = 0
-            dias_mais_antiga = 0
-            cor_alerta_encomenda = "#2abb98"
-
-        # 5. AVISOS ATIVOS (vigentes)
-        agora = timezone.now()
-        try:
-            avisos_ativos = (
-                Aviso.objects.filter(
-                    created_by__condominio_id=condominio_id,
-                    status=Aviso.STATUS_ATIVO,
-                    data_inicio__lte=agora,
-                )
-                .filter(Q(data_fim__gte=agora) | Q(data_fim__isnull=True))
-                .count()
+            metricas = calcular_metricas(
+                {
+                    # 1. MORADORES e 2. FUNCIONÁRIOS (Portaria)
+                    "usuarios": (
+                        User.objects.filter(
+                            condominio_id=condominio_id,
+                            groups__name__in=["Moradores", "Portaria"],
+                        ),
+                        {
+                            "moradores": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(groups__name="Moradores"),
+                            ),
+                            "moradores_ativos": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(
+                                    groups__name="Moradores", is_active=True
+                                ),
+                            ),
+                            "moradores_pendentes": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(
+                                    groups__name="Moradores", is_active=False
+                                ),
+                            ),
+                            "funcionarios": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(groups__name="Portaria"),
+                            ),
+                        },
+                    ),
+                    # 3. VISITANTES DO MÊS ATUAL
+                    "visitantes": (
+                        Visitante.objects.filter(
+                            condominio_id=condominio_id,
+                            created_on__gte=primeiro_dia_mes,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 4. ENCOMENDAS PENDENTES (não retiradas)
+                    "encomendas": (
+                        Encomenda.objects.filter(
+                            condominio_id=condominio_id,
+                            retirado_em__isnull=True,
+                        ),
+                        {
+                            "total": Count("id"),
+                            "mais_antiga": Min("created_on"),
+                        },
+                    ),
+                    # 5. AVISOS ATIVOS (vigentes)
+                    "avisos": (
+                        Aviso.objects.filter(
+                            condominio_id=condominio_id,
+                            status=Aviso.STATUS_ATIVO,
+                            data_inicio__lte=hoje,
+                        ).filter(
+                            Q(data_fim__gte=hoje) | Q(data_fim__isnull=True)
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 6. RESERVAS CONFIRMADAS NOS PRÓXIMOS 7 DIAS
+                    "reservas": (
+                        EspacoReserva.objects.filter(
+                            condominio_id=condominio_id,
+                            data_reserva__gte=hoje_date,
+                            data_reserva__lte=proximos_7_dias,
+                            status="confirmada",
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 6b. EVENTOS PRÓXIMOS (próximos 7 dias)
+                    "eventos": (
+                        Evento.objects.filter(
+                            condominio_id=condominio_id,
+                            datetime_inicio__date__gte=hoje_date,
+                            datetime_inicio__date__lte=proximos_7_dias,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 8. OCORRÊNCIAS PENDENTES (abertas)
+                    "ocorrencias": (
+                        Ocorrencia.objects.filter(
+                            status=Ocorrencia.STATUS_ABERTA,
+                            condominio_id=condominio_id,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                }
             )
         except Exception:
-            logger.exception("Erro ao calcular avisos ativos do condomínio")
-            avisos_ativos = 0
+            logger.exception("Erro ao calcular estatísticas do síndico")
+            metricas = {}
+
+        usuarios = metricas.get("usuarios", {})
+        moradores_total = usuarios.get("moradores") or 0
+        moradores_ativos = usuarios.get("moradores_ativos") or 0
+        moradores_pendentes = usuarios.get("moradores_pendentes") or 0
+        funcionarios_total = usuarios.get("funcionarios") or 0
+        percentual_ativos = (
+            round((moradores_ativos / moradores_total) * 100)
+            if moradores_total > 0
+            else 0
+        )
 
-        # 6. RESERVAS CONFIRMADAS NOS PRÓXIMOS 7 DIAS
-        hoje_date = timezone.now().date()
-        proximos_7_dias = hoje_date + timedelta(days=7)
-        try:
-            reservas_proximas = EspacoReserva.objects.filter(
-                morador__condominio_id=condominio_id,
-                data_reserva__gte=hoje_date,
-                data_reserva__lte=proximos_7_dias,
-                status="confirmada",
-            ).count()
-        except Exception:
-            logger.exception("Erro ao calcular reservas próximas")
-            reservas_proximas = 0
+        visitantes_mes = metricas.get("visitantes", {}).get("total") or 0
+
+        # Cor por idade da encomenda mais antiga:
+        # > 3 dias = vermelho, >= 2 dias = amarelo, < 2 dias = verde
+        encomendas = metricas.get("encomendas", {})
+        encomendas_pendentes_total = encomendas.get("total") or 0
+        mais_antiga = encomendas.get("mais_antiga")
+        dias_mais_antiga = (hoje - mais_antiga).days if mais_antiga else 0
+        if dias_mais_antiga > 3:
+            cor_alerta_encomenda = "#ef4444"
+        elif dias_mais_antiga >= 2:
+            cor_alerta_encomenda = "#f59e0b"
+        else:
+            cor_alerta_encomenda = "#2abb98"
 
-        # 6b. EVENTOS PRÓXIMOS (próximos 7 dias) do condomínio do síndico
-        try:
-            eventos_proximos = Evento.objects.filter(
-                created_by__isnull=False,
-                created_by__condominio_id=condominio_id,
-                datetime_inicio__date__gte=hoje_date,
-                datetime_inicio__date__lte=proximos_7_dias,
-            ).count()
-        except Exception:
-            logger.exception("Erro ao calcular eventos próximos")
-            eventos_proximos = 0
+        avisos_ativos = metricas.get("avisos", {}).get("total") or 0
+        reservas_proximas = metricas.get("reservas", {}).get("total") or 0
+        eventos_proximos = metricas.get("eventos", {}).get("total") or 0
+        ocorrencias_pendentes = (
+            metricas.get("ocorrencias", {}).get("total") or 0
+        )
 
         # 7. PENDÊNCIAS (por ora, sempre 0 conforme solicitado)
         pendencias = 0
 
-        # 8. OCORRÊNCIAS PENDENTES (abertas)
-        try:
-            ocorrencias_pendentes = Ocorrencia.objects.filter(
-                status=Ocorrencia.STATUS_ABERTA,
-                criado_por__condominio_id=condominio_id,
-            ).count()
-        except Exception:
-            logger.exception("Erro ao calcular ocorrências pendentes")
-            ocorrencias_pendentes = 0
-
-        return Response(
-            {
-                "moradores": {
-                    "total": moradores_total,
-                    "ativos": moradores_ativos,
-                    "pendentes": moradores_pendentes,
-                    "percentual_ativos": percentual_ativos,
-                },
-                "funcionarios": {"total": funcionarios_total},
-                "visitantes_mes": {"total": visitantes_mes},
-                "encomendas_pendentes": {
-                    "total": encomendas_pendentes_total,
-                    "dias_mais_antiga": dias_mais_antiga,
-                    "cor_alerta": cor_alerta_encomenda,
-                },
-                "avisos_ativos": {"total": avisos_ativos},
-                "reservas_proximas": {"total": reservas_proximas},
-                "eventos_proximos": {"total": eventos_proximos},
-                "pendencias": {"total": pendencias},
-                "ocorrencias_pendentes": {"total": ocorrencias_pendentes},
-            }
-        )
+        dados = {
+            "moradores": {
+                "total": moradores_total,
+                "ativos": moradores_ativos,
+                "pendentes": moradores_pendentes,
+                "percentual_ativos": percentual_ativos,
+            },
+            "funcionarios": {"total": funcionarios_total},
+            "visitantes_mes": {"total": visitantes_mes},
+            "encomendas_pendentes": {
+                "total": encomendas_pendentes_total,
+                "dias_mais_antiga": dias_mais_antiga,
+                "cor_alerta": cor_alerta_encomenda,
+            },
+            "avisos_ativos": {"total": avisos_ativos},
+            "reservas_proximas": {"total": reservas_proximas},
+            "eventos_proximos": {"total": eventos_proximos},
+            "pendencias": {"total": pendencias},
+            "ocorrencias_pendentes": {"total": ocorrencias_pendentes},
+        }
+        if metricas:
+            guardar_dashboard(chave, dados)
+        return Response(dados)
 
     except Exception as e:
         return Response(
@@ -368,7 +379,7 @@ def portaria_stats_view(request):
     """
     try:
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if not is_portaria and not user.is_staff:
             return Response(
@@ -383,62 +394,70 @@ def portaria_stats_view(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        hoje = timezone.now().date()
+        chave = chave_dashboard("portaria", condominio_id)
+        dados = ler_dashboard(chave)
+        if dados is not None:
+            return Response(dados)
 
-        # 1. VISITANTES DENTRO DO CONDOMÍNIO AGORA
-        try:
-            visitantes_dentro = Visitante.objects.filter(
-                morador__condominio_id=condominio_id,
-                data_saida__isnull=True,
-                data_entrada__date=hoje,
-            ).count()
-        except Exception:
-            logger.exception(
-                "Erro ao calcular visitantes dentro do condomínio"
-            )
-            visitantes_dentro = 0
+        hoje = timezone.now().date()
 
-        # 2. ENCOMENDAS PENDENTES (não retiradas)
         try:
-            encomendas_pendentes = Encomenda.objects.filter(
-                created_by__condominio_id=condominio_id,
-                retirado_em__isnull=True,
-            ).count()
-        except Exception:
-            logger.exception(
-                "Erro ao calcular encomendas pendentes da portaria"
+            metricas = calcular_metricas(
+                {
+                    # 1. VISITANTES DENTRO DO CONDOMÍNIO AGORA
+                    "visitantes": (
+                        Visitante.objects.filter(
+                            condominio_id=condominio_id,
+                            data_saida__isnull=True,
+                            data_entrada__date=hoje,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 2. ENCOMENDAS PENDENTES (não retiradas)
+                    "encomendas": (
+                        Encomenda.objects.filter(
+                            condominio_id=condominio_id,
+                            retirado_em__isnull=True,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 3. RESERVAS CONFIRMADAS HOJE
+                    "reservas": (
+                        EspacoReserva.objects.filter(
+                            condominio_id=condominio_id,
+                            data_reserva=hoje,
+                            status="confirmada",
+                        ),
+                        {"total": Count("id")},
+                    ),
+                    # 4. EVENTOS HOJE
+                    "eventos": (
+                        Evento.objects.filter(
+                            condominio_id=condominio_id,
+                            datetime_inicio__date=hoje,
+                        ),
+                        {"total": Count("id")},
+                    ),
+                }
             )
-            encomendas_pendentes = 0
-
-        # 3. RESERVAS CONFIRMADAS HOJE
-        try:
-            reservas_hoje = EspacoReserva.objects.filter(
-                morador__condominio_id=condominio_id,
-                data_reserva=hoje,
-                status="confirmada",
-            ).count()
-        except Exception:
-            logger.exception("Erro ao calcular reservas de hoje")
-            reservas_hoje = 0
-
-        # 4. EVENTOS HOJE
-        try:
-            eventos_hoje = Evento.objects.filter(
-                created_by__condominio_id=condominio_id,
-                datetime_inicio__date=hoje,
-            ).count()
         except Exception:
-            logger.exception("Erro ao calcular eventos de hoje")
-            eventos_hoje = 0
-
-        return Response(
-            {
-                "visitantes_dentro": {"total": visitantes_dentro},
-                "encomendas_pendentes": {"total": encomendas_pendentes},
-                "reservas_hoje": {"total": reservas_hoje},
-                "eventos_hoje": {"total": eventos_hoje},
-            }
-        )
+            logger.exception("Erro ao calcular estatísticas da portaria")
+            metricas = {}
+
+        visitantes_dentro = metricas.get("visitantes", {}).get("total") or 0
+        encomendas_pendentes = metricas.get("encomendas", {}).get("total") or 0
+        reservas_hoje = metricas.get("reservas", {}).get("total") or 0
+        eventos_hoje = metricas.get("eventos", {}).get("total") or 0
+
+        dados = {
+            "visitantes_dentro": {"total": visitantes_dentro},
+            "encomendas_pendentes": {"total": encomendas_pendentes},
+            "reservas_hoje": {"total": reservas_hoje},
+            "eventos_hoje": {"total": eventos_hoje},
+        }
+        if metricas:
+            guardar_dashboard(chave, dados)
+        return Response(dados)
 
     except Exception as e:
         return Response(
@@ -455,7 +474,7 @@ def admin_stats_view(request):
     - Total de condomínios ativos
     - Total de usuários ativos e pendentes
     - Totais por grupo (síndicos, moradores, porteiros)
-    - Detalhes por condomínio (moradores e unidades)
+    - Detalhes por condomínio (moradores e unidades), paginados (?page=)
     """
     try:
         user = request.user
@@ -466,79 +485,119 @@ def admin_stats_view(request):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # 1. TOTAL DE CONDOMÍNIOS ATIVOS
         try:
-            total_condominios = Condominio.objects.filter(
-                is_ativo=True
-            ).count()
-        except Exception:
-            logger.exception("Erro ao contar condomínios")
-            total_condominios = 0
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
 
-        # 2. USUÁRIOS ATIVOS E PENDENTES
-        try:
-            total_usuarios = User.objects.filter(is_active=True).count()
-            usuarios_pendentes = User.objects.filter(is_active=False).count()
-        except Exception:
-            logger.exception("Erro ao contar usuários")
-            total_usuarios = 0
-            usuarios_pendentes = 0
+        chave = chave_dashboard(f"admin:{page}")
+        dados = ler_dashboard(chave)
+        if dados is not None:
+            return Response(dados)
+        completo = True
 
-        # 3. TOTAIS POR GRUPO
+        # 1. CONDOMÍNIOS ATIVOS, 2. USUÁRIOS e 3. TOTAIS POR GRUPO
         try:
-            total_sindicos = User.objects.filter(
-                groups__name="Síndicos"
-            ).count()
-            total_moradores = User.objects.filter(
-                groups__name="Moradores"
-            ).count()
-            total_porteiros = User.objects.filter(
-                groups__name="Portaria"
-            ).count()
+            metricas = calcular_metricas(
+                {
+                    "condominios": (
+                        Condominio.objects.filter(is_ativo=True),
+                        {"total": Count("id")},
+                    ),
+                    "usuarios": (
+                        User.objects.all(),
+                        {
+                            "ativos": Count(
+                                "id", distinct=True, filter=Q(is_active=True)
+                            ),
+                            "pendentes": Count(
+                                "id", distinct=True, filter=Q(is_active=False)
+                            ),
+                            "sindicos": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(groups__name="Síndicos"),
+                            ),
+                            "moradores": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(groups__name="Moradores"),
+                            ),
+                            "porteiros": Count(
+                                "id",
+                                distinct=True,
+                                filter=Q(groups__name="Portaria"),
+                            ),
+                        },
+                    ),
+                }
+            )
         except Exception:
-            logger.exception("Erro ao contar usuários por grupo")
-            total_sindicos = 0
-            total_moradores = 0
-            total_porteiros = 0
+            completo = False
+            logger.exception("Erro ao calcular totais do dashboard admin")
+            metricas = {}
 
-        # 4. DETALHES POR CONDOMÍNIO
+        usuarios = metricas.get("usuarios", {})
+        total_condominios = metricas.get("condominios", {}).get("total") or 0
+
+        # 4. DETALHES POR CONDOMÍNIO (contagens em subconsultas agrupadas)
         try:
-            condominios = Condominio.objects.filter(is_ativo=True).order_by(
-                "nome"
+            moradores = (
+                User.objects.filter(
+                    condominio=OuterRef("pk"), groups__name="Moradores"
+                )
+                .order_by()
+                .values("condominio")
+                .annotate(total=Count("id", distinct=True))
+                .values("total")
             )
-            condominios_detalhes = []
-            for c in condominios:
-                moradores_c = User.objects.filter(
-                    condominio=c, groups__name="Moradores"
-                ).count()
-                unidades_c = (
-                    Unidade.objects.filter(morador__condominio=c)
-                    .distinct()
-                    .count()
+            unidades = (
+                User.unidades.through.objects.filter(
+                    user__condominio=OuterRef("pk")
                 )
-                condominios_detalhes.append(
-                    {
-                        "id": c.id,
-                        "nome": c.nome,
-                        "total_moradores": moradores_c,
-                        "total_unidades": unidades_c,
-                    }
+                .order_by()
+                .values("user__condominio")
+                .annotate(total=Count("unidade", distinct=True))
+                .values("total")
+            )
+            condominios = (
+                Condominio.objects.filter(is_ativo=True)
+                .annotate(
+                    total_moradores=Coalesce(Subquery(moradores), 0),
+                    total_unidades=Coalesce(Subquery(unidades), 0),
                 )
+                .order_by("nome")
+                .values("id", "nome", "total_moradores", "total_unidades")
+            )
+            paginator = Paginator(condominios, 50)
+            page_obj = paginator.get_page(page)
+            condominios_detalhes = list(page_obj.object_list)
+            paginacao = {
+                "count": paginator.count,
+                "num_pages": paginator.num_pages,
+                "current_page": page_obj.number,
+                "has_next": page_obj.has_next(),
+                "has_previous": page_obj.has_previous(),
+            }
         except Exception:
+            completo = False
             logger.exception("Erro ao montar detalhes dos condomínios")
             condominios_detalhes = []
-
-        return Response(
-            {
-                "total_condominios": total_condominios,
-                "total_usuarios": total_usuarios,
-                "usuarios_pendentes": usuarios_pendentes,
-                "total_sindicos": total_sindicos,
-                "total_moradores": total_moradores,
-                "total_porteiros": total_porteiros,
-                "condominios_detalhes": condominios_detalhes,
-            }
-        )
+            paginacao = {}
+
+        dados = {
+            "total_condominios": total_condominios,
+            "total_usuarios": usuarios.get("ativos") or 0,
+            "usuarios_pendentes": usuarios.get("pendentes") or 0,
+            "total_sindicos": usuarios.get("sindicos") or 0,
+            "total_moradores": usuarios.get("moradores") or 0,
+            "total_porteiros": usuarios.get("porteiros") or 0,
+            "condominios_detalhes": condominios_detalhes,
+            "condominios_paginacao": paginacao,
+        }
+        if completo:
+            guardar_dashboard(chave, dados)
+        return Response(dados)
 
     except Exception as e:
         return Response(
@@ -1,5 +1,5 @@
+from access.grupos import pertence_a_grupo
 from django.contrib.auth.models import Group
-from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status
@@ -8,6 +8,11 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Aviso, Encomenda
+from ...services.encomenda_badge_service import (
+    badge_das_unidades,
+    contar_por_idade,
+)
+from ...services.paginacao_service import CursorInvalido, paginar
 from ..serializers import EncomendaListSerializer, EncomendaSerializer
 
 
@@ -44,12 +49,7 @@ def criar_aviso_encomenda(encomenda, criador):
             days=30
         )  # Aviso válido por 30 dias
         # Evitar criar avisos duplicados caso a função seja chamada duas vezes
-        existing = Aviso.objects.filter(
-            Q(grupo=grupo_moradores) | Q(grupos=grupo_moradores),
-            titulo=titulo,
-            created_by=criador,
-            status=Aviso.STATUS_ATIVO,
-        ).exists()
+        existing = Aviso.objects.filter(encomenda=encomenda).exists()
 
         if not existing:
             aviso = Aviso.objects.create(
@@ -61,6 +61,10 @@ def criar_aviso_encomenda(encomenda, criador):
                 data_inicio=now,
                 data_fim=data_fim,
                 created_by=criador,
+                origem=Aviso.ORIGEM_ENCOMENDA,
+                encomenda=encomenda,
+                unidade_id=encomenda.unidade_id,
+                condominio_id=encomenda.condominio_id,
             )
             aviso.grupos.add(grupo_moradores)
     except Exception as e:
@@ -95,9 +99,9 @@ def encomenda_list_view(request):
         )
 
         # Controle de acesso por grupo
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         # Filtrar por condomínio do usuário para Portaria e Síndicos (exceto staff)
         if (
@@ -105,9 +109,7 @@ def encomenda_list_view(request):
             and not user.is_staff
             and getattr(user, "condominio_id", None)
         ):
-            encomendas = encomendas.filter(
-                created_by__condominio_id=user.condominio_id
-            )
+            encomendas = encomendas.for_condominio(user.condominio_id)
         elif is_morador and not (user.is_staff or is_portaria or is_sindico):
             # Moradores veem apenas encomendas das suas unidades
             unidades_ids = list(user.unidades.values_list("id", flat=True))
@@ -129,27 +131,14 @@ def encomenda_list_view(request):
                 | Q(retirado_por__icontains=search)
             )
 
-        # Ordenação
-        encomendas = encomendas.order_by("-created_on")
-
-        # Paginação
-        page = int(request.GET.get("page", 1))
-        paginator = Paginator(encomendas, 10)
-        page_obj = paginator.get_page(page)
-
-        serializer = EncomendaListSerializer(page_obj.object_list, many=True)
+        # Ordenação e paginação (por página ou por cursor)
+        itens, paginacao = paginar(request, encomendas, 10, ("-created_on",))
 
-        return Response(
-            {
-                "results": serializer.data,
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-            }
-        )
+        serializer = EncomendaListSerializer(itens, many=True)
+        return Response({"results": serializer.data, **paginacao})
 
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"Erro ao listar encomendas: {str(e)}"},
@@ -167,7 +156,7 @@ def encomenda_create_view(request):
     """
     try:
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if not (user.is_staff or is_portaria):
             return Response(
@@ -205,8 +194,8 @@ def encomenda_detail_view(request, pk):
     try:
         encomenda = Encomenda.objects.select_related("unidade").get(pk=pk)
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         # Moradores só podem ver encomendas das suas unidades
         if is_morador and not (user.is_staff or is_portaria):
@@ -243,9 +232,9 @@ def encomenda_update_view(request, pk):
     """
     try:
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         encomenda = Encomenda.objects.get(pk=pk)
         was_contestada_aberta = bool(
@@ -488,64 +477,31 @@ def encomenda_badge_view(request):
       - red: 4+ dias
 
     Para moradores, filtra pela unidade vinculada ao usuário.
-    Para staff/portaria, é possível filtrar por ?unidade_id=<id> (opcional).
+    Para portaria/síndico, restringe ao condomínio do usuário; staff vê
+    todos. Ambos podem filtrar por ?unidade_id=<id> (opcional).
     """
     try:
         user = request.user
-        now = timezone.now()
 
-        qs = Encomenda.objects.filter(retirado_em__isnull=True)
-
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if is_morador and not (user.is_staff or is_portaria or is_sindico):
-            # Morador: apenas encomendas das próprias unidades
+            # Morador: apenas encomendas das próprias unidades (com cache)
             unidades_ids = list(user.unidades.values_list("id", flat=True))
-            if unidades_ids:
-                qs = qs.filter(unidade_id__in=unidades_ids)
-            else:
-                qs = qs.none()
-        else:
-            # Staff/Portaria/Síndico: pode filtrar por unidade_id opcionalmente
-            unidade_id = request.GET.get("unidade_id")
-            if unidade_id:
-                qs = qs.filter(unidade_id=unidade_id)
-            # Caso não informe, mantemos todas (útil para dashboards gerais)
-
-        total = qs.count()
-
-        green = yellow = red = 0
-        if total > 0:
-            for enc in qs.only("created_on"):
-                delta_days = (now - enc.created_on).days
-                if delta_days <= 0:
-                    green += 1
-                elif 1 <= delta_days <= 3:
-                    yellow += 1
-                else:
-                    red += 1
-
-        # Cor do badge: priorizar mais antigo (vermelho > amarelo > verde)
-        if total == 0:
-            badge_color = "none"
-        elif red > 0:
-            badge_color = "red"
-        elif yellow > 0:
-            badge_color = "yellow"
-        else:
-            badge_color = "green"
-
-        return Response(
-            {
-                "total": total,
-                "green": green,
-                "yellow": yellow,
-                "red": red,
-                "badge_color": badge_color,
-            }
-        )
+            return Response(badge_das_unidades(unidades_ids))
+
+        # Staff/Portaria/Síndico: pode filtrar por unidade_id opcionalmente
+        qs = Encomenda.objects.all()
+        if not user.is_staff and getattr(user, "condominio_id", None):
+            qs = qs.for_condominio(user.condominio_id)
+        unidade_id = request.GET.get("unidade_id")
+        if unidade_id:
+            qs = qs.filter(unidade_id=unidade_id)
+        # Caso não informe, mantemos todas do condomínio (dashboards gerais)
+
+        return Response(contar_por_idade(qs))
     except Exception as e:
         return Response(
             {"error": f"Erro ao calcular badge de encomendas: {str(e)}"},
@@ -1,5 +1,6 @@
 from datetime import date
 
+from access.grupos import pertence_a_grupo
 from django.core.paginator import Paginator
 from django.db.models import Q
 from rest_framework import status
@@ -19,9 +20,7 @@ from ..serializers import (
 
 
 def _is_sindico(user):
-    return user.groups.filter(
-        Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-    ).exists()
+    return pertence_a_grupo(user, "Síndicos", "Sindicos")
 
 
 # ------------------------ Espaços ------------------------
@@ -39,19 +38,17 @@ def espaco_list_view(request):
         if not (
             user.is_staff
             or _is_sindico(user)
-            or user.groups.filter(name__iexact="Portaria").exists()
-            or user.groups.filter(name__iexact="Moradores").exists()
+            or pertence_a_grupo(user, "Portaria")
+            or pertence_a_grupo(user, "Moradores")
         ):
             return Response([], status=status.HTTP_200_OK)
 
         search = request.GET.get("search", "").strip()
         espacos = Espaco.objects.all()
 
-        # Filtrar por condomínio do criador (exceto staff)
+        # Filtrar por condomínio (exceto staff)
         if not user.is_staff and getattr(user, "condominio_id", None):
-            espacos = espacos.filter(
-                created_by__condominio_id=user.condominio_id
-            )
+            espacos = espacos.for_condominio(user.condominio_id)
 
         if search:
             espacos = espacos.filter(Q(nome__icontains=search))
@@ -226,8 +223,8 @@ def espaco_inventario_list_view(request):
         if not (
             user.is_staff
             or _is_sindico(user)
-            or user.groups.filter(name__iexact="Portaria").exists()
-            or user.groups.filter(name__iexact="Moradores").exists()
+            or pertence_a_grupo(user, "Portaria")
+            or pertence_a_grupo(user, "Moradores")
         ):
             return Response([], status=status.HTTP_200_OK)
 
@@ -239,7 +236,7 @@ def espaco_inventario_list_view(request):
         if not user.is_staff and getattr(user, "condominio_id", None):
             itens = itens.filter(
                 Q(created_by__condominio_id=user.condominio_id)
-                | Q(espaco__created_by__condominio_id=user.condominio_id)
+                | Q(espaco__condominio_id=user.condominio_id)
             )
 
         if espaco_id:
@@ -456,8 +453,8 @@ def espaco_reserva_list_view(request):
     try:
         user = request.user
         is_sindico = _is_sindico(user)
-        is_portaria = user.groups.filter(name__iexact="Portaria").exists()
-        is_morador = user.groups.filter(name__iexact="Moradores").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         if not (
             user.is_authenticated
@@ -467,17 +464,11 @@ def espaco_reserva_list_view(request):
 
         reservas = EspacoReserva.objects.select_related(
             "espaco", "morador"
-        ).all()
+        ).prefetch_related("morador__unidades")
 
-        # Filtrar por condomínio do contexto do registro para perfis não-staff
-        # Considerar diferentes associações: criado por, espaço criado por ou unidade do morador
+        # Filtrar por condomínio do registro para perfis não-staff
         if not user.is_staff and getattr(user, "condominio_id", None):
-            reservas = reservas.filter(
-                Q(created_by__condominio_id=user.condominio_id)
-                | Q(espaco__created_by__condominio_id=user.condominio_id)
-                # condominio associado diretamente ao usuário (morador)
-                | Q(morador__condominio_id=user.condominio_id)
-            )
+            reservas = reservas.for_condominio(user.condominio_id)
 
         # Morador vê apenas as suas
         if is_morador and not (is_sindico or is_portaria or user.is_staff):
@@ -540,7 +531,7 @@ def espaco_reserva_create_view(request):
     try:
         user = request.user
         is_sindico = _is_sindico(user)
-        is_morador = user.groups.filter(name__iexact="Moradores").exists()
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         if not (is_sindico or is_morador or user.is_staff):
             return Response(
@@ -717,7 +708,7 @@ def espaco_reserva_hoje_view(request):
     try:
         user = request.user
         is_sindico = _is_sindico(user)
-        is_portaria = user.groups.filter(name__iexact="Portaria").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if not (user.is_staff or is_sindico or is_portaria):
             return Response(
@@ -733,14 +724,9 @@ def espaco_reserva_hoje_view(request):
             "espaco", "morador"
         ).filter(data_reserva=hoje, status="confirmada")
 
-        # Filtrar por condomínio do contexto do registro para síndico/portaria (exceto staff)
-        # Considerar criado por, espaço criado por ou unidade do morador
+        # Filtrar por condomínio do registro para síndico/portaria (exceto staff)
         if not user.is_staff and getattr(user, "condominio_id", None):
-            reservas = reservas.filter(
-                Q(created_by__condominio_id=user.condominio_id)
-                | Q(espaco__created_by__condominio_id=user.condominio_id)
-                | Q(morador__condominio_id=user.condominio_id)
-            )
+            reservas = reservas.for_condominio(user.condominio_id)
 
         reservas = reservas.order_by("espaco__nome").distinct()
 
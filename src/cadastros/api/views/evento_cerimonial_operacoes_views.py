@@ -1,15 +1,14 @@
-import base64
 import re
 import unicodedata
-from io import BytesIO
 from urllib.parse import urlparse
 
-import qrcode
+from access.grupos import pertence_a_grupo
 from access.models import User
 from app.utils.validators import validate_cpf
 from django.conf import settings as django_settings
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -22,6 +21,8 @@ from ...models import (
     EventoCerimonialFuncionario,
     FuncaoFesta,
 )
+from ...services.email_service import enfileirar_email
+from ...services.qrcode_service import qrcode_data_url
 from ..serializers.evento_cerimonial_aux_serializer import (
     EventoCerimonialConviteSerializer,
     EventoCerimonialFuncionarioSerializer,
@@ -75,19 +76,11 @@ def _signup_url(request, token):
     return f"{_frontend_base(request)}/signup/evento/{token}"
 
 
-def _qr_data_url(value):
-    img = qrcode.make(str(value))
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    encoded = base64.b64encode(buffer.getvalue()).decode()
-    return f"data:image/png;base64,{encoded}"
-
-
 def _enriquecer_convite(request, convite):
     data = EventoCerimonialConviteSerializer(convite).data
     signup_url = _signup_url(request, convite.token)
     data["signup_url"] = signup_url
-    data["qr_code_data_url"] = _qr_data_url(signup_url)
+    data["qr_code_data_url"] = qrcode_data_url(signup_url)
     return data
 
 
@@ -180,7 +173,6 @@ def _validar_usuario_funcionario(usuario, is_recepcao):
 
 
 def _enviar_email_acesso_funcionario(request, user, senha_temporaria):
-    import resend
 
     if not user.email:
         return False, "Usuário sem e-mail cadastrado"
@@ -228,8 +220,7 @@ def _enviar_email_acesso_funcionario(request, user, senha_temporaria):
 """
 
     try:
-        resend.api_key = api_key
-        resend.Emails.send(
+        enfileirar_email(
             {
                 "from": email_from,
                 "to": [user.email],
@@ -247,6 +238,7 @@ def _garantir_grupo_recepcao(usuario):
     usuario.groups.add(group)
 
 
+@transaction.atomic
 def _criar_usuario_funcionario(
     request,
     *,
@@ -345,6 +337,7 @@ def _criar_usuario_funcionario(
     }
 
 
+@transaction.atomic
 def _vincular_usuario_existente(
     request,
     *,
@@ -626,9 +619,7 @@ def evento_cerimonial_convite_signup_view(request, token):
 @permission_classes([IsAuthenticated])
 def evento_cerimonial_funcionarios_cadastro_view(request):
     user = request.user
-    if not (
-        user.is_staff or user.groups.filter(name="Cerimonialista").exists()
-    ):
+    if not (user.is_staff or pertence_a_grupo(user, "Cerimonialista")):
         return Response(
             {
                 "error": "Apenas cerimonialistas podem visualizar funcionários cadastrados."
@@ -926,9 +917,7 @@ def evento_cerimonial_funcionario_detail_view(request, pk, funcionario_pk):
 @permission_classes([IsAuthenticated])
 def funcao_festa_list_create_view(request):
     user = request.user
-    if not (
-        user.is_staff or user.groups.filter(name="Cerimonialista").exists()
-    ):
+    if not (user.is_staff or pertence_a_grupo(user, "Cerimonialista")):
         return Response(
             {
                 "error": "Apenas cerimonialistas podem gerenciar funções de festa."
@@ -1058,9 +1047,7 @@ def funcao_festa_list_create_view(request):
 @permission_classes([IsAuthenticated])
 def funcao_festa_detail_view(request, funcao_pk):
     user = request.user
-    if not (
-        user.is_staff or user.groups.filter(name="Cerimonialista").exists()
-    ):
+    if not (user.is_staff or pertence_a_grupo(user, "Cerimonialista")):
         return Response(
             {
                 "error": "Apenas cerimonialistas podem gerenciar funções de festa."
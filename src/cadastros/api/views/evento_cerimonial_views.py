@@ -1,12 +1,13 @@
+from access.grupos import pertence_a_grupo
 from django.core.paginator import Paginator
 from django.db.models import Q
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import EventoCerimonial, ListaConvidadosCerimonial
+from ...services.arquivo_service import resposta_arquivo, salvar_upload
 from ..serializers.evento_cerimonial_serializer import (
     EventoCerimonialListSerializer,
     EventoCerimonialSerializer,
@@ -14,15 +15,15 @@ from ..serializers.evento_cerimonial_serializer import (
 
 
 def _is_cerimonialista(user):
-    return user.groups.filter(name__iexact="Cerimonialista").exists()
+    return pertence_a_grupo(user, "Cerimonialista")
 
 
 def _is_organizador(user):
-    return user.groups.filter(name__iexact="Organizador do Evento").exists()
+    return pertence_a_grupo(user, "Organizador do Evento")
 
 
 def _is_recepcao(user):
-    return user.groups.filter(name__iexact="Recepção").exists()
+    return pertence_a_grupo(user, "Recepção")
 
 
 def _is_participante_evento(user, evento):
@@ -47,16 +48,7 @@ def _pode_editar_evento(user, evento):
 def _salvar_imagem_db(evento, request):
     arquivo = request.FILES.get("imagem")
     if arquivo:
-        evento.imagem_db_data = arquivo.read()
-        evento.imagem_db_content_type = arquivo.content_type
-        evento.imagem_db_filename = arquivo.name
-        evento.save(
-            update_fields=[
-                "imagem_db_data",
-                "imagem_db_content_type",
-                "imagem_db_filename",
-            ]
-        )
+        salvar_upload(evento, "imagem", arquivo)
 
 
 @api_view(["GET"])
@@ -64,9 +56,7 @@ def _salvar_imagem_db(evento, request):
 def evento_cerimonial_list_view(request):
     try:
         user = request.user
-        eventos = EventoCerimonial.objects.prefetch_related(
-            "cerimonialistas", "organizadores", "funcionarios"
-        ).all()
+        eventos = EventoCerimonial.objects.all()
 
         if not user.is_staff:
             eventos = eventos.filter(
@@ -93,7 +83,9 @@ def evento_cerimonial_list_view(request):
             }
             eventos = eventos.filter(evento_confirmado=confirmado_bool)
 
-        eventos = eventos.order_by("datetime_inicio")
+        eventos = EventoCerimonialListSerializer.preparar_queryset(
+            eventos, request
+        ).order_by("datetime_inicio")
 
         page = int(request.GET.get("page", 1))
         paginator = Paginator(eventos, 10)
@@ -165,8 +157,8 @@ def evento_cerimonial_create_view(request):
 @permission_classes([IsAuthenticated])
 def evento_cerimonial_detail_view(request, pk):
     try:
-        evento = EventoCerimonial.objects.prefetch_related(
-            "cerimonialistas", "organizadores", "funcionarios"
+        evento = EventoCerimonialSerializer.preparar_queryset(
+            EventoCerimonial.objects.all(), request
         ).get(pk=pk)
     except EventoCerimonial.DoesNotExist:
         return Response(
@@ -264,17 +256,19 @@ def evento_cerimonial_imagem_db_view(request, pk):
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    if not evento.imagem_db_data:
+    response = resposta_arquivo(
+        request,
+        evento.imagem_arquivo_id,
+        evento.imagem_db_content_type,
+        last_modified=evento.updated_at,
+    )
+    if response is None:
         return Response(
             {"error": "Imagem não encontrada."},
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    return HttpResponse(
-        evento.imagem_db_data,
-        content_type=evento.imagem_db_content_type
-        or "application/octet-stream",
-    )
+    return response
 
 
 __all__ = [
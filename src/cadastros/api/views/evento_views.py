@@ -1,7 +1,6 @@
 from access.api.permissions import IsStaffOrSindico
-from django.core.paginator import Paginator
+from access.grupos import pertence_a_grupo
 from django.db.models import Q
-from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -9,6 +8,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Evento
+from ...services.arquivo_service import resposta_arquivo, salvar_upload
+from ...services.paginacao_service import CursorInvalido, paginar
 from ..serializers.evento_serializer import (
     EventoListSerializer,
     EventoSerializer,
@@ -16,19 +17,10 @@ from ..serializers.evento_serializer import (
 
 
 def _salvar_imagem_db(evento, request):
-    """Salva o arquivo 'imagem' de request.FILES como BLOB no modelo."""
+    """Salva o arquivo 'imagem' de request.FILES no armazenamento de arquivos."""
     arquivo = request.FILES.get("imagem")
     if arquivo:
-        evento.imagem_db_data = arquivo.read()
-        evento.imagem_db_content_type = arquivo.content_type
-        evento.imagem_db_filename = arquivo.name
-        evento.save(
-            update_fields=[
-                "imagem_db_data",
-                "imagem_db_content_type",
-                "imagem_db_filename",
-            ]
-        )
+        salvar_upload(evento, "imagem", arquivo)
 
 
 @api_view(["GET"])
@@ -47,17 +39,13 @@ def evento_list_view(request):
         eventos = Evento.objects.select_related("espaco", "created_by").all()
 
         # Controle de acesso por grupo
-        is_sindico = user.groups.filter(
-            Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-        ).exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos", "Sindicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         # Escopo por condomínio para todos os perfis não-staff
         if not user.is_staff and getattr(user, "condominio_id", None):
-            eventos = eventos.filter(
-                created_by__condominio_id=user.condominio_id
-            )
+            eventos = eventos.for_condominio(user.condominio_id)
 
         # Parâmetro para síndico/staff: incluir eventos passados
         incluir_passados = (
@@ -90,29 +78,16 @@ def evento_list_view(request):
                 | Q(espaco__nome__icontains=search)
             )
 
-        # Ordenação
-        eventos = eventos.order_by("datetime_inicio")
-
-        # Paginação
-        page = int(request.GET.get("page", 1))
-        paginator = Paginator(eventos, 10)
-        page_obj = paginator.get_page(page)
+        # Ordenação e paginação (por página ou por cursor)
+        itens, paginacao = paginar(request, eventos, 10, ("datetime_inicio",))
 
         serializer = EventoListSerializer(
-            page_obj.object_list, many=True, context={"request": request}
-        )
-
-        return Response(
-            {
-                "results": serializer.data,
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-            }
+            itens, many=True, context={"request": request}
         )
+        return Response({"results": serializer.data, **paginacao})
 
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"Erro ao listar eventos: {str(e)}"},
@@ -277,17 +252,21 @@ def evento_delete_view(request, pk):
 def evento_imagem_db_view(request, pk):
     """Serve a imagem do evento armazenada como BLOB no banco."""
     try:
-        evento = Evento.objects.get(pk=pk)
-        if not evento.imagem_db_data:
+        evento = Evento.objects.only(
+            "id", "imagem_arquivo", "imagem_db_content_type", "updated_at"
+        ).get(pk=pk)
+        response = resposta_arquivo(
+            request,
+            evento.imagem_arquivo_id,
+            evento.imagem_db_content_type,
+            last_modified=evento.updated_at,
+        )
+        if response is None:
             return Response(
                 {"error": "Imagem não encontrada no banco."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        return HttpResponse(
-            evento.imagem_db_data,
-            content_type=evento.imagem_db_content_type
-            or "application/octet-stream",
-        )
+        return response
     except Evento.DoesNotExist:
         return Response(
             {"error": "Evento não encontrado."},
@@ -1,13 +1,9 @@
-import base64
-import io
 import json
 import urllib.request
 
-import qrcode
 from django.conf import settings as django_settings
 from django.db.models import Max, Q
 from django.http import HttpResponse
-from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -18,10 +14,20 @@ from ...models import (
     RESPOSTA_PRESENCA_CONFIRMADO,
     RESPOSTA_PRESENCA_RECUSADO,
     ConvidadoListaCerimonial,
+    EnvioListaCerimonial,
     EventoCerimonial,
     EventoCerimonialFuncionario,
     ListaConvidadosCerimonial,
 )
+from ...services.convite_cerimonial_service import (
+    anexo_imagem_evento,
+    iniciar_envio,
+    montar_email_confirmacao_presenca,
+    montar_email_qrcode,
+    progresso_envio,
+)
+from ...services.email_service import enfileirar_email
+from ...services.qrcode_service import qrcode_png
 from ..serializers.lista_convidados_cerimonial_serializer import (
     ConvidadoListaCerimonialSerializer,
     ListaConvidadosCerimonialSerializer,
@@ -125,208 +131,29 @@ def _normalizar_resposta_presenca(value):
     return None
 
 
-def _build_rsvp_url(request, token, resposta):
-    path = reverse(
-        "lista-convidados-cerimonial-rsvp-public",
-        kwargs={"token": token},
-    )
-    return request.build_absolute_uri(f"{path}?resposta={resposta}")
-
-
 def _enviar_qrcode_email_cerimonial(convidado, lista):
-    try:
-        import resend
-    except Exception:
+    if not convidado.email or not django_settings.RESEND_API_KEY:
         return False
-    if not convidado.email:
-        return False
-
-    api_key = django_settings.RESEND_API_KEY
-    email_from = django_settings.EMAIL_FROM
-    if not api_key:
-        return False
-
-    evento = lista.evento
-    data_evento = (
-        evento.datetime_inicio.strftime("%d/%m/%Y %H:%M")
-        if evento.datetime_inicio
-        else "A confirmar"
-    )
 
-    endereco = ""
     try:
-        from ..serializers.evento_cerimonial_serializer import (
-            EventoCerimonialSerializer,
-        )
-
-        endereco = EventoCerimonialSerializer().get_endereco_completo(evento)
-    except Exception:
-        endereco = ""
-
-    img = qrcode.make(str(convidado.qr_token))
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-
-    html_body = f"""
-    <div style=\"font-family:Arial,sans-serif;max-width:620px;margin:0 auto;border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;\">
-      <div style=\"background:#19294a;padding:20px 24px;text-align:center;\">
-        <p style=\"color:#ffffff;margin:0;font-size:1rem;font-weight:600;\">Convite para Evento</p>
-      </div>
-      <div style=\"padding:24px;background:#ffffff;\">
-        <h2 style=\"color:#19294a;margin:0 0 12px;font-size:1.1rem;\">Olá, {convidado.nome}!</h2>
-        <p style=\"color:#374151;line-height:1.6;margin:0 0 16px;\">
-          Você foi convidado(a) para o evento:<br/>
-          <strong style=\"font-size:1.05rem;color:#2abb98;\">{evento.nome}</strong>
-        </p>
-        <table style=\"width:100%;border-collapse:collapse;margin:0 0 20px;background:#f9fafb;border-radius:8px;border:1px solid #e5e7eb;\">
-          <tr>
-            <td style=\"padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;\">Data</td>
-            <td style=\"padding:8px 12px;color:#111827;font-weight:500;\">{data_evento}</td>
-          </tr>
-          <tr>
-            <td style=\"padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;\">Local</td>
-            <td style=\"padding:8px 12px;color:#111827;font-weight:500;\">{endereco or "-"}</td>
-          </tr>
-        </table>
-        <div style=\"background:#f0fdf4;border:1px solid #86efac;border-radius:8px;padding:16px 20px;text-align:center;\">
-          <p style=\"color:#15803d;font-weight:600;font-size:1rem;margin:0 0 8px;\">QR Code de Acesso</p>
-          <p style=\"color:#166534;font-size:0.88rem;margin:0 0 12px;\">Apresente-o na recepção para confirmar sua entrada.</p>
-          <img src=\"cid:qrcode\" alt=\"QR Code de Acesso\" style=\"width:200px;height:200px;border-radius:8px;\" />
-        </div>
-      </div>
-    </div>
-    """
-
-    try:
-        resend.api_key = api_key
-        resend.Emails.send(
-            {
-                "from": email_from,
-                "to": [convidado.email],
-                "subject": f"Seu convite para {evento.nome}",
-                "html": html_body,
-                "attachments": [
-                    {
-                        "filename": "qrcode.png",
-                        "content": qr_base64,
-                        "content_id": "qrcode",
-                        "disposition": "inline",
-                    }
-                ],
-            }
-        )
+        enfileirar_email(montar_email_qrcode(convidado, lista.evento))
         return True
     except Exception:
         return False
 
 
 def _enviar_confirmacao_presenca_email_cerimonial(request, convidado, lista):
-    try:
-        import resend
-    except Exception:
-        return False
-
-    if not convidado.email:
-        return False
-
-    api_key = django_settings.RESEND_API_KEY
-    email_from = django_settings.EMAIL_FROM
-    if not api_key:
+    if not convidado.email or not django_settings.RESEND_API_KEY:
         return False
 
-    evento = lista.evento
-    data_evento = (
-        evento.datetime_inicio.strftime("%d/%m/%Y %H:%M")
-        if evento.datetime_inicio
-        else "A confirmar"
-    )
-
-    endereco = ""
     try:
-        from ..serializers.evento_cerimonial_serializer import (
-            EventoCerimonialSerializer,
-        )
-
-        endereco = EventoCerimonialSerializer().get_endereco_completo(evento)
-    except Exception:
-        endereco = ""
-
-    confirmar_url = _build_rsvp_url(
-        request,
-        convidado.qr_token,
-        RESPOSTA_PRESENCA_CONFIRMADO,
-    )
-    recusar_url = _build_rsvp_url(
-        request,
-        convidado.qr_token,
-        RESPOSTA_PRESENCA_RECUSADO,
-    )
-
-    evento_imagem_html = ""
-    attachments = []
-    if evento.imagem_db_data:
-        evento_img_b64 = base64.b64encode(evento.imagem_db_data).decode()
-        evento_img_filename = (
-            evento.imagem_db_filename or f"evento-{evento.id}-imagem.jpg"
-        )
-        attachments.append(
-            {
-                "filename": evento_img_filename,
-                "content": evento_img_b64,
-                "content_id": "evento_imagem",
-                "disposition": "inline",
-            }
-        )
-        evento_imagem_html = """
-        <div style="margin:0 0 18px;">
-          <p style="color:#334155;font-size:0.88rem;font-weight:600;margin:0 0 8px;">Imagem do evento</p>
-          <img src="cid:evento_imagem" alt="Imagem do evento" style="width:100%;max-height:260px;object-fit:cover;border-radius:10px;border:1px solid #e5e7eb;" />
-        </div>
-        """
-
-    html_body = f"""
-    <div style="font-family:Arial,sans-serif;max-width:620px;margin:0 auto;border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;">
-      <div style="background:#19294a;padding:20px 24px;text-align:center;">
-        <p style="color:#ffffff;margin:0;font-size:1rem;font-weight:600;">Confirmação de Presença</p>
-      </div>
-      <div style="padding:24px;background:#ffffff;">
-        <h2 style="color:#19294a;margin:0 0 12px;font-size:1.1rem;">Olá, {convidado.nome}!</h2>
-        <p style="color:#374151;line-height:1.6;margin:0 0 16px;">
-          Você foi convidado(a) para o evento:<br/>
-          <strong style="font-size:1.05rem;color:#2abb98;">{evento.nome}</strong>
-        </p>
-                {evento_imagem_html}
-        <table style="width:100%;border-collapse:collapse;margin:0 0 20px;background:#f9fafb;border-radius:8px;border:1px solid #e5e7eb;">
-          <tr>
-            <td style="padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;">Data</td>
-            <td style="padding:8px 12px;color:#111827;font-weight:500;">{data_evento}</td>
-          </tr>
-          <tr>
-            <td style="padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;">Local</td>
-            <td style="padding:8px 12px;color:#111827;font-weight:500;">{endereco or "-"}</td>
-          </tr>
-        </table>
-        <p style="color:#1f2937;line-height:1.6;margin:0 0 12px;">Por favor, confirme sua presença clicando em um dos botões abaixo:</p>
-        <div style="display:flex;gap:10px;flex-wrap:wrap;">
-          <a href="{confirmar_url}" style="background:#16a34a;color:#fff;text-decoration:none;padding:10px 14px;border-radius:8px;font-weight:600;font-size:0.88rem;">Confirmar presença</a>
-          <a href="{recusar_url}" style="background:#dc2626;color:#fff;text-decoration:none;padding:10px 14px;border-radius:8px;font-weight:600;font-size:0.88rem;">Não poderei ir</a>
-        </div>
-        <p style="color:#64748b;font-size:0.8rem;margin:14px 0 0;">Após confirmar presença, você receberá por e-mail o QR Code de acesso.</p>
-      </div>
-    </div>
-    """
-
-    try:
-        resend.api_key = api_key
-        resend.Emails.send(
-            {
-                "from": email_from,
-                "to": [convidado.email],
-                "subject": f"Confirme sua presença em {evento.nome}",
-                "html": html_body,
-                "attachments": attachments,
-            }
+        enfileirar_email(
+            montar_email_confirmacao_presenca(
+                convidado,
+                lista.evento,
+                request.build_absolute_uri,
+                anexo_imagem_evento(lista.evento),
+            )
         )
         return True
     except Exception:
@@ -356,14 +183,7 @@ def listas_convidados_cerimonial_view(request):
     user = request.user
 
     if request.method == "GET":
-        qs = ListaConvidadosCerimonial.objects.select_related(
-            "evento"
-        ).prefetch_related(
-            "convidados",
-            "evento__cerimonialistas",
-            "evento__organizadores",
-            "evento__funcionarios",
-        )
+        qs = ListaConvidadosCerimonial.objects.all()
 
         if not user.is_staff:
             qs = qs.filter(
@@ -384,8 +204,11 @@ def listas_convidados_cerimonial_view(request):
         if data_evento:
             qs = qs.filter(data_evento=data_evento)
 
+        qs = ListaConvidadosCerimonialSerializer.preparar_queryset(qs, request)
         serializer = ListaConvidadosCerimonialSerializer(
-            qs.order_by("-created_on"), many=True
+            qs.order_by("-created_on"),
+            many=True,
+            context={"request": request},
         )
         return Response(serializer.data)
 
@@ -450,13 +273,10 @@ def listas_convidados_cerimonial_view(request):
 def lista_convidados_cerimonial_detail_view(request, lista_pk):
     try:
         lista = (
-            ListaConvidadosCerimonial.objects.select_related("evento")
-            .prefetch_related(
-                "convidados",
-                "evento__cerimonialistas",
-                "evento__organizadores",
-                "evento__funcionarios",
+            ListaConvidadosCerimonialSerializer.preparar_queryset(
+                ListaConvidadosCerimonial.objects.all(), request
             )
+            .select_related("evento")
             .get(pk=lista_pk)
         )
     except ListaConvidadosCerimonial.DoesNotExist:
@@ -473,7 +293,11 @@ def lista_convidados_cerimonial_detail_view(request, lista_pk):
                 {"error": "Sem permissão."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        return Response(ListaConvidadosCerimonialSerializer(lista).data)
+        return Response(
+            ListaConvidadosCerimonialSerializer(
+                lista, context={"request": request}
+            ).data
+        )
 
     if request.method == "PATCH":
         if not _pode_editar_lista(request.user, evento):
@@ -638,7 +462,6 @@ def finalizar_lista_convidados_cerimonial_view(request, lista_pk):
         lista = (
             ListaConvidadosCerimonial.objects.select_related("evento")
             .prefetch_related(
-                "convidados",
                 "evento__cerimonialistas",
                 "evento__organizadores",
             )
@@ -656,65 +479,41 @@ def finalizar_lista_convidados_cerimonial_view(request, lista_pk):
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    convidados = list(lista.convidados.all())
-    if not convidados:
+    if not lista.convidados.exists():
         return Response(
             {"error": "A lista não possui convidados para envio."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    enviados_confirmacao = 0
-    enviados_qr = 0
-    falhas = []
+    # Os e-mails são montados e enfileirados em segundo plano; o progresso
+    # é acompanhado pelo endpoint de envio
+    envio, _criado = iniciar_envio(
+        lista, request.user, request.build_absolute_uri("/")
+    )
+    return Response(progresso_envio(envio), status=status.HTTP_202_ACCEPTED)
 
-    for convidado in convidados:
-        if not convidado.email:
-            falhas.append(
-                {
-                    "convidado_id": convidado.id,
-                    "nome": convidado.nome,
-                    "erro": "Convidado sem e-mail cadastrado.",
-                }
-            )
-            continue
-
-        if convidado.resposta_presenca == RESPOSTA_PRESENCA_CONFIRMADO:
-            enviado = _enviar_qrcode_email_cerimonial(convidado, lista)
-            if enviado:
-                enviados_qr += 1
-            else:
-                falhas.append(
-                    {
-                        "convidado_id": convidado.id,
-                        "nome": convidado.nome,
-                        "erro": "Não foi possível enviar o QR Code.",
-                    }
-                )
-            continue
-
-        enviado = _enviar_confirmacao_presenca_email_cerimonial(
-            request, convidado, lista
-        )
-        if enviado:
-            enviados_confirmacao += 1
-        else:
-            falhas.append(
-                {
-                    "convidado_id": convidado.id,
-                    "nome": convidado.nome,
-                    "erro": "Não foi possível enviar o e-mail de confirmação.",
-                }
-            )
 
-    return Response(
-        {
-            "success": len(falhas) == 0,
-            "total_convidados": len(convidados),
-            "enviados_confirmacao": enviados_confirmacao,
-            "enviados_qr": enviados_qr,
-            "falhas": falhas,
-        }
-    )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def envio_lista_convidados_cerimonial_view(request, lista_pk, envio_pk):
+    """Progresso do envio iniciado por ``finalizar``."""
+    try:
+        envio = EnvioListaCerimonial.objects.select_related(
+            "lista__evento"
+        ).get(pk=envio_pk, lista_id=lista_pk)
+    except EnvioListaCerimonial.DoesNotExist:
+        return Response(
+            {"error": "Envio não encontrado."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    if not _pode_editar_lista(request.user, envio.lista.evento):
+        return Response(
+            {"error": "Sem permissão."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    return Response(progresso_envio(envio))
 
 
 @api_view(["PATCH"])
@@ -1205,8 +1004,6 @@ def resposta_presenca_public_cerimonial_view(request, token):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def download_qrcode_cerimonial_view(request):
-    from PIL import Image, ImageDraw, ImageFont
-
     token = request.query_params.get("token", "").strip()
     if not token:
         return Response(
@@ -1230,36 +1027,11 @@ def download_qrcode_cerimonial_view(request):
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    qr_img = qrcode.make(str(token))
-    qr_size = qr_img.size[0]
-
-    padding = 20
-    text_height = 50
-    canvas_w = qr_size + (padding * 2)
-    canvas_h = qr_size + (padding * 2) + text_height
-
-    canvas = Image.new("RGB", (canvas_w, canvas_h), color="white")
-    canvas.paste(qr_img, (padding, padding))
-
-    draw = ImageDraw.Draw(canvas)
-    try:
-        font = ImageFont.truetype("Arial.ttf", 20)
-    except Exception:
-        font = ImageFont.load_default()
-
     nome = convidado.nome
-    bbox = draw.textbbox((0, 0), nome, font=font)
-    text_w = bbox[2] - bbox[0]
-    text_x = max((canvas_w - text_w) // 2, 10)
-    text_y = qr_size + padding + 12
-    draw.text((text_x, text_y), nome, fill="black", font=font)
-
-    out = io.BytesIO()
-    canvas.save(out, format="PNG")
-    out.seek(0)
-
     filename = f"qrcode-{nome.replace(' ', '-').lower()}.png"
-    response = HttpResponse(out.getvalue(), content_type="image/png")
+    response = HttpResponse(
+        qrcode_png(token, rotulo=nome), content_type="image/png"
+    )
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
 
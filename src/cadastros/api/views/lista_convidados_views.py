@@ -2,12 +2,16 @@ import json
 import urllib.error
 import urllib.request
 
+from access.grupos import pertence_a_grupo
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import ConvidadoLista, ListaConvidados, Visitante
+from ...services.arquivo_service import ler_arquivo
+from ...services.email_service import enfileirar_email
+from ...services.qrcode_service import qrcode_png
 from ..serializers.lista_convidados_serializer import (
     ConvidadoListaSerializer,
     ListaConvidadosSerializer,
@@ -15,11 +19,11 @@ from ..serializers.lista_convidados_serializer import (
 
 
 def _is_morador(user):
-    return user.groups.filter(name="Moradores").exists()
+    return pertence_a_grupo(user, "Moradores")
 
 
 def _pode_criar_lista(user):
-    return user.groups.filter(name__in=["Moradores", "Síndicos"]).exists()
+    return pertence_a_grupo(user, "Moradores", "Síndicos")
 
 
 def _enviar_qrcode_email(convidado, lista):
@@ -31,8 +35,6 @@ def _enviar_qrcode_email(convidado, lista):
     import base64
     import io
 
-    import qrcode
-    import resend
     from django.conf import settings as django_settings
 
     if not convidado.email:
@@ -49,42 +51,24 @@ def _enviar_qrcode_email(convidado, lista):
         condominio_nome = condominio.nome if condominio else "Condomínio"
         condominio_endereco = ""
         if condominio:
-            # Se tivermos apenas o CEP armazenado, consultar ViaCEP para obter o
-            # endereço completo e montar uma descrição amigável.
+            # Endereço resolvido a partir do CEP e gravado no condomínio;
+            # montar uma descrição amigável sem consultar APIs externas.
             cep_raw = (condominio.cep or "").strip()
             endereco_parts = []
             if cep_raw:
-                cep_only = "".join(c for c in cep_raw if c.isdigit())
-                if cep_only:
-                    try:
-                        via_url = f"https://viacep.com.br/ws/{cep_only}/json/"
-                        req = urllib.request.Request(
-                            via_url, headers={"User-Agent": "CancellaFlow/1.0"}
-                        )
-                        with urllib.request.urlopen(req, timeout=5) as resp:
-                            data = json.load(resp)
-                        # Se ViaCEP indicar erro, não usar
-                        if data.get("erro"):
-                            raise ValueError("CEP não encontrado no ViaCEP")
-                        # data pode conter: logradouro, bairro, localidade, uf
-                        log = data.get("logradouro") or ""
-                        bairro = data.get("bairro") or ""
-                        cidade = data.get("localidade") or ""
-                        uf = data.get("uf") or ""
-                        if log:
-                            endereco_parts.append(log)
-                        if bairro:
-                            endereco_parts.append(bairro)
-                        if cidade or uf:
-                            cidade_uf = ", ".join(p for p in [cidade, uf] if p)
-                            endereco_parts.append(cidade_uf)
-                        # manter o CEP por último
-                        endereco_parts.append(f"CEP {cep_raw}")
-                    except Exception:
-                        # Se a consulta falhar, fallback para os dados básicos
-                        endereco_parts = []
-                        if condominio.cep:
-                            endereco_parts.append(f"CEP {condominio.cep}")
+                log = condominio.logradouro or ""
+                bairro = condominio.bairro or ""
+                cidade = condominio.cidade or ""
+                uf = condominio.estado or ""
+                if log:
+                    endereco_parts.append(log)
+                if bairro:
+                    endereco_parts.append(bairro)
+                if cidade or uf:
+                    cidade_uf = ", ".join(p for p in [cidade, uf] if p)
+                    endereco_parts.append(cidade_uf)
+                # manter o CEP por último
+                endereco_parts.append(f"CEP {cep_raw}")
             # adicionar número e complemento se existirem — colocados após o logradouro
             numero_comp = []
             if getattr(condominio, "numero", None):
@@ -102,13 +86,7 @@ def _enviar_qrcode_email(convidado, lista):
             lista
         )
 
-        # Gerar QR code em memória: manter bytes e também base64 para fallback
-        img = qrcode.make(str(convidado.qr_token))
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        qr_bytes = buffer.getvalue()
-        qr_bytes_list = list(qr_bytes)
-        qr_base64 = base64.b64encode(qr_bytes).decode()
+        qr_bytes = qrcode_png(convidado.qr_token)
 
         # Tentar obter logo do condomínio — prioriza armazenamento em DB, fallback no FileField
         logo_html = ""
@@ -119,8 +97,8 @@ def _enviar_qrcode_email(convidado, lista):
 
             raw_logo_bytes = None
             # 1) Preferir logo armazenada diretamente no banco
-            if condominio and getattr(condominio, "logo_db_data", None):
-                raw_logo_bytes = bytes(condominio.logo_db_data)
+            if condominio and getattr(condominio, "logo_arquivo_id", None):
+                raw_logo_bytes = ler_arquivo(condominio.logo_arquivo_id)
                 logo_filename = condominio.logo_db_filename or "logo.png"
             # 2) Fallback: FileField
             elif condominio and getattr(condominio, "logo", None):
@@ -208,8 +186,6 @@ def _enviar_qrcode_email(convidado, lista):
     <p style="color:#9ca3af;font-size:0.75rem;margin:0;">{condominio_nome}</p>
   </div>
 </div>"""
-
-        resend.api_key = api_key
         payload = {
             "from": email_from,
             "to": [convidado.email],
@@ -236,7 +212,7 @@ def _enviar_qrcode_email(convidado, lista):
                 }
             )
 
-        resend.Emails.send(payload)
+        enfileirar_email(payload)
         return True
     except Exception:
         return False
@@ -245,8 +221,8 @@ def _enviar_qrcode_email(convidado, lista):
 def _is_sindico_ou_portaria(user):
     return (
         user.is_staff
-        or user.groups.filter(name="Síndicos").exists()
-        or user.groups.filter(name="Portaria").exists()
+        or pertence_a_grupo(user, "Síndicos")
+        or pertence_a_grupo(user, "Portaria")
     )
 
 
@@ -267,12 +243,14 @@ def listas_convidados_view(request):
                 ListaConvidados.objects.filter(
                     morador__condominio=user.condominio
                 )
+                .select_related("morador", "espaco", "unidade_evento")
                 .prefetch_related("convidados")
                 .order_by("-created_on")
             )
         elif _is_morador(user):
             qs = (
                 ListaConvidados.objects.filter(morador=user)
+                .select_related("morador", "espaco", "unidade_evento")
                 .prefetch_related("convidados")
                 .order_by("-created_on")
             )
@@ -942,11 +920,7 @@ def download_qrcode_view(request):
     GET ?token=<uuid> — Retorna um PNG do QR Code com o nome da pessoa abaixo.
     Busca o token em ConvidadoLista e depois em Visitante.
     """
-    import io
-
-    import qrcode
     from django.http import HttpResponse
-    from PIL import Image, ImageDraw, ImageFont
 
     token = request.query_params.get("token", "").strip()
     if not token:
@@ -972,60 +946,13 @@ def download_qrcode_view(request):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-    # Gerar QR code
-    qr_img = qrcode.make(str(token))
-    qr_size = qr_img.size[0]
-
-    # Canvas: QR + padding + faixa com o nome
-    padding = 20
-    name_height = 44
-    canvas = Image.new(
-        "RGB",
-        (qr_size + padding * 2, qr_size + padding * 2 + name_height),
-        "white",
-    )
-    canvas.paste(qr_img, (padding, padding))
-
-    draw = ImageDraw.Draw(canvas)
-    font = None
-    for font_path in [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
-        "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
-    ]:
-        try:
-            font = ImageFont.truetype(font_path, 18)
-            break
-        except Exception:
-            continue
-    if font is None:
-        font = ImageFont.load_default()
-
-    text_x = canvas.width // 2
-    text_y = qr_size + padding + name_height // 2
-    try:
-        draw.text(
-            (text_x, text_y), nome, fill="#111827", font=font, anchor="mm"
-        )
-    except TypeError:
-        try:
-            bbox = draw.textbbox((0, 0), nome, font=font)
-            text_w = bbox[2] - bbox[0]
-        except AttributeError:
-            text_w = len(nome) * 10
-        draw.text(
-            (text_x - text_w // 2, text_y - 9), nome, fill="#111827", font=font
-        )
-
-    output = io.BytesIO()
-    canvas.save(output, format="PNG")
-    output.seek(0)
-
     safe_nome = "".join(
         c if c.isalnum() or c in "-_" else "-"
         for c in nome.lower().replace(" ", "-")
     )
-    response = HttpResponse(output.read(), content_type="image/png")
+    response = HttpResponse(
+        qrcode_png(token, rotulo=nome), content_type="image/png"
+    )
     response["Content-Disposition"] = (
         f'attachment; filename="qrcode-{safe_nome}.png"'
     )
@@ -1,7 +1,7 @@
 import logging
 from datetime import timedelta
 
-from django.db.models import Q
+from access.grupos import pertence_a_grupo
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -19,12 +19,7 @@ logger = logging.getLogger(__name__)
 
 
 def _is_sindico_or_staff(user):
-    return (
-        user.is_staff
-        or user.groups.filter(
-            Q(name__iexact="Síndicos") | Q(name__iexact="Sindicos")
-        ).exists()
-    )
+    return user.is_staff or pertence_a_grupo(user, "Síndicos", "Sindicos")
 
 
 def _get_condominio(user):
@@ -46,7 +41,7 @@ def ocorrencia_list_view(request):
             condominio = _get_condominio(user)
             qs = Ocorrencia.objects.select_related(
                 "criado_por", "respondido_por"
-            ).filter(criado_por__condominio=condominio)
+            ).for_condominio(getattr(condominio, "id", None))
         else:
             qs = Ocorrencia.objects.select_related(
                 "criado_por", "respondido_por"
@@ -85,8 +80,8 @@ def ocorrencia_create_view(request):
     """
     try:
         user = request.user
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if not (is_morador or is_portaria or user.is_staff):
             return Response(
@@ -5,9 +5,9 @@ import string
 import unicodedata
 
 import openpyxl
+from access.grupos import pertence_a_grupo
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.core.paginator import Paginator
 from django.db.models import Q
 from django.http import HttpResponse
 from openpyxl.comments import Comment
@@ -27,6 +27,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Unidade
+from ...services.paginacao_service import CursorInvalido, paginar
 from ..serializers import (
     UnidadeCreateBulkSerializer,
     UnidadeListSerializer,
@@ -51,18 +52,16 @@ def unidade_list_view(request):
         # Busca
         search = request.GET.get("search", "")
         # Relação com usuários é M2M (User.unidades, related_name='moradores')
-        unidades = Unidade.objects.prefetch_related("moradores").all()
+        unidades = Unidade.objects.all()
 
         # Controle de acesso por grupo
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
-        # Filtrar por condomínio: apenas unidades criadas por usuários do mesmo condomínio
+        # Filtrar por condomínio: apenas unidades do mesmo condomínio
         if hasattr(user, "condominio_id") and user.condominio_id:
-            unidades = unidades.filter(
-                created_by__condominio_id=user.condominio_id
-            )
+            unidades = unidades.for_condominio(user.condominio_id)
 
         if is_morador and not (user.is_staff or is_sindico or is_portaria):
             # Moradores veem apenas suas próprias unidades
@@ -84,27 +83,21 @@ def unidade_list_view(request):
         if is_active is not None:
             unidades = unidades.filter(is_active=is_active.lower() == "true")
 
-        # Ordenação
-        unidades = unidades.order_by("bloco", "numero")
+        # Carrega moradores apenas se os campos pedidos (?fields=) usarem
+        unidades = UnidadeListSerializer.preparar_queryset(unidades, request)
 
-        # Paginação
-        page = int(request.GET.get("page", 1))
-        paginator = Paginator(unidades, 12)
-        page_obj = paginator.get_page(page)
+        # Ordenação e paginação (por página ou por cursor)
+        itens, paginacao = paginar(request, unidades, 12, ("bloco", "numero"))
 
-        serializer = UnidadeListSerializer(page_obj.object_list, many=True)
+        serializer = UnidadeListSerializer(
+            itens, many=True, context={"request": request}
+        )
+        return Response({"results": serializer.data, **paginacao})
 
+    except CursorInvalido as e:
         return Response(
-            {
-                "results": serializer.data,
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-            }
+            {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
         )
-
     except Exception as e:
         return Response(
             {"error": f"Erro ao listar unidades: {str(e)}"},
@@ -121,7 +114,7 @@ def unidade_create_view(request):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if not (user.is_staff or is_sindico):
             return Response(
@@ -155,7 +148,7 @@ def unidade_create_bulk_view(request):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if not (user.is_staff or is_sindico):
             return Response(
@@ -224,7 +217,7 @@ def unidade_update_view(request, pk):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if not (user.is_staff or is_sindico):
             return Response(
@@ -264,7 +257,7 @@ def unidade_inactivate_view(request, pk):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if not (user.is_staff or is_sindico):
             return Response(
@@ -379,7 +372,7 @@ def export_modelo_excel_view(request):
     unidades. Apenas Síndicos e Administradores podem acessar.
     """
     user = request.user
-    is_sindico = user.groups.filter(name="Síndicos").exists()
+    is_sindico = pertence_a_grupo(user, "Síndicos")
 
     if not (user.is_staff or is_sindico):
         return Response(
@@ -545,7 +538,7 @@ def import_excel_view(request):
     Retorna JSON com {'criados': N, 'erros': [{'linha': X, 'motivo': '...'}]}.
     """
     user = request.user
-    is_sindico = user.groups.filter(name="Síndicos").exists()
+    is_sindico = pertence_a_grupo(user, "Síndicos")
 
     if not (user.is_staff or is_sindico):
         return Response(
@@ -1,3 +1,4 @@
+from access.grupos import pertence_a_grupo
 from django.core.paginator import Paginator
 from django.db.models import Q
 from rest_framework import status
@@ -26,9 +27,9 @@ def veiculo_list_view(request):
         veiculos = Veiculo.objects.select_related("morador").all()
 
         # Controle de acesso por grupo
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         # Filtrar por condomínio do morador (para todos os perfis exceto staff)
         if not user.is_staff and getattr(user, "condominio_id", None):
@@ -94,9 +95,9 @@ def veiculo_create_view(request):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if is_portaria and not (user.is_staff or is_sindico):
             return Response(
@@ -135,8 +136,8 @@ def veiculo_detail_view(request, pk):
 
         # Verificar permissão
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if not (
             user.is_staff
@@ -175,8 +176,8 @@ def veiculo_update_view(request, pk):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if is_portaria and not (user.is_staff or is_sindico):
             return Response(
@@ -226,8 +227,8 @@ def veiculo_delete_view(request, pk):
     """
     try:
         user = request.user
-        is_sindico = user.groups.filter(name="Síndicos").exists()
-        is_portaria = user.groups.filter(name="Portaria").exists()
+        is_sindico = pertence_a_grupo(user, "Síndicos")
+        is_portaria = pertence_a_grupo(user, "Portaria")
 
         if is_portaria and not (user.is_staff or is_sindico):
             return Response(
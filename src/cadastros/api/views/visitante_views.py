@@ -1,5 +1,5 @@
+from access.grupos import pertence_a_grupo
 from access.models import User
-from django.core.paginator import Paginator
 from django.db.models import Q
 from django.utils import timezone
 from rest_framework import status
@@ -8,6 +8,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Visitante
+from ...services.arquivo_service import ler_arquivo
+from ...services.email_service import enfileirar_email
+from ...services.paginacao_service import CursorInvalido, paginar
+from ...services.qrcode_service import qrcode_png
 from ..serializers import VisitanteListSerializer, VisitanteSerializer
 
 
@@ -19,12 +23,7 @@ def _enviar_qrcode_email_visitante(visitante):
     """
     import base64
     import io
-    import json
-    import urllib.error
-    import urllib.request
 
-    import qrcode
-    import resend
     from django.conf import settings as django_settings
 
     if not visitante.email:
@@ -40,42 +39,21 @@ def _enviar_qrcode_email_visitante(visitante):
         condominio = getattr(morador, "condominio", None)
         condominio_nome = condominio.nome if condominio else "Condomínio"
 
-        # Resolver endereço via ViaCEP
+        # Endereço já resolvido e gravado no condomínio (sem I/O externo)
         condominio_endereco = ""
         if condominio:
             cep_raw = (getattr(condominio, "cep", None) or "").strip()
             endereco_parts = []
             if cep_raw:
-                cep_only = "".join(c for c in cep_raw if c.isdigit())
-                if cep_only:
-                    try:
-                        via_url = f"https://viacep.com.br/ws/{cep_only}/json/"
-                        req = urllib.request.Request(
-                            via_url, headers={"User-Agent": "CancellaFlow/1.0"}
-                        )
-                        with urllib.request.urlopen(req, timeout=5) as resp:
-                            data = json.load(resp)
-                        if not data.get("erro"):
-                            for part in [
-                                data.get("logradouro"),
-                                data.get("bairro"),
-                            ]:
-                                if part:
-                                    endereco_parts.append(part)
-                            cidade_uf = ", ".join(
-                                p
-                                for p in [
-                                    data.get("localidade"),
-                                    data.get("uf"),
-                                ]
-                                if p
-                            )
-                            if cidade_uf:
-                                endereco_parts.append(cidade_uf)
-                            endereco_parts.append(f"CEP {cep_raw}")
-                    except Exception:
-                        if cep_raw:
-                            endereco_parts.append(f"CEP {cep_raw}")
+                for part in [condominio.logradouro, condominio.bairro]:
+                    if part:
+                        endereco_parts.append(part)
+                cidade_uf = ", ".join(
+                    p for p in [condominio.cidade, condominio.estado] if p
+                )
+                if cidade_uf:
+                    endereco_parts.append(cidade_uf)
+                endereco_parts.append(f"CEP {cep_raw}")
             for attr in ["numero", "complemento"]:
                 val = getattr(condominio, attr, None)
                 if val:
@@ -90,11 +68,7 @@ def _enviar_qrcode_email_visitante(visitante):
             or morador.username
         )
 
-        # Gerar QR code em memória
-        img = qrcode.make(str(visitante.qr_token))
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        qr_bytes = buffer.getvalue()
+        qr_bytes = qrcode_png(visitante.qr_token)
 
         # Logo do condomínio (opcional)
         logo_html = ""
@@ -103,8 +77,8 @@ def _enviar_qrcode_email_visitante(visitante):
             from PIL import Image
 
             raw_logo_bytes = None
-            if condominio and getattr(condominio, "logo_db_data", None):
-                raw_logo_bytes = bytes(condominio.logo_db_data)
+            if condominio and getattr(condominio, "logo_arquivo_id", None):
+                raw_logo_bytes = ler_arquivo(condominio.logo_arquivo_id)
             elif condominio and getattr(condominio, "logo", None):
                 logo_field = condominio.logo
                 try:
@@ -158,8 +132,6 @@ def _enviar_qrcode_email_visitante(visitante):
     <p style="color:#9ca3af;font-size:0.75rem;margin:0;">{condominio_nome}</p>
   </div>
 </div>"""
-
-        resend.api_key = api_key
         payload = {
             "from": email_from,
             "to": [visitante.email],
@@ -184,7 +156,7 @@ def _enviar_qrcode_email_visitante(visitante):
                 }
             )
 
-        resend.Emails.send(payload)
+        enfileirar_email(payload)
         return True
     except Exception:
         return False
@@ -219,9 +191,9 @@ def visitante_list_view(request):
         )
 
         # Controle de acesso por grupo
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         # Parâmetro de escopo (opcional) para Síndicos: 'all' ou 'mine'
         scope = (request.GET.get("scope") or "").lower()
@@ -232,9 +204,7 @@ def visitante_list_view(request):
             and not user.is_staff
             and getattr(user, "condominio_id", None)
         ):
-            visitantes = visitantes.filter(
-                morador__condominio_id=user.condominio_id
-            )
+            visitantes = visitantes.for_condominio(user.condominio_id)
         elif is_morador and not (user.is_staff or is_portaria or is_sindico):
             # Moradores veem apenas seus próprios visitantes
             visitantes = visitantes.filter(morador=user)
@@ -242,9 +212,7 @@ def visitante_list_view(request):
             # Síndicos podem ver seus próprios visitantes por padrão
             # ou todos do condomínio quando scope=all
             if scope == "all" and getattr(user, "condominio_id", None):
-                visitantes = visitantes.filter(
-                    morador__condominio_id=user.condominio_id
-                )
+                visitantes = visitantes.for_condominio(user.condominio_id)
             else:
                 visitantes = visitantes.filter(morador=user)
         elif not (user.is_staff or is_portaria):
@@ -274,27 +242,14 @@ def visitante_list_view(request):
                 )
             )
 
-        # Ordenação
-        visitantes = visitantes.order_by("-data_entrada")
+        # Ordenação e paginação (por página ou por cursor)
+        itens, paginacao = paginar(request, visitantes, 10, ("-data_entrada",))
 
-        # Paginação
-        page = int(request.GET.get("page", 1))
-        paginator = Paginator(visitantes, 10)
-        page_obj = paginator.get_page(page)
-
-        serializer = VisitanteListSerializer(page_obj.object_list, many=True)
-
-        return Response(
-            {
-                "results": serializer.data,
-                "count": paginator.count,
-                "num_pages": paginator.num_pages,
-                "current_page": page_obj.number,
-                "has_next": page_obj.has_next(),
-                "has_previous": page_obj.has_previous(),
-            }
-        )
+        serializer = VisitanteListSerializer(itens, many=True)
+        return Response({"results": serializer.data, **paginacao})
 
+    except CursorInvalido as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"Erro ao listar visitantes: {str(e)}"},
@@ -311,8 +266,8 @@ def visitante_create_view(request):
     """
     try:
         user = request.user
-        is_morador = user.groups.filter(name="Moradores").exists()
-        is_sindico = user.groups.filter(name="Síndicos").exists()
+        is_morador = pertence_a_grupo(user, "Moradores")
+        is_sindico = pertence_a_grupo(user, "Síndicos")
 
         if not (user.is_staff or is_morador or is_sindico):
             return Response(
@@ -385,8 +340,8 @@ def visitante_detail_view(request, pk):
     try:
         visitante = Visitante.objects.select_related("morador").get(pk=pk)
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
         if (
             is_morador
             and not (user.is_staff or is_portaria)
@@ -421,8 +376,8 @@ def visitante_update_view(request, pk):
     """
     try:
         user = request.user
-        is_portaria = user.groups.filter(name="Portaria").exists()
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_portaria = pertence_a_grupo(user, "Portaria")
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         visitante = Visitante.objects.get(pk=pk)
 
@@ -474,7 +429,7 @@ def visitante_delete_view(request, pk):
     """
     try:
         user = request.user
-        is_morador = user.groups.filter(name="Moradores").exists()
+        is_morador = pertence_a_grupo(user, "Moradores")
 
         visitante = Visitante.objects.get(pk=pk)
 
@@ -527,7 +482,7 @@ def visitante_enviar_qrcode_view(request, pk):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    is_morador = user.groups.filter(name="Moradores").exists()
+    is_morador = pertence_a_grupo(user, "Moradores")
     if not (user.is_staff or (is_morador and visitante.morador == user)):
         return Response(
             {"error": "Sem permissão."}, status=status.HTTP_403_FORBIDDEN
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+
+from cadastros.models import Condominio, EventoCerimonial
+from cadastros.models.endereco import CAMPOS_CHAVE_ENDERECO
+
+MODELOS = {
+    "condominio": Condominio,
+    "evento_cerimonial": EventoCerimonial,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Preenche os campos de endereço (logradouro, bairro, cidade, estado, "
+        "endereco_completo) de condomínios e eventos do cerimonial a partir "
+        "do CEP, em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Quantidade de registros por lote (padrão: 200)",
+        )
+        parser.add_argument(
+            "--modelo",
+            choices=sorted(MODELOS),
+            action="append",
+            help="Restringe a um modelo (pode ser repetido)",
+        )
+        parser.add_argument(
+            "--todos",
+            action="store_true",
+            help="Recalcula também registros que já têm endereço preenchido",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        nomes = options["modelo"] or sorted(MODELOS)
+
+        for nome in nomes:
+            total = self._processar(
+                MODELOS[nome], batch_size, options["todos"]
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f"{nome}: {total} registro(s) atualizados")
+            )
+
+    def _processar(self, model, batch_size, todos):
+        campos = model.CAMPOS_ENDERECO
+        qs = model.objects.all()
+        if not todos:
+            # Sem logradouro: nunca resolvido ou salvo com o provedor fora do
+            # ar (endereco_completo fica só com "CEP: ...")
+            qs = qs.exclude(cep="").filter(logradouro="")
+        qs = qs.only("id", *CAMPOS_CHAVE_ENDERECO, *campos).order_by("pk")
+
+        total = 0
+        ultimo_pk = 0
+        while True:
+            lote = list(qs.filter(pk__gt=ultimo_pk)[:batch_size])
+            if not lote:
+                break
+            for obj in lote:
+                obj.atualizar_endereco()
+            model.objects.bulk_update(lote, campos)
+            total += len(lote)
+            ultimo_pk = lote[-1].pk
+            self.stdout.write(f"  {model.__name__}: {total} processados...")
+        return total
@@ -0,0 +1,267 @@
+import json
+import math
+import subprocess
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http.request import validate_host
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from cadastros.models import (
+    Condominio,
+    ConvidadoListaCerimonial,
+    Encomenda,
+    Unidade,
+    Visitante,
+)
+from cadastros.services.carga_sintetica import nome_usuario
+
+User = get_user_model()
+
+# (url, perfil que faz a requisição, parâmetros)
+ENDPOINTS = (
+    ("user-list", "admin", {}),
+    ("condominio-list", "admin", {}),
+    ("unidade-list", "sindico", {}),
+    ("encomenda-list", "portaria", {}),
+    ("visitante-list", "portaria", {}),
+    ("evento-cerimonial-list", "cerimonialista", {}),
+    ("listas-convidados-cerimonial", "cerimonialista", {}),
+    ("sindico-stats", "sindico", {}),
+    ("portaria-stats", "portaria", {}),
+    ("morador-stats", "morador", {}),
+    ("admin-stats", "admin", {}),
+)
+
+VOLUMES = {
+    "condominios": Condominio,
+    "unidades": Unidade,
+    "usuarios": User,
+    "encomendas": Encomenda,
+    "visitantes": Visitante,
+    "convidados_cerimonial": ConvidadoListaCerimonial,
+}
+
+
+def percentil(valores, p):
+    """Percentil pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    return ordenados[max(math.ceil(p / 100 * len(ordenados)) - 1, 0)]
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _host():
+    # O Client usa "testserver", que fora dos testes não está em ALLOWED_HOSTS
+    if validate_host("testserver", settings.ALLOWED_HOSTS):
+        return "testserver"
+    return settings.ALLOWED_HOSTS[0].lstrip(".")
+
+
+class _ContadorConsultas:
+    def __init__(self):
+        self.consultas = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.consultas += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede os principais endpoints com o test client (p50/p95/p99, "
+        "consultas e memória) sobre a carga do seed_load e grava o "
+        "resultado em JSON para comparar entre commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeticoes",
+            type=int,
+            default=30,
+            help="Requisições medidas por endpoint (padrão: 30)",
+        )
+        parser.add_argument(
+            "--aquecimento",
+            type=int,
+            default=3,
+            help="Requisições descartadas antes da medição (padrão: 3)",
+        )
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            choices=[url for url, _, _ in ENDPOINTS],
+            help="Mede apenas os endpoints informados",
+        )
+        parser.add_argument(
+            "--frio",
+            action="store_true",
+            help="Limpa o cache antes de cada requisição",
+        )
+        parser.add_argument(
+            "--saida",
+            help="Arquivo JSON do resultado (padrão: bench-<commit>.json)",
+        )
+        parser.add_argument(
+            "--comparar",
+            help="JSON de uma execução anterior para comparar",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeticoes"] < 1:
+            raise CommandError("--repeticoes deve ser ao menos 1")
+        selecionados = options["endpoints"]
+        endpoints = [
+            endpoint
+            for endpoint in ENDPOINTS
+            if not selecionados or endpoint[0] in selecionados
+        ]
+        clientes = self._clientes({perfil for _, perfil, _ in endpoints})
+
+        resultados = {}
+        for url, perfil, params in endpoints:
+            resultados[url] = self._medir(
+                clientes[perfil], reverse(url), params, options
+            )
+            resultados[url]["perfil"] = perfil
+            self._imprimir(url, resultados[url])
+
+        commit = _commit()
+        relatorio = {
+            "commit": commit,
+            "data": timezone.now().isoformat(),
+            "banco": connection.vendor,
+            "repeticoes": options["repeticoes"],
+            "aquecimento": options["aquecimento"],
+            "frio": options["frio"],
+            "volumes": {
+                nome: modelo.objects.count()
+                for nome, modelo in VOLUMES.items()
+            },
+            "endpoints": resultados,
+        }
+        saida = options["saida"] or f"bench-{commit[:10] or 'local'}.json"
+        with open(saida, "w") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Resultado gravado em {saida}"))
+
+        if options["comparar"]:
+            self._comparar(options["comparar"], relatorio)
+
+    def _clientes(self, perfis):
+        clientes = {}
+        for perfil in perfis:
+            username = nome_usuario(perfil)
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(
+                    f"Usuário {username} não encontrado; rode o seed_load"
+                )
+            token = Token.objects.get_or_create(user=user)[0]
+            clientes[perfil] = Client(
+                HTTP_HOST=_host(), HTTP_AUTHORIZATION=f"Token {token.key}"
+            )
+        return clientes
+
+    def _requisitar(self, cliente, caminho, params, frio):
+        if frio:
+            cache.clear()
+        contador = _ContadorConsultas()
+        with connection.execute_wrapper(contador):
+            inicio = time.perf_counter()
+            response = cliente.get(caminho, params)
+            duracao = time.perf_counter() - inicio
+        return response, duracao * 1000, contador.consultas
+
+    def _medir(self, cliente, caminho, params, options):
+        for _ in range(options["aquecimento"]):
+            self._requisitar(cliente, caminho, params, options["frio"])
+
+        tempos, consultas = [], []
+        for _ in range(options["repeticoes"]):
+            response, ms, total = self._requisitar(
+                cliente, caminho, params, options["frio"]
+            )
+            tempos.append(ms)
+            consultas.append(total)
+
+        # Memória numa requisição à parte: o tracemalloc distorce o tempo
+        tracemalloc.start()
+        try:
+            self._requisitar(cliente, caminho, params, options["frio"])
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "status": response.status_code,
+            "p50_ms": round(percentil(tempos, 50), 2),
+            "p95_ms": round(percentil(tempos, 95), 2),
+            "p99_ms": round(percentil(tempos, 99), 2),
+            "media_ms": round(sum(tempos) / len(tempos), 2),
+            "consultas": max(consultas),
+            "bytes": len(response.content),
+            "memoria_pico_kib": round(pico / 1024, 1),
+        }
+
+    def _imprimir(self, url, resultado):
+        linha = (
+            f"{url} [{resultado['perfil']}]: "
+            f"p50 {resultado['p50_ms']:.1f} ms, "
+            f"p95 {resultado['p95_ms']:.1f} ms, "
+            f"p99 {resultado['p99_ms']:.1f} ms, "
+            f"{resultado['consultas']} consultas, "
+            f"{resultado['memoria_pico_kib']:.0f} KiB"
+        )
+        if resultado["status"] != 200:
+            self.stdout.write(
+                self.style.ERROR(f"{linha} (status {resultado['status']})")
+            )
+        else:
+            self.stdout.write(linha)
+
+    def _comparar(self, caminho, atual):
+        try:
+            with open(caminho) as arquivo:
+                anterior = json.load(arquivo)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Não foi possível ler {caminho}: {e}")
+
+        self.stdout.write(
+            f"Comparação com {anterior.get('commit', '')[:10] or caminho}:"
+        )
+        for url, depois in atual["endpoints"].items():
+            antes = anterior["endpoints"].get(url)
+            if antes is None:
+                continue
+            variacao = (
+                (depois["p95_ms"] - antes["p95_ms"]) / antes["p95_ms"] * 100
+                if antes["p95_ms"]
+                else 0.0
+            )
+            linha = (
+                f"{url}: p95 {antes['p95_ms']:.1f} -> "
+                f"{depois['p95_ms']:.1f} ms ({variacao:+.0f}%), consultas "
+                f"{antes['consultas']} -> {depois['consultas']}"
+            )
+            if depois["consultas"] > antes["consultas"]:
+                linha = self.style.WARNING(linha)
+            self.stdout.write(linha)
@@ -0,0 +1,81 @@
+import copy
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from app.utils.conexao_banco import MODOS_CONEXAO, configurar_conexao
+
+User = get_user_model()
+
+
+def _requisicao():
+    # Os signals de início/fim de request disparam o close_old_connections,
+    # como no ciclo real do Django
+    request_started.send(sender=Command)
+    try:
+        User.objects.only("pk").order_by("pk").first()
+    finally:
+        request_finished.send(sender=Command)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara requisições por segundo em cada modo de conexão com o "
+        "banco (DB_CONEXAO_MODO). Use com o Postgres local ou o pooler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requisicoes",
+            type=int,
+            default=200,
+            help="Requisições simuladas por modo (padrão: 200)",
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=60,
+            help="CONN_MAX_AGE dos modos persistentes (padrão: 60)",
+        )
+        parser.add_argument(
+            "--modos",
+            nargs="+",
+            choices=MODOS_CONEXAO,
+            default=list(MODOS_CONEXAO),
+        )
+
+    def handle(self, *args, **options):
+        banco = connections["default"]
+        if banco.vendor != "postgresql":
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Banco {banco.vendor}: o custo de conexão não é "
+                    "representativo do Postgres"
+                )
+            )
+
+        original = copy.deepcopy(banco.settings_dict)
+        try:
+            for modo in options["modos"]:
+                banco.close()
+                configurar_conexao(
+                    banco.settings_dict, modo, max_age=options["max_age"]
+                )
+                _requisicao()  # aquecimento
+
+                inicio = time.perf_counter()
+                for _ in range(options["requisicoes"]):
+                    _requisicao()
+                duracao = time.perf_counter() - inicio
+
+                self.stdout.write(
+                    f"{modo}: {options['requisicoes'] / duracao:.1f} req/s "
+                    f"({duracao / options['requisicoes'] * 1000:.2f} ms "
+                    "por requisição)"
+                )
+        finally:
+            banco.close()
+            banco.settings_dict.update(original)
@@ -0,0 +1,115 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from app.compressao import QUALIDADE_BROTLI, brotli
+from app.utils.json_rapido import JSONRapidoRenderer, orjson
+from cadastros.api.serializers import UnidadeListSerializer
+from cadastros.api.serializers.evento_cerimonial_serializer import (
+    EventoCerimonialListSerializer,
+)
+from cadastros.api.serializers.lista_convidados_cerimonial_serializer import (
+    ListaConvidadosCerimonialSerializer,
+)
+from cadastros.models import (
+    EventoCerimonial,
+    ListaConvidadosCerimonial,
+    Unidade,
+)
+
+
+def _payloads(limite):
+    """Respostas das maiores listagens, montadas com os dados do banco."""
+    listas = (
+        ListaConvidadosCerimonial.objects.annotate(total=Count("convidados"))
+        .order_by("-total")
+        .select_related("evento")[:limite]
+    )
+    unidades = Unidade.objects.prefetch_related("moradores").order_by(
+        "condominio_id", "bloco", "numero"
+    )[:limite]
+    eventos = EventoCerimonial.objects.select_related(
+        "lista_convidados"
+    ).order_by("-datetime_inicio")[:limite]
+    return {
+        "listas-convidados-cerimonial": ListaConvidadosCerimonialSerializer(
+            listas, many=True
+        ).data,
+        "unidades": {
+            "results": UnidadeListSerializer(unidades, many=True).data
+        },
+        "eventos-cerimonial": {
+            "results": EventoCerimonialListSerializer(eventos, many=True).data
+        },
+    }
+
+
+def _cronometrar(renderer, dados, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        corpo = renderer.render(dados)
+    return (time.perf_counter() - inicio) / repeticoes * 1000, corpo
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara renderização JSON (stdlib x orjson) e compressão (gzip x "
+        "brotli) nas maiores listagens da API, com os dados do banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limite",
+            type=int,
+            default=500,
+            help="Itens por listagem (padrão: 500)",
+        )
+        parser.add_argument(
+            "--repeticoes",
+            type=int,
+            default=20,
+            help="Renderizações por medição (padrão: 20)",
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson não instalado: o renderer rápido usa a stdlib"
+                )
+            )
+        padrao, rapido = JSONRenderer(), JSONRapidoRenderer()
+
+        mais_lentas = []
+        for nome, dados in _payloads(options["limite"]).items():
+            ms_padrao, corpo = _cronometrar(
+                padrao, dados, options["repeticoes"]
+            )
+            ms_rapido, corpo_rapido = _cronometrar(
+                rapido, dados, options["repeticoes"]
+            )
+            if orjson is not None and ms_rapido >= ms_padrao:
+                mais_lentas.append(nome)
+            if corpo_rapido != corpo:
+                self.stdout.write(
+                    self.style.ERROR(f"{nome}: saídas JSON diferentes")
+                )
+
+            tamanhos = [f"json {len(corpo)} B"]
+            tamanhos.append(f"gzip {len(gzip.compress(corpo))} B")
+            if brotli is not None:
+                comprimido = brotli.compress(corpo, quality=QUALIDADE_BROTLI)
+                tamanhos.append(f"br {len(comprimido)} B")
+            self.stdout.write(
+                f"{nome}: stdlib {ms_padrao:.2f} ms, "
+                f"rápido {ms_rapido:.2f} ms; " + ", ".join(tamanhos)
+            )
+
+        if mais_lentas:
+            raise CommandError(
+                "Renderer rápido não foi mais rápido que o padrão em: "
+                + ", ".join(mais_lentas)
+            )
@@ -0,0 +1,63 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from cadastros.models import ArquivoVariante
+from cadastros.services.arquivo_service import REFERENCIAS
+from cadastros.services.imagem_service import gerar_variantes
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera as variantes redimensionadas (WebP/PNG) das imagens já "
+        "armazenadas (fotos de usuário, logos e imagens de eventos), em "
+        "lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Quantidade de imagens por lote (padrão: 100)",
+        )
+        parser.add_argument(
+            "--todos",
+            action="store_true",
+            help="Regera também as imagens que já têm variantes",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        ids = sorted(self._arquivos_referenciados())
+        if not options["todos"]:
+            com_variantes = set(
+                ArquivoVariante.objects.values_list("original_id", flat=True)
+            )
+            ids = [pk for pk in ids if pk not in com_variantes]
+
+        total = 0
+        for inicio in range(0, len(ids), batch_size):
+            for arquivo_id in ids[inicio : inicio + batch_size]:
+                total += gerar_variantes(
+                    arquivo_id, substituir=options["todos"]
+                )
+            self.stdout.write(
+                f"  {min(inicio + batch_size, len(ids))}/{len(ids)} "
+                "imagens processadas..."
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"{total} variante(s) gerada(s)"))
+
+    def _arquivos_referenciados(self):
+        """Ids dos arquivos usados como imagem original por algum modelo."""
+        ids = set()
+        for app_label, model_name, campo in REFERENCIAS:
+            if model_name == "ArquivoVariante":
+                continue
+            model = apps.get_model(app_label, model_name)
+            ids.update(
+                model.objects.filter(**{f"{campo}__isnull": False})
+                .values_list(f"{campo}_id", flat=True)
+                .distinct()
+            )
+        return ids
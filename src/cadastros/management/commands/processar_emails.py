@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cadastros.services.convite_cerimonial_service import (
+    retomar_envios_interrompidos,
+)
+from cadastros.services.email_service import processar_lote, purgar_outbox
+
+# Intervalo entre as limpezas da outbox no modo contínuo
+INTERVALO_PURGA = 3600
+
+# Intervalo entre as buscas por envios de listas do cerimonial parados
+INTERVALO_RETOMADA = 60
+
+
+class Command(BaseCommand):
+    help = (
+        "Envia os e-mails pendentes da outbox em lotes. Com --continuo fica "
+        "em execução como worker; vários workers podem rodar em paralelo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Quantidade de e-mails por lote (padrão: EMAIL_OUTBOX_LOTE)",
+        )
+        parser.add_argument(
+            "--continuo",
+            action="store_true",
+            help="Continua processando até ser interrompido",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=5,
+            help="Segundos de espera quando a fila está vazia (padrão: 5)",
+        )
+        parser.add_argument(
+            "--retencao-dias",
+            type=int,
+            default=None,
+            help=(
+                "Remove enviados/descartados mais antigos que isso "
+                "(padrão: EMAIL_OUTBOX_RETENCAO_DIAS)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        total_enviados = total_falhas = 0
+        ultima_purga = ultima_retomada = None
+
+        try:
+            while True:
+                if (
+                    ultima_purga is None
+                    or time.monotonic() - ultima_purga >= INTERVALO_PURGA
+                ):
+                    removidos = purgar_outbox(options["retencao_dias"])
+                    ultima_purga = time.monotonic()
+                    if removidos:
+                        self.stdout.write(
+                            f"  {removidos} e-mail(s) antigo(s) removido(s)"
+                        )
+                if (
+                    ultima_retomada is None
+                    or time.monotonic() - ultima_retomada >= INTERVALO_RETOMADA
+                ):
+                    retomados = retomar_envios_interrompidos()
+                    ultima_retomada = time.monotonic()
+                    if retomados:
+                        self.stdout.write(
+                            f"  {retomados} envio(s) de lista retomado(s)"
+                        )
+                enviados, falhas = processar_lote(limite=batch_size)
+                total_enviados += enviados
+                total_falhas += falhas
+                if enviados or falhas:
+                    self.stdout.write(
+                        f"  lote: {enviados} enviado(s), {falhas} falha(s)"
+                    )
+                    continue
+                if not options["continuo"]:
+                    break
+                time.sleep(options["intervalo"])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total_enviados} e-mail(s) enviado(s), "
+                f"{total_falhas} falha(s)"
+            )
+        )
@@ -0,0 +1,100 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from cadastros.services.carga_sintetica import (
+    GeradorCarga,
+    existe_carga,
+    limpar,
+)
+
+VOLUMES = (
+    ("condominios", 5),
+    ("unidades", 500),
+    ("moradores", 2000),
+    ("encomendas", 20000),
+    ("visitantes", 20000),
+    ("eventos", 3),
+    ("convidados", 5000),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera dados sintéticos determinísticos em volume (bulk_create) para "
+        "testes de desempenho. Ex. de escala real: --condominios 500 "
+        "--unidades 50000 --moradores 200000 --encomendas 2000000 "
+        "--visitantes 2000000 --eventos 20 --convidados 5000"
+    )
+
+    def add_arguments(self, parser):
+        for nome, padrao in VOLUMES:
+            parser.add_argument(
+                f"--{nome}",
+                type=int,
+                default=padrao,
+                help=f"Quantidade de {nome} (padrão: {padrao})"
+                + (" por evento" if nome == "convidados" else ""),
+            )
+        parser.add_argument(
+            "--semente",
+            type=int,
+            default=42,
+            help="Semente dos geradores aleatórios (padrão: 42)",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=5000,
+            help="Registros por bulk_create (padrão: 5000)",
+        )
+        parser.add_argument(
+            "--forcar",
+            action="store_true",
+            help="Permite rodar com DEBUG desligado (nunca em produção)",
+        )
+        parser.add_argument(
+            "--limpar",
+            action="store_true",
+            help="Remove a carga anterior antes de gerar a nova",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["forcar"]:
+            raise CommandError(
+                "seed_load grava milhares de usuários (inclusive um staff): "
+                "só roda com DEBUG ligado ou com --forcar"
+            )
+        volumes = {nome: options[nome] for nome, _ in VOLUMES}
+        if volumes["condominios"] < 1 or volumes["unidades"] < 1:
+            raise CommandError("Informe ao menos um condomínio e uma unidade")
+
+        if existe_carga():
+            if not options["limpar"]:
+                raise CommandError(
+                    "Já existe carga gerada no banco; use --limpar"
+                )
+            self.stdout.write("Removendo a carga anterior...")
+            limpar()
+
+        inicio = time.perf_counter()
+        gerador = GeradorCarga(
+            semente=options["semente"],
+            lote=options["lote"],
+            progresso=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        gerador.gerar(**volumes)
+        # Dashboards e grupos em cache não enxergam o que o bulk_create gravou
+        cache.clear()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Carga gerada em "
+                f"{time.perf_counter() - inicio:.1f} s: "
+                + ", ".join(
+                    f"{nome} {valor}" for nome, valor in volumes.items()
+                )
+            )
+        )
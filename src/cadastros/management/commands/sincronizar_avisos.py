@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from cadastros.models import Aviso
+from cadastros.services.aviso_service import sincronizar_aviso
+
+
+class Command(BaseCommand):
+    help = (
+        "Refaz as entregas (caixa de entrada) dos avisos vigentes. Útil após "
+        "alterações em massa de grupos ou unidades feitas sem signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--todos",
+            action="store_true",
+            help="Inclui avisos inativos e expirados",
+        )
+
+    def handle(self, *args, **options):
+        avisos = Aviso.objects.all()
+        if not options["todos"]:
+            agora = timezone.now()
+            avisos = avisos.filter(status=Aviso.STATUS_ATIVO).filter(
+                Q(data_fim__gte=agora) | Q(data_fim__isnull=True)
+            )
+
+        total = 0
+        for aviso_id in avisos.values_list("id", flat=True).iterator():
+            sincronizar_aviso(aviso_id)
+            total += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{total} aviso(s) sincronizado(s)")
+        )
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.10 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "cadastros",
+            "0007_remove_eventocerimonialconvite_unique_convite_ativo_por_evento_tipo_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CepEndereco",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "cep",
+                    models.CharField(
+                        help_text="CEP somente com números",
+                        max_length=8,
+                        unique=True,
+                        verbose_name="CEP",
+                    ),
+                ),
+                (
+                    "logradouro",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "bairro",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "cidade",
+                    models.CharField(blank=True, default="", max_length=255),
+                ),
+                (
+                    "estado",
+                    models.CharField(blank=True, default="", max_length=2),
+                ),
+                (
+                    "encontrado",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Falso quando o CEP não existe nos provedores consultados",
+                        verbose_name="Encontrado",
+                    ),
+                ),
+                (
+                    "fonte",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Provedor que resolveu o CEP (brasilapi, viacep)",
+                        max_length=20,
+                        verbose_name="Fonte",
+                    ),
+                ),
+                (
+                    "consultado_em",
+                    models.DateTimeField(
+                        help_text="Data da última consulta ao provedor externo",
+                        verbose_name="Consultado em",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Endereço por CEP",
+                "verbose_name_plural": "Endereços por CEP",
+                "ordering": ["cep"],
+            },
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 4.2.10 on 2026-10-17 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0008_cependereco"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="condominio",
+            name="bairro",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Bairro",
+            ),
+        ),
+        migrations.AddField(
+            model_name="condominio",
+            name="cidade",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Cidade",
+            ),
+        ),
+        migrations.AddField(
+            model_name="condominio",
+            name="endereco_completo",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Endereço formatado para exibição",
+                max_length=600,
+                verbose_name="Endereço completo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="condominio",
+            name="estado",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="UF, preenchida automaticamente a partir do CEP",
+                max_length=2,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="condominio",
+            name="logradouro",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Logradouro",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="bairro",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Bairro",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="cidade",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Cidade",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="endereco_completo",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Endereço formatado para exibição",
+                max_length=600,
+                verbose_name="Endereço completo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="estado",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="UF, preenchida automaticamente a partir do CEP",
+                max_length=2,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="logradouro",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Preenchido automaticamente a partir do CEP",
+                max_length=255,
+                verbose_name="Logradouro",
+            ),
+        ),
+    ]
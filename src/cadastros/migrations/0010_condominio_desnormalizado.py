@@ -0,0 +1,179 @@
+# Generated by Django 4.2.10 on 2026-10-17 03:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0009_endereco_resolvido"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aviso",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="encomenda",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="espaco",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="espacoreserva",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evento",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ocorrencia",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="unidade",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="visitante",
+            name="condominio",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Condomínio ao qual o registro pertence",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                to="cadastros.condominio",
+                verbose_name="Condomínio",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="aviso",
+            index=models.Index(
+                fields=["condominio", "status", "data_inicio"],
+                name="aviso_condo_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="encomenda",
+            index=models.Index(
+                fields=["condominio", "retirado_em", "created_on"],
+                name="encomenda_condo_retirada_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="encomenda",
+            index=models.Index(
+                fields=["condominio", "unidade", "retirado_em"],
+                name="encomenda_condo_unidade_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="espaco",
+            index=models.Index(
+                fields=["condominio", "nome"], name="espaco_condo_nome_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="espacoreserva",
+            index=models.Index(
+                fields=["condominio", "data_reserva", "status"],
+                name="reserva_condo_data_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="evento",
+            index=models.Index(
+                fields=["condominio", "datetime_inicio"],
+                name="evento_condo_inicio_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ocorrencia",
+            index=models.Index(
+                fields=["condominio", "status", "created_at"],
+                name="ocorrencia_condo_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="unidade",
+            index=models.Index(
+                fields=["condominio", "bloco", "numero"],
+                name="unidade_condo_bloco_num_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visitante",
+            index=models.Index(
+                fields=["condominio", "data_entrada"],
+                name="visitante_condo_entrada_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visitante",
+            index=models.Index(
+                fields=["condominio", "data_saida"],
+                name="visitante_condo_saida_idx",
+            ),
+        ),
+    ]
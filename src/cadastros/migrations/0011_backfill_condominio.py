@@ -0,0 +1,88 @@
+from django.db import migrations
+from django.db.models import Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+TAMANHO_LOTE = 1000
+
+# Ordem importa: Unidade e Espaco são preenchidos antes dos modelos que
+# derivam o condomínio deles (Encomenda, Evento, EspacoReserva).
+ORIGENS = [
+    ("Unidade", [("created_by_id", "access", "User")]),
+    ("Espaco", [("created_by_id", "access", "User")]),
+    ("Aviso", [("created_by_id", "access", "User")]),
+    (
+        "Encomenda",
+        [
+            ("created_by_id", "access", "User"),
+            ("unidade_id", "cadastros", "Unidade"),
+        ],
+    ),
+    (
+        "Evento",
+        [
+            ("created_by_id", "access", "User"),
+            ("espaco_id", "cadastros", "Espaco"),
+        ],
+    ),
+    ("Visitante", [("morador_id", "access", "User")]),
+    (
+        "EspacoReserva",
+        [
+            ("espaco_id", "cadastros", "Espaco"),
+            ("morador_id", "access", "User"),
+            ("created_by_id", "access", "User"),
+        ],
+    ),
+    ("Ocorrencia", [("criado_por_id", "access", "User")]),
+]
+
+
+def _expressao_condominio(apps, origens):
+    subqueries = [
+        Subquery(
+            apps.get_model(app_label, model_name)
+            .objects.filter(pk=OuterRef(campo))
+            .values("condominio_id")[:1]
+        )
+        for campo, app_label, model_name in origens
+    ]
+    if len(subqueries) == 1:
+        return subqueries[0]
+    return Coalesce(*subqueries)
+
+
+def preencher_condominio(apps, _schema_editor):
+    for model_name, origens in ORIGENS:
+        model = apps.get_model("cadastros", model_name)
+        limites = model.objects.filter(condominio__isnull=True).aggregate(
+            menor=Min("pk"), maior=Max("pk")
+        )
+        if limites["menor"] is None:
+            continue
+
+        expressao = _expressao_condominio(apps, origens)
+        inicio = limites["menor"]
+        while inicio <= limites["maior"]:
+            model.objects.filter(
+                pk__gte=inicio,
+                pk__lt=inicio + TAMANHO_LOTE,
+                condominio__isnull=True,
+            ).update(condominio_id=expressao)
+            inicio += TAMANHO_LOTE
+
+
+class Migration(migrations.Migration):
+    # Cada lote é confirmado separadamente para não manter um lock longo
+    atomic = False
+
+    dependencies = [
+        ("access", "0003_create_event_user_groups"),
+        ("cadastros", "0010_condominio_desnormalizado"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            preencher_condominio,
+            migrations.RunPython.noop,
+        ),
+    ]
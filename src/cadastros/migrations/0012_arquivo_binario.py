@@ -0,0 +1,174 @@
+# Generated by Django 4.2.10 on 2026-10-17 03:55
+
+import hashlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# (app_label, modelo, prefixo dos campos <prefixo>_db_data/<prefixo>_arquivo)
+REFERENCIAS = [
+    ("cadastros", "Condominio", "logo"),
+    ("cadastros", "Evento", "imagem"),
+    ("cadastros", "EventoCerimonial", "imagem"),
+]
+
+
+def mover_para_arquivos(apps, _schema_editor):
+    ArquivoBinario = apps.get_model("cadastros", "ArquivoBinario")
+    for app_label, model_name, prefixo in REFERENCIAS:
+        model = apps.get_model(app_label, model_name)
+        campo_dados = f"{prefixo}_db_data"
+        pks = list(
+            model.objects.filter(
+                **{f"{campo_dados}__isnull": False}
+            ).values_list("pk", flat=True)
+        )
+        # Um registro por vez para não carregar todos os BLOBs em memória
+        for pk in pks:
+            dados, content_type = (
+                model.objects.filter(pk=pk)
+                .values_list(campo_dados, f"{prefixo}_db_content_type")
+                .first()
+            )
+            if not dados:
+                continue
+            dados = bytes(dados)
+            arquivo, _ = ArquivoBinario.objects.get_or_create(
+                hash=hashlib.sha256(dados).hexdigest(),
+                defaults={
+                    "tamanho": len(dados),
+                    "content_type": content_type or "",
+                    "dados": dados,
+                },
+            )
+            model.objects.filter(pk=pk).update(
+                **{f"{prefixo}_arquivo": arquivo}
+            )
+
+
+def restaurar_dos_arquivos(apps, _schema_editor):
+    ArquivoBinario = apps.get_model("cadastros", "ArquivoBinario")
+    for app_label, model_name, prefixo in REFERENCIAS:
+        model = apps.get_model(app_label, model_name)
+        campo_fk = f"{prefixo}_arquivo_id"
+        registros = model.objects.filter(
+            **{f"{campo_fk}__isnull": False}
+        ).values_list("pk", campo_fk)
+        for pk, arquivo_id in registros:
+            dados = (
+                ArquivoBinario.objects.filter(pk=arquivo_id)
+                .values_list("dados", flat=True)
+                .first()
+            )
+            model.objects.filter(pk=pk).update(**{f"{prefixo}_db_data": dados})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0011_backfill_condominio"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArquivoBinario",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hash",
+                    models.CharField(
+                        help_text="SHA-256 do conteúdo (hexadecimal)",
+                        max_length=64,
+                        unique=True,
+                        verbose_name="Hash",
+                    ),
+                ),
+                (
+                    "tamanho",
+                    models.PositiveIntegerField(
+                        help_text="Tamanho em bytes", verbose_name="Tamanho"
+                    ),
+                ),
+                (
+                    "content_type",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        max_length=100,
+                        verbose_name="Content-Type",
+                    ),
+                ),
+                ("dados", models.BinaryField(verbose_name="Dados")),
+                (
+                    "created_on",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Criado em"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Arquivo binário",
+                "verbose_name_plural": "Arquivos binários",
+            },
+        ),
+        migrations.AddField(
+            model_name="condominio",
+            name="logo_arquivo",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Logo armazenada no banco (armazenamento por conteúdo)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="cadastros.arquivobinario",
+                verbose_name="Logo (DB)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evento",
+            name="imagem_arquivo",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Imagem armazenada no banco (armazenamento por conteúdo)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="cadastros.arquivobinario",
+                verbose_name="Imagem (DB)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="eventocerimonial",
+            name="imagem_arquivo",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Imagem armazenada no banco (armazenamento por conteúdo)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="cadastros.arquivobinario",
+                verbose_name="Imagem (DB)",
+            ),
+        ),
+        migrations.RunPython(mover_para_arquivos, restaurar_dos_arquivos),
+        migrations.RemoveField(
+            model_name="condominio",
+            name="logo_db_data",
+        ),
+        migrations.RemoveField(
+            model_name="evento",
+            name="imagem_db_data",
+        ),
+        migrations.RemoveField(
+            model_name="eventocerimonial",
+            name="imagem_db_data",
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0012_arquivo_binario"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArquivoVariante",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "tamanho",
+                    models.PositiveSmallIntegerField(
+                        help_text="Maior lado da imagem em pixels",
+                        verbose_name="Tamanho",
+                    ),
+                ),
+                (
+                    "formato",
+                    models.CharField(
+                        choices=[("webp", "WebP"), ("png", "PNG")],
+                        max_length=10,
+                        verbose_name="Formato",
+                    ),
+                ),
+                (
+                    "arquivo",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="cadastros.arquivobinario",
+                        verbose_name="Arquivo",
+                    ),
+                ),
+                (
+                    "original",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="variantes",
+                        to="cadastros.arquivobinario",
+                        verbose_name="Original",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Variante de arquivo",
+                "verbose_name_plural": "Variantes de arquivo",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="arquivovariante",
+            constraint=models.UniqueConstraint(
+                fields=("original", "tamanho", "formato"),
+                name="arquivo_variante_unica",
+            ),
+        ),
+    ]
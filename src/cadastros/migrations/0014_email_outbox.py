@@ -0,0 +1,119 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:05
+
+import cadastros.models.email_outbox
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0013_arquivo_variante"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "chave_idempotencia",
+                    models.CharField(
+                        default=cadastros.models.email_outbox._nova_chave,
+                        max_length=255,
+                        unique=True,
+                        verbose_name="Chave de idempotência",
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        help_text="Parâmetros do e-mail no formato da API do Resend",
+                        verbose_name="Payload",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pendente", "Pendente"),
+                            ("enviando", "Enviando"),
+                            ("enviado", "Enviado"),
+                            ("falhou", "Falhou"),
+                        ],
+                        default="pendente",
+                        max_length=10,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "tentativas",
+                    models.PositiveSmallIntegerField(
+                        default=0, verbose_name="Tentativas"
+                    ),
+                ),
+                (
+                    "proxima_tentativa_em",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Próxima tentativa em",
+                    ),
+                ),
+                (
+                    "reservado_ate",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Fim da reserva do worker que está enviando o e-mail",
+                        null=True,
+                        verbose_name="Reservado até",
+                    ),
+                ),
+                (
+                    "enviado_em",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Enviado em"
+                    ),
+                ),
+                (
+                    "provedor_id",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        max_length=100,
+                        verbose_name="ID no provedor",
+                    ),
+                ),
+                (
+                    "ultimo_erro",
+                    models.TextField(
+                        blank=True, default="", verbose_name="Último erro"
+                    ),
+                ),
+                (
+                    "created_on",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Criado em"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "E-mail (outbox)",
+                "verbose_name_plural": "E-mails (outbox)",
+                "ordering": ["-created_on"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "proxima_tentativa_em"],
+                        name="email_outbox_fila_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("cadastros", "0014_email_outbox"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EnvioListaCerimonial",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pendente", "Pendente"),
+                            ("processando", "Processando"),
+                            ("concluido", "Concluído"),
+                            ("erro", "Erro"),
+                        ],
+                        default="pendente",
+                        max_length=12,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "url_base",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Usada nos links de confirmação de presença",
+                        max_length=255,
+                        verbose_name="URL base",
+                    ),
+                ),
+                (
+                    "total",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total"
+                    ),
+                ),
+                (
+                    "processados",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Processados"
+                    ),
+                ),
+                (
+                    "enfileirados_confirmacao",
+                    models.PositiveIntegerField(default=0),
+                ),
+                ("enfileirados_qr", models.PositiveIntegerField(default=0)),
+                (
+                    "erros",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Convidados que não puderam ser enfileirados",
+                        verbose_name="Erros",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("updated_on", models.DateTimeField(auto_now=True)),
+                ("concluido_em", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "lista",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="envios",
+                        to="cadastros.listaconvidadoscerimonial",
+                        verbose_name="Lista",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Envio da Lista de Convidados (Cerimonial)",
+                "verbose_name_plural": "Envios da Lista de Convidados (Cerimonial)",
+                "ordering": ["-created_on"],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0015_envio_lista_cerimonial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="encomenda",
+            index=models.Index(
+                condition=models.Q(("retirado_em__isnull", True)),
+                fields=["condominio", "unidade", "created_on"],
+                name="encomenda_pendente_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0016_encomenda_pendente_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="aviso",
+            name="encomenda",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Encomenda que gerou o aviso automático",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="avisos",
+                to="cadastros.encomenda",
+            ),
+        ),
+        migrations.AddField(
+            model_name="aviso",
+            name="origem",
+            field=models.CharField(
+                choices=[("manual", "Manual"), ("encomenda", "Encomenda")],
+                default="manual",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="aviso",
+            name="unidade",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Unidade destinatária do aviso automático",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="avisos",
+                to="cadastros.unidade",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="aviso",
+            index=models.Index(
+                fields=["condominio", "origem", "unidade"],
+                name="aviso_condo_origem_idx",
+            ),
+        ),
+    ]
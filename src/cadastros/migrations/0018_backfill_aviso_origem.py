@@ -0,0 +1,70 @@
+import re
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Q
+
+# Título gerado por criar_aviso_encomenda a partir de
+# Unidade.identificacao_completa ("Bl. <bloco> - Unid. <numero>" ou
+# "Unid. <numero>")
+TITULO_ENCOMENDA = re.compile(
+    r"^Nova encomenda para (?:Bl\. (?P<bloco>.+?) - )?Unid\. (?P<numero>.+)$"
+)
+
+# O aviso é criado logo depois da encomenda
+TOLERANCIA = timedelta(minutes=5)
+
+
+def _unidade(Unidade, aviso, bloco, numero):
+    unidades = Unidade.objects.filter(numero=numero)
+    if bloco:
+        unidades = unidades.filter(bloco=bloco)
+    else:
+        unidades = unidades.filter(Q(bloco__isnull=True) | Q(bloco=""))
+    if aviso.condominio_id:
+        unidades = unidades.filter(condominio_id=aviso.condominio_id)
+    return unidades.order_by("pk").first()
+
+
+def vincular_avisos_encomenda(apps, _schema_editor):
+    Aviso = apps.get_model("cadastros", "Aviso")
+    Encomenda = apps.get_model("cadastros", "Encomenda")
+    Unidade = apps.get_model("cadastros", "Unidade")
+
+    avisos = Aviso.objects.filter(
+        titulo__startswith="Nova encomenda para ", origem="manual"
+    ).iterator()
+    for aviso in avisos:
+        # Mesmo sem unidade identificada o aviso continua sendo de encomenda
+        # (fora do feed do síndico e dos moradores de outras unidades)
+        unidade = encomenda = None
+        encontrado = TITULO_ENCOMENDA.match(aviso.titulo)
+        if encontrado:
+            unidade = _unidade(
+                Unidade, aviso, encontrado["bloco"], encontrado["numero"]
+            )
+        if unidade is not None:
+            encomenda = (
+                Encomenda.objects.filter(
+                    unidade=unidade,
+                    created_on__lte=aviso.created_at + TOLERANCIA,
+                    avisos__isnull=True,
+                )
+                .order_by("-created_on")
+                .first()
+            )
+        Aviso.objects.filter(pk=aviso.pk).update(
+            origem="encomenda", unidade=unidade, encomenda=encomenda
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cadastros", "0017_aviso_origem"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            vincular_avisos_encomenda, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("cadastros", "0018_backfill_aviso_origem"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvisoEntrega",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ativo",
+                    models.BooleanField(
+                        default=True,
+                        help_text="Aviso ativo e, se de encomenda, ainda não retirada",
+                        verbose_name="Ativo",
+                    ),
+                ),
+                (
+                    "prioridade",
+                    models.CharField(max_length=10, verbose_name="Prioridade"),
+                ),
+                ("data_inicio", models.DateTimeField(verbose_name="Início")),
+                (
+                    "data_fim",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Fim"
+                    ),
+                ),
+                (
+                    "lido",
+                    models.BooleanField(default=False, verbose_name="Lido"),
+                ),
+                (
+                    "lido_em",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Lido em"
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "aviso",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="entregas",
+                        to="cadastros.aviso",
+                        verbose_name="Aviso",
+                    ),
+                ),
+                (
+                    "usuario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="avisos_entregues",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Usuário",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Entrega de Aviso",
+                "verbose_name_plural": "Entregas de Avisos",
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "usuario",
+                            "ativo",
+                            "prioridade",
+                            "data_inicio",
+                        ],
+                        name="aviso_entrega_feed_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="avisoentrega",
+            constraint=models.UniqueConstraint(
+                fields=("usuario", "aviso"), name="aviso_entrega_unica"
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations
+from django.db.models import Q
+from django.utils import timezone
+
+TAMANHO_LOTE = 1000
+
+
+def entregar_avisos_vigentes(apps, _schema_editor):
+    """Popula a caixa de entrada com os avisos ativos e não expirados."""
+    Aviso = apps.get_model("cadastros", "Aviso")
+    AvisoEntrega = apps.get_model("cadastros", "AvisoEntrega")
+    User = apps.get_model("access", "User")
+
+    agora = timezone.now()
+    avisos = (
+        Aviso.objects.filter(status="ativo")
+        .filter(Q(data_fim__gte=agora) | Q(data_fim__isnull=True))
+        .select_related("encomenda")
+    )
+    for aviso in avisos.iterator():
+        grupos_ids = set(aviso.grupos.values_list("id", flat=True))
+        if aviso.grupo_id:
+            grupos_ids.add(aviso.grupo_id)
+
+        usuarios = User.objects.filter(
+            is_active=True, groups__id__in=grupos_ids
+        )
+        if aviso.condominio_id:
+            usuarios = usuarios.filter(
+                Q(condominio_id=aviso.condominio_id)
+                | Q(condominio__isnull=True)
+            )
+        else:
+            usuarios = usuarios.filter(condominio__isnull=True)
+        if aviso.origem == "encomenda":
+            if aviso.unidade_id is None:
+                continue
+            usuarios = usuarios.filter(unidades__id=aviso.unidade_id)
+
+        ativo = aviso.encomenda is None or aviso.encomenda.retirado_em is None
+        AvisoEntrega.objects.bulk_create(
+            [
+                AvisoEntrega(
+                    usuario_id=usuario_id,
+                    aviso_id=aviso.pk,
+                    ativo=ativo,
+                    prioridade=aviso.prioridade,
+                    data_inicio=aviso.data_inicio,
+                    data_fim=aviso.data_fim,
+                )
+                for usuario_id in usuarios.values_list(
+                    "id", flat=True
+                ).distinct()
+            ],
+            batch_size=TAMANHO_LOTE,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("access", "0003_create_event_user_groups"),
+        ("cadastros", "0019_aviso_entrega"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            entregar_avisos_vigentes, migrations.RunPython.noop
+        ),
+    ]
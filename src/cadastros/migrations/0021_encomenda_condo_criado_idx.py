@@ -0,0 +1,20 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0020_backfill_aviso_entrega"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="encomenda",
+            index=models.Index(
+                fields=["condominio", "created_on"],
+                name="encomenda_condo_criado_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cadastros", "0021_encomenda_condo_criado_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailoutbox",
+            name="lote_envio",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="Chave de idempotência do lote no provedor",
+                max_length=32,
+                verbose_name="Lote de envio",
+            ),
+        ),
+    ]
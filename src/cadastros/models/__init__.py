@@ -1,6 +1,11 @@
+from .arquivo_binario import ArquivoBinario, ArquivoVariante
 from .aviso import Aviso
+from .aviso_entrega import AvisoEntrega
+from .cep_endereco import CepEndereco
 from .condominio import Condominio
+from .email_outbox import EmailOutbox
 from .encomenda import Encomenda
+from .envio_lista_cerimonial import EnvioListaCerimonial
 from .espaco import Espaco, EspacoInventarioItem, EspacoReserva
 from .evento import Evento
 from .evento_cerimonial import (
@@ -23,12 +28,17 @@ from .veiculo import Veiculo
 from .visitante import Visitante
 
 __all__ = [
+    "ArquivoBinario",
+    "ArquivoVariante",
+    "CepEndereco",
     "Condominio",
+    "EmailOutbox",
     "Encomenda",
     "Unidade",
     "Veiculo",
     "Visitante",
     "Aviso",
+    "AvisoEntrega",
     "Espaco",
     "EspacoInventarioItem",
     "EspacoReserva",
@@ -41,6 +51,7 @@ __all__ = [
     "ConvidadoLista",
     "ListaConvidadosCerimonial",
     "ConvidadoListaCerimonial",
+    "EnvioListaCerimonial",
     "RESPOSTA_PRESENCA_PENDENTE",
     "RESPOSTA_PRESENCA_CONFIRMADO",
     "RESPOSTA_PRESENCA_RECUSADO",
@@ -0,0 +1,88 @@
+from django.db import models
+
+
+class ArquivoBinario(models.Model):
+    """
+    Armazenamento de imagens/arquivos endereçado pelo conteúdo (SHA-256).
+
+    Os modelos apenas referenciam o arquivo por FK; os bytes ficam fora das
+    linhas "quentes" (usuário, condomínio, eventos) e só são lidos pelos
+    endpoints que servem a imagem. Conteúdos idênticos são gravados uma vez.
+    """
+
+    hash = models.CharField(
+        max_length=64,
+        unique=True,
+        verbose_name="Hash",
+        help_text="SHA-256 do conteúdo (hexadecimal)",
+    )
+    tamanho = models.PositiveIntegerField(
+        verbose_name="Tamanho", help_text="Tamanho em bytes"
+    )
+    content_type = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        verbose_name="Content-Type",
+    )
+    dados = models.BinaryField(verbose_name="Dados")
+    created_on = models.DateTimeField(
+        auto_now_add=True, verbose_name="Criado em"
+    )
+
+    class Meta:
+        verbose_name = "Arquivo binário"
+        verbose_name_plural = "Arquivos binários"
+
+    def __str__(self):
+        return f"{self.hash[:12]} ({self.tamanho} bytes)"
+
+
+class ArquivoVariante(models.Model):
+    """
+    Versão redimensionada/convertida de uma imagem armazenada.
+
+    Gerada no upload (ou pelo comando ``gerar_variantes_imagens``) e servida
+    quando o cliente pede ``?size=`` nos endpoints de imagem. Os bytes da
+    variante também ficam em ``ArquivoBinario``.
+    """
+
+    FORMATO_WEBP = "webp"
+    FORMATO_PNG = "png"
+    FORMATO_CHOICES = [
+        (FORMATO_WEBP, "WebP"),
+        (FORMATO_PNG, "PNG"),
+    ]
+
+    original = models.ForeignKey(
+        ArquivoBinario,
+        on_delete=models.CASCADE,
+        related_name="variantes",
+        verbose_name="Original",
+    )
+    tamanho = models.PositiveSmallIntegerField(
+        verbose_name="Tamanho",
+        help_text="Maior lado da imagem em pixels",
+    )
+    formato = models.CharField(
+        max_length=10, choices=FORMATO_CHOICES, verbose_name="Formato"
+    )
+    arquivo = models.ForeignKey(
+        ArquivoBinario,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Arquivo",
+    )
+
+    class Meta:
+        verbose_name = "Variante de arquivo"
+        verbose_name_plural = "Variantes de arquivo"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["original", "tamanho", "formato"],
+                name="arquivo_variante_unica",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.original_id} {self.tamanho}px {self.formato}"
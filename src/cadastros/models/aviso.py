@@ -2,8 +2,10 @@ from django.conf import settings
 from django.contrib.auth.models import Group
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
 
-class Aviso(models.Model):
+
+class Aviso(PorCondominioMixin, models.Model):
     PRIORIDADE_BAIXA = "baixa"
     PRIORIDADE_MEDIA = "media"
     PRIORIDADE_ALTA = "alta"
@@ -26,6 +28,14 @@ class Aviso(models.Model):
         (STATUS_INATIVO, "Inativo"),
     ]
 
+    ORIGEM_MANUAL = "manual"
+    ORIGEM_ENCOMENDA = "encomenda"
+
+    ORIGEM_CHOICES = [
+        (ORIGEM_MANUAL, "Manual"),
+        (ORIGEM_ENCOMENDA, "Encomenda"),
+    ]
+
     titulo = models.CharField(max_length=255)
     descricao = models.TextField()
     grupo = models.ForeignKey(
@@ -51,6 +61,27 @@ class Aviso(models.Model):
     data_inicio = models.DateTimeField()
     data_fim = models.DateTimeField(null=True, blank=True)
 
+    # Avisos automáticos (ex.: encomenda registrada pela portaria)
+    origem = models.CharField(
+        max_length=10, choices=ORIGEM_CHOICES, default=ORIGEM_MANUAL
+    )
+    encomenda = models.ForeignKey(
+        "cadastros.Encomenda",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="avisos",
+        help_text="Encomenda que gerou o aviso automático",
+    )
+    unidade = models.ForeignKey(
+        "cadastros.Unidade",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="avisos",
+        help_text="Unidade destinatária do aviso automático",
+    )
+
     # Controle/auditoria
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -73,6 +104,16 @@ class Aviso(models.Model):
         verbose_name = "Aviso"
         verbose_name_plural = "Avisos"
         ordering = ["-prioridade", "-data_inicio", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["condominio", "status", "data_inicio"],
+                name="aviso_condo_status_idx",
+            ),
+            models.Index(
+                fields=["condominio", "origem", "unidade"],
+                name="aviso_condo_origem_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"[{self.get_prioridade_display()}] {self.titulo}"
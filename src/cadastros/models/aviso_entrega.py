@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import models
+
+
+class AvisoEntrega(models.Model):
+    """
+    Entrega de um aviso a um usuário (caixa de entrada).
+
+    Uma linha por (usuário, aviso), gravada quando o aviso é publicado ou
+    quando o público dele muda (ver ``cadastros.services.aviso_service``).
+    Status, prioridade e vigência do aviso são copiados para cá, de modo
+    que o feed da Home é uma leitura direta no índice
+    ``aviso_entrega_feed_idx``.
+    """
+
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="avisos_entregues",
+        verbose_name="Usuário",
+    )
+    aviso = models.ForeignKey(
+        "cadastros.Aviso",
+        on_delete=models.CASCADE,
+        related_name="entregas",
+        verbose_name="Aviso",
+    )
+    ativo = models.BooleanField(
+        default=True,
+        verbose_name="Ativo",
+        help_text="Aviso ativo e, se de encomenda, ainda não retirada",
+    )
+    prioridade = models.CharField(max_length=10, verbose_name="Prioridade")
+    data_inicio = models.DateTimeField(verbose_name="Início")
+    data_fim = models.DateTimeField(null=True, blank=True, verbose_name="Fim")
+    lido = models.BooleanField(default=False, verbose_name="Lido")
+    lido_em = models.DateTimeField(
+        null=True, blank=True, verbose_name="Lido em"
+    )
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Entrega de Aviso"
+        verbose_name_plural = "Entregas de Avisos"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["usuario", "aviso"], name="aviso_entrega_unica"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["usuario", "ativo", "prioridade", "data_inicio"],
+                name="aviso_entrega_feed_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Aviso {self.aviso_id} -> usuário {self.usuario_id}"
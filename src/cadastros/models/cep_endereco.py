@@ -0,0 +1,56 @@
+from django.db import models
+
+
+class CepEndereco(models.Model):
+    """
+    Cache persistente de endereços resolvidos por CEP.
+
+    Compartilhado entre todos os processos/workers. Entradas com
+    ``encontrado=False`` funcionam como cache negativo para CEPs inexistentes.
+    """
+
+    cep = models.CharField(
+        max_length=8,
+        unique=True,
+        verbose_name="CEP",
+        help_text="CEP somente com números",
+    )
+    logradouro = models.CharField(max_length=255, blank=True, default="")
+    bairro = models.CharField(max_length=255, blank=True, default="")
+    cidade = models.CharField(max_length=255, blank=True, default="")
+    estado = models.CharField(max_length=2, blank=True, default="")
+    encontrado = models.BooleanField(
+        default=True,
+        verbose_name="Encontrado",
+        help_text="Falso quando o CEP não existe nos provedores consultados",
+    )
+    fonte = models.CharField(
+        max_length=20,
+        blank=True,
+        default="",
+        verbose_name="Fonte",
+        help_text="Provedor que resolveu o CEP (brasilapi, viacep)",
+    )
+    consultado_em = models.DateTimeField(
+        verbose_name="Consultado em",
+        help_text="Data da última consulta ao provedor externo",
+    )
+
+    class Meta:
+        verbose_name = "Endereço por CEP"
+        verbose_name_plural = "Endereços por CEP"
+        ordering = ["cep"]
+
+    def __str__(self):
+        if not self.encontrado:
+            return f"{self.cep} (não encontrado)"
+        return f"{self.cep} - {self.logradouro}, {self.cidade}/{self.estado}"
+
+    def as_dict(self):
+        return {
+            "cep": self.cep,
+            "logradouro": self.logradouro,
+            "bairro": self.bairro,
+            "cidade": self.cidade,
+            "estado": self.estado,
+        }
@@ -3,8 +3,10 @@ import string
 
 from django.db import models
 
+from .endereco import EnderecoPorCepMixin
 
-class Condominio(models.Model):
+
+class Condominio(EnderecoPorCepMixin, models.Model):
     nome = models.CharField(
         max_length=255,
         verbose_name="Nome do Condomínio",
@@ -63,11 +65,15 @@ class Condominio(models.Model):
         blank=True,
         help_text="Logo do condomínio (png, jpg, jpeg, svg — qualquer tamanho)",
     )
-    # Campos para armazenar logo diretamente no banco (BLOB)
-    logo_db_data = models.BinaryField(
+    # Logo armazenada no banco (bytes em ArquivoBinario, referenciados por FK)
+    logo_arquivo = models.ForeignKey(
+        "cadastros.ArquivoBinario",
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Dados binários da logo (se armazenada no DB)",
+        related_name="+",
+        verbose_name="Logo (DB)",
+        help_text="Logo armazenada no banco (armazenamento por conteúdo)",
     )
     logo_db_content_type = models.CharField(
         max_length=100,
@@ -0,0 +1,99 @@
+import uuid
+
+from django.db import models
+from django.utils import timezone
+
+
+def _nova_chave():
+    return uuid.uuid4().hex
+
+
+class EmailOutbox(models.Model):
+    """
+    Fila transacional de e-mails.
+
+    As views gravam o e-mail aqui (na mesma transação da alteração de
+    negócio) e o comando ``processar_emails`` faz o envio pelo provedor, com
+    retentativas. ``chave_idempotencia`` é repassada ao provedor para que
+    uma retentativa nunca gere um e-mail duplicado; e-mails enviados pela
+    API de lote usam a chave do lote (``lote_envio``), fixada no primeiro
+    envio e reenviada com os mesmos e-mails.
+    """
+
+    STATUS_PENDENTE = "pendente"
+    STATUS_ENVIANDO = "enviando"
+    STATUS_ENVIADO = "enviado"
+    STATUS_FALHOU = "falhou"
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, "Pendente"),
+        (STATUS_ENVIANDO, "Enviando"),
+        (STATUS_ENVIADO, "Enviado"),
+        (STATUS_FALHOU, "Falhou"),
+    ]
+
+    chave_idempotencia = models.CharField(
+        max_length=255,
+        unique=True,
+        default=_nova_chave,
+        verbose_name="Chave de idempotência",
+    )
+    lote_envio = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        db_index=True,
+        verbose_name="Lote de envio",
+        help_text="Chave de idempotência do lote no provedor",
+    )
+    payload = models.JSONField(
+        verbose_name="Payload",
+        help_text="Parâmetros do e-mail no formato da API do Resend",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDENTE,
+        verbose_name="Status",
+    )
+    tentativas = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Tentativas"
+    )
+    proxima_tentativa_em = models.DateTimeField(
+        default=timezone.now, verbose_name="Próxima tentativa em"
+    )
+    reservado_ate = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Reservado até",
+        help_text="Fim da reserva do worker que está enviando o e-mail",
+    )
+    enviado_em = models.DateTimeField(
+        null=True, blank=True, verbose_name="Enviado em"
+    )
+    provedor_id = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        verbose_name="ID no provedor",
+    )
+    ultimo_erro = models.TextField(
+        blank=True, default="", verbose_name="Último erro"
+    )
+    created_on = models.DateTimeField(
+        auto_now_add=True, verbose_name="Criado em"
+    )
+
+    class Meta:
+        verbose_name = "E-mail (outbox)"
+        verbose_name_plural = "E-mails (outbox)"
+        ordering = ["-created_on"]
+        indexes = [
+            models.Index(
+                fields=["status", "proxima_tentativa_em"],
+                name="email_outbox_fila_idx",
+            ),
+        ]
+
+    def __str__(self):
+        destinatarios = ", ".join(self.payload.get("to") or [])
+        return f"{self.payload.get('subject', '')} -> {destinatarios}"
@@ -1,10 +1,14 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
+
 User = get_user_model()
 
 
-class Encomenda(models.Model):
+class Encomenda(PorCondominioMixin, models.Model):
+    ORIGENS_CONDOMINIO = ("created_by", "unidade")
+
     unidade = models.ForeignKey(
         "cadastros.Unidade",
         on_delete=models.CASCADE,
@@ -114,6 +118,35 @@ class Encomenda(models.Model):
         verbose_name = "Encomenda"
         verbose_name_plural = "Encomendas"
         ordering = ["-created_on"]
+        indexes = [
+            models.Index(
+                fields=["condominio", "retirado_em", "created_on"],
+                name="encomenda_condo_retirada_idx",
+            ),
+            models.Index(
+                fields=["condominio", "unidade", "retirado_em"],
+                name="encomenda_condo_unidade_idx",
+            ),
+            # Listagem por cursor (?cursor=), ordenada por created_on
+            models.Index(
+                fields=["condominio", "created_on"],
+                name="encomenda_condo_criado_idx",
+            ),
+            # Badge de pendentes por idade (apenas encomendas não retiradas)
+            models.Index(
+                fields=["condominio", "unidade", "created_on"],
+                name="encomenda_pendente_idx",
+                condition=models.Q(retirado_em__isnull=True),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Unidade gravada no banco: ao mover a encomenda, o badge da unidade
+        # anterior também precisa ser invalidado
+        instance._unidade_id_original = instance.__dict__.get("unidade_id")
+        return instance
 
     def __str__(self):
         return f"Encomenda para {self.destinatario_nome} - Unidade {self.unidade} - {self.descricao[:50]}"
@@ -0,0 +1,152 @@
+from django.db import models
+
+CAMPOS_CHAVE_ENDERECO = ("cep", "numero", "complemento")
+
+
+class EnderecoPorCepMixin(models.Model):
+    """
+    Campos de endereço resolvidos a partir do CEP e gravados na própria linha.
+
+    A resolução acontece na escrita (quando o registro é criado ou quando
+    ``cep``/``numero``/``complemento`` mudam), de modo que listagens e
+    serializers apenas leem colunas, sem I/O externo.
+    O modelo concreto deve declarar ``cep``, ``numero`` e ``complemento``.
+    """
+
+    CAMPOS_ENDERECO = (
+        "logradouro",
+        "bairro",
+        "cidade",
+        "estado",
+        "endereco_completo",
+    )
+
+    logradouro = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="Logradouro",
+        help_text="Preenchido automaticamente a partir do CEP",
+    )
+    bairro = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="Bairro",
+        help_text="Preenchido automaticamente a partir do CEP",
+    )
+    cidade = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="Cidade",
+        help_text="Preenchido automaticamente a partir do CEP",
+    )
+    estado = models.CharField(
+        max_length=2,
+        blank=True,
+        default="",
+        verbose_name="Estado",
+        help_text="UF, preenchida automaticamente a partir do CEP",
+    )
+    endereco_completo = models.CharField(
+        max_length=600,
+        blank=True,
+        default="",
+        verbose_name="Endereço completo",
+        help_text="Endereço formatado para exibição",
+    )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._endereco_original = {
+            campo: instance.__dict__[campo]
+            for campo in CAMPOS_CHAVE_ENDERECO
+            if campo in instance.__dict__
+        }
+        return instance
+
+    def _campos_endereco_alterados(self):
+        original = getattr(self, "_endereco_original", None)
+        if original is None:
+            # Instância nova (não veio do banco)
+            return {
+                campo
+                for campo in CAMPOS_CHAVE_ENDERECO
+                if getattr(self, campo, None)
+            }
+        alterados = set()
+        for campo in CAMPOS_CHAVE_ENDERECO:
+            if campo not in self.__dict__:
+                continue  # campo adiado e não alterado
+            if (
+                campo not in original
+                or original[campo] != self.__dict__[campo]
+            ):
+                alterados.add(campo)
+        return alterados
+
+    def atualizar_endereco(self, resolver_cep=True):
+        """
+        Preenche os campos de endereço. Com ``resolver_cep`` consulta o serviço
+        de CEP (cache em memória/DB, provedores externos só em último caso).
+        """
+        if resolver_cep:
+            from ..services.cep_service import buscar_endereco
+
+            dados = buscar_endereco(self.cep) or {}
+            self.logradouro = dados.get("logradouro", "")
+            self.bairro = dados.get("bairro", "")
+            self.cidade = dados.get("cidade", "")
+            self.estado = dados.get("estado", "")
+        self.endereco_completo = self.montar_endereco_completo()
+
+    def montar_endereco_completo(self):
+        partes = []
+
+        if self.logradouro:
+            partes.append(
+                f"{self.logradouro}, {self.numero}"
+                if self.numero
+                else self.logradouro
+            )
+        elif self.numero:
+            partes.append(f"Número {self.numero}")
+
+        if self.complemento:
+            partes.append(self.complemento)
+
+        if self.bairro:
+            partes.append(self.bairro)
+
+        if self.cidade and self.estado:
+            partes.append(f"{self.cidade} - {self.estado}")
+        elif self.cidade:
+            partes.append(self.cidade)
+
+        cep = "".join(ch for ch in (self.cep or "") if ch.isdigit())
+        if cep:
+            cep_fmt = f"{cep[:5]}-{cep[5:]}" if len(cep) == 8 else cep
+            partes.append(f"CEP: {cep_fmt}")
+
+        return ", ".join(partes)
+
+    def save(self, *args, **kwargs):
+        alterados = self._campos_endereco_alterados()
+        if alterados:
+            self.atualizar_endereco(resolver_cep="cep" in alterados)
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | set(
+                    self.CAMPOS_ENDERECO
+                )
+        super().save(*args, **kwargs)
+        self._endereco_original = {
+            campo: self.__dict__[campo]
+            for campo in CAMPOS_CHAVE_ENDERECO
+            if campo in self.__dict__
+        }
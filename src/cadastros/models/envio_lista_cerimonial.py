@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import models
+
+
+class EnvioListaCerimonial(models.Model):
+    """
+    Job de envio dos e-mails da lista de convidados do cerimonial.
+
+    Criado ao finalizar a lista; os e-mails (confirmação de presença ou
+    QR code) são montados em segundo plano e gravados na outbox com chave
+    ``convite-cerimonial:<id da lista>:<tipo>:<id do convidado>``, o que
+    permite acompanhar a entrega de cada convidado. A chave não depende do
+    envio: finalizar a lista de novo (ou retomar um envio interrompido) não
+    repete o e-mail de quem já o recebeu.
+    """
+
+    STATUS_PENDENTE = "pendente"
+    STATUS_PROCESSANDO = "processando"
+    STATUS_CONCLUIDO = "concluido"
+    STATUS_ERRO = "erro"
+    STATUS_CHOICES = [
+        (STATUS_PENDENTE, "Pendente"),
+        (STATUS_PROCESSANDO, "Processando"),
+        (STATUS_CONCLUIDO, "Concluído"),
+        (STATUS_ERRO, "Erro"),
+    ]
+
+    lista = models.ForeignKey(
+        "cadastros.ListaConvidadosCerimonial",
+        on_delete=models.CASCADE,
+        related_name="envios",
+        verbose_name="Lista",
+    )
+    status = models.CharField(
+        max_length=12,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDENTE,
+        verbose_name="Status",
+    )
+    url_base = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        verbose_name="URL base",
+        help_text="Usada nos links de confirmação de presença",
+    )
+    total = models.PositiveIntegerField(default=0, verbose_name="Total")
+    processados = models.PositiveIntegerField(
+        default=0, verbose_name="Processados"
+    )
+    enfileirados_confirmacao = models.PositiveIntegerField(default=0)
+    enfileirados_qr = models.PositiveIntegerField(default=0)
+    erros = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="Erros",
+        help_text="Convidados que não puderam ser enfileirados",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+    concluido_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Envio da Lista de Convidados (Cerimonial)"
+        verbose_name_plural = "Envios da Lista de Convidados (Cerimonial)"
+        ordering = ["-created_on"]
+
+    def __str__(self):
+        return f"Envio {self.pk} - lista {self.lista_id} ({self.status})"
+
+    @property
+    def prefixo_chave(self):
+        return f"convite-cerimonial:{self.lista_id}:"
@@ -5,10 +5,12 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from .por_condominio import PorCondominioMixin
+
 User = get_user_model()
 
 
-class Espaco(models.Model):
+class Espaco(PorCondominioMixin, models.Model):
     nome = models.CharField(max_length=255)
     capacidade_pessoas = models.PositiveIntegerField(default=0)
     valor_aluguel = models.DecimalField(
@@ -47,6 +49,12 @@ class Espaco(models.Model):
         verbose_name = "Espaço"
         verbose_name_plural = "Espaços"
         ordering = ["nome"]
+        indexes = [
+            models.Index(
+                fields=["condominio", "nome"],
+                name="espaco_condo_nome_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.nome
@@ -96,7 +104,9 @@ class EspacoInventarioItem(models.Model):
         return f"{self.nome} ({self.codigo}) - {self.espaco.nome}"
 
 
-class EspacoReserva(models.Model):
+class EspacoReserva(PorCondominioMixin, models.Model):
+    ORIGENS_CONDOMINIO = ("espaco", "morador", "created_by")
+
     STATUS_CHOICES = [
         ("pendente", "Pendente"),
         ("confirmada", "Confirmada"),
@@ -167,6 +177,12 @@ class EspacoReserva(models.Model):
         unique_together = [
             ["espaco", "data_reserva"]
         ]  # Apenas uma reserva por dia por espaço
+        indexes = [
+            models.Index(
+                fields=["condominio", "data_reserva", "status"],
+                name="reserva_condo_data_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.espaco.nome} - {self.morador.get_full_name()} em {self.data_reserva}"
@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
+
+
+class Evento(PorCondominioMixin, models.Model):
+    ORIGENS_CONDOMINIO = ("created_by", "espaco")
 
-class Evento(models.Model):
     titulo = models.CharField(
         max_length=255, verbose_name="Título", help_text="Título do evento"
     )
@@ -44,11 +48,15 @@ class Evento(models.Model):
         verbose_name="Imagem",
         help_text="Imagem ilustrativa do evento (legado — prefer imagem_db)",
     )
-    # Armazenamento da imagem como BLOB no banco (mesma abordagem do condomínio)
-    imagem_db_data = models.BinaryField(
+    # Imagem no banco (bytes em ArquivoBinario, mesma abordagem do condomínio)
+    imagem_arquivo = models.ForeignKey(
+        "cadastros.ArquivoBinario",
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Dados binários da imagem armazenados no banco",
+        related_name="+",
+        verbose_name="Imagem (DB)",
+        help_text="Imagem armazenada no banco (armazenamento por conteúdo)",
     )
     imagem_db_content_type = models.CharField(
         max_length=100,
@@ -84,6 +92,12 @@ class Evento(models.Model):
     class Meta:
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
+        indexes = [
+            models.Index(
+                fields=["condominio", "datetime_inicio"],
+                name="evento_condo_inicio_idx",
+            ),
+        ]
 
     ordering = ["datetime_inicio"]
 
@@ -3,8 +3,10 @@ import uuid
 from django.conf import settings
 from django.db import models
 
+from .endereco import EnderecoPorCepMixin
 
-class EventoCerimonial(models.Model):
+
+class EventoCerimonial(EnderecoPorCepMixin, models.Model):
     nome = models.CharField(max_length=255, verbose_name="Nome")
     datetime_inicio = models.DateTimeField(verbose_name="Início")
     datetime_fim = models.DateTimeField(verbose_name="Término")
@@ -40,10 +42,14 @@ class EventoCerimonial(models.Model):
         verbose_name="Evento Confirmado",
     )
 
-    imagem_db_data = models.BinaryField(
+    imagem_arquivo = models.ForeignKey(
+        "cadastros.ArquivoBinario",
+        on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        help_text="Dados binários da imagem armazenados no banco",
+        related_name="+",
+        verbose_name="Imagem (DB)",
+        help_text="Imagem armazenada no banco (armazenamento por conteúdo)",
     )
     imagem_db_content_type = models.CharField(
         max_length=100,
@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
+
+
+class Ocorrencia(PorCondominioMixin, models.Model):
+    ORIGENS_CONDOMINIO = ("criado_por",)
 
-class Ocorrencia(models.Model):
     TIPO_PROBLEMA = "problema"
     TIPO_SUGESTAO = "sugestao"
     TIPO_CHOICES = [
@@ -57,6 +61,12 @@ class Ocorrencia(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Ocorrência"
         verbose_name_plural = "Ocorrências"
+        indexes = [
+            models.Index(
+                fields=["condominio", "status", "created_at"],
+                name="ocorrencia_condo_status_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_tipo_display()} — {self.titulo} ({self.get_status_display()})"
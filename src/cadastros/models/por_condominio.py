@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class PorCondominioQuerySet(models.QuerySet):
+    def for_condominio(self, condominio_id):
+        """Filtra pelo condomínio gravado no próprio registro (sem joins)."""
+        return self.filter(condominio_id=condominio_id)
+
+
+class PorCondominioMixin(models.Model):
+    """
+    Coluna ``condominio`` desnormalizada para o escopo por condomínio.
+
+    Antes o escopo era feito pelo condomínio do criador/morador (join com
+    ``access_user``), o que também mudava o resultado quando o usuário
+    trocava de condomínio. O valor é gravado uma única vez, na criação,
+    a partir das relações listadas em ``ORIGENS_CONDOMINIO`` (na ordem),
+    caso não tenha sido informado explicitamente.
+    """
+
+    ORIGENS_CONDOMINIO = ("created_by",)
+
+    condominio = models.ForeignKey(
+        "cadastros.Condominio",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Condomínio",
+        help_text="Condomínio ao qual o registro pertence",
+    )
+
+    objects = PorCondominioQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def resolver_condominio_id(self):
+        for origem in self.ORIGENS_CONDOMINIO:
+            if getattr(self, f"{origem}_id", None) is None:
+                continue
+            condominio_id = getattr(
+                getattr(self, origem), "condominio_id", None
+            )
+            if condominio_id:
+                return condominio_id
+        return None
+
+    def save(self, *args, **kwargs):
+        if self.condominio_id is None:
+            self.condominio_id = self.resolver_condominio_id()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and self.condominio_id:
+                kwargs["update_fields"] = set(update_fields) | {"condominio"}
+        super().save(*args, **kwargs)
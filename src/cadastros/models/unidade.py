@@ -1,10 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
+
 User = get_user_model()
 
 
-class Unidade(models.Model):
+class Unidade(PorCondominioMixin, models.Model):
     numero = models.CharField(
         max_length=20,
         verbose_name="Número da Unidade",
@@ -49,6 +51,12 @@ class Unidade(models.Model):
         verbose_name = "Unidade"
         verbose_name_plural = "Unidades"
         ordering = ["bloco", "numero"]
+        indexes = [
+            models.Index(
+                fields=["condominio", "bloco", "numero"],
+                name="unidade_condo_bloco_num_idx",
+            ),
+        ]
 
     def __str__(self):
         if self.bloco:
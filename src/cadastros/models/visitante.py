@@ -5,6 +5,8 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models
 
+from .por_condominio import PorCondominioMixin
+
 User = get_user_model()
 
 
@@ -32,7 +34,9 @@ def validate_placa_brasileira(value):
         )
 
 
-class Visitante(models.Model):
+class Visitante(PorCondominioMixin, models.Model):
+    ORIGENS_CONDOMINIO = ("morador",)
+
     morador = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -98,6 +102,16 @@ class Visitante(models.Model):
         verbose_name = "Visitante"
         verbose_name_plural = "Visitantes"
         ordering = ["-data_entrada"]
+        indexes = [
+            models.Index(
+                fields=["condominio", "data_entrada"],
+                name="visitante_condo_entrada_idx",
+            ),
+            models.Index(
+                fields=["condominio", "data_saida"],
+                name="visitante_condo_saida_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nome} - Visitando {self.morador.full_name}"
@@ -0,0 +1,213 @@
+"""
+Leitura e gravação de arquivos no armazenamento endereçado por conteúdo.
+
+Os modelos guardam apenas a FK para ``ArquivoBinario``; os bytes são lidos
+sob demanda com ``ler_arquivo`` (sem carregar a linha do dono nem o modelo
+inteiro do arquivo).
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+
+# (app_label, modelo, campo FK) que referenciam ArquivoBinario
+REFERENCIAS = (
+    ("access", "User", "foto_arquivo"),
+    ("cadastros", "Condominio", "logo_arquivo"),
+    ("cadastros", "Evento", "imagem_arquivo"),
+    ("cadastros", "EventoCerimonial", "imagem_arquivo"),
+    ("cadastros", "ArquivoVariante", "arquivo"),
+)
+
+
+def calcular_hash(dados):
+    return hashlib.sha256(dados).hexdigest()
+
+
+def armazenar_arquivo(dados, content_type=""):
+    """Grava (ou reaproveita) o conteúdo e retorna o ``ArquivoBinario``."""
+    from ..models import ArquivoBinario
+
+    dados = bytes(dados)
+    hash_hex = calcular_hash(dados)
+    existente = (
+        ArquivoBinario.objects.defer("dados").filter(hash=hash_hex).first()
+    )
+    if existente is not None:
+        return existente
+
+    try:
+        with transaction.atomic():
+            return ArquivoBinario.objects.create(
+                hash=hash_hex,
+                tamanho=len(dados),
+                content_type=content_type or "",
+                dados=dados,
+            )
+    except IntegrityError:
+        # Outro processo gravou o mesmo conteúdo ao mesmo tempo
+        return ArquivoBinario.objects.defer("dados").get(hash=hash_hex)
+
+
+def ler_arquivo(arquivo_id):
+    """Retorna os bytes do arquivo ou None."""
+    from ..models import ArquivoBinario
+
+    if not arquivo_id:
+        return None
+    dados = (
+        ArquivoBinario.objects.filter(pk=arquivo_id)
+        .values_list("dados", flat=True)
+        .first()
+    )
+    return bytes(dados) if dados is not None else None
+
+
+def url_versionada(path, arquivo_id):
+    """
+    Acrescenta a versão do conteúdo à URL da imagem.
+
+    Cada ``ArquivoBinario`` corresponde a um único conteúdo (nunca é
+    alterado), então o id serve como versão e a URL pode ser cacheada
+    como imutável.
+    """
+    return f"{path}?v={arquivo_id}"
+
+
+def _aplicar_cache(response, request, arquivo_id, publico):
+    versionada = request.GET.get("v") == str(arquivo_id)
+    if versionada:
+        max_age = getattr(
+            settings, "IMAGENS_CACHE_MAX_AGE_VERSIONADA", 31536000
+        )
+    else:
+        max_age = getattr(settings, "IMAGENS_CACHE_MAX_AGE", 300)
+    diretivas = {"public": True} if publico else {"private": True}
+    if versionada:
+        diretivas["immutable"] = True
+    patch_cache_control(response, max_age=max_age, **diretivas)
+    return response
+
+
+def resposta_arquivo(
+    request, arquivo_id, content_type=None, last_modified=None, publico=False
+):
+    """
+    Monta a resposta de um arquivo armazenado, ou None se não existir.
+
+    Envia ``ETag`` (hash do conteúdo), ``Last-Modified`` e ``Cache-Control``
+    e responde ``304 Not Modified`` sem ler os bytes quando o cliente já
+    tem a versão atual. Com ``?size=<px>`` serve a variante redimensionada
+    (ver ``imagem_service``), se existir.
+    """
+    from ..models import ArquivoBinario
+    from .imagem_service import escolher_formato, escolher_variante
+
+    if not arquivo_id:
+        return None
+
+    servido_id = arquivo_id
+    variante = None
+    tamanho = request.GET.get("size", "")
+    if tamanho.isdigit():
+        variante = escolher_variante(
+            arquivo_id, int(tamanho), escolher_formato(request)
+        )
+    if variante is not None:
+        servido_id, content_type = variante
+
+    meta = (
+        ArquivoBinario.objects.filter(pk=servido_id)
+        .values_list("hash", "created_on")
+        .first()
+    )
+    if meta is None:
+        return None
+
+    hash_hex, criado_em = meta
+    etag = f'"{hash_hex}"'
+    # O conteúdo pode ser mais novo que o dono (arquivo trocado sem salvar
+    # os demais campos); vale a data mais recente dos dois
+    if last_modified is not None:
+        criado_em = max(criado_em, last_modified)
+    modificado_em = int(criado_em.timestamp())
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=modificado_em
+    )
+    if response is None:
+        dados = ler_arquivo(servido_id)
+        if dados is None:
+            return None
+        response = HttpResponse(
+            dados, content_type=content_type or "application/octet-stream"
+        )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(modificado_em)
+    if tamanho and "formato" not in request.GET:
+        # O formato da variante depende do cabeçalho Accept
+        patch_vary_headers(response, ["Accept"])
+    return _aplicar_cache(response, request, arquivo_id, publico)
+
+
+def salvar_upload(instancia, prefixo, upload):
+    """
+    Armazena o arquivo enviado e o associa à instância.
+
+    Usa a convenção de campos ``<prefixo>_arquivo``,
+    ``<prefixo>_db_content_type`` e ``<prefixo>_db_filename``
+    (ex.: ``foto``, ``logo``, ``imagem``). O arquivo anterior é removido se
+    não for mais referenciado. As variantes redimensionadas são geradas na
+    mesma chamada. O ``updated_at`` do dono, se existir, é atualizado junto.
+    """
+    from .imagem_service import gerar_variantes_seguro
+
+    anterior_id = getattr(instancia, f"{prefixo}_arquivo_id")
+    arquivo = armazenar_arquivo(upload.read(), upload.content_type)
+    setattr(instancia, f"{prefixo}_arquivo", arquivo)
+    setattr(instancia, f"{prefixo}_db_content_type", upload.content_type)
+    setattr(instancia, f"{prefixo}_db_filename", upload.name)
+    campos = [
+        f"{prefixo}_arquivo",
+        f"{prefixo}_db_content_type",
+        f"{prefixo}_db_filename",
+    ]
+    # updated_at é o Last-Modified da imagem servida
+    if any(f.name == "updated_at" for f in instancia._meta.concrete_fields):
+        campos.append("updated_at")
+    instancia.save(update_fields=campos)
+    gerar_variantes_seguro(arquivo.pk)
+    if anterior_id and anterior_id != arquivo.pk:
+        remover_se_orfao(anterior_id)
+    return arquivo
+
+
+def remover_se_orfao(arquivo_id):
+    """Remove o arquivo (e suas variantes) se nada o referencia mais."""
+    from django.apps import apps
+
+    from ..models import ArquivoBinario, ArquivoVariante
+
+    if not arquivo_id:
+        return False
+    for app_label, model_name, campo in REFERENCIAS:
+        model = apps.get_model(app_label, model_name)
+        if model.objects.filter(**{f"{campo}_id": arquivo_id}).exists():
+            return False
+    variantes_ids = list(
+        ArquivoVariante.objects.filter(original_id=arquivo_id).values_list(
+            "arquivo_id", flat=True
+        )
+    )
+    ArquivoBinario.objects.filter(pk=arquivo_id).delete()
+    for variante_id in set(variantes_ids):
+        remover_se_orfao(variante_id)
+    return True
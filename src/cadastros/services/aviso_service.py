@@ -0,0 +1,164 @@
+"""
+Caixa de entrada de avisos (fan-out na escrita).
+
+Quando um aviso é publicado ou alterado, ``sincronizar_aviso`` grava uma
+``AvisoEntrega`` para cada usuário do público (grupos do aviso, mesmo
+condomínio e, para avisos de encomenda, moradores da unidade). Quando o
+usuário muda de grupo, condomínio ou unidades, ``sincronizar_usuario``
+refaz a caixa dele. Os signals em ``cadastros.signals`` disparam as duas.
+
+O feed da Home (``feed_do_usuario``) lê só a tabela de entregas.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Aviso, AvisoEntrega
+
+User = get_user_model()
+
+
+def _grupos_ids(aviso):
+    ids = set(aviso.grupos.values_list("id", flat=True))
+    if aviso.grupo_id:
+        ids.add(aviso.grupo_id)
+    return ids
+
+
+def destinatarios(aviso):
+    """Queryset dos usuários que devem receber ``aviso``."""
+    usuarios = User.objects.filter(
+        is_active=True, groups__id__in=_grupos_ids(aviso)
+    )
+    # Usuário sem condomínio recebe os avisos dos seus grupos de qualquer
+    # condomínio (mesma regra do aviso_list_view)
+    if aviso.condominio_id:
+        usuarios = usuarios.filter(
+            Q(condominio_id=aviso.condominio_id) | Q(condominio__isnull=True)
+        )
+    else:
+        usuarios = usuarios.filter(condominio__isnull=True)
+    if aviso.origem == Aviso.ORIGEM_ENCOMENDA:
+        # Sem unidade (título não resolvido ou unidade excluída) ninguém
+        # recebe; unidades__id=None viraria "usuários sem unidade"
+        if aviso.unidade_id is None:
+            return usuarios.none()
+        usuarios = usuarios.filter(unidades__id=aviso.unidade_id)
+    return usuarios.distinct()
+
+
+def avisos_do_usuario(usuario):
+    """Queryset dos avisos que devem estar na caixa de ``usuario``."""
+    grupos_ids = list(usuario.groups.values_list("id", flat=True))
+    avisos = Aviso.objects.filter(
+        Q(grupos__id__in=grupos_ids) | Q(grupo_id__in=grupos_ids)
+    )
+    if usuario.condominio_id:
+        avisos = avisos.for_condominio(usuario.condominio_id)
+    unidades_ids = list(usuario.unidades.values_list("id", flat=True))
+    avisos = avisos.filter(
+        ~Q(origem=Aviso.ORIGEM_ENCOMENDA) | Q(unidade_id__in=unidades_ids)
+    )
+    return avisos.distinct()
+
+
+def _campos(aviso):
+    ativo = aviso.status == Aviso.STATUS_ATIVO
+    if ativo and aviso.encomenda_id:
+        # Aviso de encomenda sai do feed quando a encomenda é retirada
+        ativo = aviso.encomenda.retirado_em is None
+    return {
+        "ativo": ativo,
+        "prioridade": aviso.prioridade,
+        "data_inicio": aviso.data_inicio,
+        "data_fim": aviso.data_fim,
+    }
+
+
+def _criar_entregas(entregas):
+    AvisoEntrega.objects.bulk_create(
+        entregas,
+        batch_size=settings.AVISO_ENTREGA_LOTE,
+        ignore_conflicts=True,
+    )
+
+
+@transaction.atomic
+def sincronizar_aviso(aviso_id):
+    """Ajusta as entregas de um aviso ao público e aos dados atuais."""
+    aviso = (
+        Aviso.objects.select_related("encomenda").filter(pk=aviso_id).first()
+    )
+    if aviso is None:
+        return
+
+    desejados = set(destinatarios(aviso).values_list("id", flat=True))
+    entregas = AvisoEntrega.objects.filter(aviso=aviso)
+    existentes = set(entregas.values_list("usuario_id", flat=True))
+
+    removidos = existentes - desejados
+    if removidos:
+        entregas.filter(usuario_id__in=removidos).delete()
+
+    # Só regrava as entregas que ficaram desatualizadas
+    campos = _campos(aviso)
+    entregas.exclude(**campos).update(**campos)
+    _criar_entregas(
+        AvisoEntrega(usuario_id=usuario_id, aviso=aviso, **campos)
+        for usuario_id in desejados - existentes
+    )
+
+
+@transaction.atomic
+def sincronizar_usuario(usuario):
+    """Refaz a caixa de entrada de um usuário."""
+    entregas = AvisoEntrega.objects.filter(usuario=usuario)
+    if not usuario.is_active:
+        entregas.delete()
+        return
+
+    desejados = {
+        aviso.pk: aviso
+        for aviso in avisos_do_usuario(usuario).select_related("encomenda")
+    }
+    existentes = set(entregas.values_list("aviso_id", flat=True))
+
+    removidos = existentes - set(desejados)
+    if removidos:
+        entregas.filter(aviso_id__in=removidos).delete()
+    _criar_entregas(
+        AvisoEntrega(usuario=usuario, aviso=aviso, **_campos(aviso))
+        for aviso_id, aviso in desejados.items()
+        if aviso_id not in existentes
+    )
+
+
+def feed_do_usuario(usuario, limite=10):
+    """Entregas vigentes do usuário, mais prioritárias e recentes antes."""
+    agora = timezone.now()
+    return (
+        AvisoEntrega.objects.filter(
+            usuario=usuario, ativo=True, data_inicio__lte=agora
+        )
+        .filter(Q(data_fim__gte=agora) | Q(data_fim__isnull=True))
+        .select_related("aviso__grupo", "aviso__created_by")
+        .prefetch_related("aviso__grupos")
+        .order_by("-prioridade", "-data_inicio")[:limite]
+    )
+
+
+def marcar_como_lido(usuario, aviso_id):
+    """Marca o aviso como lido; retorna ``False`` se não foi entregue."""
+    entrega = AvisoEntrega.objects.filter(
+        usuario=usuario, aviso_id=aviso_id
+    ).first()
+    if entrega is None:
+        return False
+    if not entrega.lido:
+        entrega.lido = True
+        entrega.lido_em = timezone.now()
+        entrega.save(update_fields=["lido", "lido_em"])
+    return True
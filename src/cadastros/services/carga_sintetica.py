@@ -0,0 +1,432 @@
+"""
+Geração de dados sintéticos em volume (``manage.py seed_load``).
+
+Os registros são gravados com ``bulk_create`` em lotes, sem ``save()`` nem
+signals: os campos que o ``save()`` preencheria (condomínio desnormalizado,
+CPF formatado) são calculados aqui. Tudo sai de geradores
+``random.Random`` com semente fixa, um por tipo de registro, então a mesma
+semente e os mesmos volumes geram exatamente os mesmos dados (inclusive
+UUIDs e datas relativas ao momento da carga).
+
+Os registros gerados são identificados pelo prefixo ``PREFIXO`` (usernames
+e nomes), o que permite removê-los com ``limpar`` e localizar os usuários
+de cada perfil no ``manage.py bench``, que se autentica por token. Os
+usuários gerados não têm senha utilizável (não é possível entrar com eles
+pelo login) e o admin é só staff, não superusuário.
+"""
+
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+from app.utils.validators import format_cpf
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import (
+    Condominio,
+    ConvidadoListaCerimonial,
+    Encomenda,
+    EventoCerimonial,
+    ListaConvidadosCerimonial,
+    Unidade,
+    Visitante,
+)
+from ..models.lista_convidados_cerimonial import RESPOSTA_PRESENCA_CHOICES
+
+User = get_user_model()
+
+PREFIXO = "carga"
+BLOCOS = "ABCDEFGH"
+# Faixas de CPF dos usuários gerados (base de 9 dígitos, sem verificadores)
+BASE_CPF_MORADORES = 100_000_000
+BASE_CPF_EQUIPE = 900_000_000
+
+NOMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Diego",
+    "Elisa",
+    "Fábio",
+    "Gabriela",
+    "Heitor",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+)
+SOBRENOMES = (
+    "Almeida",
+    "Barbosa",
+    "Costa",
+    "Ferreira",
+    "Gomes",
+    "Lima",
+    "Oliveira",
+    "Pereira",
+    "Rocha",
+    "Santos",
+    "Silva",
+    "Souza",
+)
+
+
+def nome_usuario(perfil, indice=0):
+    """Username do ``indice``-ésimo usuário gerado com o perfil dado."""
+    return f"{PREFIXO}-{perfil}-{indice}"
+
+
+def cpf_valido(numero):
+    """CPF com dígitos verificadores válidos a partir de uma base numérica."""
+    digitos = [int(c) for c in f"{numero:09d}"]
+    for _ in range(2):
+        soma = sum(
+            d * peso
+            for d, peso in zip(digitos, range(len(digitos) + 1, 1, -1))
+        )
+        digitos.append(soma * 10 % 11 % 10)
+    return "".join(map(str, digitos))
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _nome(rng):
+    return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}"
+
+
+@contextmanager
+def _datas_explicitas(modelo, *campos):
+    """Permite gravar datas no passado em campos auto_now/auto_now_add."""
+    originais = []
+    for nome in campos:
+        campo = modelo._meta.get_field(nome)
+        originais.append((campo, campo.auto_now, campo.auto_now_add))
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in originais:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def existe_carga():
+    return User.objects.filter(username__startswith=f"{PREFIXO}-").exists()
+
+
+def limpar():
+    """Remove os dados gerados (em bases grandes, prefira um banco novo)."""
+    condominios = Condominio.objects.filter(nome__startswith=f"[{PREFIXO}]")
+    with transaction.atomic():
+        EventoCerimonial.objects.filter(
+            nome__startswith=f"[{PREFIXO}]"
+        ).delete()
+        Encomenda.objects.filter(condominio__in=condominios).delete()
+        Visitante.objects.filter(condominio__in=condominios).delete()
+        Unidade.objects.filter(condominio__in=condominios).delete()
+        User.objects.filter(username__startswith=f"{PREFIXO}-").delete()
+        condominios.delete()
+
+
+class GeradorCarga:
+    """Gera uma carga determinística com os volumes informados."""
+
+    def __init__(self, semente=42, lote=5000, progresso=None):
+        self.semente = semente
+        self.lote = lote
+        self.progresso = progresso or (lambda mensagem: None)
+        self.agora = timezone.now()
+        # Hash inutilizável (como set_unusable_password), calculado uma vez
+        self.senha = make_password(None)
+        self.condominios = []
+        self.unidades = []
+        self.moradores = []
+        self.porteiros = []
+
+    def _rng(self, nome):
+        # Um gerador por tipo: mudar um volume não altera os demais dados
+        return random.Random(f"{self.semente}-{nome}")
+
+    def _inserir(self, modelo, objetos):
+        total = 0
+        iterador = iter(objetos)
+        while True:
+            lote = list(islice(iterador, self.lote))
+            if not lote:
+                break
+            with transaction.atomic():
+                modelo.objects.bulk_create(lote, batch_size=self.lote)
+            total += len(lote)
+            self.progresso(f"{modelo._meta.verbose_name_plural}: {total}")
+        return total
+
+    def _usuario(self, rng, perfil, indice, condominio_id, cpf, **campos):
+        return User(
+            id=_uuid(rng),
+            username=nome_usuario(perfil, indice),
+            password=self.senha,
+            full_name=_nome(rng),
+            email=f"{nome_usuario(perfil, indice)}@example.com",
+            cpf=format_cpf(cpf_valido(cpf)),
+            phone="(11) 91234-5678",
+            first_access=False,
+            condominio_id=condominio_id,
+            **campos,
+        )
+
+    def _vincular_grupo(self, nome, usuarios_ids):
+        grupo = Group.objects.get_or_create(name=nome)[0]
+        Relacao = User.groups.through
+        self._inserir(
+            Relacao,
+            (
+                Relacao(user_id=usuario_id, group_id=grupo.id)
+                for usuario_id in usuarios_ids
+            ),
+        )
+
+    def gerar(
+        self,
+        condominios,
+        unidades,
+        moradores,
+        encomendas,
+        visitantes,
+        eventos,
+        convidados,
+    ):
+        self._condominios(condominios)
+        self._equipe()
+        self._unidades(unidades)
+        self._moradores(moradores)
+        self._encomendas(encomendas)
+        self._visitantes(visitantes)
+        self._eventos(eventos, convidados)
+
+    def _condominios(self, quantidade):
+        self._inserir(
+            Condominio,
+            (
+                Condominio(
+                    nome=f"[{PREFIXO}] Condomínio {i:05d}",
+                    cnpj=f"99{i:012d}",
+                    telefone="(11) 3333-4444",
+                    cep="01310100",
+                    numero=str(i),
+                    signup_slug=f"{PREFIXO}-{i}",
+                )
+                for i in range(quantidade)
+            ),
+        )
+        # bulk_create não devolve ids em todos os bancos
+        self.condominios = list(
+            Condominio.objects.filter(nome__startswith=f"[{PREFIXO}]")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def _equipe(self):
+        """Admin, cerimonialista e um síndico e um porteiro por condomínio."""
+        rng = self._rng("equipe")
+        sequencia = iter(range(BASE_CPF_EQUIPE, 10**9))
+        admin = self._usuario(
+            rng,
+            "admin",
+            0,
+            None,
+            next(sequencia),
+            is_staff=True,
+        )
+        self.cerimonialista = self._usuario(
+            rng, "cerimonialista", 0, None, next(sequencia)
+        )
+        sindicos, porteiros = [], []
+        for i, condominio_id in enumerate(self.condominios):
+            sindicos.append(
+                self._usuario(
+                    rng,
+                    "sindico",
+                    i,
+                    condominio_id,
+                    next(sequencia),
+                )
+            )
+            porteiros.append(
+                self._usuario(
+                    rng,
+                    "portaria",
+                    i,
+                    condominio_id,
+                    next(sequencia),
+                )
+            )
+        self._inserir(
+            User, [admin, self.cerimonialista, *sindicos, *porteiros]
+        )
+        self.porteiros = [porteiro.id for porteiro in porteiros]
+        self._vincular_grupo("Síndicos", [s.id for s in sindicos])
+        self._vincular_grupo("Portaria", self.porteiros)
+        self._vincular_grupo("Cerimonialista", [self.cerimonialista.id])
+
+    def _unidades(self, quantidade):
+        total_condominios = len(self.condominios)
+
+        def unidades():
+            for j in range(quantidade):
+                k = j // total_condominios
+                yield Unidade(
+                    condominio_id=self.condominios[j % total_condominios],
+                    bloco=BLOCOS[k % len(BLOCOS)],
+                    numero=str(101 + k // len(BLOCOS)),
+                )
+
+        self._inserir(Unidade, unidades())
+        self.unidades = list(
+            Unidade.objects.filter(condominio_id__in=self.condominios)
+            .order_by("id")
+            .values_list("id", "condominio_id")
+        )
+
+    def _moradores(self, quantidade):
+        """Moradores distribuídos em rodízio pelas unidades."""
+        rng = self._rng("moradores")
+        self.moradores = []
+
+        def moradores():
+            for i in range(quantidade):
+                _, condominio_id = self.unidades[i % len(self.unidades)]
+                morador = self._usuario(
+                    rng, "morador", i, condominio_id, BASE_CPF_MORADORES + i
+                )
+                self.moradores.append((morador.id, condominio_id))
+                yield morador
+
+        self._inserir(User, moradores())
+        ids = [morador_id for morador_id, _ in self.moradores]
+        self._vincular_grupo("Moradores", ids)
+        Relacao = User.unidades.through
+        self._inserir(
+            Relacao,
+            (
+                Relacao(
+                    user_id=morador_id,
+                    unidade_id=self.unidades[i % len(self.unidades)][0],
+                )
+                for i, morador_id in enumerate(ids)
+            ),
+        )
+
+    def _data_passada(self, rng, dias=365):
+        return self.agora - timedelta(seconds=rng.randrange(dias * 86400))
+
+    def _encomendas(self, quantidade):
+        rng = self._rng("encomendas")
+        total_condominios = len(self.condominios)
+
+        def encomendas():
+            for _ in range(quantidade):
+                posicao = rng.randrange(len(self.unidades))
+                unidade_id, condominio_id = self.unidades[posicao]
+                criada = self._data_passada(rng)
+                retirada = (
+                    criada + timedelta(hours=rng.randrange(1, 72))
+                    if rng.random() < 0.9
+                    else None
+                )
+                yield Encomenda(
+                    unidade_id=unidade_id,
+                    condominio_id=condominio_id,
+                    destinatario_nome=_nome(rng),
+                    descricao=rng.choice(("Caixa", "Envelope", "Sacola")),
+                    codigo_rastreio=f"BR{rng.randrange(10**9):09d}",
+                    created_by_id=self.porteiros[posicao % total_condominios],
+                    created_on=criada,
+                    updated_on=retirada or criada,
+                    retirado_por=_nome(rng) if retirada else None,
+                    retirado_em=retirada,
+                )
+
+        with _datas_explicitas(Encomenda, "created_on", "updated_on"):
+            self._inserir(Encomenda, encomendas())
+
+    def _visitantes(self, quantidade):
+        rng = self._rng("visitantes")
+
+        def visitantes():
+            for _ in range(quantidade):
+                morador_id, condominio_id = rng.choice(self.moradores)
+                entrada = self._data_passada(rng)
+                saida = (
+                    entrada + timedelta(minutes=rng.randrange(10, 600))
+                    if rng.random() < 0.97
+                    else None
+                )
+                yield Visitante(
+                    morador_id=morador_id,
+                    condominio_id=condominio_id,
+                    nome=_nome(rng),
+                    documento=f"{rng.randrange(10**9):09d}",
+                    qr_token=_uuid(rng),
+                    data_entrada=entrada,
+                    data_saida=saida,
+                    created_on=entrada,
+                    updated_on=saida or entrada,
+                )
+
+        with _datas_explicitas(Visitante, "created_on", "updated_on"):
+            self._inserir(Visitante, visitantes())
+
+    def _eventos(self, quantidade, convidados_por_lista):
+        """Eventos cerimoniais, cada um com uma lista de convidados."""
+        rng = self._rng("eventos")
+        respostas = [valor for valor, _ in RESPOSTA_PRESENCA_CHOICES]
+        for i in range(quantidade):
+            inicio = self.agora + timedelta(days=rng.randrange(1, 180))
+            evento = EventoCerimonial.objects.bulk_create(
+                [
+                    EventoCerimonial(
+                        nome=f"[{PREFIXO}] Evento {i:05d}",
+                        datetime_inicio=inicio,
+                        datetime_fim=inicio + timedelta(hours=6),
+                        numero_pessoas=convidados_por_lista,
+                        evento_confirmado=True,
+                        created_by_id=self.cerimonialista.id,
+                    )
+                ]
+            )[0]
+            if evento.pk is None:
+                evento = EventoCerimonial.objects.get(nome=evento.nome)
+            evento.cerimonialistas.add(self.cerimonialista.id)
+            if self.moradores:
+                evento.organizadores.add(rng.choice(self.moradores)[0])
+            lista = ListaConvidadosCerimonial.objects.create(
+                evento=evento,
+                titulo="Convidados",
+                data_evento=inicio.date(),
+            )
+            self._inserir(
+                ConvidadoListaCerimonial,
+                (
+                    ConvidadoListaCerimonial(
+                        lista=lista,
+                        nome=_nome(rng),
+                        # Únicos dentro da lista; 20% dos convidados sem CPF
+                        cpf=(
+                            cpf_valido(BASE_CPF_MORADORES + c)
+                            if rng.random() < 0.8
+                            else None
+                        ),
+                        vip=rng.random() < 0.05,
+                        qr_token=_uuid(rng),
+                        resposta_presenca=rng.choice(respostas),
+                    )
+                    for c in range(convidados_por_lista)
+                ),
+            )
@@ -0,0 +1,269 @@
+"""
+Serviço único de resolução de endereços por CEP.
+
+Camadas de cache (da mais barata para a mais cara):
+  1. LRU em memória do processo, com TTL (positivo, negativo e de falha);
+  2. tabela ``CepEndereco`` compartilhada entre processos;
+  3. provedores externos (BrasilAPI e, como fallback, ViaCEP).
+
+Consultas simultâneas ao mesmo CEP dentro do processo são deduplicadas
+(single-flight): apenas uma thread consulta DB/provedores e as demais aguardam
+o resultado.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+import requests
+from app.metricas import chamada_externa
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from ..models import CepEndereco
+
+logger = logging.getLogger(__name__)
+
+BRASILAPI_URL = "https://brasilapi.com.br/api/cep/v2/{cep}"
+VIACEP_URL = "https://viacep.com.br/ws/{cep}/json/"
+USER_AGENT = "CancellaFlow/1.0"
+
+
+def _config(nome, padrao):
+    return getattr(settings, nome, padrao)
+
+
+class ProvedorIndisponivel(Exception):
+    """Nenhum provedor respondeu de forma conclusiva (rede/timeout/5xx)."""
+
+
+class _TTLCache:
+    """LRU simples com expiração por entrada, seguro entre threads."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        """Retorna ``(encontrado, valor)``; valor pode ser None (cache negativo)."""
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                return False, None
+            expira_em, valor = item
+            if expira_em < time.monotonic():
+                del self._dados[chave]
+                return False, None
+            self._dados.move_to_end(chave)
+            return True, valor
+
+    def set(self, chave, valor, ttl):
+        with self._lock:
+            self._dados[chave] = (time.monotonic() + ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+
+
+_memoria = _TTLCache(maxsize=_config("CEP_CACHE_MEMORIA_MAX", 2048))
+_em_andamento = {}
+_em_andamento_lock = threading.Lock()
+
+
+def normalizar_cep(value):
+    """Remove qualquer caractere não numérico do CEP."""
+    if value is None:
+        return ""
+    return "".join(ch for ch in str(value) if ch.isdigit())
+
+
+def formatar_cep(cep):
+    cep = normalizar_cep(cep)
+    return f"{cep[:5]}-{cep[5:]}" if len(cep) == 8 else cep
+
+
+def limpar_cache_memoria():
+    """Esvazia o cache em memória do processo (usado em testes)."""
+    _memoria.clear()
+
+
+def buscar_endereco(cep):
+    """
+    Resolve um CEP para ``{"cep", "logradouro", "bairro", "cidade", "estado"}``.
+
+    Retorna None para CEPs inválidos, inexistentes ou quando os provedores
+    estão indisponíveis e não há dado (mesmo expirado) na tabela.
+    O dicionário retornado é uma cópia e pode ser alterado pelo chamador.
+    """
+    cep = normalizar_cep(cep)
+    if len(cep) != 8:
+        return None
+
+    encontrado, valor = _memoria.get(cep)
+    if encontrado:
+        return dict(valor) if valor else None
+
+    with _em_andamento_lock:
+        evento = _em_andamento.get(cep)
+        lider = evento is None
+        if lider:
+            evento = threading.Event()
+            _em_andamento[cep] = evento
+
+    if not lider:
+        evento.wait(timeout=_config("CEP_REQUEST_TIMEOUT", 5) * 2 + 1)
+        encontrado, valor = _memoria.get(cep)
+        return dict(valor) if encontrado and valor else None
+
+    try:
+        valor, ttl = _resolver(cep)
+        _memoria.set(cep, valor, ttl)
+        return dict(valor) if valor else None
+    finally:
+        with _em_andamento_lock:
+            _em_andamento.pop(cep, None)
+        evento.set()
+
+
+def _resolver(cep):
+    """Consulta DB e, se necessário, os provedores. Retorna (valor, ttl_memoria)."""
+    ttl_memoria = _config("CEP_CACHE_MEMORIA_TTL", 6 * 60 * 60)
+    ttl_negativo = _config("CEP_CACHE_NEGATIVO_TTL", 24 * 60 * 60)
+    ttl_falha = _config("CEP_CACHE_FALHA_TTL", 60)
+
+    registro = None
+    try:
+        registro = CepEndereco.objects.filter(cep=cep).first()
+    except DatabaseError:
+        logger.exception("Falha ao ler cache de CEP %s", cep)
+
+    if registro and _registro_valido(registro):
+        if registro.encontrado:
+            return registro.as_dict(), ttl_memoria
+        return None, ttl_negativo
+
+    try:
+        dados, fonte = _consultar_provedores(cep)
+    except ProvedorIndisponivel:
+        # Servir dado expirado é melhor que nada; tenta de novo em breve.
+        if registro and registro.encontrado:
+            return registro.as_dict(), ttl_falha
+        return None, ttl_falha
+
+    _persistir(cep, dados, fonte)
+    if dados:
+        return dados, ttl_memoria
+    return None, ttl_negativo
+
+
+def _registro_valido(registro):
+    if registro.encontrado:
+        validade = timedelta(days=_config("CEP_CACHE_DB_TTL_DIAS", 90))
+    else:
+        validade = timedelta(seconds=_config("CEP_CACHE_NEGATIVO_TTL", 86400))
+    return registro.consultado_em + validade > timezone.now()
+
+
+def _persistir(cep, dados, fonte):
+    defaults = {
+        "logradouro": "",
+        "bairro": "",
+        "cidade": "",
+        "estado": "",
+        "encontrado": bool(dados),
+        "fonte": fonte,
+        "consultado_em": timezone.now(),
+    }
+    if dados:
+        defaults.update(
+            {
+                k: (dados.get(k) or "")[:255]
+                for k in ("logradouro", "bairro", "cidade")
+            }
+        )
+        defaults["estado"] = (dados.get("estado") or "")[:2]
+    try:
+        CepEndereco.objects.update_or_create(cep=cep, defaults=defaults)
+    except DatabaseError:
+        logger.exception("Falha ao gravar cache de CEP %s", cep)
+
+
+def _consultar_provedores(cep):
+    """
+    Consulta BrasilAPI e depois ViaCEP.
+
+    Retorna ``(dados, fonte)`` quando algum provedor encontra o CEP e
+    ``(None, "")`` quando todos respondem que ele não existe. Lança
+    ProvedorIndisponivel se nenhum deu resposta conclusiva.
+    """
+    inconclusivo = False
+    for fonte, consultar in (
+        ("brasilapi", _consultar_brasilapi),
+        ("viacep", _consultar_viacep),
+    ):
+        try:
+            dados = consultar(cep)
+        except (requests.RequestException, ValueError):
+            logger.warning(
+                "Provedor de CEP %s indisponível para %s", fonte, cep
+            )
+            inconclusivo = True
+            continue
+        if dados:
+            dados["cep"] = cep
+            return dados, fonte
+
+    if inconclusivo:
+        raise ProvedorIndisponivel(cep)
+    return None, ""
+
+
+def _get(url):
+    with chamada_externa(url):
+        return requests.get(
+            url,
+            timeout=_config("CEP_REQUEST_TIMEOUT", 5),
+            headers={"User-Agent": USER_AGENT},
+        )
+
+
+def _consultar_brasilapi(cep):
+    response = _get(BRASILAPI_URL.format(cep=cep))
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise requests.RequestException(
+            f"BrasilAPI HTTP {response.status_code}"
+        )
+    data = response.json()
+    return {
+        "logradouro": data.get("street") or "",
+        "bairro": data.get("neighborhood") or "",
+        "cidade": data.get("city") or "",
+        "estado": data.get("state") or "",
+    }
+
+
+def _consultar_viacep(cep):
+    response = _get(VIACEP_URL.format(cep=cep))
+    if response.status_code in (400, 404):
+        return None
+    if response.status_code != 200:
+        raise requests.RequestException(f"ViaCEP HTTP {response.status_code}")
+    data = response.json()
+    if data.get("erro"):
+        return None
+    return {
+        "logradouro": data.get("logradouro") or "",
+        "bairro": data.get("bairro") or "",
+        "cidade": data.get("localidade") or "",
+        "estado": data.get("uf") or "",
+    }
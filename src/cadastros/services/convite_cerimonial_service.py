@@ -0,0 +1,447 @@
+"""
+E-mails da lista de convidados do cerimonial e envio em lote.
+
+Ao finalizar a lista, ``iniciar_envio`` cria um ``EnvioListaCerimonial`` e
+retorna imediatamente; o job monta os e-mails (HTML + QR code) num pool de
+threads limitado e grava cada um na outbox. A entrega (com o limite de
+taxa do provedor) fica com o worker ``processar_emails``, que também retoma
+os envios interrompidos (ver ``retomar_envios_interrompidos``).
+"""
+
+import base64
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import (
+    RESPOSTA_PRESENCA_CONFIRMADO,
+    RESPOSTA_PRESENCA_RECUSADO,
+    ConvidadoListaCerimonial,
+    EmailOutbox,
+    EnvioListaCerimonial,
+)
+from .arquivo_service import ler_arquivo
+from .email_service import enfileirar_email
+from .qrcode_service import pre_renderizar, qrcode_base64
+
+logger = logging.getLogger(__name__)
+
+# Convidados montados por rodada do pool (limita a memória dos payloads)
+TAMANHO_RODADA = 50
+
+STATUS_EM_ANDAMENTO = (
+    EnvioListaCerimonial.STATUS_PENDENTE,
+    EnvioListaCerimonial.STATUS_PROCESSANDO,
+)
+
+
+def _dados_evento(evento):
+    data_evento = (
+        evento.datetime_inicio.strftime("%d/%m/%Y %H:%M")
+        if evento.datetime_inicio
+        else "A confirmar"
+    )
+    return data_evento, evento.endereco_completo or ""
+
+
+def rsvp_url(url_absoluta, token, resposta):
+    """``url_absoluta`` é ``request.build_absolute_uri`` ou equivalente."""
+    path = reverse(
+        "lista-convidados-cerimonial-rsvp-public",
+        kwargs={"token": token},
+    )
+    return url_absoluta(f"{path}?resposta={resposta}")
+
+
+def anexo_imagem_evento(evento, dados=None):
+    """Anexo inline com a imagem do evento, ou None se não houver."""
+    if dados is None:
+        dados = ler_arquivo(evento.imagem_arquivo_id)
+    if not dados:
+        return None
+    return {
+        "filename": evento.imagem_db_filename
+        or f"evento-{evento.id}-imagem.jpg",
+        "content": base64.b64encode(dados).decode(),
+        "content_id": "evento_imagem",
+        "disposition": "inline",
+    }
+
+
+def montar_email_qrcode(convidado, evento):
+    data_evento, endereco = _dados_evento(evento)
+
+    qr_base64 = qrcode_base64(convidado.qr_token)
+
+    html_body = f"""
+    <div style=\"font-family:Arial,sans-serif;max-width:620px;margin:0 auto;border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;\">
+      <div style=\"background:#19294a;padding:20px 24px;text-align:center;\">
+        <p style=\"color:#ffffff;margin:0;font-size:1rem;font-weight:600;\">Convite para Evento</p>
+      </div>
+      <div style=\"padding:24px;background:#ffffff;\">
+        <h2 style=\"color:#19294a;margin:0 0 12px;font-size:1.1rem;\">Olá, {convidado.nome}!</h2>
+        <p style=\"color:#374151;line-height:1.6;margin:0 0 16px;\">
+          Você foi convidado(a) para o evento:<br/>
+          <strong style=\"font-size:1.05rem;color:#2abb98;\">{evento.nome}</strong>
+        </p>
+        <table style=\"width:100%;border-collapse:collapse;margin:0 0 20px;background:#f9fafb;border-radius:8px;border:1px solid #e5e7eb;\">
+          <tr>
+            <td style=\"padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;\">Data</td>
+            <td style=\"padding:8px 12px;color:#111827;font-weight:500;\">{data_evento}</td>
+          </tr>
+          <tr>
+            <td style=\"padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;\">Local</td>
+            <td style=\"padding:8px 12px;color:#111827;font-weight:500;\">{endereco or "-"}</td>
+          </tr>
+        </table>
+        <div style=\"background:#f0fdf4;border:1px solid #86efac;border-radius:8px;padding:16px 20px;text-align:center;\">
+          <p style=\"color:#15803d;font-weight:600;font-size:1rem;margin:0 0 8px;\">QR Code de Acesso</p>
+          <p style=\"color:#166534;font-size:0.88rem;margin:0 0 12px;\">Apresente-o na recepção para confirmar sua entrada.</p>
+          <img src=\"cid:qrcode\" alt=\"QR Code de Acesso\" style=\"width:200px;height:200px;border-radius:8px;\" />
+        </div>
+      </div>
+    </div>
+    """
+
+    return {
+        "from": settings.EMAIL_FROM,
+        "to": [convidado.email],
+        "subject": f"Seu convite para {evento.nome}",
+        "html": html_body,
+        "attachments": [
+            {
+                "filename": "qrcode.png",
+                "content": qr_base64,
+                "content_id": "qrcode",
+                "disposition": "inline",
+            }
+        ],
+    }
+
+
+def montar_email_confirmacao_presenca(
+    convidado, evento, url_absoluta, anexo_imagem=None
+):
+    data_evento, endereco = _dados_evento(evento)
+
+    confirmar_url = rsvp_url(
+        url_absoluta,
+        convidado.qr_token,
+        RESPOSTA_PRESENCA_CONFIRMADO,
+    )
+    recusar_url = rsvp_url(
+        url_absoluta,
+        convidado.qr_token,
+        RESPOSTA_PRESENCA_RECUSADO,
+    )
+
+    evento_imagem_html = ""
+    attachments = []
+    if anexo_imagem:
+        attachments.append(anexo_imagem)
+        evento_imagem_html = """
+        <div style="margin:0 0 18px;">
+          <p style="color:#334155;font-size:0.88rem;font-weight:600;margin:0 0 8px;">Imagem do evento</p>
+          <img src="cid:evento_imagem" alt="Imagem do evento" style="width:100%;max-height:260px;object-fit:cover;border-radius:10px;border:1px solid #e5e7eb;" />
+        </div>
+        """
+
+    html_body = f"""
+    <div style="font-family:Arial,sans-serif;max-width:620px;margin:0 auto;border:1px solid #e5e7eb;border-radius:12px;overflow:hidden;">
+      <div style="background:#19294a;padding:20px 24px;text-align:center;">
+        <p style="color:#ffffff;margin:0;font-size:1rem;font-weight:600;">Confirmação de Presença</p>
+      </div>
+      <div style="padding:24px;background:#ffffff;">
+        <h2 style="color:#19294a;margin:0 0 12px;font-size:1.1rem;">Olá, {convidado.nome}!</h2>
+        <p style="color:#374151;line-height:1.6;margin:0 0 16px;">
+          Você foi convidado(a) para o evento:<br/>
+          <strong style="font-size:1.05rem;color:#2abb98;">{evento.nome}</strong>
+        </p>
+                {evento_imagem_html}
+        <table style="width:100%;border-collapse:collapse;margin:0 0 20px;background:#f9fafb;border-radius:8px;border:1px solid #e5e7eb;">
+          <tr>
+            <td style="padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;">Data</td>
+            <td style="padding:8px 12px;color:#111827;font-weight:500;">{data_evento}</td>
+          </tr>
+          <tr>
+            <td style="padding:8px 12px;color:#6b7280;font-size:0.88rem;width:120px;">Local</td>
+            <td style="padding:8px 12px;color:#111827;font-weight:500;">{endereco or "-"}</td>
+          </tr>
+        </table>
+        <p style="color:#1f2937;line-height:1.6;margin:0 0 12px;">Por favor, confirme sua presença clicando em um dos botões abaixo:</p>
+        <div style="display:flex;gap:10px;flex-wrap:wrap;">
+          <a href="{confirmar_url}" style="background:#16a34a;color:#fff;text-decoration:none;padding:10px 14px;border-radius:8px;font-weight:600;font-size:0.88rem;">Confirmar presença</a>
+          <a href="{recusar_url}" style="background:#dc2626;color:#fff;text-decoration:none;padding:10px 14px;border-radius:8px;font-weight:600;font-size:0.88rem;">Não poderei ir</a>
+        </div>
+        <p style="color:#64748b;font-size:0.8rem;margin:14px 0 0;">Após confirmar presença, você receberá por e-mail o QR Code de acesso.</p>
+      </div>
+    </div>
+    """
+
+    return {
+        "from": settings.EMAIL_FROM,
+        "to": [convidado.email],
+        "subject": f"Confirme sua presença em {evento.nome}",
+        "html": html_body,
+        "attachments": attachments,
+    }
+
+
+# --------------------------------------------------------------------------
+# Envio em lote (finalização da lista)
+# --------------------------------------------------------------------------
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _obter_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.LISTA_CERIMONIAL_ENVIO_JOBS,
+                thread_name_prefix="envio-lista-cerimonial",
+            )
+        return _executor
+
+
+def iniciar_envio(lista, usuario, url_base):
+    """
+    Cria o envio da lista e agenda a execução em segundo plano.
+
+    Retorna ``(envio, criado)``; se já houver um envio em andamento para a
+    lista (atualizado dentro de ``LISTA_CERIMONIAL_ENVIO_TIMEOUT``), ele é
+    retornado em vez de criar outro. Envios parados da lista são encerrados
+    com erro: o novo envio enfileira o que faltou.
+    """
+    limite = _limite_interrompido()
+    envios = EnvioListaCerimonial.objects.filter(
+        lista=lista, status__in=STATUS_EM_ANDAMENTO
+    )
+    em_andamento = (
+        envios.filter(updated_on__gte=limite).order_by("-created_on").first()
+    )
+    if em_andamento is not None:
+        return em_andamento, False
+    envios.filter(updated_on__lt=limite).update(
+        status=EnvioListaCerimonial.STATUS_ERRO, updated_on=timezone.now()
+    )
+
+    envio = EnvioListaCerimonial.objects.create(
+        lista=lista,
+        created_by=usuario,
+        url_base=url_base,
+        total=lista.convidados.count(),
+    )
+    if settings.LISTA_CERIMONIAL_ENVIO_SINCRONO:
+        executar_envio(envio.pk)
+        envio.refresh_from_db()
+    else:
+        transaction.on_commit(
+            lambda: _obter_executor().submit(_executar_em_thread, envio.pk)
+        )
+    return envio, True
+
+
+def _limite_interrompido():
+    """Envios em andamento sem progresso desde então estão parados."""
+    return timezone.now() - timedelta(
+        seconds=settings.LISTA_CERIMONIAL_ENVIO_TIMEOUT
+    )
+
+
+def _executar_ou_marcar_erro(envio_id):
+    try:
+        executar_envio(envio_id)
+    except Exception:
+        logger.exception("Erro no envio %s da lista do cerimonial", envio_id)
+        EnvioListaCerimonial.objects.filter(pk=envio_id).update(
+            status=EnvioListaCerimonial.STATUS_ERRO,
+            updated_on=timezone.now(),
+        )
+
+
+def _executar_em_thread(envio_id):
+    try:
+        _executar_ou_marcar_erro(envio_id)
+    finally:
+        connections.close_all()
+
+
+def retomar_envios_interrompidos():
+    """
+    Reexecuta os envios parados em andamento (processo reiniciado ou deploy
+    no meio do job) e retorna quantos foram retomados.
+
+    Os convidados já enfileirados não recebem o e-mail de novo: a chave na
+    outbox é a mesma.
+    """
+    limite = _limite_interrompido()
+    parados = EnvioListaCerimonial.objects.filter(
+        status__in=STATUS_EM_ANDAMENTO, updated_on__lt=limite
+    )
+    retomados = 0
+    for envio_id in parados.values_list("pk", flat=True):
+        # Só um worker assume cada envio
+        if parados.filter(pk=envio_id).update(updated_on=timezone.now()):
+            logger.warning("Retomando o envio %s da lista", envio_id)
+            _executar_ou_marcar_erro(envio_id)
+            retomados += 1
+    return retomados
+
+
+def executar_envio(envio_id):
+    """Monta e enfileira os e-mails de todos os convidados da lista."""
+    envio = EnvioListaCerimonial.objects.select_related("lista__evento").get(
+        pk=envio_id
+    )
+    envio.status = EnvioListaCerimonial.STATUS_PROCESSANDO
+    envio.save(update_fields=["status", "updated_on"])
+
+    evento = envio.lista.evento
+    convidados = list(envio.lista.convidados.order_by("pk"))
+    # QR codes dos confirmados gerados de uma vez (pool de processos) e a
+    # imagem do evento lida uma única vez para todos os convidados
+    pre_renderizar(
+        [
+            c.qr_token
+            for c in convidados
+            if c.email and c.resposta_presenca == RESPOSTA_PRESENCA_CONFIRMADO
+        ]
+    )
+    anexo_imagem = None
+    if any(
+        c.email and c.resposta_presenca != RESPOSTA_PRESENCA_CONFIRMADO
+        for c in convidados
+    ):
+        anexo_imagem = anexo_imagem_evento(evento)
+
+    def url_absoluta(path):
+        return urljoin(envio.url_base, path)
+
+    def montar(convidado):
+        """Executado no pool: só CPU, sem acesso ao banco."""
+        if not convidado.email:
+            return None, None, "Convidado sem e-mail cadastrado."
+        try:
+            if convidado.resposta_presenca == RESPOSTA_PRESENCA_CONFIRMADO:
+                return "qr", montar_email_qrcode(convidado, evento), None
+            payload = montar_email_confirmacao_presenca(
+                convidado, evento, url_absoluta, anexo_imagem
+            )
+            return "confirmacao", payload, None
+        except Exception:
+            logger.exception(
+                "Erro ao montar e-mail do convidado %s", convidado.pk
+            )
+            return None, None, "Não foi possível montar o e-mail."
+
+    erros = []
+    contagem = {"qr": 0, "confirmacao": 0}
+    with ThreadPoolExecutor(
+        max_workers=settings.LISTA_CERIMONIAL_ENVIO_WORKERS
+    ) as pool:
+        for inicio in range(0, len(convidados), TAMANHO_RODADA):
+            rodada = convidados[inicio : inicio + TAMANHO_RODADA]
+            for convidado, (tipo, payload, erro) in zip(
+                rodada, pool.map(montar, rodada)
+            ):
+                if erro is None:
+                    try:
+                        enfileirar_email(
+                            payload,
+                            chave=f"{envio.prefixo_chave}{tipo}:"
+                            f"{convidado.pk}",
+                        )
+                        contagem[tipo] += 1
+                        continue
+                    except Exception:
+                        erro = "Não foi possível enfileirar o e-mail."
+                erros.append(
+                    {
+                        "convidado_id": convidado.id,
+                        "nome": convidado.nome,
+                        "erro": erro,
+                    }
+                )
+
+            EnvioListaCerimonial.objects.filter(pk=envio.pk).update(
+                processados=inicio + len(rodada),
+                enfileirados_qr=contagem["qr"],
+                enfileirados_confirmacao=contagem["confirmacao"],
+                erros=erros,
+                updated_on=timezone.now(),
+            )
+
+    agora = timezone.now()
+    EnvioListaCerimonial.objects.filter(pk=envio.pk).update(
+        status=EnvioListaCerimonial.STATUS_CONCLUIDO,
+        total=len(convidados),
+        processados=len(convidados),
+        concluido_em=agora,
+        updated_on=agora,
+    )
+
+
+def progresso_envio(envio):
+    """
+    Resumo do envio: montagem, entrega pela outbox e erros por convidado. A
+    entrega é a dos e-mails da lista, inclusive os de envios anteriores.
+    """
+    entregas = {
+        EmailOutbox.STATUS_ENVIADO: 0,
+        EmailOutbox.STATUS_FALHOU: 0,
+    }
+    falhas_entrega = []
+    pendentes = 0
+    linhas = EmailOutbox.objects.filter(
+        chave_idempotencia__startswith=envio.prefixo_chave
+    ).values_list("chave_idempotencia", "status", "ultimo_erro")
+    for chave, status_email, ultimo_erro in linhas:
+        if status_email in entregas:
+            entregas[status_email] += 1
+        else:
+            pendentes += 1
+        if status_email == EmailOutbox.STATUS_FALHOU:
+            convidado_id = int(chave.rsplit(":", 1)[1])
+            falhas_entrega.append((convidado_id, ultimo_erro))
+
+    nomes = dict(
+        ConvidadoListaCerimonial.objects.filter(
+            pk__in=[convidado_id for convidado_id, _ in falhas_entrega]
+        ).values_list("pk", "nome")
+    )
+    falhas = list(envio.erros) + [
+        {
+            "convidado_id": convidado_id,
+            "nome": nomes.get(convidado_id, ""),
+            "erro": ultimo_erro or "Falha na entrega pelo provedor.",
+        }
+        for convidado_id, ultimo_erro in falhas_entrega
+    ]
+
+    return {
+        "envio_id": envio.pk,
+        "lista_id": envio.lista_id,
+        "status": envio.status,
+        "success": envio.status == EnvioListaCerimonial.STATUS_CONCLUIDO
+        and not falhas,
+        "total_convidados": envio.total,
+        "processados": envio.processados,
+        "enviados_confirmacao": envio.enfileirados_confirmacao,
+        "enviados_qr": envio.enfileirados_qr,
+        "entregues": entregas[EmailOutbox.STATUS_ENVIADO],
+        "aguardando_entrega": pendentes,
+        "falhas_entrega": entregas[EmailOutbox.STATUS_FALHOU],
+        "falhas": falhas,
+        "created_on": envio.created_on,
+        "concluido_em": envio.concluido_em,
+    }
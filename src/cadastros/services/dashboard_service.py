@@ -0,0 +1,172 @@
+"""
+Métricas agregadas dos dashboards.
+
+Cada tabela é lida com uma única consulta de agregação condicional
+(``Count(filter=Q(...))``, ``Min(...)``) em vez de um ``COUNT`` por
+métrica. Com ``DASHBOARD_CONSULTA_UNICA`` ativo e todas as tabelas no
+mesmo banco, as consultas de todas as tabelas vão juntas numa só ida ao
+banco (``SELECT ... FROM (...) CROSS JOIN (...)``).
+
+Os resultados dos dashboards ficam em cache por condomínio/papel; ver
+``chave_dashboard``.
+"""
+
+import time
+
+from app.utils.cache_compartilhado import ttl_invalidavel
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.models import Value
+
+
+def _consulta(queryset, agregados):
+    # Anotar uma constante e agrupar por ela não gera GROUP BY: o resultado
+    # é sempre uma única linha, mesmo sem registros, como no aggregate()
+    return (
+        queryset.order_by()
+        .annotate(_unica=Value(1))
+        .values("_unica")
+        .annotate(**agregados)
+        .values(*agregados)
+    )
+
+
+def _banco(agregacoes):
+    bancos = {
+        router.db_for_read(queryset.model)
+        for queryset, _agregados in agregacoes.values()
+    }
+    return bancos.pop() if len(bancos) == 1 else None
+
+
+def _calcular_em_uma_consulta(agregacoes, banco):
+    partes = []
+    for nome, (queryset, agregados) in agregacoes.items():
+        compilador = _consulta(queryset, agregados).query.get_compiler(
+            using=banco
+        )
+        sql, params = compilador.as_sql()
+        colunas = [alias for _coluna, _sql, alias in compilador.select]
+        conversores = compilador.get_converters(
+            [coluna for coluna, _sql, _alias in compilador.select]
+        )
+        partes.append((nome, compilador, sql, params, colunas, conversores))
+
+    derivadas = " CROSS JOIN ".join(
+        f"({parte[2]}) AS metricas_{indice}"
+        for indice, parte in enumerate(partes)
+    )
+    params = [param for parte in partes for param in parte[3]]
+    with connections[banco].cursor() as cursor:
+        cursor.execute(f"SELECT * FROM {derivadas}", params)
+        linha = cursor.fetchone()
+
+    resultado = {}
+    inicio = 0
+    for nome, compilador, _sql, _params, colunas, conversores in partes:
+        valores = linha[inicio : inicio + len(colunas)]
+        inicio += len(colunas)
+        if conversores:
+            valores = next(
+                compilador.apply_converters([list(valores)], conversores)
+            )
+        resultado[nome] = dict(zip(colunas, valores))
+    return resultado
+
+
+def calcular_metricas(agregacoes):
+    """
+    Calcula as métricas de várias tabelas.
+
+    ``agregacoes`` mapeia um nome para ``(queryset, {alias: agregado})``;
+    o retorno mapeia o mesmo nome para ``{alias: valor}``.
+    """
+    banco = _banco(agregacoes)
+    if settings.DASHBOARD_CONSULTA_UNICA and banco is not None:
+        return _calcular_em_uma_consulta(agregacoes, banco)
+    return {
+        nome: queryset.aggregate(**agregados)
+        for nome, (queryset, agregados) in agregacoes.items()
+    }
+
+
+# Snapshots em cache -------------------------------------------------------
+#
+# A chave de cada snapshot leva a versão do condomínio (ou a versão global,
+# para o admin) incrementada pelos signals em ``cadastros.signals`` a cada
+# alteração, e a janela de tempo corrente: campos que dependem da hora
+# (``dias_mais_antiga``, "hoje", "mês atual") mudam no máximo a cada
+# ``DASHBOARD_CACHE_JANELA`` segundos, sem precisar de invalidação. Com o
+# cache por processo (LocMem) os outros workers não veem o incremento da
+# versão, e a janela cai para ``DASHBOARD_CACHE_JANELA_POR_PROCESSO``.
+
+CACHE_PREFIX = "dashboard"
+_ESCOPO_GLOBAL = "global"
+
+
+def _chave_versao(condominio_id):
+    escopo = _ESCOPO_GLOBAL if condominio_id is None else condominio_id
+    return f"{CACHE_PREFIX}:versao:{escopo}"
+
+
+def _versao(condominio_id):
+    chave = _chave_versao(condominio_id)
+    versao = cache.get(chave)
+    if versao is None:
+        versao = 1
+        cache.add(chave, versao, None)
+    return versao
+
+
+def _incrementar(condominio_id):
+    chave = _chave_versao(condominio_id)
+    try:
+        cache.incr(chave)
+    except ValueError:
+        cache.set(chave, 2, None)
+
+
+def invalidar_dashboards(condominio_id=None):
+    """
+    Invalida os snapshots do condomínio e os globais (admin e registros
+    sem condomínio).
+    """
+    if condominio_id is not None:
+        _incrementar(condominio_id)
+    _incrementar(None)
+
+
+def _janela():
+    return ttl_invalidavel(
+        settings.DASHBOARD_CACHE_JANELA,
+        settings.DASHBOARD_CACHE_JANELA_POR_PROCESSO,
+    )
+
+
+def chave_dashboard(papel, condominio_id=None, usuario_id=None):
+    """
+    Chave do snapshot do dashboard ``papel``; ``None`` com o cache
+    desligado. Sem ``condominio_id`` o snapshot é global.
+    """
+    janela = _janela()
+    if janela <= 0:
+        return None
+    partes = (
+        CACHE_PREFIX,
+        papel,
+        condominio_id,
+        usuario_id,
+        _versao(condominio_id),
+        int(time.time() // janela),
+    )
+    return ":".join(map(str, partes))
+
+
+def ler_dashboard(chave):
+    return cache.get(chave) if chave else None
+
+
+def guardar_dashboard(chave, dados):
+    if chave:
+        cache.set(chave, dados, _janela())
@@ -0,0 +1,312 @@
+"""
+Envio de e-mails pela outbox transacional.
+
+As views chamam ``enfileirar_email`` em vez de falar com o provedor: o
+e-mail é gravado em ``EmailOutbox`` dentro da transação corrente e só sai
+depois do commit, pelo worker (``python manage.py processar_emails``).
+
+O worker reserva lotes com ``SELECT ... FOR UPDATE SKIP LOCKED`` (vários
+workers podem rodar em paralelo), envia pelo transporte configurado em
+``EMAIL_OUTBOX_TRANSPORTE`` e reagenda as falhas com backoff exponencial.
+"""
+
+import logging
+import random
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from app.metricas import chamada_externa
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+RESEND_API_URL = "https://api.resend.com"
+
+# Limite de e-mails por chamada da API de lote do Resend
+RESEND_LOTE_MAX = 100
+
+# Campos do payload mantidos depois do envio (ou da desistência). O corpo e
+# os anexos saem da outbox: alguns e-mails levam senha provisória no HTML
+CAMPOS_PAYLOAD_MANTIDOS = ("from", "to", "subject")
+STATUS_FINAIS = (EmailOutbox.STATUS_ENVIADO, EmailOutbox.STATUS_FALHOU)
+
+
+def enfileirar_email(payload, chave=None):
+    """
+    Grava o e-mail na outbox e retorna o registro criado.
+
+    ``chave`` deduplica o enfileiramento: se já existir um e-mail com a mesma
+    chave, ele é retornado e nada novo é gravado.
+    """
+    # Savepoint próprio: quem chama costuma capturar a exceção e seguir
+    # dentro da transação externa
+    with transaction.atomic():
+        if chave:
+            email, _criado = EmailOutbox.objects.get_or_create(
+                chave_idempotencia=chave, defaults={"payload": payload}
+            )
+            return email
+        return EmailOutbox.objects.create(payload=payload)
+
+
+class ResendTransporte:
+    """
+    Entrega pelo Resend.
+
+    E-mails sem anexos vão pela API de lote (até 100 por chamada); a API de
+    lote não aceita anexos, então e-mails com QR code/logo inline são
+    enviados um a um. O lote de cada e-mail é gravado antes da primeira
+    chamada e a retentativa reenvia o mesmo lote, com a mesma chave: o
+    provedor só reconhece a repetição se receber os mesmos e-mails. As chamadas respeitam
+    ``EMAIL_OUTBOX_TAXA_POR_SEGUNDO`` (compartilhado no processo).
+    """
+
+    _taxa_lock = threading.Lock()
+    _ultima_chamada = 0.0
+
+    def __init__(self):
+        import resend
+
+        resend.api_key = settings.RESEND_API_KEY
+        self.resend = resend
+
+    def enviar(self, emails):
+        """Retorna ``{id do registro: (id no provedor, erro)}``."""
+        resultados = {}
+        simples = [e for e in emails if not e.payload.get("attachments")]
+        com_anexos = [e for e in emails if e.payload.get("attachments")]
+
+        for lote in self._lotes(simples):
+            resultados.update(self._enviar_lote(lote))
+
+        for email in com_anexos:
+            self._aguardar_taxa()
+            try:
+                with chamada_externa(RESEND_API_URL):
+                    resposta = self.resend.Emails.send(
+                        email.payload,
+                        {"idempotency_key": email.chave_idempotencia},
+                    )
+                resultados[email.pk] = (resposta.get("id", ""), None)
+            except Exception as exc:
+                resultados[email.pk] = (None, str(exc))
+        return resultados
+
+    def _lotes(self, emails):
+        lotes = {}
+        novos = []
+        for email in emails:
+            if email.lote_envio:
+                lotes.setdefault(email.lote_envio, []).append(email)
+            else:
+                novos.append(email)
+        for inicio in range(0, len(novos), RESEND_LOTE_MAX):
+            lote = novos[inicio : inicio + RESEND_LOTE_MAX]
+            chave = uuid.uuid4().hex
+            EmailOutbox.objects.filter(pk__in=[e.pk for e in lote]).update(
+                lote_envio=chave
+            )
+            for email in lote:
+                email.lote_envio = chave
+            lotes[chave] = lote
+        return list(lotes.values())
+
+    def _enviar_lote(self, lote):
+        self._aguardar_taxa()
+        try:
+            with chamada_externa(RESEND_API_URL):
+                resposta = self.resend.Batch.send(
+                    [e.payload for e in lote],
+                    {"idempotency_key": lote[0].lote_envio},
+                )
+        except Exception as exc:
+            return {e.pk: (None, str(exc)) for e in lote}
+        dados = resposta.get("data") or []
+        return {
+            email.pk: (dados[i].get("id", "") if i < len(dados) else "", None)
+            for i, email in enumerate(lote)
+        }
+
+    @classmethod
+    def _aguardar_taxa(cls):
+        taxa = settings.EMAIL_OUTBOX_TAXA_POR_SEGUNDO
+        if taxa <= 0:
+            return
+        with cls._taxa_lock:
+            espera = cls._ultima_chamada + 1 / taxa - time.monotonic()
+            if espera > 0:
+                time.sleep(espera)
+            cls._ultima_chamada = time.monotonic()
+
+
+class MemoriaTransporte:
+    """Transporte local para testes e desenvolvimento: só guarda em memória."""
+
+    enviados = []
+
+    def enviar(self, emails):
+        resultados = {}
+        for email in emails:
+            MemoriaTransporte.enviados.append(email.payload)
+            resultados[email.pk] = (f"memoria-{email.pk}", None)
+        return resultados
+
+    @classmethod
+    def limpar(cls):
+        cls.enviados.clear()
+
+
+def payload_sem_conteudo(payload):
+    return {
+        campo: payload[campo]
+        for campo in CAMPOS_PAYLOAD_MANTIDOS
+        if campo in payload
+    }
+
+
+def obter_transporte():
+    return import_string(settings.EMAIL_OUTBOX_TRANSPORTE)()
+
+
+def calcular_backoff(tentativas):
+    """Espera antes da próxima tentativa (exponencial, com jitter)."""
+    base = settings.EMAIL_OUTBOX_BACKOFF_BASE * 2 ** max(0, tentativas - 1)
+    segundos = min(base, settings.EMAIL_OUTBOX_BACKOFF_MAX)
+    return timedelta(seconds=segundos * random.uniform(0.8, 1.2))
+
+
+def reservar_lote(limite):
+    """
+    Reserva até ``limite`` e-mails prontos para envio.
+
+    E-mails que ficaram em ``enviando`` além do prazo da reserva (worker
+    interrompido) voltam a ser elegíveis; a chave de idempotência evita o
+    envio duplicado no provedor. Um lote já enviado ao provedor é sempre
+    reservado inteiro, mesmo que passe de ``limite``.
+    """
+    agora = timezone.now()
+    prontos = Q(
+        status=EmailOutbox.STATUS_PENDENTE, proxima_tentativa_em__lte=agora
+    ) | Q(status=EmailOutbox.STATUS_ENVIANDO, reservado_ate__lt=agora)
+
+    with transaction.atomic():
+        reservados = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(prontos)
+            .order_by("proxima_tentativa_em", "pk")
+            .values_list("pk", "lote_envio")[:limite]
+        )
+        ids = [pk for pk, _lote in reservados]
+        lotes = {lote for _pk, lote in reservados if lote}
+        if lotes:
+            ids += (
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(prontos, lote_envio__in=lotes)
+                .exclude(pk__in=ids)
+                .values_list("pk", flat=True)
+            )
+        EmailOutbox.objects.filter(pk__in=ids).update(
+            status=EmailOutbox.STATUS_ENVIANDO,
+            reservado_ate=agora
+            + timedelta(seconds=settings.EMAIL_OUTBOX_RESERVA),
+            tentativas=F("tentativas") + 1,
+        )
+    return list(EmailOutbox.objects.filter(pk__in=ids).order_by("pk"))
+
+
+def processar_lote(limite=None, transporte=None):
+    """Envia um lote da outbox e retorna ``(enviados, falhas)``."""
+    emails = reservar_lote(limite or settings.EMAIL_OUTBOX_LOTE)
+    if not emails:
+        return 0, 0
+
+    transporte = transporte or obter_transporte()
+    try:
+        resultados = transporte.enviar(emails)
+    except Exception as exc:
+        logger.exception("Erro no transporte de e-mails")
+        resultados = {e.pk: (None, str(exc)) for e in emails}
+
+    agora = timezone.now()
+    enviados = falhas = 0
+    # E-mails do mesmo lote voltam juntos para a fila
+    proximas = {}
+    for email in emails:
+        provedor_id, erro = resultados.get(
+            email.pk, (None, "Sem resposta do transporte")
+        )
+        email.reservado_ate = None
+        if erro is None:
+            email.status = EmailOutbox.STATUS_ENVIADO
+            email.enviado_em = agora
+            email.provedor_id = provedor_id or ""
+            email.ultimo_erro = ""
+            email.payload = payload_sem_conteudo(email.payload)
+            enviados += 1
+            continue
+
+        falhas += 1
+        email.ultimo_erro = erro
+        if email.tentativas >= settings.EMAIL_OUTBOX_MAX_TENTATIVAS:
+            email.status = EmailOutbox.STATUS_FALHOU
+            email.payload = payload_sem_conteudo(email.payload)
+            logger.error(
+                "E-mail %s descartado após %s tentativas: %s",
+                email.pk,
+                email.tentativas,
+                erro,
+            )
+        else:
+            email.status = EmailOutbox.STATUS_PENDENTE
+            grupo = email.lote_envio or email.pk
+            if grupo not in proximas:
+                proximas[grupo] = agora + calcular_backoff(email.tentativas)
+            email.proxima_tentativa_em = proximas[grupo]
+
+    EmailOutbox.objects.bulk_update(
+        emails,
+        [
+            "payload",
+            "status",
+            "reservado_ate",
+            "enviado_em",
+            "provedor_id",
+            "ultimo_erro",
+            "proxima_tentativa_em",
+        ],
+    )
+    return enviados, falhas
+
+
+def purgar_outbox(dias=None):
+    """
+    Remove os e-mails enviados ou descartados há mais de ``dias`` (padrão:
+    ``EMAIL_OUTBOX_RETENCAO_DIAS``) e tira o corpo dos que ainda o guardam
+    (gravados antes de o worker limpar o payload). Retorna quantos removeu.
+    """
+    if dias is None:
+        dias = settings.EMAIL_OUTBOX_RETENCAO_DIAS
+    finais = EmailOutbox.objects.filter(status__in=STATUS_FINAIS)
+
+    com_conteudo = list(
+        finais.filter(
+            Q(payload__has_key="html")
+            | Q(payload__has_key="text")
+            | Q(payload__has_key="attachments")
+        ).only("pk", "payload")
+    )
+    for email in com_conteudo:
+        email.payload = payload_sem_conteudo(email.payload)
+    EmailOutbox.objects.bulk_update(com_conteudo, ["payload"], batch_size=500)
+
+    limite = timezone.now() - timedelta(days=dias)
+    removidos, _ = finais.filter(created_on__lt=limite).delete()
+    return removidos
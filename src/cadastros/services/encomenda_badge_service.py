@@ -0,0 +1,120 @@
+"""
+Badge de encomendas pendentes por idade.
+
+As faixas (verde: criada há menos de 1 dia, amarela: 1 a 3 dias,
+vermelha: 4 dias ou mais) são contadas no banco com uma agregação
+condicional sobre ``created_on``, usando o índice parcial das encomendas
+pendentes.
+
+Para o morador, as datas de criação das encomendas pendentes de cada
+unidade ficam em cache (``ENCOMENDA_BADGE_CACHE_TTL``); as faixas são
+calculadas na hora, então o cache não envelhece com o tempo. Os signals em
+``cadastros.signals`` descartam o cache da unidade (e da unidade anterior,
+se a encomenda mudou de unidade) quando uma encomenda muda. Sem cache
+compartilhado entre os workers vale o TTL curto
+``ENCOMENDA_BADGE_CACHE_TTL_POR_PROCESSO``.
+"""
+
+from datetime import timedelta
+
+from app.utils.cache_compartilhado import ttl_invalidavel
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from ..models import Encomenda
+
+CACHE_PREFIX = "encomenda:badge:unidade"
+
+
+def _limites(agora):
+    return agora - timedelta(days=1), agora - timedelta(days=4)
+
+
+def _resumo(green, yellow, red):
+    total = green + yellow + red
+    # Cor do badge: priorizar mais antigo (vermelho > amarelo > verde)
+    if total == 0:
+        badge_color = "none"
+    elif red > 0:
+        badge_color = "red"
+    elif yellow > 0:
+        badge_color = "yellow"
+    else:
+        badge_color = "green"
+    return {
+        "total": total,
+        "green": green,
+        "yellow": yellow,
+        "red": red,
+        "badge_color": badge_color,
+    }
+
+
+def contar_por_idade(queryset, agora=None):
+    """Resumo do badge para as encomendas pendentes de ``queryset``."""
+    verde_desde, vermelho_ate = _limites(agora or timezone.now())
+    contagens = queryset.filter(retirado_em__isnull=True).aggregate(
+        green=Count("id", filter=Q(created_on__gt=verde_desde)),
+        yellow=Count(
+            "id",
+            filter=Q(created_on__lte=verde_desde, created_on__gt=vermelho_ate),
+        ),
+        red=Count("id", filter=Q(created_on__lte=vermelho_ate)),
+    )
+    return _resumo(contagens["green"], contagens["yellow"], contagens["red"])
+
+
+def _chave(unidade_id):
+    return f"{CACHE_PREFIX}:{unidade_id}"
+
+
+def _pendentes_por_unidade(unidades_ids):
+    """Datas de criação das encomendas pendentes, por unidade (com cache)."""
+    ttl = ttl_invalidavel(
+        settings.ENCOMENDA_BADGE_CACHE_TTL,
+        settings.ENCOMENDA_BADGE_CACHE_TTL_POR_PROCESSO,
+    )
+    chaves = {_chave(unidade_id): unidade_id for unidade_id in unidades_ids}
+    em_cache = cache.get_many(chaves) if ttl > 0 else {}
+    resultado = {chaves[chave]: datas for chave, datas in em_cache.items()}
+
+    faltantes = [u for u in unidades_ids if u not in resultado]
+    if faltantes:
+        for unidade_id in faltantes:
+            resultado[unidade_id] = []
+        pendentes = Encomenda.objects.filter(
+            unidade_id__in=faltantes, retirado_em__isnull=True
+        ).values_list("unidade_id", "created_on")
+        for unidade_id, created_on in pendentes:
+            resultado[unidade_id].append(created_on)
+        if ttl > 0:
+            cache.set_many({_chave(u): resultado[u] for u in faltantes}, ttl)
+    return resultado
+
+
+def badge_das_unidades(unidades_ids, agora=None):
+    """Resumo do badge das unidades do morador (servido do cache)."""
+    verde_desde, vermelho_ate = _limites(agora or timezone.now())
+    green = yellow = red = 0
+    for datas in _pendentes_por_unidade(unidades_ids).values():
+        for created_on in datas:
+            if created_on > verde_desde:
+                green += 1
+            elif created_on > vermelho_ate:
+                yellow += 1
+            else:
+                red += 1
+    return _resumo(green, yellow, red)
+
+
+def invalidar_badge_unidade(unidade_id):
+    if unidade_id is None:
+        return
+    chave = _chave(unidade_id)
+    cache.delete(chave)
+    # De novo após o commit: uma leitura concorrente pode ter recolocado
+    # no cache o estado anterior à transação
+    transaction.on_commit(lambda: cache.delete(chave))
@@ -0,0 +1,153 @@
+"""
+Variantes redimensionadas das imagens armazenadas (logos, fotos e imagens de
+eventos).
+
+No upload, cada imagem gera uma variante por tamanho de
+``IMAGENS_VARIANTES_TAMANHOS`` em WebP e em PNG. Os endpoints de imagem
+servem a variante quando o cliente pede ``?size=<px>`` (e opcionalmente
+``?formato=webp|png``); sem ``size`` continua sendo servido o original.
+"""
+
+import io
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from ..models import ArquivoVariante
+from .arquivo_service import armazenar_arquivo, ler_arquivo, remover_se_orfao
+
+logger = logging.getLogger(__name__)
+
+# formato -> (formato do Pillow, content type, opções de gravação)
+FORMATOS = {
+    ArquivoVariante.FORMATO_WEBP: ("WEBP", "image/webp", {"quality": 80}),
+    ArquivoVariante.FORMATO_PNG: ("PNG", "image/png", {"optimize": True}),
+}
+
+
+def tamanhos_variantes():
+    return tuple(sorted(set(settings.IMAGENS_VARIANTES_TAMANHOS)))
+
+
+def _abrir_imagem(dados):
+    """Abre a imagem já com a orientação EXIF aplicada, ou None."""
+    try:
+        imagem = Image.open(io.BytesIO(dados))
+        # JPEG: decodifica direto numa escala menor, bem mais barato que
+        # decodificar a foto inteira para depois reduzir
+        maior = max(tamanhos_variantes(), default=0)
+        if maior:
+            imagem.draft("RGB", (maior, maior))
+        imagem = ImageOps.exif_transpose(imagem)
+        imagem.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return None
+
+    tem_alfa = imagem.mode in ("RGBA", "LA", "PA") or (
+        imagem.mode == "P" and "transparency" in imagem.info
+    )
+    return imagem.convert("RGBA" if tem_alfa else "RGB")
+
+
+def _codificar(imagem, formato):
+    formato_pil, _content_type, opcoes = FORMATOS[formato]
+    buffer = io.BytesIO()
+    imagem.save(buffer, format=formato_pil, **opcoes)
+    return buffer.getvalue()
+
+
+def gerar_variantes(arquivo_id, substituir=False):
+    """
+    Gera as variantes do arquivo e retorna quantas foram criadas.
+
+    Arquivos que não são imagens são ignorados. Tamanhos maiores que a
+    própria imagem viram uma única variante no tamanho original (sem
+    ampliar). Com ``substituir``, os arquivos das variantes anteriores que
+    não forem reaproveitados são removidos.
+    """
+    existentes = ArquivoVariante.objects.filter(original_id=arquivo_id)
+    anteriores = set()
+    if substituir:
+        anteriores = set(existentes.values_list("arquivo_id", flat=True))
+        existentes.delete()
+    elif existentes.exists():
+        return 0
+
+    try:
+        return _criar_variantes(arquivo_id)
+    finally:
+        # Variantes regeradas com o mesmo conteúdo continuam referenciadas
+        for variante_id in anteriores:
+            remover_se_orfao(variante_id)
+
+
+def _criar_variantes(arquivo_id):
+    dados = ler_arquivo(arquivo_id)
+    if dados is None:
+        return 0
+    imagem = _abrir_imagem(dados)
+    if imagem is None:
+        return 0
+
+    maior_lado = max(imagem.size)
+    tamanhos = sorted({min(t, maior_lado) for t in tamanhos_variantes()})
+
+    criadas = 0
+    # Do maior para o menor: cada redução parte da anterior
+    for tamanho in reversed(tamanhos):
+        imagem.thumbnail((tamanho, tamanho), Image.LANCZOS)
+        for formato, (_pil, content_type, _opcoes) in FORMATOS.items():
+            arquivo = armazenar_arquivo(
+                _codificar(imagem, formato), content_type
+            )
+            try:
+                with transaction.atomic():
+                    ArquivoVariante.objects.create(
+                        original_id=arquivo_id,
+                        tamanho=tamanho,
+                        formato=formato,
+                        arquivo=arquivo,
+                    )
+            except IntegrityError:
+                # Gerada em paralelo por outra requisição/comando
+                continue
+            criadas += 1
+    return criadas
+
+
+def gerar_variantes_seguro(arquivo_id):
+    """Como ``gerar_variantes``, mas sem interromper o upload se falhar."""
+    try:
+        return gerar_variantes(arquivo_id)
+    except Exception:
+        logger.exception("Erro ao gerar variantes do arquivo %s", arquivo_id)
+        return 0
+
+
+def escolher_formato(request):
+    formato = request.GET.get("formato", "").lower()
+    if formato in FORMATOS:
+        return formato
+    if "image/webp" in request.headers.get("Accept", ""):
+        return ArquivoVariante.FORMATO_WEBP
+    return ArquivoVariante.FORMATO_PNG
+
+
+def escolher_variante(arquivo_id, tamanho, formato):
+    """
+    Retorna ``(arquivo_id, content_type)`` da menor variante com pelo menos
+    ``tamanho`` pixels (ou da maior disponível), ou None se não houver.
+    """
+    variantes = list(
+        ArquivoVariante.objects.filter(original_id=arquivo_id, formato=formato)
+        .order_by("tamanho")
+        .values_list("tamanho", "arquivo_id")
+    )
+    if not variantes:
+        return None
+    _tamanho, variante_id = next(
+        (v for v in variantes if v[0] >= tamanho), variantes[-1]
+    )
+    return variante_id, FORMATOS[formato][1]
@@ -0,0 +1,145 @@
+"""
+Paginação das listagens: por número de página ou por cursor (keyset).
+
+Sem ``?cursor=`` a resposta mantém o formato antigo (``count``,
+``num_pages``, ``current_page``...), calculado pelo ``Paginator``.
+
+Com ``?cursor=`` (vazio na primeira página) a consulta filtra pelas chaves
+de ordenação do último item da página anterior em vez de usar ``OFFSET``,
+busca um item a mais para saber se há próxima página e só faz o
+``COUNT(*)`` quando o cliente pede ``?count=true``. O cursor é opaco para
+o cliente (JSON em base64).
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+
+
+class CursorInvalido(ValueError):
+    """Cursor que não foi gerado para esta listagem."""
+
+
+def _chaves(queryset, ordenacao):
+    """Campos de ordenação como (campo, descendente), terminando na PK."""
+    opts = queryset.model._meta
+    chaves = []
+    for nome in ordenacao:
+        descendente = nome.startswith("-")
+        nome = nome.lstrip("-")
+        campo = opts.pk if nome == "pk" else opts.get_field(nome)
+        chaves.append((campo, descendente))
+    if not chaves or chaves[-1][0] != opts.pk:
+        # Desempate pela PK para a ordem ser total
+        chaves.append((opts.pk, chaves[-1][1] if chaves else False))
+    return chaves
+
+
+def _ordenacao(chaves):
+    return [
+        f"-{campo.name}" if descendente else campo.name
+        for campo, descendente in chaves
+    ]
+
+
+def codificar_cursor(valores):
+    # str() preserva os microssegundos das datas (o DjangoJSONEncoder corta
+    # em milissegundos e o cursor pularia itens)
+    texto = json.dumps(valores, default=str)
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor, chaves):
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(preenchido))
+    except (ValueError, binascii.Error):
+        raise CursorInvalido("Cursor inválido.")
+    if not isinstance(valores, list) or len(valores) != len(chaves):
+        raise CursorInvalido("Cursor inválido.")
+    try:
+        return [
+            None if valor is None else campo.to_python(valor)
+            for (campo, _), valor in zip(chaves, valores)
+        ]
+    except ValidationError:
+        raise CursorInvalido("Cursor inválido.")
+
+
+def _depois_de(chaves, valores, nulo_maior):
+    """
+    Filtro dos itens posteriores a ``valores`` na ordem de ``chaves``.
+
+    Segue a posição nativa de NULL no banco (maior que tudo no PostgreSQL,
+    menor no SQLite), a mesma que o ORDER BY e os índices usam.
+    """
+    filtro = Q(pk__in=[])
+    iguais = Q()
+    for (campo, descendente), valor in zip(chaves, valores):
+        nome = campo.name
+        nulo_no_fim = nulo_maior != descendente
+        if valor is None:
+            posterior = Q(**{f"{nome}__isnull": False})
+            igual = Q(**{f"{nome}__isnull": True})
+            if not nulo_no_fim:
+                filtro |= iguais & posterior
+        else:
+            operador = "lt" if descendente else "gt"
+            posterior = Q(**{f"{nome}__{operador}": valor})
+            if nulo_no_fim and campo.null:
+                posterior |= Q(**{f"{nome}__isnull": True})
+            igual = Q(**{nome: valor})
+            filtro |= iguais & posterior
+        iguais &= igual
+    return filtro
+
+
+def paginar(request, queryset, por_pagina, ordenacao):
+    """
+    Ordena e pagina ``queryset`` conforme os parâmetros da requisição.
+
+    Retorna ``(itens, metadados)``; os metadados vão junto de ``results``
+    na resposta da listagem.
+    """
+    chaves = _chaves(queryset, ordenacao)
+    queryset = queryset.order_by(*_ordenacao(chaves))
+
+    cursor = request.GET.get("cursor")
+    if cursor is None:
+        page = int(request.GET.get("page", 1))
+        paginator = Paginator(queryset, por_pagina)
+        page_obj = paginator.get_page(page)
+        return page_obj.object_list, {
+            "count": paginator.count,
+            "num_pages": paginator.num_pages,
+            "current_page": page_obj.number,
+            "has_next": page_obj.has_next(),
+            "has_previous": page_obj.has_previous(),
+        }
+
+    contar = request.GET.get("count", "").lower() == "true"
+    total = queryset.count() if contar else None
+    if cursor:
+        nulo_maior = connections[queryset.db].features.nulls_order_largest
+        valores = decodificar_cursor(cursor, chaves)
+        queryset = queryset.filter(_depois_de(chaves, valores, nulo_maior))
+
+    itens = list(queryset[: por_pagina + 1])
+    has_next = len(itens) > por_pagina
+    itens = itens[:por_pagina]
+    proximo = None
+    if has_next:
+        proximo = codificar_cursor(
+            [getattr(itens[-1], campo.attname) for campo, _ in chaves]
+        )
+    return itens, {
+        "count": total,
+        "next_cursor": proximo,
+        "has_next": has_next,
+        "has_previous": bool(cursor),
+    }
@@ -0,0 +1,246 @@
+"""
+Renderização de QR codes com cache.
+
+Todos os QR codes da aplicação (e-mails, downloads, convites) passam por
+``qrcode_png``: o PNG é gerado uma vez por (conteúdo, rótulo) e guardado
+num LRU em memória e, opcionalmente, em disco (``QRCODE_CACHE_DIR``),
+compartilhado entre os workers. A fonte do rótulo é carregada uma única
+vez por processo.
+
+``pre_renderizar`` gera de uma vez os QR codes de uma lista inteira num
+pool de processos (ex.: antes do envio em lote dos convites).
+
+Este módulo não importa modelos: ``_renderizar`` roda nos processos do
+pool sem depender do Django configurado.
+"""
+
+import base64
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import qrcode
+from app.metricas import incrementar
+from django.conf import settings
+from PIL import Image, ImageDraw, ImageFont
+
+logger = logging.getLogger(__name__)
+
+NIVEIS_CORRECAO = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+FONTES_CANDIDATAS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    "/usr/share/fonts/truetype/freefont/FreeSansBold.ttf",
+    "Arial.ttf",
+)
+TAMANHO_FONTE = 18
+MARGEM_ROTULO = 20
+ALTURA_ROTULO = 44
+
+_memoria = OrderedDict()
+_memoria_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _fonte(caminho_preferido=""):
+    """Carrega a fonte do rótulo (uma vez por processo)."""
+    for caminho in filter(None, (caminho_preferido, *FONTES_CANDIDATAS)):
+        try:
+            return ImageFont.truetype(caminho, TAMANHO_FONTE)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def _parametros():
+    return (
+        settings.QRCODE_CORRECAO,
+        settings.QRCODE_BOX_SIZE,
+        settings.QRCODE_BORDA,
+        settings.QRCODE_FONTE,
+    )
+
+
+def _renderizar(conteudo, rotulo, parametros):
+    correcao, box_size, borda, fonte = parametros
+    qr = qrcode.QRCode(
+        error_correction=NIVEIS_CORRECAO[correcao],
+        box_size=box_size,
+        border=borda,
+    )
+    qr.add_data(conteudo)
+    qr.make(fit=True)
+    imagem = qr.make_image().get_image()
+
+    if rotulo:
+        imagem = imagem.convert("L")
+        lado = imagem.size[0]
+        canvas = Image.new(
+            "L",
+            (
+                lado + MARGEM_ROTULO * 2,
+                lado + MARGEM_ROTULO * 2 + ALTURA_ROTULO,
+            ),
+            "white",
+        )
+        canvas.paste(imagem, (MARGEM_ROTULO, MARGEM_ROTULO))
+        ImageDraw.Draw(canvas).text(
+            (canvas.width // 2, lado + MARGEM_ROTULO + ALTURA_ROTULO // 2),
+            rotulo,
+            fill="black",
+            font=_fonte(fonte),
+            anchor="mm",
+        )
+        imagem = canvas
+
+    saida = io.BytesIO()
+    imagem.save(saida, format="PNG", optimize=True)
+    return saida.getvalue()
+
+
+def _chave(conteudo, rotulo, parametros):
+    bruto = "|".join(map(str, (conteudo, rotulo or "", *parametros)))
+    return hashlib.sha256(bruto.encode()).hexdigest()
+
+
+def _caminho_disco(chave):
+    diretorio = settings.QRCODE_CACHE_DIR
+    if not diretorio:
+        return None
+    return os.path.join(diretorio, chave[:2], f"{chave}.png")
+
+
+def _ler_cache(chave):
+    with _memoria_lock:
+        png = _memoria.get(chave)
+        if png is not None:
+            _memoria.move_to_end(chave)
+            return png
+
+    caminho = _caminho_disco(chave)
+    if caminho is None:
+        return None
+    try:
+        with open(caminho, "rb") as arquivo:
+            png = arquivo.read()
+    except OSError:
+        return None
+    _guardar_memoria(chave, png)
+    return png
+
+
+def _guardar_memoria(chave, png):
+    with _memoria_lock:
+        _memoria[chave] = png
+        _memoria.move_to_end(chave)
+        while len(_memoria) > settings.QRCODE_CACHE_MEMORIA_MAX:
+            _memoria.popitem(last=False)
+
+
+def _guardar_cache(chave, png):
+    _guardar_memoria(chave, png)
+    caminho = _caminho_disco(chave)
+    if caminho is None:
+        return
+    try:
+        # Os PNGs codificam tokens de acesso: só o usuário da aplicação lê
+        os.makedirs(settings.QRCODE_CACHE_DIR, mode=0o700, exist_ok=True)
+        os.makedirs(os.path.dirname(caminho), mode=0o700, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        descritor = os.open(
+            temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+        )
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(png)
+        os.replace(temporario, caminho)
+    except OSError:
+        logger.warning("Não foi possível gravar o QR code em %s", caminho)
+
+
+def limpar_cache_memoria():
+    with _memoria_lock:
+        _memoria.clear()
+
+
+def qrcode_png(conteudo, rotulo=None):
+    """PNG do QR code de ``conteudo``, com ``rotulo`` opcional abaixo."""
+    conteudo = str(conteudo)
+    parametros = _parametros()
+    chave = _chave(conteudo, rotulo, parametros)
+    png = _ler_cache(chave)
+    if png is None:
+        png = _renderizar(conteudo, rotulo, parametros)
+        _guardar_cache(chave, png)
+        incrementar("qrcode_renderizados_total", origem="render")
+    else:
+        incrementar("qrcode_renderizados_total", origem="cache")
+    return png
+
+
+def qrcode_base64(conteudo, rotulo=None):
+    return base64.b64encode(qrcode_png(conteudo, rotulo)).decode()
+
+
+def qrcode_data_url(conteudo, rotulo=None):
+    return f"data:image/png;base64,{qrcode_base64(conteudo, rotulo)}"
+
+
+def pre_renderizar(itens, processos=None):
+    """
+    Gera e guarda no cache os QR codes de ``itens``.
+
+    ``itens`` é uma sequência de ``conteudo`` ou ``(conteudo, rotulo)``.
+    Os que ainda não estão em cache são renderizados em paralelo num pool
+    de até ``processos`` processos (``QRCODE_PROCESSOS``); lotes pequenos
+    são renderizados no próprio processo. Retorna quantos foram gerados.
+    """
+    parametros = _parametros()
+    pendentes = {}
+    for item in itens:
+        conteudo, rotulo = item if isinstance(item, tuple) else (item, None)
+        conteudo = str(conteudo)
+        chave = _chave(conteudo, rotulo, parametros)
+        if chave not in pendentes and _ler_cache(chave) is None:
+            pendentes[chave] = (conteudo, rotulo)
+    if not pendentes:
+        return 0
+
+    processos = processos or settings.QRCODE_PROCESSOS or os.cpu_count()
+    if processos <= 1 or len(pendentes) < settings.QRCODE_LOTE_MINIMO:
+        for chave, (conteudo, rotulo) in pendentes.items():
+            _guardar_cache(chave, _renderizar(conteudo, rotulo, parametros))
+        incrementar(
+            "qrcode_renderizados_total", len(pendentes), origem="pre_render"
+        )
+        return len(pendentes)
+
+    chaves = list(pendentes)
+    # "spawn": o processo pai pode ter threads (jobs de envio em segundo
+    # plano), o que torna o fork inseguro
+    with ProcessPoolExecutor(
+        max_workers=min(processos, len(chaves)),
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        resultados = pool.map(
+            _renderizar,
+            [pendentes[c][0] for c in chaves],
+            [pendentes[c][1] for c in chaves],
+            [parametros] * len(chaves),
+            chunksize=max(1, len(chaves) // (processos * 4)),
+        )
+        for chave, png in zip(chaves, resultados):
+            _guardar_cache(chave, png)
+    incrementar("qrcode_renderizados_total", len(chaves), origem="pre_render")
+    return len(chaves)
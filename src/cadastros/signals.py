@@ -0,0 +1,151 @@
+from access.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    Aviso,
+    Condominio,
+    Encomenda,
+    EspacoReserva,
+    Evento,
+    Ocorrencia,
+    Unidade,
+    Visitante,
+)
+from .services.aviso_service import sincronizar_aviso, sincronizar_usuario
+from .services.dashboard_service import invalidar_dashboards
+from .services.encomenda_badge_service import invalidar_badge_unidade
+
+MODELOS_POR_CONDOMINIO = (
+    Aviso,
+    Encomenda,
+    EspacoReserva,
+    Evento,
+    Ocorrencia,
+    Visitante,
+    User,
+)
+
+
+def invalidar_dashboards_do_registro(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        # Login não altera nenhuma métrica
+        return
+    invalidar_dashboards(instance.condominio_id)
+
+
+for modelo in MODELOS_POR_CONDOMINIO:
+    post_save.connect(
+        invalidar_dashboards_do_registro,
+        sender=modelo,
+        dispatch_uid=f"dashboard-save-{modelo._meta.label_lower}",
+    )
+    post_delete.connect(
+        invalidar_dashboards_do_registro,
+        sender=modelo,
+        dispatch_uid=f"dashboard-delete-{modelo._meta.label_lower}",
+    )
+
+
+@receiver(post_save, sender=Encomenda)
+@receiver(post_delete, sender=Encomenda)
+def invalidar_badge_encomendas(sender, instance, **kwargs):
+    invalidar_badge_unidade(instance.unidade_id)
+    original = getattr(instance, "_unidade_id_original", None)
+    if original != instance.unidade_id:
+        invalidar_badge_unidade(original)
+    instance._unidade_id_original = instance.unidade_id
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidar_dashboards_ao_alterar_grupos(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        # instance é o usuário
+        invalidar_dashboards(instance.condominio_id)
+        return
+    # instance é o grupo; pk_set contém os usuários afetados (no clear,
+    # desconhecidos: os snapshots expiram com a janela do cache)
+    condominios = set(
+        User.objects.filter(pk__in=pk_set or ()).values_list(
+            "condominio_id", flat=True
+        )
+    )
+    for condominio_id in condominios or {None}:
+        invalidar_dashboards(condominio_id)
+
+
+@receiver(m2m_changed, sender=User.unidades.through)
+def invalidar_dashboards_ao_alterar_unidades(
+    sender, instance, action, reverse, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # Contagem de unidades por condomínio do dashboard admin (global)
+    invalidar_dashboards(None if reverse else instance.condominio_id)
+
+
+@receiver(post_save, sender=Condominio)
+@receiver(post_delete, sender=Condominio)
+@receiver(post_save, sender=Unidade)
+@receiver(post_delete, sender=Unidade)
+def invalidar_dashboard_admin(sender, instance, **kwargs):
+    invalidar_dashboards()
+
+
+# Caixa de entrada de avisos -----------------------------------------------
+
+
+@receiver(post_save, sender=Aviso)
+def sincronizar_entregas_do_aviso(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sincronizar_aviso(instance.pk)
+
+
+@receiver(m2m_changed, sender=Aviso.grupos.through)
+def sincronizar_entregas_ao_alterar_grupos_do_aviso(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        sincronizar_aviso(instance.pk)
+        return
+    for aviso_id in pk_set or ():
+        sincronizar_aviso(aviso_id)
+
+
+@receiver(post_save, sender=Encomenda)
+def sincronizar_entregas_da_encomenda(sender, instance, created, **kwargs):
+    # Retirada da encomenda tira o aviso automático do feed
+    if not created:
+        for aviso_id in instance.avisos.values_list("id", flat=True):
+            sincronizar_aviso(aviso_id)
+
+
+@receiver(post_save, sender=User)
+def sincronizar_caixa_do_usuario(sender, instance, raw=False, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if raw or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    sincronizar_usuario(instance)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.unidades.through)
+def sincronizar_caixa_ao_alterar_grupos_ou_unidades(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        sincronizar_usuario(instance)
+        return
+    # instance é o grupo/unidade; no clear os usuários são desconhecidos
+    # (ver o comando sincronizar_avisos)
+    for usuario in User.objects.filter(pk__in=pk_set or ()):
+        sincronizar_usuario(usuario)
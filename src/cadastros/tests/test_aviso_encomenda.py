@@ -0,0 +1,139 @@
+"""
+Testes do vínculo entre avisos automáticos e encomendas/unidades.
+"""
+
+import importlib
+from unittest.mock import patch
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cadastros.api.views.encomenda_views import criar_aviso_encomenda
+from cadastros.models import Aviso, Condominio, Encomenda, Unidade
+
+User = get_user_model()
+
+backfill = importlib.import_module(
+    "cadastros.migrations.0018_backfill_aviso_origem"
+)
+
+
+class AvisoEncomendaTests(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Avisos",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        moradores, _ = Group.objects.get_or_create(name="Moradores")
+        portaria, _ = Group.objects.get_or_create(name="Portaria")
+        sindicos, _ = Group.objects.get_or_create(name="Síndicos")
+
+        self.porteiro = self._usuario("porteiro", "52998224725", portaria)
+        self.sindico = self._usuario("sindico", "15350946056", sindicos)
+        self.unidade_a = Unidade.objects.create(
+            numero="101", bloco="A", condominio=self.condominio
+        )
+        self.unidade_b = Unidade.objects.create(
+            numero="102", bloco="A", condominio=self.condominio
+        )
+        self.morador = self._usuario("morador", "39053344705", moradores)
+        self.morador.unidades.add(self.unidade_a)
+        self._usuario("vizinho", "28625587887", moradores).unidades.add(
+            self.unidade_b
+        )
+
+    def _usuario(self, nome, cpf, grupo):
+        usuario = User.objects.create_user(
+            username=nome,
+            password="senha123",
+            email=f"{nome}@example.com",
+            cpf=cpf,
+            condominio=self.condominio,
+        )
+        usuario.groups.add(grupo)
+        return usuario
+
+    def _encomenda(self, unidade):
+        encomenda = Encomenda.objects.create(
+            unidade=unidade,
+            destinatario_nome="Morador",
+            created_by=self.porteiro,
+        )
+        criar_aviso_encomenda(encomenda, self.porteiro)
+        return encomenda
+
+    def _titulos(self, usuario, nome_url):
+        self.client.force_authenticate(user=usuario)
+        response = self.client.get(reverse(nome_url))
+        dados = response.data
+        if isinstance(dados, dict):
+            dados = dados["results"]
+        return {aviso["titulo"] for aviso in dados}
+
+    def test_aviso_vinculado_a_encomenda_e_unidade(self):
+        encomenda = self._encomenda(self.unidade_a)
+        criar_aviso_encomenda(encomenda, self.porteiro)
+
+        aviso = Aviso.objects.get()
+        self.assertEqual(aviso.origem, Aviso.ORIGEM_ENCOMENDA)
+        self.assertEqual(aviso.encomenda, encomenda)
+        self.assertEqual(aviso.unidade, self.unidade_a)
+        self.assertEqual(aviso.condominio, self.condominio)
+
+    def test_feed_do_morador_mostra_apenas_suas_unidades(self):
+        self._encomenda(self.unidade_a)
+        self._encomenda(self.unidade_b)
+
+        for nome_url in ("aviso-list", "aviso-home"):
+            self.assertEqual(
+                self._titulos(self.morador, nome_url),
+                {"Nova encomenda para Bl. A - Unid. 101"},
+            )
+
+    def test_sindico_nao_ve_avisos_de_encomenda(self):
+        self._encomenda(self.unidade_a)
+
+        self.assertEqual(self._titulos(self.sindico, "aviso-list"), set())
+
+    def test_migracao_vincula_avisos_antigos_pelo_titulo(self):
+        encomenda = Encomenda.objects.create(
+            unidade=self.unidade_b,
+            destinatario_nome="Vizinho",
+            created_by=self.porteiro,
+        )
+        legado = Aviso.objects.create(
+            titulo="Nova encomenda para Bl. A - Unid. 102",
+            descricao="Aviso antigo",
+            data_inicio=timezone.now(),
+            created_by=self.porteiro,
+        )
+        manual = Aviso.objects.create(
+            titulo="Manutenção do elevador",
+            descricao="Aviso manual",
+            data_inicio=timezone.now(),
+            created_by=self.sindico,
+        )
+
+        backfill.vincular_avisos_encomenda(apps, None)
+
+        legado.refresh_from_db()
+        self.assertEqual(legado.origem, Aviso.ORIGEM_ENCOMENDA)
+        self.assertEqual(legado.unidade, self.unidade_b)
+        self.assertEqual(legado.encomenda, encomenda)
+        manual.refresh_from_db()
+        self.assertEqual(manual.origem, Aviso.ORIGEM_MANUAL)
+        self.assertIsNone(manual.unidade)
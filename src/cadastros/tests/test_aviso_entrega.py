@@ -0,0 +1,184 @@
+"""
+Testes da caixa de entrada de avisos (fan-out na escrita).
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cadastros.models import Aviso, AvisoEntrega, Condominio
+from cadastros.services.aviso_service import (
+    sincronizar_aviso,
+    sincronizar_usuario,
+)
+
+User = get_user_model()
+
+CPFS = [
+    "39053344705",
+    "52998224725",
+    "15350946056",
+    "28625587887",
+    "11144477735",
+    "87748248800",
+]
+
+
+class AvisoEntregaTests(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Avisos",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        outro = Condominio.objects.create(
+            nome="Outro Condominio",
+            cnpj="11444777000161",
+            telefone="11933334444",
+            cep="01310000",
+            numero="20",
+        )
+        self.moradores, _ = Group.objects.get_or_create(name="Moradores")
+        self.portaria, _ = Group.objects.get_or_create(name="Portaria")
+        sindicos, _ = Group.objects.get_or_create(name="Síndicos")
+
+        self.sindico = self._usuario("sindico", sindicos)
+        self.morador = self._usuario("morador", self.moradores)
+        self.vizinho = self._usuario("vizinho", self.moradores)
+        self.porteiro = self._usuario("porteiro", self.portaria)
+        self.externo = self._usuario(
+            "externo", self.moradores, condominio=outro
+        )
+
+    def _usuario(self, nome, grupo, condominio=None):
+        usuario = User.objects.create_user(
+            username=nome,
+            password="senha123",
+            email=f"{nome}@example.com",
+            cpf=CPFS[User.objects.count()],
+            condominio=condominio or self.condominio,
+        )
+        usuario.groups.add(grupo)
+        return usuario
+
+    def _publicar(self, titulo="Aviso", grupos=("Moradores",)):
+        self.client.force_authenticate(user=self.sindico)
+        response = self.client.post(
+            reverse("aviso-create"),
+            {
+                "titulo": titulo,
+                "descricao": "Comunicado",
+                "grupos": [Group.objects.get(name=nome).id for nome in grupos],
+                "prioridade": "media",
+                "status": "ativo",
+                "data_inicio": timezone.now().isoformat(),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Aviso.objects.get(pk=response.data["id"])
+
+    def _feed(self, usuario):
+        self.client.force_authenticate(user=usuario)
+        response = self.client.get(reverse("aviso-home"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _destinatarios(self, aviso):
+        return set(
+            AvisoEntrega.objects.filter(aviso=aviso).values_list(
+                "usuario__username", flat=True
+            )
+        )
+
+    def test_publicacao_entrega_ao_publico_do_condominio(self):
+        aviso = self._publicar()
+
+        self.assertEqual(self._destinatarios(aviso), {"morador", "vizinho"})
+        self.assertEqual(
+            [item["titulo"] for item in self._feed(self.morador)], ["Aviso"]
+        )
+        self.assertEqual(self._feed(self.porteiro), [])
+        self.assertEqual(self._feed(self.externo), [])
+
+    def test_feed_le_apenas_a_caixa_de_entrada(self):
+        self._publicar("Primeiro")
+        self._publicar("Segundo")
+        self._feed(self.morador)
+
+        # Entregas + grupos dos avisos (prefetch)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self._feed(self.morador)), 2)
+
+    def test_mudanca_de_publico_atualiza_entregas(self):
+        aviso = self._publicar()
+
+        self.porteiro.groups.add(self.moradores)
+        self.vizinho.groups.remove(self.moradores)
+        aviso.grupos.add(self.portaria)
+
+        self.assertEqual(self._destinatarios(aviso), {"morador", "porteiro"})
+
+    def test_inativar_aviso_tira_do_feed(self):
+        aviso = self._publicar()
+
+        aviso.status = Aviso.STATUS_INATIVO
+        aviso.save()
+
+        self.assertEqual(self._feed(self.morador), [])
+
+    def test_marcar_como_lido(self):
+        aviso = self._publicar()
+        self.assertFalse(self._feed(self.morador)[0]["lido"])
+
+        response = self.client.post(
+            reverse("aviso-marcar-lido", args=[aviso.pk])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self._feed(self.morador)[0]["lido"])
+        self.client.force_authenticate(user=self.porteiro)
+        response = self.client.post(
+            reverse("aviso-marcar-lido", args=[aviso.pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(AVISO_ENTREGA_LOTE=1)
+    def test_fan_out_em_lotes(self):
+        aviso = self._publicar(grupos=("Moradores", "Portaria"))
+
+        self.assertEqual(AvisoEntrega.objects.filter(aviso=aviso).count(), 3)
+
+    def test_aviso_de_encomenda_sem_unidade_nao_e_entregue(self):
+        # Título não resolvido na 0018 ou unidade excluída (SET_NULL)
+        aviso = Aviso.objects.create(
+            titulo="Encomenda para unidade desconhecida",
+            descricao="Encomenda",
+            grupo=self.moradores,
+            origem=Aviso.ORIGEM_ENCOMENDA,
+            condominio=self.condominio,
+            data_inicio=timezone.now(),
+            created_by=self.porteiro,
+        )
+
+        sincronizar_aviso(aviso.pk)
+        self.assertEqual(self._destinatarios(aviso), set())
+
+        # Os dois caminhos de sincronização concordam
+        sincronizar_usuario(self.morador)
+        self.assertEqual(self._destinatarios(aviso), set())
@@ -0,0 +1,145 @@
+"""
+Testes dos campos sob demanda (?fields= / ?omit=) nos serializers.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cadastros.models import (
+    ConvidadoListaCerimonial,
+    EventoCerimonial,
+    ListaConvidadosCerimonial,
+    Unidade,
+)
+
+User = get_user_model()
+
+
+class CamposDinamicosTests(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.usuario = User.objects.create_user(
+            username="cerimonialista",
+            password="senha123",
+            email="cerimonial@example.com",
+            cpf="39053344705",
+            is_staff=True,
+        )
+        self.usuario.groups.add(
+            Group.objects.get_or_create(name="Síndicos")[0]
+        )
+        self.client.force_authenticate(user=self.usuario)
+
+    def _consultas(self, nome_url, params=None, **kwargs):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(
+                reverse(nome_url, kwargs=kwargs), params or {}
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(consultas)
+
+    def test_fields_e_omit_na_listagem_de_unidades(self):
+        for numero in ("101", "102"):
+            Unidade.objects.create(numero=numero, bloco="A").moradores.add(
+                self.usuario
+            )
+
+        self._consultas("unidade-list")  # aquece o cache de grupos
+        dados, completo = self._consultas("unidade-list")
+        self.assertIn("moradores", dados["results"][0])
+
+        dados, enxuto = self._consultas(
+            "unidade-list", {"fields": "id,numero"}
+        )
+        self.assertEqual(set(dados["results"][0]), {"id", "numero"})
+        # Sem moradores na resposta não há prefetch de moradores
+        self.assertEqual(enxuto, completo - 1)
+
+        dados, _ = self._consultas("unidade-list", {"omit": "moradores"})
+        self.assertNotIn("moradores", dados["results"][0])
+        self.assertIn("morador_nome", dados["results"][0])
+
+    def test_lista_do_cerimonial_sem_convidados(self):
+        inicio = timezone.now() + timedelta(days=10)
+        evento = EventoCerimonial.objects.create(
+            nome="Casamento",
+            datetime_inicio=inicio,
+            datetime_fim=inicio + timedelta(hours=6),
+        )
+        lista = ListaConvidadosCerimonial.objects.create(
+            evento=evento, titulo="Convidados"
+        )
+        for nome, vip in (("Carla", False), ("Bruno", True), ("Ana", False)):
+            ConvidadoListaCerimonial.objects.create(
+                lista=lista, nome=nome, vip=vip
+            )
+
+        dados, _ = self._consultas(
+            "lista-convidados-cerimonial-detail", lista_pk=lista.pk
+        )
+        self.assertEqual(
+            [c["nome"] for c in dados["convidados"]], ["Bruno", "Ana", "Carla"]
+        )
+
+        dados, _ = self._consultas(
+            "lista-convidados-cerimonial-detail",
+            {"fields": "id,titulo,evento_nome"},
+            lista_pk=lista.pk,
+        )
+        self.assertEqual(
+            dados,
+            {
+                "id": lista.pk,
+                "titulo": "Convidados",
+                "evento_nome": "Casamento",
+            },
+        )
+
+    def test_total_de_convidados_sem_a_lista_de_convidados(self):
+        inicio = timezone.now() + timedelta(days=10)
+
+        def nova_lista(numero):
+            evento = EventoCerimonial.objects.create(
+                nome=f"Casamento {numero}",
+                datetime_inicio=inicio,
+                datetime_fim=inicio + timedelta(hours=6),
+            )
+            lista = ListaConvidadosCerimonial.objects.create(
+                evento=evento, titulo="Convidados"
+            )
+            for nome in ("Ana", "Bruno"):
+                ConvidadoListaCerimonial.objects.create(lista=lista, nome=nome)
+
+        params = {"omit": "convidados"}
+        nova_lista(1)
+        self._consultas("listas-convidados-cerimonial", params)  # aquece
+        _, com_uma = self._consultas("listas-convidados-cerimonial", params)
+        nova_lista(2)
+        nova_lista(3)
+        dados, com_tres = self._consultas(
+            "listas-convidados-cerimonial", params
+        )
+
+        self.assertEqual(com_tres, com_uma)
+        self.assertEqual([item["total_convidados"] for item in dados], [2] * 3)
+
+        # A busca por nome de convidado não altera o total
+        dados, _ = self._consultas(
+            "listas-convidados-cerimonial",
+            {"fields": "id,total_convidados", "search": "Ana"},
+        )
+        self.assertEqual([item["total_convidados"] for item in dados], [2] * 3)
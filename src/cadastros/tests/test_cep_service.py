@@ -0,0 +1,149 @@
+"""
+Testes do serviço de resolução de endereços por CEP.
+
+As chamadas HTTP são mockadas; nenhum provedor externo é consultado.
+"""
+
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.utils import timezone
+
+from cadastros.models import CepEndereco
+from cadastros.services import cep_service
+
+BRASILAPI_OK = {
+    "cep": "01310100",
+    "state": "SP",
+    "city": "São Paulo",
+    "neighborhood": "Bela Vista",
+    "street": "Avenida Paulista",
+}
+
+
+def _resposta(status_code, payload=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.json.return_value = payload or {}
+    return resp
+
+
+class CepServiceTests(TestCase):
+    def setUp(self):
+        cep_service.limpar_cache_memoria()
+        self.addCleanup(cep_service.limpar_cache_memoria)
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_resolve_e_grava_cache_em_memoria_e_db(self, mock_get):
+        mock_get.return_value = _resposta(200, BRASILAPI_OK)
+
+        dados = cep_service.buscar_endereco("01310-100")
+        self.assertEqual(dados["logradouro"], "Avenida Paulista")
+        self.assertEqual(dados["estado"], "SP")
+
+        cep_service.buscar_endereco("01310100")
+        self.assertEqual(mock_get.call_count, 1)
+
+        registro = CepEndereco.objects.get(cep="01310100")
+        self.assertTrue(registro.encontrado)
+        self.assertEqual(registro.fonte, "brasilapi")
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_cache_db_compartilhado_evita_http(self, mock_get):
+        CepEndereco.objects.create(
+            cep="01310100",
+            logradouro="Avenida Paulista",
+            cidade="São Paulo",
+            estado="SP",
+            consultado_em=timezone.now(),
+        )
+
+        dados = cep_service.buscar_endereco("01310100")
+
+        self.assertEqual(dados["cidade"], "São Paulo")
+        mock_get.assert_not_called()
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_cep_inexistente_fica_em_cache_negativo(self, mock_get):
+        mock_get.side_effect = [
+            _resposta(404),
+            _resposta(200, {"erro": True}),
+        ]
+
+        self.assertIsNone(cep_service.buscar_endereco("99999999"))
+        cep_service.limpar_cache_memoria()
+        self.assertIsNone(cep_service.buscar_endereco("99999999"))
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertFalse(CepEndereco.objects.get(cep="99999999").encontrado)
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_fallback_para_viacep(self, mock_get):
+        mock_get.side_effect = [
+            _resposta(503),
+            _resposta(
+                200,
+                {
+                    "logradouro": "Praça da Sé",
+                    "bairro": "Sé",
+                    "localidade": "São Paulo",
+                    "uf": "SP",
+                },
+            ),
+        ]
+
+        dados = cep_service.buscar_endereco("01001000")
+
+        self.assertEqual(dados["logradouro"], "Praça da Sé")
+        self.assertEqual(
+            CepEndereco.objects.get(cep="01001000").fonte, "viacep"
+        )
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_provedor_fora_do_ar_serve_registro_expirado(self, mock_get):
+        CepEndereco.objects.create(
+            cep="01310100",
+            logradouro="Avenida Paulista",
+            consultado_em=timezone.now() - timedelta(days=365),
+        )
+        mock_get.return_value = _resposta(500)
+
+        dados = cep_service.buscar_endereco("01310100")
+
+        self.assertEqual(dados["logradouro"], "Avenida Paulista")
+
+    @patch("cadastros.services.cep_service.requests.get")
+    def test_cep_invalido_nao_consulta(self, mock_get):
+        self.assertIsNone(cep_service.buscar_endereco("123"))
+        self.assertIsNone(cep_service.buscar_endereco(None))
+        mock_get.assert_not_called()
+
+    def test_single_flight_deduplica_consultas_concorrentes(self):
+        chamadas = []
+
+        def resolver_lento(cep):
+            chamadas.append(cep)
+            time.sleep(0.2)
+            return {"cep": cep, "logradouro": "Rua A"}, 60
+
+        resultados = []
+        with patch.object(cep_service, "_resolver", resolver_lento):
+            threads = [
+                threading.Thread(
+                    target=lambda: resultados.append(
+                        cep_service.buscar_endereco("01310100")
+                    )
+                )
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(len(resultados), 5)
+        self.assertTrue(all(r["logradouro"] == "Rua A" for r in resultados))
@@ -0,0 +1,134 @@
+"""
+Testes da coluna ``condominio`` desnormalizada nos modelos de cadastros.
+"""
+
+import importlib
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from cadastros.models import (
+    Condominio,
+    Encomenda,
+    Espaco,
+    EspacoReserva,
+    Ocorrencia,
+    Unidade,
+    Visitante,
+)
+
+User = get_user_model()
+
+backfill = importlib.import_module(
+    "cadastros.migrations.0011_backfill_condominio"
+)
+
+
+class CondominioDesnormalizadoTests(TestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio A",
+            cnpj="11222333000181",
+            telefone="11999999999",
+            cep="01310100",
+            numero="10",
+        )
+        self.outro = Condominio.objects.create(
+            nome="Condominio B",
+            cnpj="11222333000262",
+            telefone="11999999999",
+            cep="01310100",
+            numero="20",
+        )
+        self.portaria = User.objects.create_user(
+            username="portaria",
+            password="senha123",
+            email="portaria@example.com",
+            condominio=self.condominio,
+        )
+        self.unidade = Unidade.objects.create(
+            numero="101", created_by=self.portaria
+        )
+
+    def test_condominio_derivado_na_criacao(self):
+        encomenda = Encomenda.objects.create(
+            unidade=self.unidade,
+            descricao="Caixa",
+            created_by=self.portaria,
+        )
+        espaco = Espaco.objects.create(nome="Salão", created_by=self.portaria)
+        ocorrencia = Ocorrencia.objects.create(
+            tipo=Ocorrencia.TIPO_PROBLEMA,
+            titulo="Lâmpada",
+            descricao="Queimada",
+            criado_por=self.portaria,
+        )
+
+        self.assertEqual(self.unidade.condominio_id, self.condominio.id)
+        self.assertEqual(encomenda.condominio_id, self.condominio.id)
+        self.assertEqual(espaco.condominio_id, self.condominio.id)
+        self.assertEqual(ocorrencia.condominio_id, self.condominio.id)
+
+    def test_troca_de_condominio_do_criador_nao_move_registros(self):
+        encomenda = Encomenda.objects.create(
+            unidade=self.unidade,
+            descricao="Caixa",
+            created_by=self.portaria,
+        )
+
+        self.portaria.condominio = self.outro
+        self.portaria.save()
+        encomenda.refresh_from_db()
+        encomenda.descricao = "Caixa grande"
+        encomenda.save()
+
+        self.assertEqual(
+            list(Encomenda.objects.for_condominio(self.condominio.id)),
+            [encomenda],
+        )
+        self.assertFalse(
+            Encomenda.objects.for_condominio(self.outro.id).exists()
+        )
+
+    def test_for_condominio_nao_faz_join_com_usuario(self):
+        sql = str(
+            Encomenda.objects.for_condominio(self.condominio.id)
+            .filter(retirado_em__isnull=True)
+            .query
+        )
+        self.assertNotIn("JOIN", sql)
+
+    def test_backfill_preenche_registros_existentes(self):
+        espaco = Espaco.objects.create(nome="Salão", created_by=self.portaria)
+        visitante = Visitante.objects.create(
+            morador=self.portaria,
+            nome="Visitante",
+            documento="123",
+            data_entrada="2026-01-01T10:00:00Z",
+        )
+        grupo_moradores, _ = Group.objects.get_or_create(name="Moradores")
+        self.portaria.groups.add(grupo_moradores)
+        reserva = EspacoReserva.objects.create(
+            espaco=espaco,
+            morador=self.portaria,
+            data_reserva=date.today() + timedelta(days=1),
+        )
+        for model in (Unidade, Espaco, Visitante, EspacoReserva):
+            model.objects.update(condominio=None)
+
+        backfill.preencher_condominio(apps, None)
+
+        for obj in (self.unidade, espaco, visitante, reserva):
+            obj.refresh_from_db()
+            self.assertEqual(obj.condominio_id, self.condominio.id)
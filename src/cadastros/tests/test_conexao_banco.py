@@ -0,0 +1,34 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from app.utils.conexao_banco import configurar_conexao, ler_max_age
+
+
+class ConfigurarConexaoTests(SimpleTestCase):
+    def test_fechar_mantem_uma_conexao_por_requisicao(self):
+        banco = configurar_conexao({"CONN_MAX_AGE": 600}, "fechar")
+
+        self.assertEqual(banco["CONN_MAX_AGE"], 0)
+        self.assertFalse(banco["CONN_HEALTH_CHECKS"])
+
+    def test_persistente_com_health_check(self):
+        banco = configurar_conexao({}, "persistente", max_age=120)
+
+        self.assertEqual(banco["CONN_MAX_AGE"], 120)
+        self.assertTrue(banco["CONN_HEALTH_CHECKS"])
+        self.assertFalse(banco["DISABLE_SERVER_SIDE_CURSORS"])
+
+    def test_transacao_desliga_cursores_no_servidor(self):
+        banco = configurar_conexao({}, "transacao", max_age=None)
+
+        self.assertIsNone(banco["CONN_MAX_AGE"])
+        self.assertTrue(banco["DISABLE_SERVER_SIDE_CURSORS"])
+
+    def test_modo_invalido(self):
+        with self.assertRaises(ImproperlyConfigured):
+            configurar_conexao({}, "pool")
+
+    def test_ler_max_age(self):
+        self.assertEqual(ler_max_age("30"), 30)
+        self.assertIsNone(ler_max_age("none"))
+        self.assertIsNone(ler_max_age(""))
@@ -0,0 +1,397 @@
+"""
+Regressão de N+1: o número de consultas das listagens e dashboards não
+pode crescer com o número de registros.
+
+Cada endpoint é medido com N registros e de novo com 10N; as duas
+medições têm de ter o mesmo número de consultas. O cache é limpo antes de
+cada medição, para as duas partirem do mesmo estado.
+"""
+
+from datetime import date, timedelta
+from itertools import count
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from access.autenticacao import _local
+from cadastros.models import (
+    Aviso,
+    Condominio,
+    ConvidadoLista,
+    ConvidadoListaCerimonial,
+    Encomenda,
+    Espaco,
+    EspacoInventarioItem,
+    EspacoReserva,
+    Evento,
+    EventoCerimonial,
+    ListaConvidados,
+    ListaConvidadosCerimonial,
+    Ocorrencia,
+    Unidade,
+    Veiculo,
+    Visitante,
+)
+
+User = get_user_model()
+
+N = 2
+
+
+def _grupo(nome):
+    return Group.objects.get_or_create(name=nome)[0]
+
+
+class ConsultasConstantesTests(APITestCase):
+    def setUp(self):
+        self._sequencia = count(1)
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio N+1",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        self.sindico = self._usuario(
+            "sindico", "Síndicos", is_staff=True, cpf="39053344705"
+        )
+        self.morador = self._usuario("morador", "Moradores", cpf="52998224725")
+        self.porteiro = self._usuario(
+            "porteiro", "Portaria", cpf="15350946056"
+        )
+        self.unidade = Unidade.objects.create(
+            numero="101", bloco="A", condominio=self.condominio
+        )
+        self.unidade.moradores.add(self.morador)
+        self.espaco = Espaco.objects.create(
+            nome="Salão", created_by=self.sindico
+        )
+
+    def _usuario(self, username, grupo=None, **kwargs):
+        kwargs.setdefault("cpf", f"9{next(self._sequencia):010d}")
+        user = User.objects.create_user(
+            username=username,
+            password=None,
+            email=f"{username}@example.com",
+            full_name=username.title(),
+            condominio=self.condominio,
+            **kwargs,
+        )
+        if grupo:
+            user.groups.add(_grupo(grupo))
+        return user
+
+    def _consultas(self, nome_url, user, params, kwargs):
+        cache.clear()
+        _local.clear()
+        # Instância nova: os grupos guardados na anterior não valem
+        self.client.force_authenticate(user=User.objects.get(pk=user.pk))
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(
+                reverse(nome_url, kwargs=kwargs), params
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, len(consultas)
+
+    def assertConsultasConstantes(
+        self, nome_url, semear, user=None, params=None, kwargs=None
+    ):
+        """Mesmo número de consultas com N e com 10N registros."""
+        user = user or self.sindico
+        params = params or {}
+
+        semear(N)
+        dados, com_n = self._consultas(nome_url, user, params, kwargs)
+        semear(9 * N)
+        dados_10n, com_10n = self._consultas(nome_url, user, params, kwargs)
+
+        self.assertEqual(
+            com_n,
+            com_10n,
+            f"{nome_url}: {com_n} consultas com {N} registros e {com_10n} "
+            f"com {10 * N}",
+        )
+        if not nome_url.endswith("-stats"):
+            self.assertGreater(_tamanho(dados_10n), _tamanho(dados))
+
+    # Semeadura: cada função cria mais ``quantidade`` registros
+
+    def _moradores(self, quantidade):
+        return [
+            self._usuario(f"morador{next(self._sequencia)}", "Moradores")
+            for _ in range(quantidade)
+        ]
+
+    def _unidades(self, quantidade):
+        for morador in self._moradores(quantidade):
+            unidade = Unidade.objects.create(
+                numero=str(next(self._sequencia)),
+                bloco="B",
+                condominio=self.condominio,
+            )
+            unidade.moradores.add(morador, self.morador)
+
+    def _encomendas(self, quantidade):
+        for i in range(quantidade):
+            Encomenda.objects.create(
+                unidade=self.unidade,
+                destinatario_nome=f"Morador {i}",
+                created_by=self.porteiro,
+            )
+
+    def _veiculos(self, quantidade):
+        for morador in self._moradores(quantidade):
+            Veiculo.objects.create(
+                placa=f"ABC{next(self._sequencia):04d}",
+                marca_modelo="Fiat Uno",
+                morador=morador,
+                created_by=self.sindico,
+            )
+
+    def _visitantes(self, quantidade):
+        for morador in self._moradores(quantidade):
+            Visitante.objects.create(
+                morador=morador,
+                nome=f"Visitante {next(self._sequencia)}",
+                documento="123456789",
+                data_entrada=timezone.now(),
+            )
+
+    def _avisos(self, quantidade):
+        moradores = _grupo("Moradores")
+        for i in range(quantidade):
+            aviso = Aviso.objects.create(
+                titulo=f"Aviso {i}",
+                descricao="Descrição",
+                grupo=moradores,
+                data_inicio=timezone.now() - timedelta(hours=1),
+                created_by=self.sindico,
+            )
+            aviso.grupos.add(moradores, _grupo("Portaria"))
+
+    def _ocorrencias(self, quantidade):
+        for morador in self._moradores(quantidade):
+            Ocorrencia.objects.create(
+                tipo=Ocorrencia.TIPO_PROBLEMA,
+                titulo="Barulho",
+                descricao="Barulho após as 22h",
+                criado_por=morador,
+                respondido_por=self.sindico,
+            )
+
+    def _espacos(self, quantidade):
+        for _ in range(quantidade):
+            espaco = Espaco.objects.create(
+                nome=f"Espaço {next(self._sequencia)}", created_by=self.sindico
+            )
+            EspacoInventarioItem.objects.create(
+                espaco=espaco,
+                nome="Cadeira",
+                codigo=str(next(self._sequencia)),
+                created_by=self.sindico,
+            )
+
+    def _reservas(self, quantidade):
+        for morador in self._moradores(quantidade):
+            EspacoReserva.objects.create(
+                espaco=self.espaco,
+                morador=morador,
+                data_reserva=date.today()
+                + timedelta(days=next(self._sequencia)),
+                created_by=self.sindico,
+            )
+
+    def _eventos(self, quantidade):
+        inicio = timezone.now() + timedelta(days=1)
+        for _ in range(quantidade):
+            Evento.objects.create(
+                titulo=f"Evento {next(self._sequencia)}",
+                espaco=self.espaco,
+                datetime_inicio=inicio,
+                datetime_fim=inicio + timedelta(hours=4),
+                created_by=self.sindico,
+            )
+
+    def _eventos_cerimonial(self, quantidade):
+        inicio = timezone.now() + timedelta(days=10)
+        for _ in range(quantidade):
+            evento = EventoCerimonial.objects.create(
+                nome=f"Casamento {next(self._sequencia)}",
+                datetime_inicio=inicio,
+                datetime_fim=inicio + timedelta(hours=6),
+                created_by=self.sindico,
+            )
+            evento.cerimonialistas.add(self.sindico)
+            evento.organizadores.add(*self._moradores(1))
+            lista = ListaConvidadosCerimonial.objects.create(
+                evento=evento, titulo="Convidados"
+            )
+            for nome in ("Ana", "Bruno"):
+                ConvidadoListaCerimonial.objects.create(lista=lista, nome=nome)
+
+    def _listas_convidados(self, quantidade):
+        for _ in range(quantidade):
+            lista = ListaConvidados.objects.create(
+                morador=self.morador,
+                titulo=f"Aniversário {next(self._sequencia)}",
+                local_tipo="unidade",
+                unidade_evento=self.unidade,
+            )
+            for nome in ("Ana", "Bruno"):
+                ConvidadoLista.objects.create(
+                    lista=lista,
+                    nome=nome,
+                    cpf=f"{next(self._sequencia):011d}",
+                )
+
+    def _grupos(self, quantidade):
+        for _ in range(quantidade):
+            grupo = _grupo(f"Grupo {next(self._sequencia)}")
+            grupo.user_set.add(*self._moradores(1))
+
+    def _condominios(self, quantidade):
+        for _ in range(quantidade):
+            numero = next(self._sequencia)
+            condominio = Condominio.objects.create(
+                nome=f"Condominio {numero}",
+                cnpj=f"{numero:014d}",
+                telefone="11911112222",
+                cep="01310000",
+                numero="10",
+            )
+            sindico = self._usuario(f"sindico{numero}", "Síndicos")
+            sindico.condominio = condominio
+            sindico.save()
+
+    def _movimento(self, quantidade):
+        self._encomendas(quantidade)
+        self._avisos(quantidade)
+        self._ocorrencias(quantidade)
+        self._reservas(quantidade)
+        self._eventos(quantidade)
+        self._visitantes(quantidade)
+
+    # Listagens de access
+
+    def test_usuarios(self):
+        self.assertConsultasConstantes("user-list", self._unidades)
+
+    def test_grupos(self):
+        self.assertConsultasConstantes(
+            "group-list", self._grupos, params={"page_size": 100}
+        )
+
+    # Listagens de cadastros
+
+    def test_condominios(self):
+        self.assertConsultasConstantes("condominio-list", self._condominios)
+
+    def test_sindico_do_condominio_e_o_primeiro_por_nome(self):
+        # Com vários síndicos vale a ordem de User.Meta.ordering (full_name)
+        for nome in ("zeca", "bia", "carlos"):
+            self._usuario(nome, "Síndicos")
+        self.client.force_authenticate(user=self.sindico)
+
+        response = self.client.get(reverse("condominio-list"))
+
+        self.assertEqual(response.status_code, 200)
+        item = _itens(response.data)[0]
+        self.assertEqual(item["sindico_nome"], "Bia")
+        self.assertEqual(
+            item["sindico_id"],
+            str(User.objects.get(username="bia").pk),
+        )
+
+    def test_unidades(self):
+        self.assertConsultasConstantes("unidade-list", self._unidades)
+
+    def test_encomendas(self):
+        self.assertConsultasConstantes("encomenda-list", self._encomendas)
+
+    def test_veiculos(self):
+        self.assertConsultasConstantes("veiculo-list", self._veiculos)
+
+    def test_visitantes(self):
+        self.assertConsultasConstantes("visitante-list", self._visitantes)
+
+    def test_avisos(self):
+        self.assertConsultasConstantes("aviso-list", self._avisos)
+
+    def test_avisos_home(self):
+        self.assertConsultasConstantes(
+            "aviso-home", self._avisos, user=self.morador
+        )
+
+    def test_ocorrencias(self):
+        self.assertConsultasConstantes("ocorrencia-list", self._ocorrencias)
+
+    def test_espacos(self):
+        self.assertConsultasConstantes("espaco-list", self._espacos)
+
+    def test_inventario_dos_espacos(self):
+        self.assertConsultasConstantes(
+            "espaco-inventario-list", self._espacos, params={"page_size": 50}
+        )
+
+    def test_reservas(self):
+        self.assertConsultasConstantes("espaco-reserva-list", self._reservas)
+
+    def test_eventos(self):
+        self.assertConsultasConstantes("evento-list", self._eventos)
+
+    def test_eventos_cerimonial(self):
+        self.assertConsultasConstantes(
+            "evento-cerimonial-list", self._eventos_cerimonial
+        )
+
+    def test_listas_de_convidados(self):
+        self.assertConsultasConstantes(
+            "listas-convidados", self._listas_convidados
+        )
+
+    def test_listas_de_convidados_cerimonial(self):
+        self.assertConsultasConstantes(
+            "listas-convidados-cerimonial", self._eventos_cerimonial
+        )
+
+    # Dashboards
+
+    def test_dashboard_sindico(self):
+        self.assertConsultasConstantes("sindico-stats", self._movimento)
+
+    def test_dashboard_portaria(self):
+        self.assertConsultasConstantes(
+            "portaria-stats", self._movimento, user=self.porteiro
+        )
+
+    def test_dashboard_morador(self):
+        self.assertConsultasConstantes(
+            "morador-stats", self._movimento, user=self.morador
+        )
+
+    def test_dashboard_admin(self):
+        self.assertConsultasConstantes("admin-stats", self._movimento)
+
+
+def _itens(dados):
+    if isinstance(dados, dict):
+        dados = dados.get("results", dados)
+    return dados
+
+
+def _tamanho(dados):
+    return len(_itens(dados))
@@ -0,0 +1,277 @@
+"""
+Testes das estatísticas dos dashboards do síndico e da portaria.
+"""
+
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cadastros.models import (
+    Aviso,
+    Condominio,
+    Encomenda,
+    Evento,
+    Ocorrencia,
+    Unidade,
+    Visitante,
+)
+
+User = get_user_model()
+
+
+class DashboardTestBase(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Dashboard",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        outro = Condominio.objects.create(
+            nome="Outro Condominio",
+            cnpj="11444777000161",
+            telefone="11933334444",
+            cep="01310000",
+            numero="20",
+        )
+        moradores, _ = Group.objects.get_or_create(name="Moradores")
+        portaria, _ = Group.objects.get_or_create(name="Portaria")
+        sindicos, _ = Group.objects.get_or_create(name="Síndicos")
+
+        self.sindico = self._usuario("sindico", "39053344705", sindicos)
+        self.porteiro = self._usuario("porteiro", "52998224725", portaria)
+        self.morador = self._usuario("morador", "15350946056", moradores)
+        self._usuario("inativo", "28625587887", moradores, is_active=False)
+        self._usuario("externo", "11144477735", moradores, condominio=outro)
+
+        unidade = Unidade.objects.create(numero="101", bloco="A")
+        agora = timezone.now()
+        antiga = Encomenda.objects.create(
+            unidade=unidade,
+            destinatario_nome="Morador",
+            condominio=self.condominio,
+        )
+        Encomenda.objects.filter(pk=antiga.pk).update(
+            created_on=agora - timedelta(days=5)
+        )
+        Encomenda.objects.create(
+            unidade=unidade,
+            destinatario_nome="Morador",
+            condominio=self.condominio,
+        )
+        Encomenda.objects.create(
+            unidade=unidade,
+            destinatario_nome="Morador",
+            condominio=self.condominio,
+            retirado_em=agora,
+        )
+        Visitante.objects.create(
+            morador=self.morador,
+            nome="Visitante",
+            data_entrada=agora,
+        )
+        Aviso.objects.create(
+            titulo="Aviso",
+            descricao="Teste",
+            data_inicio=agora - timedelta(days=1),
+            created_by=self.sindico,
+        )
+        Evento.objects.create(
+            titulo="Evento",
+            datetime_inicio=agora + timedelta(days=1),
+            datetime_fim=agora + timedelta(days=1, hours=2),
+            created_by=self.sindico,
+        )
+        Ocorrencia.objects.create(
+            tipo=Ocorrencia.TIPO_PROBLEMA,
+            titulo="Ocorrência",
+            descricao="Teste",
+            criado_por=self.morador,
+        )
+
+    def _usuario(self, nome, cpf, grupo, condominio=None, **extra):
+        usuario = User.objects.create_user(
+            username=nome,
+            password="senha123",
+            email=f"{nome}@example.com",
+            cpf=cpf,
+            condominio=condominio or self.condominio,
+            **extra,
+        )
+        usuario.groups.add(grupo)
+        return usuario
+
+
+class DashboardStatsTests(DashboardTestBase):
+    def _stats_sindico(self):
+        self.client.force_authenticate(user=self.sindico)
+        response = self.client.get(reverse("sindico-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_sindico_stats(self):
+        dados = self._stats_sindico()
+
+        self.assertEqual(
+            dados["moradores"],
+            {"total": 2, "ativos": 1, "pendentes": 1, "percentual_ativos": 50},
+        )
+        self.assertEqual(dados["funcionarios"], {"total": 1})
+        self.assertEqual(dados["visitantes_mes"], {"total": 1})
+        self.assertEqual(
+            dados["encomendas_pendentes"],
+            {"total": 2, "dias_mais_antiga": 5, "cor_alerta": "#ef4444"},
+        )
+        self.assertEqual(dados["avisos_ativos"], {"total": 1})
+        self.assertEqual(dados["eventos_proximos"], {"total": 1})
+        self.assertEqual(dados["ocorrencias_pendentes"], {"total": 1})
+
+    @override_settings(DASHBOARD_CONSULTA_UNICA=False)
+    def test_sindico_stats_uma_consulta_por_tabela(self):
+        por_tabela = self._stats_sindico()
+
+        with override_settings(DASHBOARD_CONSULTA_UNICA=True):
+            self.assertEqual(self._stats_sindico(), por_tabela)
+
+    def test_sindico_stats_em_uma_consulta(self):
+        self.client.force_authenticate(user=self.sindico)
+        self.client.get(reverse("sindico-stats"))
+
+        # Grupos já em cache: sobra apenas a consulta das métricas
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("sindico-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_portaria_stats_em_uma_consulta(self):
+        self.client.force_authenticate(user=self.porteiro)
+        self.client.get(reverse("portaria-stats"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("portaria-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "visitantes_dentro": {"total": 1},
+                "encomendas_pendentes": {"total": 2},
+                "reservas_hoje": {"total": 0},
+                "eventos_hoje": {"total": 0},
+            },
+        )
+
+    def test_admin_stats_sem_consulta_por_condominio(self):
+        self.morador.unidades.add(Unidade.objects.first())
+        for indice in range(5):
+            Condominio.objects.create(
+                nome=f"Condominio Extra {indice}",
+                cnpj=f"9999999900{indice:02d}00",
+                telefone="11900000000",
+                cep="01310000",
+                numero=str(indice),
+            )
+        admin = User.objects.create_user(
+            username="admin",
+            password="senha123",
+            email="admin@example.com",
+            cpf="87748248800",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=admin)
+
+        # Totais, contagem da paginação e página de condomínios
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("admin-stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_condominios"], 7)
+        self.assertEqual(response.data["total_moradores"], 3)
+        self.assertEqual(response.data["total_porteiros"], 1)
+        self.assertEqual(response.data["total_sindicos"], 1)
+        self.assertEqual(response.data["usuarios_pendentes"], 1)
+        detalhes = {
+            item["nome"]: item
+            for item in response.data["condominios_detalhes"]
+        }
+        self.assertEqual(
+            detalhes["Condominio Dashboard"]["total_moradores"], 2
+        )
+        self.assertEqual(detalhes["Condominio Dashboard"]["total_unidades"], 1)
+        self.assertEqual(detalhes["Condominio Extra 0"]["total_moradores"], 0)
+        self.assertEqual(response.data["condominios_paginacao"]["count"], 7)
+
+
+@override_settings(DASHBOARD_CACHE_JANELA=300)
+class DashboardCacheTests(DashboardTestBase):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.client.force_authenticate(user=self.porteiro)
+        self.url = reverse("portaria-stats")
+
+    def _encomendas(self):
+        return self.client.get(self.url).data["encomendas_pendentes"]["total"]
+
+    def test_snapshot_servido_sem_consultas(self):
+        self.assertEqual(self._encomendas(), 2)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._encomendas(), 2)
+
+    def test_alteracao_invalida_o_condominio(self):
+        self.assertEqual(self._encomendas(), 2)
+
+        Encomenda.objects.create(
+            unidade=Unidade.objects.first(),
+            destinatario_nome="Morador",
+            condominio=self.condominio,
+        )
+
+        self.assertEqual(self._encomendas(), 3)
+
+    def test_alteracao_em_outro_condominio_nao_invalida(self):
+        self._encomendas()
+
+        Encomenda.objects.create(
+            unidade=Unidade.objects.first(),
+            destinatario_nome="Externo",
+            condominio=Condominio.objects.get(nome="Outro Condominio"),
+        )
+
+        with self.assertNumQueries(0):
+            self._encomendas()
+
+    def test_nova_janela_recalcula(self):
+        self._encomendas()
+
+        with patch(
+            "cadastros.services.dashboard_service.time.time",
+            return_value=time.time() + 300,
+        ):
+            with self.assertNumQueries(1):
+                self._encomendas()
+
+    @override_settings(DASHBOARD_CACHE_JANELA_POR_PROCESSO=60)
+    def test_sem_cache_compartilhado_usa_a_janela_curta(self):
+        # LocMem (por processo): a invalidação por signal não chega aos
+        # outros workers, então o snapshot não pode durar a janela inteira
+        with patch("cadastros.services.dashboard_service.cache.set") as gravar:
+            self._encomendas()
+        self.assertEqual(gravar.call_args[0][2], 60)
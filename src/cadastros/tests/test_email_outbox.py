@@ -0,0 +1,196 @@
+"""
+Testes da outbox de e-mails e do worker de envio.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from cadastros.models import EmailOutbox
+from cadastros.services.email_service import (
+    MemoriaTransporte,
+    ResendTransporte,
+    enfileirar_email,
+    processar_lote,
+    purgar_outbox,
+)
+
+
+def _payload(destinatario="a@example.com", **extra):
+    return {
+        "from": "noreply@test.example.com",
+        "to": [destinatario],
+        "subject": "Assunto",
+        "html": "<p>Olá</p>",
+        **extra,
+    }
+
+
+class TransporteComFalha:
+    def enviar(self, emails):
+        return {e.pk: (None, "provedor indisponível") for e in emails}
+
+
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        MemoriaTransporte.limpar()
+
+    def test_worker_envia_pendentes(self):
+        email = enfileirar_email(_payload())
+
+        self.assertEqual(processar_lote(), (1, 0))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_ENVIADO)
+        self.assertEqual(email.tentativas, 1)
+        self.assertTrue(email.provedor_id)
+        self.assertEqual(MemoriaTransporte.enviados, [_payload()])
+        # Nada mais a enviar
+        self.assertEqual(processar_lote(), (0, 0))
+
+    def test_chave_deduplica_enfileiramento(self):
+        primeiro = enfileirar_email(_payload(), chave="aprovacao:1")
+        segundo = enfileirar_email(_payload(), chave="aprovacao:1")
+
+        self.assertEqual(primeiro.pk, segundo.pk)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
+
+    @override_settings(EMAIL_OUTBOX_MAX_TENTATIVAS=2)
+    def test_falha_reagenda_com_backoff_e_desiste(self):
+        email = enfileirar_email(_payload())
+
+        self.assertEqual(
+            processar_lote(transporte=TransporteComFalha()), (0, 1)
+        )
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_PENDENTE)
+        self.assertGreater(email.proxima_tentativa_em, timezone.now())
+        self.assertEqual(email.ultimo_erro, "provedor indisponível")
+
+        # Ainda dentro do backoff: não é reprocessado
+        self.assertEqual(
+            processar_lote(transporte=TransporteComFalha()), (0, 0)
+        )
+
+        EmailOutbox.objects.update(proxima_tentativa_em=timezone.now())
+        processar_lote(transporte=TransporteComFalha())
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_FALHOU)
+        self.assertEqual(email.tentativas, 2)
+
+    def test_reserva_expirada_volta_para_a_fila(self):
+        email = enfileirar_email(_payload())
+        EmailOutbox.objects.update(
+            status=EmailOutbox.STATUS_ENVIANDO,
+            reservado_ate=timezone.now() - timedelta(seconds=1),
+        )
+
+        self.assertEqual(processar_lote(), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_ENVIADO)
+
+    @override_settings(EMAIL_OUTBOX_TAXA_POR_SEGUNDO=0)
+    @patch("resend.Emails.send", return_value={"id": "individual"})
+    @patch(
+        "resend.Batch.send",
+        return_value={"data": [{"id": "lote-1"}, {"id": "lote-2"}]},
+    )
+    def test_resend_usa_lote_e_envia_anexos_individualmente(
+        self, mock_lote, mock_individual
+    ):
+        anexo = {"filename": "qrcode.png", "content": "eA=="}
+        simples_1 = enfileirar_email(_payload("a@example.com"))
+        simples_2 = enfileirar_email(_payload("b@example.com"))
+        com_anexo = enfileirar_email(
+            _payload("c@example.com", attachments=[anexo])
+        )
+
+        self.assertEqual(processar_lote(transporte=ResendTransporte()), (3, 0))
+
+        mock_lote.assert_called_once()
+        params, opcoes = mock_lote.call_args[0]
+        self.assertEqual(len(params), 2)
+        self.assertIn("idempotency_key", opcoes)
+        self.assertEqual(
+            mock_individual.call_args[0][1],
+            {"idempotency_key": com_anexo.chave_idempotencia},
+        )
+        ids = dict(EmailOutbox.objects.values_list("pk", "provedor_id"))
+        self.assertEqual(ids[simples_1.pk], "lote-1")
+        self.assertEqual(ids[simples_2.pk], "lote-2")
+        self.assertEqual(ids[com_anexo.pk], "individual")
+
+    @override_settings(EMAIL_OUTBOX_TAXA_POR_SEGUNDO=0)
+    @patch("resend.Batch.send")
+    def test_retentativa_reenvia_o_mesmo_lote_com_a_mesma_chave(
+        self, mock_lote
+    ):
+        mock_lote.side_effect = [
+            TimeoutError("timeout"),
+            {"data": [{"id": "lote-1"}, {"id": "lote-2"}]},
+        ]
+        enfileirar_email(_payload("a@example.com"))
+        enfileirar_email(_payload("b@example.com"))
+        processar_lote(transporte=ResendTransporte())
+
+        # Um e-mail novo na fila não entra no lote que já foi ao provedor,
+        # e o lote é reservado inteiro mesmo acima do limite
+        novo = enfileirar_email(_payload("c@example.com"))
+        EmailOutbox.objects.update(proxima_tentativa_em=timezone.now())
+        self.assertEqual(
+            processar_lote(limite=1, transporte=ResendTransporte()), (2, 0)
+        )
+
+        (params_1, opcoes_1), (params_2, opcoes_2) = [
+            chamada[0] for chamada in mock_lote.call_args_list
+        ]
+        self.assertEqual(params_2, params_1)
+        self.assertEqual(opcoes_2, opcoes_1)
+        novo.refresh_from_db()
+        self.assertEqual(novo.status, EmailOutbox.STATUS_PENDENTE)
+
+    def test_envio_remove_o_corpo_do_payload(self):
+        email = enfileirar_email(_payload(html="<p>Senha: abc123</p>"))
+
+        processar_lote()
+
+        email.refresh_from_db()
+        self.assertEqual(
+            email.payload,
+            {
+                "from": "noreply@test.example.com",
+                "to": ["a@example.com"],
+                "subject": "Assunto",
+            },
+        )
+
+    @override_settings(EMAIL_OUTBOX_MAX_TENTATIVAS=1)
+    def test_desistencia_remove_o_corpo_do_payload(self):
+        email = enfileirar_email(_payload())
+
+        processar_lote(transporte=TransporteComFalha())
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailOutbox.STATUS_FALHOU)
+        self.assertNotIn("html", email.payload)
+
+    def test_purga_remove_antigos_e_limpa_o_corpo_dos_finais(self):
+        antigo = enfileirar_email(_payload())
+        recente = enfileirar_email(_payload())
+        pendente = enfileirar_email(_payload())
+        EmailOutbox.objects.filter(pk__in=[antigo.pk, recente.pk]).update(
+            status=EmailOutbox.STATUS_ENVIADO
+        )
+        EmailOutbox.objects.filter(pk__in=[antigo.pk, pendente.pk]).update(
+            created_on=timezone.now() - timedelta(days=31)
+        )
+
+        self.assertEqual(purgar_outbox(30), 1)
+
+        self.assertFalse(EmailOutbox.objects.filter(pk=antigo.pk).exists())
+        recente.refresh_from_db()
+        self.assertNotIn("html", recente.payload)
+        pendente.refresh_from_db()
+        self.assertIn("html", pendente.payload)
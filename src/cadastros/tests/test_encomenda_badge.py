@@ -0,0 +1,142 @@
+"""
+Testes do badge de encomendas pendentes por idade.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app.utils.cache_compartilhado import ttl_invalidavel
+from cadastros.models import Condominio, Encomenda, Unidade
+
+User = get_user_model()
+
+
+@override_settings(ENCOMENDA_BADGE_CACHE_TTL=3600)
+class EncomendaBadgeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Badge",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        self.outro = Condominio.objects.create(
+            nome="Outro Condominio",
+            cnpj="11444777000161",
+            telefone="11933334444",
+            cep="01310000",
+            numero="20",
+        )
+        self.unidade = Unidade.objects.create(numero="101", bloco="A")
+
+        self.morador = User.objects.create_user(
+            username="morador",
+            password="senha123",
+            email="morador@example.com",
+            cpf="39053344705",
+            condominio=self.condominio,
+        )
+        self.morador.groups.add(
+            Group.objects.get_or_create(name="Moradores")[0]
+        )
+        self.morador.unidades.add(self.unidade)
+
+        self.porteiro = User.objects.create_user(
+            username="porteiro",
+            password="senha123",
+            email="porteiro@example.com",
+            cpf="52998224725",
+            condominio=self.condominio,
+        )
+        self.porteiro.groups.add(
+            Group.objects.get_or_create(name="Portaria")[0]
+        )
+
+        agora = timezone.now()
+        for dias in (0, 2, 5):
+            self._encomenda(agora - timedelta(days=dias, hours=1))
+        self._encomenda(agora, retirado_em=agora)
+        self._encomenda(agora, condominio=self.outro)
+
+    def _encomenda(self, created_on, condominio=None, **extra):
+        encomenda = Encomenda.objects.create(
+            unidade=self.unidade,
+            destinatario_nome="Morador",
+            condominio=condominio or self.condominio,
+            **extra,
+        )
+        Encomenda.objects.filter(pk=encomenda.pk).update(created_on=created_on)
+        return encomenda
+
+    def test_portaria_conta_faixas_do_proprio_condominio(self):
+        self.client.force_authenticate(user=self.porteiro)
+
+        response = self.client.get(reverse("encomenda-badge"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 3,
+                "green": 1,
+                "yellow": 1,
+                "red": 1,
+                "badge_color": "red",
+            },
+        )
+
+    def test_morador_servido_do_cache_da_unidade(self):
+        self.client.force_authenticate(user=self.morador)
+        url = reverse("encomenda-badge")
+
+        self.assertEqual(self.client.get(url).data["total"], 4)
+
+        # Só a consulta das unidades do morador
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).data["total"], 4)
+
+        encomenda = Encomenda.objects.filter(retirado_em__isnull=True).first()
+        encomenda.retirado_em = timezone.now()
+        encomenda.save()
+
+        self.assertEqual(self.client.get(url).data["total"], 3)
+
+    def test_mover_encomenda_invalida_a_unidade_anterior(self):
+        self.client.force_authenticate(user=self.morador)
+        url = reverse("encomenda-badge")
+        self.assertEqual(self.client.get(url).data["total"], 4)
+
+        encomenda = Encomenda.objects.filter(retirado_em__isnull=True).first()
+        encomenda.unidade = Unidade.objects.create(numero="102", bloco="A")
+        encomenda.save()
+
+        self.assertEqual(self.client.get(url).data["total"], 3)
+
+    def test_ttl_curto_sem_cache_compartilhado(self):
+        self.assertEqual(ttl_invalidavel(3600, 60), 60)
+
+        redis = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache"
+            }
+        }
+        with override_settings(CACHES=redis):
+            self.assertEqual(ttl_invalidavel(3600, 60), 3600)
@@ -0,0 +1,157 @@
+"""
+Testes dos campos de endereço gravados em Condomínio/EventoCerimonial.
+
+O CEP é resolvido somente na escrita; a leitura (serializers) não faz I/O.
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from cadastros.api.serializers import (
+    CondominioListSerializer,
+    CondominioSerializer,
+)
+from cadastros.api.serializers.evento_cerimonial_serializer import (
+    EventoCerimonialListSerializer,
+)
+from cadastros.models import Condominio, EventoCerimonial
+from cadastros.services import cep_service
+
+ENDERECO = {
+    "cep": "01310100",
+    "logradouro": "Avenida Paulista",
+    "bairro": "Bela Vista",
+    "cidade": "São Paulo",
+    "estado": "SP",
+}
+
+
+def _condominio(i=0, **kwargs):
+    dados = {
+        "nome": f"Condominio {i}",
+        "cnpj": f"1234567800019{i}",
+        "telefone": "11999999999",
+        "cep": "01310100",
+        "numero": "100",
+    }
+    dados.update(kwargs)
+    return Condominio.objects.create(**dados)
+
+
+@patch(
+    "cadastros.services.cep_service.buscar_endereco",
+    side_effect=lambda cep: dict(ENDERECO) if cep else None,
+)
+class EnderecoPorCepTests(TestCase):
+    def setUp(self):
+        cep_service.limpar_cache_memoria()
+
+    def test_criacao_preenche_campos_de_endereco(self, mock_buscar):
+        condominio = _condominio(complemento="Torre A")
+
+        self.assertEqual(mock_buscar.call_count, 1)
+        condominio.refresh_from_db()
+        self.assertEqual(condominio.logradouro, "Avenida Paulista")
+        self.assertEqual(condominio.estado, "SP")
+        self.assertEqual(
+            condominio.endereco_completo,
+            "Avenida Paulista, 100, Torre A, Bela Vista, São Paulo - SP, "
+            "CEP: 01310-100",
+        )
+
+    def test_salvar_sem_mudar_cep_nao_resolve_de_novo(self, mock_buscar):
+        condominio = _condominio()
+        condominio = Condominio.objects.get(pk=condominio.pk)
+        mock_buscar.reset_mock()
+
+        condominio.nome = "Outro nome"
+        condominio.save()
+        condominio.numero = "200"
+        condominio.save(update_fields=["numero"])
+
+        mock_buscar.assert_not_called()
+        condominio.refresh_from_db()
+        self.assertTrue(
+            condominio.endereco_completo.startswith("Avenida Paulista, 200")
+        )
+
+    def test_mudanca_de_cep_resolve_novamente(self, mock_buscar):
+        condominio = Condominio.objects.get(pk=_condominio().pk)
+        mock_buscar.reset_mock()
+
+        condominio.cep = ""
+        condominio.save()
+
+        mock_buscar.assert_called_once()
+        condominio.refresh_from_db()
+        self.assertEqual(condominio.logradouro, "")
+        self.assertEqual(condominio.endereco_completo, "Número 100")
+
+    def test_serializers_leem_colunas_sem_io(self, mock_buscar):
+        condominios = [_condominio(i) for i in range(3)]
+        inicio = timezone.now()
+        evento = EventoCerimonial.objects.create(
+            nome="Casamento",
+            datetime_inicio=inicio,
+            datetime_fim=inicio + timedelta(hours=5),
+            cep="01310100",
+        )
+        mock_buscar.reset_mock()
+
+        lista = list(
+            Condominio.objects.filter(pk__in=[c.pk for c in condominios])
+        )
+        data = CondominioSerializer(lista[0]).data
+        CondominioListSerializer(lista, many=True).data
+        evento_data = EventoCerimonialListSerializer(
+            EventoCerimonial.objects.get(pk=evento.pk)
+        ).data
+
+        mock_buscar.assert_not_called()
+        self.assertEqual(data["cidade"], "São Paulo")
+        self.assertIn("Avenida Paulista", evento_data["endereco_completo"])
+
+    def test_backfill_preenche_registros_pendentes(self, mock_buscar):
+        pks = [_condominio(i).pk for i in range(5)]
+        Condominio.objects.filter(pk__in=pks).update(
+            logradouro="", endereco_completo=""
+        )
+
+        call_command(
+            "backfill_enderecos",
+            "--batch-size=2",
+            "--modelo=condominio",
+            stdout=StringIO(),
+        )
+
+        self.assertFalse(
+            Condominio.objects.filter(
+                pk__in=pks, endereco_completo=""
+            ).exists()
+        )
+        self.assertEqual(
+            Condominio.objects.filter(logradouro="Avenida Paulista").count(),
+            5,
+        )
+
+    def test_backfill_repara_registros_salvos_com_provedor_fora(
+        self, mock_buscar
+    ):
+        mock_buscar.side_effect = lambda cep: None
+        condominio = _condominio()
+        condominio.refresh_from_db()
+        self.assertEqual(condominio.logradouro, "")
+        self.assertNotEqual(condominio.endereco_completo, "")
+
+        mock_buscar.side_effect = lambda cep: dict(ENDERECO)
+        call_command(
+            "backfill_enderecos", "--modelo=condominio", stdout=StringIO()
+        )
+
+        condominio.refresh_from_db()
+        self.assertEqual(condominio.logradouro, "Avenida Paulista")
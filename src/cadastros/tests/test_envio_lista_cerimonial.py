@@ -0,0 +1,183 @@
+"""
+Testes do envio em lote da lista de convidados do cerimonial.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cadastros.models import (
+    RESPOSTA_PRESENCA_CONFIRMADO,
+    ConvidadoListaCerimonial,
+    EmailOutbox,
+    EnvioListaCerimonial,
+    EventoCerimonial,
+    ListaConvidadosCerimonial,
+)
+from cadastros.services.convite_cerimonial_service import (
+    retomar_envios_interrompidos,
+)
+from cadastros.services.email_service import processar_lote
+
+User = get_user_model()
+
+
+class TransporteComFalha:
+    def enviar(self, emails):
+        return {e.pk: (None, "caixa inexistente") for e in emails}
+
+
+class EnvioListaCerimonialTests(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.cerimonialista = User.objects.create_user(
+            username="cerimonialista",
+            password="senha123",
+            email="cerimonial@example.com",
+            cpf="39053344705",
+        )
+        inicio = timezone.now() + timedelta(days=10)
+        self.evento = EventoCerimonial.objects.create(
+            nome="Casamento",
+            datetime_inicio=inicio,
+            datetime_fim=inicio + timedelta(hours=6),
+        )
+        self.evento.cerimonialistas.add(self.cerimonialista)
+        self.lista = ListaConvidadosCerimonial.objects.create(
+            evento=self.evento, titulo="Convidados"
+        )
+        self.pendente = ConvidadoListaCerimonial.objects.create(
+            lista=self.lista, nome="Ana", email="ana@example.com"
+        )
+        self.confirmado = ConvidadoListaCerimonial.objects.create(
+            lista=self.lista,
+            nome="Bruno",
+            email="bruno@example.com",
+            resposta_presenca=RESPOSTA_PRESENCA_CONFIRMADO,
+        )
+        self.sem_email = ConvidadoListaCerimonial.objects.create(
+            lista=self.lista, nome="Carla"
+        )
+        self.client.force_authenticate(user=self.cerimonialista)
+
+    def _finalizar(self):
+        return self.client.post(
+            reverse(
+                "lista-convidados-cerimonial-finalizar",
+                kwargs={"lista_pk": self.lista.pk},
+            )
+        )
+
+    def _progresso(self, envio_id):
+        return self.client.get(
+            reverse(
+                "lista-convidados-cerimonial-envio",
+                kwargs={"lista_pk": self.lista.pk, "envio_pk": envio_id},
+            )
+        )
+
+    def test_finalizar_retorna_envio_e_enfileira_emails(self):
+        response = self._finalizar()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["total_convidados"], 3)
+        self.assertEqual(response.data["enviados_confirmacao"], 1)
+        self.assertEqual(response.data["enviados_qr"], 1)
+        self.assertEqual(
+            [f["convidado_id"] for f in response.data["falhas"]],
+            [self.sem_email.pk],
+        )
+
+        assuntos = sorted(
+            email.payload["subject"] for email in EmailOutbox.objects.all()
+        )
+        self.assertEqual(
+            assuntos,
+            [
+                "Confirme sua presença em Casamento",
+                "Seu convite para Casamento",
+            ],
+        )
+        confirmacao = EmailOutbox.objects.get(
+            payload__to=["ana@example.com"]
+        ).payload
+        self.assertIn(
+            f"http://testserver/api/cadastros/listas-convidados-cerimonial/"
+            f"rsvp/{self.pendente.qr_token}/",
+            confirmacao["html"],
+        )
+
+    def test_progresso_acompanha_entrega_da_outbox(self):
+        envio_id = self._finalizar().data["envio_id"]
+        self.assertEqual(
+            self._progresso(envio_id).data["aguardando_entrega"], 2
+        )
+
+        processar_lote(transporte=TransporteComFalha())
+        EmailOutbox.objects.filter(payload__to=["ana@example.com"]).update(
+            status=EmailOutbox.STATUS_ENVIADO
+        )
+        EmailOutbox.objects.filter(payload__to=["bruno@example.com"]).update(
+            status=EmailOutbox.STATUS_FALHOU
+        )
+
+        data = self._progresso(envio_id).data
+        self.assertEqual(data["entregues"], 1)
+        self.assertEqual(data["falhas_entrega"], 1)
+        falha = [f for f in data["falhas"] if f["nome"] == "Bruno"][0]
+        self.assertEqual(falha["convidado_id"], self.confirmado.pk)
+        self.assertEqual(falha["erro"], "caixa inexistente")
+
+    def test_finalizar_de_novo_nao_repete_os_emails(self):
+        self._finalizar()
+        response = self._finalizar()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+    def test_envio_interrompido_e_retomado_sem_repetir(self):
+        envio_id = self._finalizar().data["envio_id"]
+        EmailOutbox.objects.filter(payload__to=["bruno@example.com"]).delete()
+        # Processo reiniciado no meio do job: o envio ficou parado
+        EnvioListaCerimonial.objects.filter(pk=envio_id).update(
+            status=EnvioListaCerimonial.STATUS_PROCESSANDO,
+            updated_on=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(retomar_envios_interrompidos(), 1)
+
+        envio = EnvioListaCerimonial.objects.get(pk=envio_id)
+        self.assertEqual(envio.status, EnvioListaCerimonial.STATUS_CONCLUIDO)
+        self.assertEqual(
+            sorted(e.payload["to"][0] for e in EmailOutbox.objects.all()),
+            ["ana@example.com", "bruno@example.com"],
+        )
+        self.assertEqual(retomar_envios_interrompidos(), 0)
+
+    def test_lista_sem_convidados_retorna_400(self):
+        self.lista.convidados.all().delete()
+        response = self._finalizar()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_progresso_exige_permissao_na_lista(self):
+        envio_id = self._finalizar().data["envio_id"]
+        outro = User.objects.create_user(
+            username="outro",
+            password="senha123",
+            email="outro@example.com",
+            cpf="52998224725",
+        )
+        self.client.force_authenticate(user=outro)
+        response = self._progresso(envio_id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,124 @@
+"""
+Testes das variantes redimensionadas das imagens armazenadas.
+"""
+
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cadastros.models import ArquivoBinario, ArquivoVariante
+from cadastros.services.arquivo_service import armazenar_arquivo
+from cadastros.services.imagem_service import gerar_variantes
+
+User = get_user_model()
+
+
+def _png(largura, altura):
+    buffer = io.BytesIO()
+    Image.new("RGB", (largura, altura), (200, 30, 30)).save(
+        buffer, format="PNG"
+    )
+    return buffer.getvalue()
+
+
+@override_settings(IMAGENS_VARIANTES_TAMANHOS=(64, 256))
+class ImagemVariantesTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="morador",
+            password="senha123",
+            email="morador@example.com",
+            cpf="39053344705",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("profile-photo", args=[self.user.id])
+
+    def _enviar(self, conteudo):
+        foto = SimpleUploadedFile("foto.png", conteudo, "image/png")
+        return self.client.post(
+            reverse("profile-photo-upload"), {"foto": foto}
+        )
+
+    def test_upload_gera_variantes_e_size_seleciona(self):
+        self._enviar(_png(1000, 500))
+        self.user.refresh_from_db()
+        variantes = ArquivoVariante.objects.filter(
+            original_id=self.user.foto_arquivo_id
+        )
+        self.assertEqual(variantes.count(), 4)
+
+        response = self.client.get(
+            self.url, {"size": "48"}, HTTP_ACCEPT="image/webp,*/*"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertIn("Accept", response["Vary"])
+        imagem = Image.open(io.BytesIO(response.content))
+        self.assertEqual(imagem.size, (64, 32))
+
+        response = self.client.get(self.url, {"size": "200", "formato": "png"})
+        self.assertEqual(response["Content-Type"], "image/png")
+        imagem = Image.open(io.BytesIO(response.content))
+        self.assertEqual(imagem.size, (256, 128))
+
+        # Sem size continua servindo o original
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, _png(1000, 500))
+
+    def test_imagem_menor_que_os_tamanhos_nao_e_ampliada(self):
+        self._enviar(_png(100, 40))
+        self.user.refresh_from_db()
+        tamanhos = set(
+            ArquivoVariante.objects.filter(
+                original_id=self.user.foto_arquivo_id
+            ).values_list("tamanho", flat=True)
+        )
+        self.assertEqual(tamanhos, {64, 100})
+
+    def test_substituir_foto_remove_variantes(self):
+        self._enviar(_png(300, 300))
+        self._enviar(_png(400, 400))
+        self.user.refresh_from_db()
+
+        self.assertFalse(
+            ArquivoVariante.objects.exclude(
+                original_id=self.user.foto_arquivo_id
+            ).exists()
+        )
+        # original + 2 tamanhos x 2 formatos
+        self.assertEqual(ArquivoBinario.objects.count(), 5)
+
+    def test_regerar_variantes_remove_os_arquivos_anteriores(self):
+        self._enviar(_png(300, 300))
+        self.user.refresh_from_db()
+
+        with override_settings(IMAGENS_VARIANTES_TAMANHOS=(32, 128)):
+            gerar_variantes(self.user.foto_arquivo_id, substituir=True)
+
+        # original + 2 tamanhos novos x 2 formatos, sem as variantes antigas
+        self.assertEqual(ArquivoBinario.objects.count(), 5)
+        self.assertEqual(
+            set(ArquivoVariante.objects.values_list("tamanho", flat=True)),
+            {32, 128},
+        )
+
+    def test_arquivo_que_nao_e_imagem_e_ignorado(self):
+        self._enviar(b"nao-e-imagem")
+        self.assertFalse(ArquivoVariante.objects.exists())
+
+    def test_comando_gera_variantes_de_imagens_existentes(self):
+        arquivo = armazenar_arquivo(_png(600, 600), "image/png")
+        User.objects.filter(pk=self.user.pk).update(foto_arquivo=arquivo)
+
+        call_command("gerar_variantes_imagens", stdout=io.StringIO())
+
+        self.assertEqual(
+            ArquivoVariante.objects.filter(original=arquivo).count(), 4
+        )
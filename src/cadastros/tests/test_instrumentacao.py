@@ -0,0 +1,105 @@
+"""
+Testes do middleware de instrumentação (Server-Timing e requisição lenta).
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from app.instrumentacao import duplicadas, impressao_digital, medir
+
+User = get_user_model()
+
+
+@override_settings(INSTRUMENTACAO_AMOSTRAGEM=0, INSTRUMENTACAO_LENTO_MS=10000)
+class InstrumentacaoMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, user, **extra):
+        token = Token.objects.create(user=user)
+        return self.client.get(
+            "/api/access/users/",
+            HTTP_AUTHORIZATION=f"Token {token.key}",
+            **extra,
+        )
+
+    def _usuario(self, username, cpf, **kwargs):
+        return User.objects.create_user(
+            username=username,
+            password="senha123",
+            email=f"{username}@example.com",
+            cpf=cpf,
+            **kwargs,
+        )
+
+    def test_server_timing_para_staff(self):
+        user = self._usuario("admin", "39053344705", is_staff=True)
+        self._usuario("morador", "52998224725")
+
+        response = self._get(user, HTTP_X_DEBUG_TIMING="1")
+
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serializer;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_sem_server_timing_para_nao_staff_ou_fora_da_amostra(self):
+        morador = self._usuario("morador", "52998224725")
+        admin = self._usuario("admin", "39053344705", is_staff=True)
+
+        self.assertFalse(
+            self._get(morador, HTTP_X_DEBUG_TIMING="1").has_header(
+                "Server-Timing"
+            )
+        )
+        self.assertFalse(self._get(admin).has_header("Server-Timing"))
+
+    @override_settings(INSTRUMENTACAO_AMOSTRAGEM=1, INSTRUMENTACAO_LENTO_MS=0)
+    def test_log_de_requisicao_lenta(self):
+        user = self._usuario("admin", "39053344705", is_staff=True)
+
+        with self.assertLogs("app.instrumentacao", "WARNING") as logs:
+            self._get(user)
+
+        dados = logs.records[0].instrumentacao
+        self.assertEqual(dados["caminho"], "/api/access/users/")
+        self.assertEqual(dados["view"], "user-list")
+        self.assertEqual(dados["status"], 200)
+        self.assertGreater(dados["consultas"], 0)
+        self.assertIn("duplicadas", dados)
+        json.loads(logs.records[0].getMessage().split(": ", 1)[1])
+
+
+class ImpressaoDigitalTests(SimpleTestCase):
+    def test_agrupa_consultas_com_valores_diferentes(self):
+        consultas = [
+            'SELECT * FROM "unidade" WHERE "id" IN (%s, %s)',
+            'SELECT * FROM "unidade" WHERE "id" IN (%s)',
+            'SELECT * FROM "aviso" WHERE "titulo" = \'x\' LIMIT 21',
+        ]
+
+        self.assertEqual(
+            impressao_digital(consultas[0]), impressao_digital(consultas[1])
+        )
+        self.assertEqual(
+            impressao_digital(consultas[2]),
+            'SELECT * FROM "aviso" WHERE "titulo" = ? LIMIT ?',
+        )
+        self.assertEqual(
+            duplicadas(consultas),
+            [
+                {
+                    "sql": 'SELECT * FROM "unidade" WHERE "id" IN (...)',
+                    "vezes": 2,
+                }
+            ],
+        )
+
+    def test_medir_sem_requisicao_medida(self):
+        with medir("http"):
+            pass
@@ -0,0 +1,111 @@
+"""
+Testes do registro de métricas e do endpoint /api/metrics/.
+"""
+
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from app.metricas import agregar, formatar, registro
+
+User = get_user_model()
+
+
+class MetricasEndpointTests(TestCase):
+    def setUp(self):
+        registro.limpar()
+        self.admin = User.objects.create_user(
+            username="admin",
+            password="senha123",
+            cpf="39053344705",
+            is_staff=True,
+        )
+
+    def _metricas(self, user):
+        token, _ = Token.objects.get_or_create(user=user)
+        return self.client.get(
+            "/api/metrics/", HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+    def test_requisicoes_por_view_e_status(self):
+        self.client.get("/api/health/")
+        self.client.get("/api/health/")
+        self.client.get("/nao-existe/")
+
+        response = self._metricas(self.admin)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        texto = response.content.decode()
+        self.assertIn(
+            'http_requisicoes_total{metodo="GET",status="200",'
+            'view="app.health.health"} 2',
+            texto,
+        )
+        self.assertIn('status="404",view="<nao_resolvida>"} 1', texto)
+        self.assertIn(
+            'http_requisicao_segundos_bucket{metodo="GET",'
+            'view="app.health.health",le="+Inf"} 2',
+            texto,
+        )
+        self.assertIn("# TYPE db_consultas_por_requisicao histogram", texto)
+        self.assertIn("# TYPE email_outbox_mensagens gauge", texto)
+
+    def test_somente_staff(self):
+        morador = User.objects.create_user(
+            username="morador", password="senha123", cpf="52998224725"
+        )
+
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 401)
+        self.assertEqual(self._metricas(morador).status_code, 403)
+
+    def test_soma_os_processos_do_diretorio(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            outro_processo = {
+                "contadores": [
+                    ["qrcode_renderizados_total", [["origem", "cache"]], 5]
+                ],
+                "histogramas": [],
+            }
+            with open(os.path.join(diretorio, "1-abc.json"), "w") as arquivo:
+                json.dump(outro_processo, arquivo)
+            registro.incrementar("qrcode_renderizados_total", origem="cache")
+
+            with override_settings(METRICAS_DIR=diretorio):
+                texto = self._metricas(self.admin).content.decode()
+
+        self.assertIn('qrcode_renderizados_total{origem="cache"} 6', texto)
+
+
+class FormatoPrometheusTests(SimpleTestCase):
+    def test_histograma_acumulado(self):
+        retrato = {
+            "contadores": [],
+            "histogramas": [
+                [
+                    "http_externo_segundos",
+                    [["host", "viacep.com.br"]],
+                    [1, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+                    15.2,
+                    4,
+                ]
+            ],
+        }
+
+        texto = formatar(*agregar([retrato, retrato]), {})
+
+        self.assertIn(
+            'http_externo_segundos_bucket{host="viacep.com.br",le="0.025"} 6',
+            texto,
+        )
+        self.assertIn(
+            'http_externo_segundos_bucket{host="viacep.com.br",le="+Inf"} 8',
+            texto,
+        )
+        self.assertIn(
+            'http_externo_segundos_sum{host="viacep.com.br"} 30.4', texto
+        )
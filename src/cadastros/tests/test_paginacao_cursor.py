@@ -0,0 +1,145 @@
+"""
+Testes da paginação por cursor das listagens.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cadastros.models import Condominio, Encomenda, Unidade
+
+User = get_user_model()
+
+
+class PaginacaoCursorTests(APITestCase):
+    def setUp(self):
+        patcher = patch(
+            "cadastros.services.cep_service.buscar_endereco",
+            return_value=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.condominio = Condominio.objects.create(
+            nome="Condominio Cursor",
+            cnpj="11222333000181",
+            telefone="11911112222",
+            cep="01310000",
+            numero="10",
+        )
+        self.porteiro = User.objects.create_user(
+            username="porteiro",
+            password="senha123",
+            email="porteiro@example.com",
+            cpf="52998224725",
+            condominio=self.condominio,
+        )
+        self.porteiro.groups.add(
+            Group.objects.get_or_create(name="Portaria")[0]
+        )
+        self.client.force_authenticate(user=self.porteiro)
+
+    def _percorrer(self, nome_url, **params):
+        ids, cursor = [], ""
+        while True:
+            response = self.client.get(
+                reverse(nome_url), {"cursor": cursor, **params}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["has_next"]:
+                return ids
+            cursor = response.data["next_cursor"]
+
+    def _encomendas(self, quantidade):
+        unidade = Unidade.objects.create(
+            numero="101", bloco="A", condominio=self.condominio
+        )
+        criado = timezone.now()
+        encomendas = [
+            Encomenda.objects.create(
+                unidade=unidade,
+                destinatario_nome=f"Morador {i}",
+                created_by=self.porteiro,
+            )
+            for i in range(quantidade)
+        ]
+        # Empates em created_on: o desempate pela PK não pode pular itens
+        Encomenda.objects.filter(pk__in=[e.pk for e in encomendas[:8]]).update(
+            created_on=criado
+        )
+        return encomendas
+
+    def test_cursor_percorre_todos_os_itens_sem_repetir(self):
+        encomendas = self._encomendas(23)
+
+        ids = self._percorrer("encomenda-list")
+
+        esperado = list(
+            Encomenda.objects.order_by("-created_on", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(ids, esperado)
+        self.assertEqual(len(ids), len(encomendas))
+
+    def test_cursor_sem_count_nao_conta(self):
+        self._encomendas(3)
+
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(
+                reverse("encomenda-list"), {"cursor": ""}
+            )
+
+        self.assertIsNone(response.data["count"])
+        self.assertFalse(
+            any(
+                "COUNT(" in q["sql"].upper()
+                for q in consultas.captured_queries
+            )
+        )
+        response = self.client.get(
+            reverse("encomenda-list"), {"cursor": "", "count": "true"}
+        )
+        self.assertEqual(response.data["count"], 3)
+
+    def test_paginacao_por_numero_mantem_formato(self):
+        self._encomendas(12)
+
+        response = self.client.get(reverse("encomenda-list"), {"page": 2})
+
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual(response.data["num_pages"], 2)
+        self.assertEqual(response.data["current_page"], 2)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertNotIn("next_cursor", response.data)
+
+    def test_cursor_com_bloco_nulo(self):
+        self.porteiro.groups.add(
+            Group.objects.get_or_create(name="Síndicos")[0]
+        )
+        for i in range(15):
+            Unidade.objects.create(
+                numero=f"{i:03d}",
+                bloco=None if i % 3 == 0 else "B",
+                condominio=self.condominio,
+            )
+
+        ids = self._percorrer("unidade-list")
+
+        self.assertEqual(len(ids), 15)
+        self.assertEqual(len(set(ids)), 15)
+
+    def test_cursor_invalido(self):
+        response = self.client.get(
+            reverse("encomenda-list"), {"cursor": "invalido"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,83 @@
+"""
+Testes da renderização de QR codes com cache.
+"""
+
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+
+from cadastros.services import qrcode_service
+from cadastros.services.qrcode_service import (
+    limpar_cache_memoria,
+    pre_renderizar,
+    qrcode_data_url,
+    qrcode_png,
+)
+
+
+class QrCodeServiceTests(SimpleTestCase):
+    def setUp(self):
+        limpar_cache_memoria()
+        self.addCleanup(limpar_cache_memoria)
+
+    def test_gera_png_e_reaproveita_cache(self):
+        with mock.patch.object(
+            qrcode_service,
+            "_renderizar",
+            wraps=qrcode_service._renderizar,
+        ) as renderizar:
+            primeiro = qrcode_png("token-123")
+            segundo = qrcode_png("token-123")
+
+        self.assertEqual(renderizar.call_count, 1)
+        self.assertEqual(primeiro, segundo)
+        self.assertTrue(primeiro.startswith(b"\x89PNG"))
+
+    def test_rotulo_gera_imagem_maior(self):
+        simples = Image.open(io.BytesIO(qrcode_png("token-123")))
+        rotulado = Image.open(
+            io.BytesIO(qrcode_png("token-123", rotulo="Maria Silva"))
+        )
+
+        self.assertEqual(simples.width, simples.height)
+        self.assertGreater(rotulado.height, rotulado.width)
+
+    def test_data_url(self):
+        self.assertTrue(
+            qrcode_data_url("abc").startswith("data:image/png;base64,")
+        )
+
+    def test_cache_em_disco_compartilhado(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            with override_settings(QRCODE_CACHE_DIR=diretorio):
+                png = qrcode_png("token-disco")
+                limpar_cache_memoria()
+                with mock.patch.object(
+                    qrcode_service, "_renderizar"
+                ) as renderizar:
+                    self.assertEqual(qrcode_png("token-disco"), png)
+                renderizar.assert_not_called()
+
+            arquivos = [
+                os.path.join(raiz, nome)
+                for raiz, _dirs, nomes in os.walk(diretorio)
+                for nome in nomes
+            ]
+            self.assertEqual(len(arquivos), 1)
+            # Só o dono lê: o PNG codifica um token de acesso
+            self.assertEqual(os.stat(arquivos[0]).st_mode & 0o777, 0o600)
+
+    @override_settings(QRCODE_LOTE_MINIMO=1)
+    def test_pre_renderizar_em_processos(self):
+        itens = ["a", "b", ("c", "Convidado C"), "a"]
+
+        self.assertEqual(pre_renderizar(itens, processos=2), 3)
+        self.assertEqual(pre_renderizar(itens, processos=2), 0)
+
+        with mock.patch.object(qrcode_service, "_renderizar") as renderizar:
+            qrcode_png("c", rotulo="Convidado C")
+        renderizar.assert_not_called()
@@ -0,0 +1,117 @@
+"""
+Testes do renderer/parser JSON rápido e da compressão das respostas.
+"""
+
+import datetime
+import gzip
+import io
+import json
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from unittest import skipIf
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from app.compressao import CompressaoMiddleware, brotli
+from app.utils.json_rapido import (
+    JSONRapidoParser,
+    JSONRapidoRenderer,
+    orjson,
+)
+
+
+class JSONRapidoTests(SimpleTestCase):
+    def test_saida_igual_a_do_renderer_padrao(self):
+        dados = OrderedDict(
+            id=uuid.uuid4(),
+            valor=Decimal("10.50"),
+            criado=timezone.now().replace(microsecond=123456),
+            data=datetime.date(2026, 1, 31),
+            hora=datetime.time(8, 30, 15, 500),
+            duracao=datetime.timedelta(minutes=90),
+            texto=gettext_lazy("Síndico"),
+            separadores="linha\u2028paragrafo\u2029fim",
+            itens=[{1: "chave inteira", "aninhado": None}],
+        )
+
+        self.assertEqual(
+            JSONRapidoRenderer().render(dados), JSONRenderer().render(dados)
+        )
+
+    def test_floats_com_o_mesmo_valor_do_renderer_padrao(self):
+        dados = {"valores": [0.5, 1e20, 1.5e-7, {"taxa": 12.25}]}
+
+        self.assertEqual(
+            json.loads(JSONRapidoRenderer().render(dados)),
+            json.loads(JSONRenderer().render(dados)),
+        )
+
+    @skipIf(orjson is None, "orjson não instalado")
+    def test_nan_vira_null(self):
+        for valor in (float("nan"), float("inf")):
+            self.assertEqual(
+                JSONRapidoRenderer().render({"valor": valor}),
+                b'{"valor":null}',
+            )
+
+    def test_indentacao_usa_renderer_padrao(self):
+        dados = {"nome": "Unidade 101"}
+        tipo = "application/json; indent=2"
+
+        self.assertEqual(
+            JSONRapidoRenderer().render(dados, tipo),
+            JSONRenderer().render(dados, tipo),
+        )
+
+    def test_parser(self):
+        parser = JSONRapidoParser()
+
+        dados = parser.parse(io.BytesIO('{"nome": "Condomínio"}'.encode()))
+        self.assertEqual(dados, {"nome": "Condomínio"})
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(b"{nome"))
+
+
+@override_settings(COMPRESSAO_MIN_BYTES=1024)
+class CompressaoMiddlewareTests(SimpleTestCase):
+    def _resposta(self, resposta, aceita):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=aceita)
+        return CompressaoMiddleware(lambda r: resposta)(request)
+
+    def _json(self, itens):
+        return JsonResponse({"results": [{"nome": "Morador"}] * itens})
+
+    def test_gzip_acima_do_limite(self):
+        resposta = self._resposta(self._json(200), "gzip")
+
+        self.assertEqual(resposta["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", resposta["Vary"])
+        self.assertIn(b"Morador", gzip.decompress(resposta.content))
+
+    def test_respostas_pequenas_e_binarias_nao_sao_comprimidas(self):
+        pequena = self._resposta(self._json(2), "gzip, br")
+        imagem = self._resposta(
+            HttpResponse(b"\x89PNG" * 1000, content_type="image/png"),
+            "gzip, br",
+        )
+
+        self.assertFalse(pequena.has_header("Content-Encoding"))
+        self.assertFalse(imagem.has_header("Content-Encoding"))
+
+    @skipIf(brotli is None, "brotli não instalado")
+    def test_brotli_quando_aceito(self):
+        resposta = self._resposta(self._json(200), "gzip, br")
+
+        self.assertEqual(resposta["Content-Encoding"], "br")
+        self.assertIn(b"Morador", brotli.decompress(resposta.content))
+
+    def test_brotli_recusado_com_q_zero(self):
+        resposta = self._resposta(self._json(200), "gzip, br;q=0")
+
+        self.assertEqual(resposta["Content-Encoding"], "gzip")
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from django.test import TestCase
+
+from cadastros.management.commands.bench import percentil
+from cadastros.models import (
+    Condominio,
+    ConvidadoListaCerimonial,
+    Encomenda,
+    Unidade,
+    Visitante,
+)
+from cadastros.services.carga_sintetica import cpf_valido
+
+User = get_user_model()
+
+VOLUMES = {
+    "condominios": 2,
+    "unidades": 6,
+    "moradores": 12,
+    "encomendas": 30,
+    "visitantes": 20,
+    "eventos": 1,
+    "convidados": 15,
+}
+
+
+def _carga(**opcoes):
+    opcoes.setdefault("forcar", True)
+    call_command("seed_load", stdout=StringIO(), **VOLUMES, **opcoes)
+
+
+class SeedLoadTests(TestCase):
+    def test_gera_os_volumes_pedidos(self):
+        _carga()
+
+        self.assertEqual(Condominio.objects.count(), 2)
+        self.assertEqual(Unidade.objects.count(), 6)
+        self.assertEqual(Encomenda.objects.count(), 30)
+        self.assertEqual(Visitante.objects.count(), 20)
+        self.assertEqual(ConvidadoListaCerimonial.objects.count(), 15)
+        # moradores + admin, cerimonialista, síndico e porteiro por condomínio
+        self.assertEqual(User.objects.count(), 12 + 2 + 2 * 2)
+        self.assertEqual(
+            User.objects.filter(groups__name="Moradores").count(), 12
+        )
+        # condomínio desnormalizado igual ao da unidade
+        self.assertFalse(
+            Encomenda.objects.exclude(
+                condominio=F("unidade__condominio")
+            ).exists()
+        )
+
+    def test_mesma_semente_gera_os_mesmos_dados(self):
+        _carga()
+        primeira = _retrato()
+        _carga(limpar=True)
+        self.assertEqual(_retrato(), primeira)
+
+        _carga(limpar=True, semente=7)
+        self.assertNotEqual(_retrato(), primeira)
+
+    def test_exige_limpar_quando_ja_existe_carga(self):
+        _carga()
+        with self.assertRaises(CommandError):
+            _carga()
+
+    def test_exige_debug_ou_forcar(self):
+        with self.assertRaises(CommandError):
+            _carga(forcar=False)
+        self.assertEqual(User.objects.count(), 0)
+
+    def test_usuarios_sem_senha_utilizavel(self):
+        _carga()
+
+        self.assertFalse(
+            any(u.has_usable_password() for u in User.objects.all())
+        )
+        self.assertFalse(User.objects.filter(is_superuser=True).exists())
+
+    def test_cpf_gerado_e_valido(self):
+        self.assertEqual(cpf_valido(529982247), "52998224725")
+
+
+class BenchTests(TestCase):
+    def test_grava_json_com_metricas_por_endpoint(self):
+        _carga()
+        with tempfile.TemporaryDirectory() as pasta:
+            saida = os.path.join(pasta, "bench.json")
+            call_command(
+                "bench",
+                repeticoes=2,
+                aquecimento=1,
+                saida=saida,
+                stdout=StringIO(),
+            )
+            with open(saida) as arquivo:
+                relatorio = json.load(arquivo)
+
+            stdout = StringIO()
+            call_command(
+                "bench",
+                repeticoes=1,
+                aquecimento=0,
+                endpoints=["encomenda-list"],
+                saida=os.path.join(pasta, "depois.json"),
+                comparar=saida,
+                stdout=stdout,
+            )
+
+        self.assertEqual(relatorio["volumes"]["encomendas"], 30)
+        for url, resultado in relatorio["endpoints"].items():
+            self.assertEqual(resultado["status"], 200, url)
+            self.assertGreater(resultado["consultas"], 0, url)
+            self.assertLessEqual(resultado["p50_ms"], resultado["p99_ms"])
+        self.assertIn("encomenda-list: p95", stdout.getvalue())
+
+    def test_percentil(self):
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil([3.0], 99), 3.0)
+
+
+def _retrato():
+    return (
+        list(User.objects.order_by("username").values_list("id", "cpf")),
+        list(
+            Visitante.objects.order_by("qr_token").values_list(
+                "qr_token", "nome", "morador_id"
+            )
+        ),
+        list(
+            Encomenda.objects.order_by("codigo_rastreio").values_list(
+                "codigo_rastreio", "destinatario_nome", "retirado_por"
+            )
+        ),
+    )